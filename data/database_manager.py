@@ -0,0 +1,225 @@
+import os
+import time
+import uuid
+from datetime import datetime, timezone
+import numpy as np
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from pyarrow import fs
+from utils import error_handler
+from data.historical_data import INTERVAL_MS, interval_start, to_milliseconds
+
+DAY_MS = 24 * 60 * 60 * 1000
+
+# 저장 컬럼 형식 (Binance K라인 응답에서 'ignore' 제외)
+KLINE_SCHEMA = pa.schema([
+    ('open_time', pa.int64()),
+    ('open', pa.float64()),
+    ('high', pa.float64()),
+    ('low', pa.float64()),
+    ('close', pa.float64()),
+    ('volume', pa.float64()),
+    ('close_time', pa.int64()),
+    ('quote_volume', pa.float64()),
+    ('trades', pa.int64()),
+    ('taker_buy_volume', pa.float64()),
+    ('taker_buy_quote_volume', pa.float64())
+])
+
+def klines_to_table(klines):
+    """K라인 목록(API 응답 형식)을 형식이 지정된 테이블로 변환"""
+    columns = list(zip(*(kline[:len(KLINE_SCHEMA)] for kline in klines))) if len(klines) else \
+        [[] for _ in KLINE_SCHEMA]
+    arrays = [
+        np.array(column, dtype=np.int64 if field.type == pa.int64() else np.float64)
+        for field, column in zip(KLINE_SCHEMA, columns)
+    ]
+    return pa.Table.from_arrays(arrays, schema=KLINE_SCHEMA)
+
+def partition_date(open_time):
+    """캔들 시작 시각(밀리초)의 UTC 날짜 문자열"""
+    return datetime.fromtimestamp(open_time / 1000, tz=timezone.utc).strftime('%Y-%m-%d')
+
+class KlineStore:
+    """심볼/간격/날짜로 분할된 Parquet K라인 저장소
+
+    - 경로: {root}/symbol={symbol}/interval={interval}/date={YYYY-MM-DD}/part-{첫 캔들 시각}-{id}.parquet
+    - 추가 전용: 이미 저장된 구간과 겹치는 캔들은 건너뛰고 새 파일로만 기록 (기존 파일은 수정하지 않음)
+    - 조회 시 날짜 디렉토리와 파일 통계로 기간 밖 데이터를 건너뛰고 메모리 매핑으로 읽음
+    """
+    def __init__(self, root="data/store"):
+        self.root = root
+        self.filesystem = fs.LocalFileSystem(use_mmap=True)
+        self._bounds = {}   # (symbol, interval) -> (첫 캔들 시각, 마지막 캔들 시각)
+
+    def _series_dir(self, symbol, interval):
+        return os.path.join(self.root, f"symbol={symbol.upper()}", f"interval={interval}")
+
+    def _date_dirs(self, symbol, interval, start_time=None, end_time=None):
+        """기간에 해당하는 날짜 디렉토리 목록 (날짜 순)"""
+        series_dir = self._series_dir(symbol, interval)
+        if not os.path.isdir(series_dir):
+            return []
+        first = partition_date(start_time) if start_time is not None else None
+        last = partition_date(end_time) if end_time is not None else None
+        dirs = []
+        for name in sorted(os.listdir(series_dir)):
+            if not name.startswith('date='):
+                continue
+            date = name[len('date='):]
+            if (first is None or date >= first) and (last is None or date <= last):
+                dirs.append(os.path.join(series_dir, name))
+        return dirs
+
+    def _files(self, symbol, interval, start_time=None, end_time=None):
+        """기간에 해당하는 파일 목록 (캔들 시각 순)"""
+        files = []
+        for date_dir in self._date_dirs(symbol, interval, start_time, end_time):
+            files.extend(os.path.join(date_dir, name) for name in sorted(os.listdir(date_dir))
+                         if name.endswith('.parquet'))
+        return files
+
+    def bounds(self, symbol, interval):
+        """저장된 첫/마지막 캔들 시각 (없으면 None), 파일 메타데이터 통계로 계산"""
+        key = (symbol.upper(), interval)
+        if key not in self._bounds:
+            first = last = None
+            for path in self._files(symbol, interval):
+                metadata = pq.read_metadata(path)
+                for index in range(metadata.num_row_groups):
+                    statistics = metadata.row_group(index).column(0).statistics
+                    first = statistics.min if first is None else min(first, statistics.min)
+                    last = statistics.max if last is None else max(last, statistics.max)
+            self._bounds[key] = (first, last) if first is not None else None
+        return self._bounds[key]
+
+    def append(self, symbol, interval, klines, closed_only=True, now=None):
+        """K라인 추가 (저장된 구간과 겹치는 캔들 및 미확정 캔들 제외)
+
+        반환: 기록한 캔들 수
+        """
+        try:
+            table = klines_to_table(klines)
+            if table.num_rows == 0:
+                return 0
+
+            open_time = table.column('open_time').to_numpy()
+            order = np.argsort(open_time, kind='stable')
+            open_time = open_time[order]
+            keep = np.ones(len(open_time), dtype=bool)
+            keep[1:] = open_time[1:] != open_time[:-1]
+
+            if closed_only:
+                now = int(time.time() * 1000) if now is None else now
+                keep &= table.column('close_time').to_numpy()[order] < now
+
+            bounds = self.bounds(symbol, interval)
+            if bounds is not None and keep.any():
+                # 저장 구간 사이의 빈 구간도 채울 수 있도록 해당 날짜 파티션의 실제 캔들 시각과 비교
+                first, last = int(open_time[keep][0]), int(open_time[keep][-1])
+                if first <= bounds[1] and last >= bounds[0]:
+                    stored = self.load(symbol, interval, start=first, end=last, columns=['open_time'])['open_time']
+                    keep &= ~np.isin(open_time, stored)
+
+            table = table.take(pa.array(order[keep]))
+            if table.num_rows == 0:
+                return 0
+
+            # UTC 날짜별로 나누어 기록
+            open_time = table.column('open_time').to_numpy()
+            days = open_time // DAY_MS
+            boundaries = np.flatnonzero(np.diff(days)) + 1
+            for start, end in zip(np.concatenate([[0], boundaries]), np.concatenate([boundaries, [len(days)]])):
+                part = table.slice(start, end - start)
+                first_time = int(open_time[start])
+                date_dir = os.path.join(self._series_dir(symbol, interval), f"date={partition_date(first_time)}")
+                os.makedirs(date_dir, exist_ok=True)
+                path = os.path.join(date_dir, f"part-{first_time:013d}-{uuid.uuid4().hex[:8]}.parquet")
+                temp_path = f"{path}.tmp"
+                # 가격/수량은 반복 값이 적어 사전 인코딩 생략 (읽기 속도 우선)
+                pq.write_table(part, temp_path, use_dictionary=['trades'])
+                os.replace(temp_path, path)
+
+            first, last = int(open_time[0]), int(open_time[-1])
+            if bounds is not None:
+                first, last = min(first, bounds[0]), max(last, bounds[1])
+            self._bounds[(symbol.upper(), interval)] = (first, last)
+
+            error_handler.log_info(f"K라인 저장 완료: {symbol} {interval} {table.num_rows}개")
+            return table.num_rows
+
+        except Exception as e:
+            error_handler.log_error(e, "K라인 저장 실패")
+            raise
+
+    def load(self, symbol, interval, start=None, end=None, columns=None):
+        """기간 내 K라인을 열 단위 배열로 조회
+
+        start, end: '%Y-%m-%d' 문자열 또는 밀리초 타임스탬프 (둘 다 포함, 캔들 시작 시각 기준)
+        columns: 조회할 컬럼 목록 (기본값 전체)
+        반환: {컬럼명: numpy 배열}
+        """
+        try:
+            start_time = to_milliseconds(start) if start is not None else None
+            end_time = to_milliseconds(end) if end is not None else None
+            columns = list(columns) if columns is not None else KLINE_SCHEMA.names
+            if 'open_time' not in columns:
+                columns = ['open_time'] + columns
+
+            files = self._files(symbol, interval, start_time, end_time)
+            if not files:
+                return {name: np.zeros(0, dtype=KLINE_SCHEMA.field(name).type.to_pandas_dtype())
+                        for name in columns}
+
+            condition = None
+            if start_time is not None:
+                condition = ds.field('open_time') >= start_time
+            if end_time is not None:
+                upper = ds.field('open_time') <= end_time
+                condition = upper if condition is None else condition & upper
+
+            dataset = ds.dataset(files, schema=KLINE_SCHEMA, format='parquet', filesystem=self.filesystem)
+            table = dataset.to_table(columns=columns, filter=condition)
+            arrays = {name: table.column(name).to_numpy() for name in columns}
+
+            # 파일 병렬 읽기로 순서가 바뀐 경우 캔들 시각 순으로 정렬
+            open_time = arrays['open_time']
+            if len(open_time) > 1 and np.any(open_time[1:] < open_time[:-1]):
+                order = np.argsort(open_time, kind='stable')
+                arrays = {name: values[order] for name, values in arrays.items()}
+            return arrays
+
+        except Exception as e:
+            error_handler.log_error(e, "K라인 조회 실패")
+            raise
+
+    def is_covered(self, symbol, interval, start, end=None, now=None):
+        """기간 전체(확정된 캔들 기준)가 빈 구간 없이 저장되어 있는지 확인 (기간 내 캔들 수로 판단)"""
+        bounds = self.bounds(symbol, interval)
+        if bounds is None:
+            return False
+        interval_ms = INTERVAL_MS[interval]
+        now = int(time.time() * 1000) if now is None else now
+        start_time = to_milliseconds(start)
+        end_time = min(to_milliseconds(end) if end is not None else now, now - interval_ms)
+        first_expected = interval_start(start_time + interval_ms - 1, interval)
+        last_expected = interval_start(end_time, interval)
+        if bounds[0] > first_expected or bounds[1] < last_expected:
+            return False
+        expected = (last_expected - first_expected) // interval_ms + 1
+        if expected <= 0:
+            return True
+        stored = self.load(symbol, interval, start=first_expected, end=last_expected, columns=['open_time'])
+        return len(stored['open_time']) == expected
+
+    def ensure(self, api, symbol, interval, start, end=None):
+        """기간이 저장되어 있지 않으면 API 로 조회하여 저장 후 조회
+
+        api: get_historical_klines(symbol, interval, start_str, end_str) 를 제공하는 API
+        start, end: '%Y-%m-%d' 문자열
+        """
+        if not self.is_covered(symbol, interval, start, end):
+            klines = api.get_historical_klines(symbol, interval=interval, start_str=start, end_str=end)
+            self.append(symbol, interval, klines)
+        return self.load(symbol, interval, start, end)
@@ -0,0 +1,520 @@
+import math
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# 기본 지표 구성: (지표 이름, 파라미터)
+DEFAULT_FEATURES = [
+    ('sma', {'period': 20}),
+    ('ema', {'period': 20}),
+    ('rsi', {'period': 14}),
+    ('macd', {'fast': 12, 'slow': 26, 'signal': 9}),
+    ('bollinger', {'period': 20, 'width': 2.0}),
+    ('atr', {'period': 14}),
+    ('vwap', {'period': 20}),
+    ('volatility', {'period': 20}),
+    ('obv', {})
+]
+
+# 이동 구간 배열 계산 시 한 번에 만드는 최대 원소 수 (행 수 x 구간 길이)
+_WINDOW_ELEMENTS = 1 << 22
+
+# 지수 이동 평균 블록 계산 시 허용하는 최대 가중치 배율 (float64 범위 내)
+_MAX_WEIGHT_EXPONENT = 100 * math.log(10)
+
+# 구간 통계를 버퍼에서 다시 계산하는 주기 (구간 길이의 배수, 누적 반올림 오차 제거)
+_REFRESH_WINDOWS = 64
+
+# 지수 평활 지표의 시작값 영향이 무시할 수준(상대 1e-12 미만)이 되는 데 필요한 캔들 수 기준
+_CONVERGENCE = 1e-12
+
+def _convergence(alpha):
+    """시작값의 가중치가 _CONVERGENCE 아래로 줄어드는 데 필요한 갱신 수"""
+    return int(math.ceil(math.log(_CONVERGENCE) / math.log(1.0 - alpha)))
+
+def _rolling(values, period, func):
+    """길이 period 이동 구간별 func(windows, axis=1) 결과 (앞의 period-1 개는 NaN)"""
+    values = np.asarray(values, dtype=np.float64)
+    out = np.full(len(values), np.nan)
+    if len(values) < period:
+        return out
+    windows = sliding_window_view(values, period)
+    rows = max(1, _WINDOW_ELEMENTS // period)
+    for start in range(0, len(windows), rows):
+        out[period - 1 + start:period - 1 + start + rows] = func(windows[start:start + rows], axis=1)
+    return out
+
+def _rolling_std(values, period, ddof):
+    return _rolling(values, period, lambda windows, axis: windows.std(axis=axis, ddof=ddof))
+
+def _ema_recursive(values, alpha, seed):
+    """y[i] = (1 - alpha) * y[i-1] + alpha * x[i] (y[-1] = seed) 를 블록 단위 배열 연산으로 계산
+
+    블록 안에서는 y[j] = b^(j+1) * (seed + alpha * sum_k x[k] * b^-(k+1)) (b = 1 - alpha) 로 계산하고
+    가중치 배율이 float64 범위를 넘지 않도록 블록 길이를 제한
+    """
+    values = np.asarray(values, dtype=np.float64)
+    beta = 1.0 - alpha
+    if beta <= 0:
+        return values.copy()
+    block = int(min(4096, max(1, _MAX_WEIGHT_EXPONENT // -math.log(beta))))
+    steps = np.arange(1, block + 1)
+    decay = beta ** steps          # b^(j+1)
+    growth = beta ** -steps        # b^-(k+1)
+    out = np.empty(len(values))
+    previous = seed
+    for start in range(0, len(values), block):
+        chunk = values[start:start + block]
+        size = len(chunk)
+        result = decay[:size] * (previous + alpha * np.cumsum(chunk * growth[:size]))
+        out[start:start + size] = result
+        previous = result[-1]
+    return out
+
+def _ema(values, period, alpha=None):
+    """첫 period 개 평균을 시작값으로 하는 지수 이동 평균 (앞의 period-1 개는 NaN)"""
+    alpha = 2.0 / (period + 1) if alpha is None else alpha
+    values = np.asarray(values, dtype=np.float64)
+    out = np.full(len(values), np.nan)
+    if len(values) < period:
+        return out
+    out[period - 1] = values[:period].sum() / period
+    out[period:] = _ema_recursive(values[period:], alpha, out[period - 1])
+    return out
+
+def _true_range(high, low, close):
+    """실제 변동폭 (첫 캔들은 고가 - 저가)"""
+    previous = np.concatenate([[np.nan], close[:-1]])
+    ranges = np.maximum(high - low, np.maximum(np.abs(high - previous), np.abs(low - previous)))
+    ranges[0] = high[0] - low[0]
+    return ranges
+
+def _rsi_from_averages(gain, loss):
+    """평균 상승폭/하락폭으로 RSI (둘 다 0 이면 50)"""
+    total = gain + loss
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(total > 0, 100.0 * gain / total, 50.0)
+
+class _EMAState:
+    """심볼별 지수 이동 평균 상태 (첫 period 개 평균으로 시작)"""
+    def __init__(self, size, period, alpha=None):
+        self.period = period
+        self.alpha = 2.0 / (period + 1) if alpha is None else alpha
+        self.count = np.zeros(size, dtype=np.int64)
+        self.total = np.zeros(size)
+        self.value = np.full(size, np.nan)
+
+    def update(self, index, x):
+        count = self.count[index] + 1
+        self.count[index] = count
+        value = self.value[index]
+        warming = count <= self.period
+        if warming.any():
+            total = self.total[index] + x
+            self.total[index] = total
+            value = np.where(count == self.period, total / self.period, value)
+        running = count > self.period
+        value = np.where(running, (1.0 - self.alpha) * value + self.alpha * x, value)
+        self.value[index] = value
+        return value
+
+class _WindowState:
+    """심볼별 길이 period 이동 구간의 평균과 편차 제곱합 (버퍼 + 구간 이동 Welford 갱신)"""
+    def __init__(self, size, period):
+        self.period = period
+        self.buffer = np.zeros((size, period))
+        self.count = np.zeros(size, dtype=np.int64)
+        self.mean = np.zeros(size)
+        self.m2 = np.zeros(size)
+
+    def update(self, index, x):
+        """값 추가 (반환: 구간 평균, 편차 제곱합, 구간이 찼는지 여부)"""
+        period = self.period
+        count = self.count[index]
+        position = count % period
+        old = self.buffer[index, position]
+        full = count >= period
+        mean = self.mean[index]
+        size = np.minimum(count + 1, period)
+        new_mean = mean + np.where(full, x - old, x - mean) / size
+        m2 = self.m2[index] + np.where(full, (x - old) * (x - new_mean + old - mean), (x - mean) * (x - new_mean))
+
+        self.buffer[index, position] = x
+        count = count + 1
+        self.count[index] = count
+        refresh = count % (period * _REFRESH_WINDOWS) == 0
+        if refresh.any():
+            rows = self.buffer[index[refresh]]
+            new_mean[refresh] = rows.mean(axis=1)
+            m2[refresh] = ((rows - new_mean[refresh][:, None]) ** 2).sum(axis=1)
+        self.mean[index] = new_mean
+        self.m2[index] = m2
+        return new_mean, m2, count >= period
+
+class Indicator:
+    """지표 명세 (이름, 파라미터, 출력 열)
+
+    같은 명세로 전체 배열 계산(compute, 백테스트/학습용)과
+    심볼별 스트리밍 상태(stream, 실시간용 O(1) 갱신)를 만들며 두 결과는 부동소수점 오차 범위 내에서 같음.
+    워밍업 구간(값을 정의할 데이터가 부족한 캔들)은 NaN.
+    """
+    name = None
+    defaults = {}
+    outputs = ()
+    cumulative = False   # 전체 이력 누적값 (구간 재계산 시 직전 값만큼 이동 필요)
+
+    def __init__(self, **params):
+        unknown = set(params) - set(self.defaults)
+        if unknown:
+            raise ValueError(f"{self.name} 지표에 없는 파라미터: {sorted(unknown)}")
+        self.params = {**self.defaults, **params}
+
+    @property
+    def columns(self):
+        """출력 열 이름 (예: ema_20, macd_signal_12_26_9)"""
+        suffix = ''.join(f"_{value:g}" for value in self.params.values())
+        return [f"{self.name}{'' if output == self.name else '_' + output}{suffix}" for output in self.outputs]
+
+    @property
+    def lookback(self):
+        """마지막 캔들 값을 전체 이력 계산과 같게(오차 범위 내) 재계산하는 데 필요한 이전 캔들 수"""
+        raise NotImplementedError
+
+    def compute(self, high, low, close, volume):
+        """전체 배열 계산 (반환: outputs 순서의 배열 목록)"""
+        raise NotImplementedError
+
+    def stream(self, size):
+        """size 개 심볼의 스트리밍 상태 (update(index, high, low, close, volume) -> outputs 순서의 배열 목록)"""
+        raise NotImplementedError
+
+class SMA(Indicator):
+    name = 'sma'
+    defaults = {'period': 20}
+    outputs = ('sma',)
+
+    @property
+    def lookback(self):
+        return self.params['period'] - 1
+
+    def compute(self, high, low, close, volume):
+        return [_rolling(close, self.params['period'], np.mean)]
+
+    def stream(self, size):
+        window = _WindowState(size, self.params['period'])
+        def update(index, high, low, close, volume):
+            mean, _, full = window.update(index, close)
+            return [np.where(full, mean, np.nan)]
+        return update
+
+class EMA(Indicator):
+    name = 'ema'
+    defaults = {'period': 20}
+    outputs = ('ema',)
+
+    @property
+    def lookback(self):
+        period = self.params['period']
+        return period - 1 + _convergence(2.0 / (period + 1))
+
+    def compute(self, high, low, close, volume):
+        return [_ema(close, self.params['period'])]
+
+    def stream(self, size):
+        state = _EMAState(size, self.params['period'])
+        return lambda index, high, low, close, volume: [state.update(index, close)]
+
+class RSI(Indicator):
+    """Wilder RSI (평균 상승/하락폭은 1/period 지수 평활, 첫 period 개 변동의 평균으로 시작)"""
+    name = 'rsi'
+    defaults = {'period': 14}
+    outputs = ('rsi',)
+
+    @property
+    def lookback(self):
+        period = self.params['period']
+        return period + _convergence(1.0 / period)
+
+    def compute(self, high, low, close, volume):
+        period = self.params['period']
+        change = np.diff(close)
+        gain = _ema(np.maximum(change, 0.0), period, alpha=1.0 / period)
+        loss = _ema(np.maximum(-change, 0.0), period, alpha=1.0 / period)
+        rsi = np.full(len(close), np.nan)
+        rsi[1:] = np.where(np.isnan(gain), np.nan, _rsi_from_averages(gain, loss))
+        return [rsi]
+
+    def stream(self, size):
+        period = self.params['period']
+        gains = _EMAState(size, period, alpha=1.0 / period)
+        losses = _EMAState(size, period, alpha=1.0 / period)
+        previous = np.full(size, np.nan)
+        def update(index, high, low, close, volume):
+            last = previous[index]
+            previous[index] = close
+            out = np.full(len(index), np.nan)
+            has_previous = ~np.isnan(last)
+            if has_previous.any():
+                sub = index[has_previous]
+                change = close[has_previous] - last[has_previous]
+                gain = gains.update(sub, np.maximum(change, 0.0))
+                loss = losses.update(sub, np.maximum(-change, 0.0))
+                out[has_previous] = np.where(np.isnan(gain), np.nan, _rsi_from_averages(gain, loss))
+            return [out]
+        return update
+
+class MACD(Indicator):
+    name = 'macd'
+    defaults = {'fast': 12, 'slow': 26, 'signal': 9}
+    outputs = ('macd', 'signal', 'histogram')
+
+    @property
+    def lookback(self):
+        fast, slow, signal = self.params['fast'], self.params['slow'], self.params['signal']
+        macd = max(fast - 1 + _convergence(2.0 / (fast + 1)), slow - 1 + _convergence(2.0 / (slow + 1)))
+        return macd + signal - 1 + _convergence(2.0 / (signal + 1))
+
+    def compute(self, high, low, close, volume):
+        macd = _ema(close, self.params['fast']) - _ema(close, self.params['slow'])
+        signal = np.full(len(close), np.nan)
+        start = self.params['slow'] - 1
+        if len(close) > start:
+            signal[start:] = _ema(macd[start:], self.params['signal'])
+        return [macd, signal, macd - signal]
+
+    def stream(self, size):
+        fast = _EMAState(size, self.params['fast'])
+        slow = _EMAState(size, self.params['slow'])
+        signal_state = _EMAState(size, self.params['signal'])
+        def update(index, high, low, close, volume):
+            macd = fast.update(index, close) - slow.update(index, close)
+            signal = np.full(len(index), np.nan)
+            valid = ~np.isnan(macd)
+            if valid.any():
+                signal[valid] = signal_state.update(index[valid], macd[valid])
+            return [macd, signal, macd - signal]
+        return update
+
+class Bollinger(Indicator):
+    """볼린저 밴드 (이동 평균 ± width x 모표준편차)"""
+    name = 'bollinger'
+    defaults = {'period': 20, 'width': 2.0}
+    outputs = ('middle', 'upper', 'lower')
+
+    @property
+    def lookback(self):
+        return self.params['period'] - 1
+
+    def compute(self, high, low, close, volume):
+        period, width = self.params['period'], self.params['width']
+        middle = _rolling(close, period, np.mean)
+        band = width * _rolling_std(close, period, ddof=0)
+        return [middle, middle + band, middle - band]
+
+    def stream(self, size):
+        period, width = self.params['period'], self.params['width']
+        window = _WindowState(size, period)
+        def update(index, high, low, close, volume):
+            mean, m2, full = window.update(index, close)
+            middle = np.where(full, mean, np.nan)
+            band = width * np.sqrt(np.maximum(m2, 0.0) / period)
+            return [middle, middle + band, middle - band]
+        return update
+
+class ATR(Indicator):
+    """Wilder ATR (실제 변동폭의 1/period 지수 평활, 첫 period 개 평균으로 시작)"""
+    name = 'atr'
+    defaults = {'period': 14}
+    outputs = ('atr',)
+
+    @property
+    def lookback(self):
+        period = self.params['period']
+        return period + _convergence(1.0 / period)
+
+    def compute(self, high, low, close, volume):
+        period = self.params['period']
+        return [_ema(_true_range(high, low, close), period, alpha=1.0 / period)]
+
+    def stream(self, size):
+        period = self.params['period']
+        state = _EMAState(size, period, alpha=1.0 / period)
+        previous = np.full(size, np.nan)
+        def update(index, high, low, close, volume):
+            last = previous[index]
+            previous[index] = close
+            ranges = np.maximum(high - low, np.maximum(np.abs(high - last), np.abs(low - last)))
+            ranges = np.where(np.isnan(last), high - low, ranges)
+            return [state.update(index, ranges)]
+        return update
+
+class VWAP(Indicator):
+    """최근 period 개 캔들의 거래량 가중 평균 가격 (대표 가격 = (고가 + 저가 + 종가) / 3)"""
+    name = 'vwap'
+    defaults = {'period': 20}
+    outputs = ('vwap',)
+
+    @property
+    def lookback(self):
+        return self.params['period'] - 1
+
+    def compute(self, high, low, close, volume):
+        period = self.params['period']
+        typical = (high + low + close) / 3
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return [_rolling(typical * volume, period, np.mean) / _rolling(volume, period, np.mean)]
+
+    def stream(self, size):
+        period = self.params['period']
+        values = _WindowState(size, period)
+        volumes = _WindowState(size, period)
+        def update(index, high, low, close, volume):
+            typical = (high + low + close) / 3
+            value_mean, _, full = values.update(index, typical * volume)
+            volume_mean, _, _ = volumes.update(index, volume)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                return [np.where(full, value_mean / volume_mean, np.nan)]
+        return update
+
+class Volatility(Indicator):
+    """최근 period 개 로그 수익률의 표본 표준편차"""
+    name = 'volatility'
+    defaults = {'period': 20}
+    outputs = ('volatility',)
+
+    @property
+    def lookback(self):
+        return self.params['period']
+
+    def compute(self, high, low, close, volume):
+        out = np.full(len(close), np.nan)
+        out[1:] = _rolling_std(np.log(close[1:] / close[:-1]), self.params['period'], ddof=1)
+        return [out]
+
+    def stream(self, size):
+        period = self.params['period']
+        window = _WindowState(size, period)
+        previous = np.full(size, np.nan)
+        def update(index, high, low, close, volume):
+            last = previous[index]
+            previous[index] = close
+            out = np.full(len(index), np.nan)
+            has_previous = ~np.isnan(last)
+            if has_previous.any():
+                returns = np.log(close[has_previous] / last[has_previous])
+                _, m2, full = window.update(index[has_previous], returns)
+                out[has_previous] = np.where(full, np.sqrt(np.maximum(m2, 0.0) / (period - 1)), np.nan)
+            return [out]
+        return update
+
+class OBV(Indicator):
+    """누적 거래량 (종가 상승 시 +거래량, 하락 시 -거래량, 첫 캔들은 0)"""
+    name = 'obv'
+    defaults = {}
+    outputs = ('obv',)
+    cumulative = True
+
+    @property
+    def lookback(self):
+        return 1
+
+    def compute(self, high, low, close, volume):
+        flow = np.zeros(len(close))
+        flow[1:] = np.sign(np.diff(close)) * volume[1:]
+        return [np.cumsum(flow)]
+
+    def stream(self, size):
+        previous = np.full(size, np.nan)
+        total = np.zeros(size)
+        def update(index, high, low, close, volume):
+            last = previous[index]
+            previous[index] = close
+            flow = np.where(np.isnan(last), 0.0, np.sign(close - last) * volume)
+            value = total[index] + flow
+            total[index] = value
+            return [value]
+        return update
+
+INDICATORS = {cls.name: cls for cls in (SMA, EMA, RSI, MACD, Bollinger, ATR, VWAP, Volatility, OBV)}
+
+def build_indicators(features=None):
+    """지표 구성((이름, 파라미터) 목록)으로 지표 객체 목록 생성"""
+    features = DEFAULT_FEATURES if features is None else features
+    indicators = []
+    for name, params in features:
+        if name not in INDICATORS:
+            raise ValueError(f"지원하지 않는 지표: {name}")
+        indicators.append(INDICATORS[name](**params))
+    return indicators
+
+def feature_columns(features=None):
+    """지표 구성의 출력 열 이름 목록"""
+    return [column for indicator in build_indicators(features) for column in indicator.columns]
+
+def lookback(features=None):
+    """지표 구성 전체의 재계산에 필요한 이전 캔들 수"""
+    return max((indicator.lookback for indicator in build_indicators(features)), default=0)
+
+def compute_features(arrays, features=None):
+    """캔들 열 배열 전체에 대한 지표 계산 (백테스트/학습용)
+
+    arrays: high, low, close, volume 열을 가진 배열 (klines_to_arrays, KlineStore.load 형식)
+    반환: {열 이름: 배열}
+    """
+    high, low, close, volume = (np.asarray(arrays[name], dtype=np.float64)
+                                for name in ('high', 'low', 'close', 'volume'))
+    result = {}
+    for indicator in build_indicators(features):
+        with np.errstate(invalid='ignore', divide='ignore'):
+            values = indicator.compute(high, low, close, volume)
+        result.update(zip(indicator.columns, values))
+    return result
+
+class StreamingFeatures:
+    """여러 심볼의 지표를 확정 캔들마다 O(1)로 갱신하는 스트리밍 계산기 (실시간용)
+
+    - 상태는 심볼 축 배열로 보관하여 같은 시각에 확정된 여러 심볼의 캔들을 한 번의 배열 연산으로 갱신
+    - 결과는 compute_features 로 같은 캔들 배열을 계산한 값과 같음 (부동소수점 오차 범위 내)
+    """
+    def __init__(self, symbols, features=None):
+        self.symbols = [symbol.upper() for symbol in symbols]
+        self.slots = {symbol: slot for slot, symbol in enumerate(self.symbols)}
+        self.indicators = build_indicators(features)
+        self.columns = [column for indicator in self.indicators for column in indicator.columns]
+        self._updates = [indicator.stream(len(self.symbols)) for indicator in self.indicators]
+        self.values = {column: np.full(len(self.symbols), np.nan) for column in self.columns}
+        self.updates = 0
+
+    def update(self, symbols, high, low, close, volume):
+        """심볼별 확정 캔들 하나씩으로 갱신 (한 번에 같은 심볼은 한 번만)
+
+        symbols: 심볼 이름 목록 또는 슬롯 위치 배열
+        반환: {열 이름: 입력 심볼 순서의 배열}
+        """
+        index = np.asarray([self.slots[symbol.upper()] for symbol in symbols] if len(symbols) and
+                           isinstance(symbols[0], str) else symbols, dtype=np.int64)
+        high, low, close, volume = (np.asarray(values, dtype=np.float64) for values in (high, low, close, volume))
+        result = {}
+        with np.errstate(invalid='ignore', divide='ignore'):
+            for indicator, update in zip(self.indicators, self._updates):
+                for column, values in zip(indicator.columns, update(index, high, low, close, volume)):
+                    self.values[column][index] = values
+                    result[column] = values
+        self.updates += len(index)
+        return result
+
+    def update_candle(self, symbol, candle):
+        """심볼 하나의 확정 캔들로 갱신 (candle: CANDLE_FIELDS 순서의 행 또는 high/low/close/volume 키의 dict)
+
+        반환: {열 이름: 값}
+        """
+        if isinstance(candle, dict):
+            high, low, close, volume = candle['high'], candle['low'], candle['close'], candle['volume']
+        else:
+            high, low, close, volume = candle[2], candle[3], candle[4], candle[5]
+        result = self.update([self.slots[symbol.upper()]], [high], [low], [close], [volume])
+        return {column: float(values[0]) for column, values in result.items()}
+
+    def latest(self, symbol):
+        """심볼의 최근 지표 값"""
+        slot = self.slots[symbol.upper()]
+        return {column: float(values[slot]) for column, values in self.values.items()}
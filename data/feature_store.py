@@ -0,0 +1,209 @@
+import os
+import json
+import numpy as np
+from utils import error_handler
+from utils.cache_manager import fingerprint
+from data import feature_engineering
+from data.feature_engineering import build_indicators, compute_features, feature_columns, lookback
+from data.historical_data import INTERVAL_MS
+
+def feature_set_version(features=None):
+    """지표 구성과 지표 코드의 해시 (구성이나 계산 코드가 바뀌면 새 버전으로 저장)"""
+    features = feature_engineering.DEFAULT_FEATURES if features is None else features
+    with open(feature_engineering.__file__, 'rb') as f:
+        source = f.read()
+    return fingerprint([[name, params] for name, params in features], source.hex())[:16]
+
+class FeatureMatrix:
+    """저장된 특성 행렬의 메모리 매핑 읽기 전용 뷰
+
+    - values: (캔들 수, 열 수) float64 행렬, open_time: 캔들 시작 시각
+    - 행 구간/열 조회는 모두 복사 없는 뷰 (학습/검증 구간을 그대로 모델 입력으로 사용)
+    """
+    def __init__(self, directory, meta):
+        self.directory = directory
+        self.meta = meta
+        self.columns = meta['columns']
+        self.rows = meta['rows']
+        self.warmup = meta['warmup']
+        if self.rows:
+            self.open_time = np.memmap(os.path.join(directory, 'open_time.i8'), dtype=np.int64, mode='r',
+                                       shape=(self.rows,))
+            self.values = np.memmap(os.path.join(directory, 'values.f8'), dtype=np.float64, mode='r',
+                                    shape=(self.rows, len(self.columns)))
+        else:
+            self.open_time = np.zeros(0, dtype=np.int64)
+            self.values = np.zeros((0, len(self.columns)))
+
+    def __len__(self):
+        return self.rows
+
+    def column(self, name):
+        """열 하나 (복사 없는 뷰)"""
+        return self.values[:, self.columns.index(name)]
+
+    def slice(self, start=None, end=None):
+        """캔들 시작 시각 구간 [start, end) 의 (open_time, values) 뷰 (밀리초)"""
+        first = 0 if start is None else int(np.searchsorted(self.open_time, start, side='left'))
+        last = self.rows if end is None else int(np.searchsorted(self.open_time, end, side='left'))
+        return self.open_time[first:last], self.values[first:last]
+
+    def split(self, validation=0.2, skip_warmup=True):
+        """시간 순 학습/검증 구간 분할 (워밍업 캔들 제외, 복사 없는 뷰)
+
+        validation: 검증 구간 비율
+        반환: {'train': (open_time, values), 'validation': (open_time, values)}
+        """
+        first = self.warmup if skip_warmup else 0
+        boundary = first + int(round((self.rows - first) * (1 - validation)))
+        return {
+            'train': (self.open_time[first:boundary], self.values[first:boundary]),
+            'validation': (self.open_time[boundary:], self.values[boundary:])
+        }
+
+class FeatureStore:
+    """심볼/간격/지표 구성 버전별 특성 행렬 저장소
+
+    - 경로: {root}/symbol={symbol}/interval={interval}/version={버전}/
+      (values.f8: 행 우선 float64 행렬, open_time.i8: 캔들 시각, meta.json: 열/행 수 등)
+    - 새 캔들은 파일 끝에 행으로 추가 (기존 행은 다시 쓰지 않음). 지수 평활/누적 지표는 lookback 만큼의
+      이전 캔들부터 다시 계산해 이어 붙이므로 전체 재계산 결과와 오차 범위 내에서 같음
+    - meta.json 의 행 수를 마지막에 교체하므로 기록 중 중단되어도 읽기는 이전 행 수까지만 사용
+    """
+    def __init__(self, root="data/features"):
+        self.root = root
+
+    def _directory(self, symbol, interval, version):
+        return os.path.join(self.root, f"symbol={symbol.upper()}", f"interval={interval}", f"version={version}")
+
+    def _read_meta(self, directory):
+        path = os.path.join(directory, 'meta.json')
+        if not os.path.exists(path):
+            return None
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def _write_meta(self, directory, meta):
+        path = os.path.join(directory, 'meta.json')
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+        os.replace(temp_path, path)
+
+    def open(self, symbol, interval, features=None):
+        """저장된 특성 행렬 (없으면 None)"""
+        directory = self._directory(symbol, interval, feature_set_version(features))
+        meta = self._read_meta(directory)
+        return FeatureMatrix(directory, meta) if meta is not None else None
+
+    def materialize(self, symbol, interval, arrays, features=None):
+        """캔들 열 배열 전체로 특성 행렬 생성 (기존 같은 버전 행렬은 교체)
+
+        arrays: open_time, high, low, close, volume 열 (klines_to_arrays, KlineStore.load 형식)
+        """
+        try:
+            version = feature_set_version(features)
+            directory = self._directory(symbol, interval, version)
+            os.makedirs(directory, exist_ok=True)
+            columns = feature_columns(features)
+            meta = {'symbol': symbol.upper(), 'interval': interval, 'version': version,
+                    'features': [[name, params] for name, params in
+                                 (feature_engineering.DEFAULT_FEATURES if features is None else features)],
+                    'columns': columns, 'rows': 0, 'warmup': 0}
+            self._write_meta(directory, meta)
+            for name in ('values.f8', 'open_time.i8'):
+                open(os.path.join(directory, name), 'wb').close()
+
+            open_time = np.asarray(arrays['open_time'], dtype=np.int64)
+            computed = compute_features(arrays, features)
+            values = np.column_stack([computed[column] for column in columns]) if len(open_time) else \
+                np.zeros((0, len(columns)))
+            self._append_rows(directory, meta, open_time, values)
+            error_handler.log_info(f"특성 행렬 생성 완료: {symbol} {interval} {version} {meta['rows']}행")
+            return FeatureMatrix(directory, meta)
+
+        except Exception as e:
+            error_handler.log_error(e, "특성 행렬 생성 실패")
+            raise
+
+    def extend(self, symbol, interval, arrays, features=None):
+        """새 캔들의 특성을 행렬 끝에 추가
+
+        arrays: 저장된 마지막 캔들과 그 이전 lookback(features) 개 캔들(또는 처음부터의 전체 이력)을 포함하는
+                연속된 캔들 열 배열
+        반환: 추가한 행 수
+        """
+        try:
+            version = feature_set_version(features)
+            directory = self._directory(symbol, interval, version)
+            meta = self._read_meta(directory)
+            if meta is None or meta['rows'] == 0:
+                return len(self.materialize(symbol, interval, arrays, features))
+
+            open_time = np.asarray(arrays['open_time'], dtype=np.int64)
+            stored = FeatureMatrix(directory, meta)
+            last_time = int(stored.open_time[-1])
+            overlap = int(np.searchsorted(open_time, last_time, side='left'))
+            if overlap >= len(open_time) or open_time[overlap] != last_time:
+                raise ValueError(f"저장된 마지막 캔들({last_time})이 입력에 없습니다.")
+            if overlap + 1 == len(open_time):
+                return 0
+
+            # 재계산 시작 위치 (입력이 저장 이력의 처음부터이면 그대로 사용)
+            start = overlap - lookback(features)
+            if start < 0:
+                if open_time[0] != stored.open_time[0]:
+                    raise ValueError(f"재계산에 필요한 이전 캔들이 부족합니다: {-start}개")
+                start = 0
+            window = {name: np.asarray(arrays[name])[start:] for name in ('high', 'low', 'close', 'volume')}
+            computed = compute_features(window, features)
+
+            # 누적 지표는 재계산 시작 캔들의 저장값에 맞춰 이동
+            stored_start = meta['rows'] - 1 - (overlap - start)
+            for indicator in build_indicators(features):
+                if indicator.cumulative:
+                    for column in indicator.columns:
+                        offset = stored.column(column)[stored_start] - computed[column][0]
+                        computed[column] = computed[column] + offset
+
+            new_rows = slice(overlap + 1 - start, None)
+            values = np.column_stack([computed[column][new_rows] for column in meta['columns']])
+            self._append_rows(directory, meta, open_time[overlap + 1:], values)
+            error_handler.log_info(f"특성 행렬 추가 완료: {symbol} {interval} {len(values)}행")
+            return len(values)
+
+        except Exception as e:
+            error_handler.log_error(e, "특성 행렬 추가 실패")
+            raise
+
+    def update_from_store(self, kline_store, symbol, interval, features=None):
+        """K라인 저장소(data.database_manager.KlineStore)의 새 캔들로 특성 행렬 갱신 (없으면 전체 생성)
+
+        반환: FeatureMatrix
+        """
+        stored = self.open(symbol, interval, features)
+        if stored is None or len(stored) == 0:
+            return self.materialize(symbol, interval, kline_store.load(symbol, interval), features)
+        start_time = int(stored.open_time[-1]) - lookback(features) * INTERVAL_MS[interval]
+        self.extend(symbol, interval, kline_store.load(symbol, interval, start=start_time), features)
+        return self.open(symbol, interval, features)
+
+    def _append_rows(self, directory, meta, open_time, values):
+        """행 추가 후 meta.json 갱신 (이전 기록 중단으로 남은 행 수 이후 데이터는 잘라냄)"""
+        rows = meta['rows']
+        width = len(meta['columns'])
+        with open(os.path.join(directory, 'values.f8'), 'r+b') as f:
+            f.truncate(rows * width * 8)
+            f.seek(0, os.SEEK_END)
+            f.write(np.ascontiguousarray(values, dtype=np.float64).tobytes())
+        with open(os.path.join(directory, 'open_time.i8'), 'r+b') as f:
+            f.truncate(rows * 8)
+            f.seek(0, os.SEEK_END)
+            f.write(np.ascontiguousarray(open_time, dtype=np.int64).tobytes())
+
+        # 모든 열이 정의된 첫 행 (워밍업 종료 위치)
+        if meta['warmup'] == rows and len(values):
+            complete = np.flatnonzero(~np.isnan(values).any(axis=1))
+            meta['warmup'] = rows + (int(complete[0]) if len(complete) else len(values))
+        meta['rows'] = rows + len(values)
+        self._write_meta(directory, meta)
@@ -0,0 +1,234 @@
+import os
+import csv
+import time
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from utils import error_handler
+from utils.api_connector import MAX_KLINES_PER_REQUEST
+
+# 캔들 간격별 길이 (밀리초)
+INTERVAL_MS = {
+    '1s': 1000,
+    '1m': 60 * 1000,
+    '3m': 3 * 60 * 1000,
+    '5m': 5 * 60 * 1000,
+    '15m': 15 * 60 * 1000,
+    '30m': 30 * 60 * 1000,
+    '1h': 60 * 60 * 1000,
+    '2h': 2 * 60 * 60 * 1000,
+    '4h': 4 * 60 * 60 * 1000,
+    '6h': 6 * 60 * 60 * 1000,
+    '8h': 8 * 60 * 60 * 1000,
+    '12h': 12 * 60 * 60 * 1000,
+    '1d': 24 * 60 * 60 * 1000,
+    '3d': 3 * 24 * 60 * 60 * 1000,
+    '1w': 7 * 24 * 60 * 60 * 1000
+}
+
+# 캔들 시작 기준 이동량 (밀리초). 주봉은 월요일 00:00 UTC 에 시작하지만 Unix epoch 는 목요일이므로 4일 이동
+INTERVAL_OFFSET_MS = {
+    '1w': 4 * 24 * 60 * 60 * 1000
+}
+
+def interval_start(timestamp, interval):
+    """timestamp(밀리초)가 속한 캔들의 시작 시각"""
+    return timestamp - (timestamp - INTERVAL_OFFSET_MS.get(interval, 0)) % INTERVAL_MS[interval]
+
+# Binance K라인 응답 필드 순서
+KLINE_COLUMNS = [
+    'open_time', 'open', 'high', 'low', 'close', 'volume', 'close_time',
+    'quote_volume', 'trades', 'taker_buy_volume', 'taker_buy_quote_volume', 'ignore'
+]
+
+# 정수형 필드 위치 (open_time, close_time, trades)
+_INT_FIELDS = (0, 6, 8)
+
+def to_milliseconds(value):
+    """날짜 문자열('%Y-%m-%d') 또는 밀리초 타임스탬프를 밀리초로 변환"""
+    if value is None:
+        return int(time.time() * 1000)
+    if isinstance(value, (int, float)):
+        return int(value)
+    return int(datetime.strptime(value, '%Y-%m-%d').timestamp() * 1000)
+
+def iter_klines(path):
+    """다운로드된 K라인 CSV 파일을 한 행씩 읽기 (API 응답과 같은 형식)"""
+    with open(path, 'r', newline='', encoding='utf-8') as f:
+        reader = csv.reader(f)
+        next(reader, None)  # 헤더
+        for row in reader:
+            for index in _INT_FIELDS:
+                row[index] = int(row[index])
+            yield row
+
+class HistoricalKlineDownloader:
+    """기간 분할, 동시 요청, 중단 후 재개를 지원하는 과거 K라인 다운로더
+
+    - 기간을 요청당 최대 캔들 수 단위의 구간(window)으로 분할
+    - 구간을 스레드 풀로 동시에 조회 (요청 예산은 BinanceAPI 의 RateLimiter 가 관리)
+    - 완료된 구간은 즉시 구간 파일로 저장하여 중단 후 재실행 시 건너뜀
+    - 최종 병합 시 구간 파일을 순서대로 스트리밍하며 중복 제거 및 누락 구간 검출
+    """
+    def __init__(self, api, output_dir="data/raw", max_workers=4, window_size=MAX_KLINES_PER_REQUEST):
+        """다운로더 초기화
+
+        api: get_klines(symbol, interval, limit, start_time, end_time) 를 제공하는 API
+        output_dir: 구간 파일 및 결과 파일 저장 경로
+        max_workers: 동시 요청 수
+        window_size: 구간당 캔들 수 (최대 1000)
+        """
+        self.api = api
+        self.output_dir = output_dir
+        self.max_workers = max_workers
+        self.window_size = min(window_size, MAX_KLINES_PER_REQUEST)
+
+    def split_windows(self, interval, start_time, end_time):
+        """기간을 구간 목록으로 분할 [(start, end), ...] (end 포함)"""
+        step = INTERVAL_MS[interval] * self.window_size
+        windows = []
+        window_start = start_time
+        while window_start <= end_time:
+            window_end = min(window_start + step - 1, end_time)
+            windows.append((window_start, window_end))
+            window_start = window_end + 1
+        return windows
+
+    def _job_dir(self, symbol, interval, start_time, end_time):
+        """다운로드 작업 디렉토리 (구간 파일 저장)"""
+        return os.path.join(self.output_dir, f"{symbol}_{interval}_{start_time}_{end_time}.parts")
+
+    def _open_end_time(self, job_dir, interval):
+        """종료 시각 미지정 작업의 종료 시각 (기록이 없으면 마지막 확정 캔들 끝으로 정해 기록)"""
+        path = os.path.join(job_dir, 'end_time')
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                return int(f.read())
+        now = to_milliseconds(None)
+        end_time = interval_start(now, interval) - 1
+        os.makedirs(job_dir, exist_ok=True)
+        with open(f"{path}.tmp", 'w', encoding='utf-8') as f:
+            f.write(str(end_time))
+        os.replace(f"{path}.tmp", path)
+        return end_time
+
+    def _chunk_path(self, job_dir, index):
+        """구간 파일 경로"""
+        return os.path.join(job_dir, f"{index:06d}.csv")
+
+    def _fetch_window(self, symbol, interval, index, window, job_dir):
+        """구간 하나를 조회하여 구간 파일로 저장 (임시 파일 → 원자적 교체)"""
+        window_start, window_end = window
+        klines = self.api.get_klines(symbol, interval, limit=self.window_size,
+                                     start_time=window_start, end_time=window_end)
+
+        path = self._chunk_path(job_dir, index)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            for kline in klines:
+                if window_start <= int(kline[0]) <= window_end:
+                    writer.writerow(kline)
+        os.replace(temp_path, path)
+        return index, len(klines)
+
+    def download(self, symbol, interval, start, end=None, output_path=None):
+        """과거 K라인 다운로드
+
+        start, end: '%Y-%m-%d' 문자열 또는 밀리초 타임스탬프 (end 는 포함하지 않음, 미지정 시 현재)
+        반환: 결과 파일 경로와 행 수, 중복/누락 통계
+        중단된 다운로드는 같은 start/end 로 다시 호출하면 남은 구간만 조회한다.
+        (end 미지정 작업은 처음 실행 시점의 마지막 확정 캔들까지를 기록해 두고 재개 시 그대로 사용)
+        """
+        try:
+            if interval not in INTERVAL_MS:
+                raise ValueError(f"지원하지 않는 캔들 간격입니다: {interval}")
+
+            start_time = to_milliseconds(start)
+            if end is not None:
+                end_time = to_milliseconds(end) - 1
+                job_dir = self._job_dir(symbol, interval, start_time, end_time)
+                os.makedirs(job_dir, exist_ok=True)
+            else:
+                # 종료 시각 미지정: 처음 정한 종료 시각을 작업 디렉토리에 기록하여 재개 시 같은 구간 사용
+                job_dir = self._job_dir(symbol, interval, start_time, 'open')
+                end_time = self._open_end_time(job_dir, interval)
+            windows = self.split_windows(interval, start_time, end_time)
+
+            # 이미 완료된 구간은 건너뜀 (중단 후 재개)
+            pending = [(index, window) for index, window in enumerate(windows)
+                       if not os.path.exists(self._chunk_path(job_dir, index))]
+            error_handler.log_info(
+                f"과거 데이터 다운로드 시작: {symbol} {interval}, "
+                f"전체 {len(windows)}개 구간 중 {len(pending)}개 남음"
+            )
+
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                futures = [
+                    executor.submit(self._fetch_window, symbol, interval, index, window, job_dir)
+                    for index, window in pending
+                ]
+                for future in as_completed(futures):
+                    future.result()
+
+            if output_path is None:
+                output_path = os.path.join(
+                    self.output_dir, f"{symbol}_{interval}_{start_time}_{end_time}.csv"
+                )
+            summary = self._merge(job_dir, len(windows), interval, start_time, end_time, output_path)
+            error_handler.log_info(f"과거 데이터 다운로드 완료: {summary}")
+            return summary
+
+        except Exception as e:
+            error_handler.log_error(e, "과거 데이터 다운로드 실패")
+            raise
+
+    def _merge(self, job_dir, window_count, interval, start_time, end_time, output_path):
+        """구간 파일을 순서대로 병합 (중복 제거, 누락 구간 검출)"""
+        interval_ms = INTERVAL_MS[interval]
+        rows = 0
+        duplicates = 0
+        gaps = []
+        expected = interval_start(start_time, interval)
+        if expected < start_time:
+            expected += interval_ms
+        last_open_time = None
+
+        temp_path = f"{output_path}.tmp"
+        with open(temp_path, 'w', newline='', encoding='utf-8') as out:
+            writer = csv.writer(out)
+            writer.writerow(KLINE_COLUMNS)
+            for index in range(window_count):
+                with open(self._chunk_path(job_dir, index), 'r', newline='', encoding='utf-8') as f:
+                    for row in csv.reader(f):
+                        open_time = int(row[0])
+                        if last_open_time is not None and open_time <= last_open_time:
+                            duplicates += 1
+                            continue
+                        if open_time > expected:
+                            gaps.append((expected, open_time - interval_ms))
+                        writer.writerow(row)
+                        rows += 1
+                        last_open_time = open_time
+                        expected = open_time + interval_ms
+
+        # 마지막 캔들 이후 기간의 누락 (종료 시각 이전에 시작해야 하는 캔들 기준)
+        last_open_expected = interval_start(end_time, interval)
+        if expected <= last_open_expected:
+            gaps.append((expected, last_open_expected))
+
+        os.replace(temp_path, output_path)
+
+        # 병합이 끝난 구간 파일 정리
+        for index in range(window_count):
+            os.remove(self._chunk_path(job_dir, index))
+        manifest = os.path.join(job_dir, 'end_time')
+        if os.path.exists(manifest):
+            os.remove(manifest)
+        os.rmdir(job_dir)
+
+        return {
+            'path': output_path,
+            'rows': rows,
+            'duplicates': duplicates,
+            'gaps': gaps
+        }
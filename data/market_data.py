@@ -0,0 +1,553 @@
+import time
+import threading
+from collections import deque
+import numpy as np
+from utils import error_handler
+from data.historical_data import INTERVAL_MS, interval_start
+from data.websocket_client import stream_name
+
+# 메모리 캔들 필드 순서 (Binance K라인 응답에서 'ignore' 제외, 숫자형)
+CANDLE_FIELDS = [
+    'open_time', 'open', 'high', 'low', 'close', 'volume', 'close_time',
+    'quote_volume', 'trades', 'taker_buy_volume', 'taker_buy_quote_volume'
+]
+
+# 체결/캔들 레코드 형식 (고정 크기 구조체 배열)
+TRADE_DTYPE = np.dtype([
+    ('time', 'i8'), ('id', 'i8'), ('price', 'f8'), ('qty', 'f8'), ('is_buyer_maker', '?')
+])
+CANDLE_DTYPE = np.dtype([
+    (name, 'i8' if name in ('open_time', 'close_time', 'trades') else 'f8') for name in CANDLE_FIELDS
+])
+
+def memory_ceiling(trade_capacity, candle_capacity, interval_count):
+    """심볼당 최대 메모리 사용량 (바이트, 버퍼는 용량의 2배를 미리 할당)"""
+    return 2 * (trade_capacity * TRADE_DTYPE.itemsize
+                + candle_capacity * interval_count * CANDLE_DTYPE.itemsize)
+
+class RingBuffer:
+    """구조체 배열 기반 고정 용량 링 버퍼
+
+    - 각 레코드를 i 와 i + capacity 두 위치에 기록하여 최근 n개가 항상 연속된 구간이 되도록 함
+      (추가 O(1), 최근 구간 조회는 복사 없는 읽기 전용 뷰)
+    - 메모리는 생성 시 2 * capacity * dtype.itemsize 바이트로 고정
+    - 반환된 뷰는 이후 capacity - n 번 추가될 때까지 유효 (그 이후 오래된 레코드부터 덮어씀)
+    """
+    def __init__(self, dtype, capacity):
+        self.dtype = np.dtype(dtype)
+        self.capacity = capacity
+        self._data = np.zeros(2 * capacity, dtype=self.dtype)
+        self._head = 0   # 다음 기록 위치 (0 ~ capacity-1)
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def nbytes(self):
+        return self._data.nbytes
+
+    def clear(self):
+        self._head = 0
+        self._size = 0
+
+    def append(self, record):
+        """레코드 추가 (가득 차면 가장 오래된 레코드를 덮어씀)"""
+        head = self._head
+        self._data[head] = record
+        self._data[head + self.capacity] = record
+        self._head = (head + 1) % self.capacity
+        if self._size < self.capacity:
+            self._size += 1
+
+    def extend(self, records):
+        """여러 레코드 추가 (튜플 목록 또는 구조체 배열)"""
+        records = np.asarray(records, dtype=self.dtype) if not isinstance(records, np.ndarray) \
+            else records.astype(self.dtype, copy=False)
+        if len(records) == 0:
+            return
+        records = records[-self.capacity:]
+        index = (self._head + np.arange(len(records))) % self.capacity
+        self._data[index] = records
+        self._data[index + self.capacity] = records
+        self._head = (self._head + len(records)) % self.capacity
+        self._size = min(self._size + len(records), self.capacity)
+
+    def last(self):
+        """가장 최근 레코드 (없으면 None)"""
+        if self._size == 0:
+            return None
+        return self._data[self._head + self.capacity - 1]
+
+    def view(self, n=None):
+        """최근 n개 레코드 (오래된 순, 복사 없는 읽기 전용 뷰)"""
+        n = self._size if n is None else min(n, self._size)
+        end = self._head + self.capacity
+        window = self._data[end - n:end]
+        window.flags.writeable = False
+        return window
+
+def _records_to_rows(records):
+    """구조체 배열을 캔들 행 목록으로 변환"""
+    return [list(row) for row in records.tolist()]
+
+def parse_kline(kline):
+    """REST K라인 응답 한 행을 숫자형 캔들로 변환"""
+    return [
+        int(kline[0]), float(kline[1]), float(kline[2]), float(kline[3]), float(kline[4]),
+        float(kline[5]), int(kline[6]), float(kline[7]), int(kline[8]),
+        float(kline[9]), float(kline[10])
+    ]
+
+def parse_kline_event(k):
+    """kline 스트림 이벤트('k' 필드)를 숫자형 캔들로 변환"""
+    return [
+        int(k['t']), float(k['o']), float(k['h']), float(k['l']), float(k['c']),
+        float(k['v']), int(k['T']), float(k['q']), int(k['n']),
+        float(k['V']), float(k['Q'])
+    ]
+
+class CandleAggregator:
+    """trade/kline 스트림으로 심볼별 다중 간격 캔들을 메모리에 유지
+
+    - 시작 시 REST 로 한 번 채우고 이후에는 체결 이벤트로 진행 중 캔들을 갱신
+    - 체결이 없는 구간은 직전 종가로 거래량 0 캔들을 채움
+    - kline 스트림의 확정 캔들(x=true)은 집계값을 대체
+    - 체결 ID 가 건너뛰면 누락 구간으로 기록하고 repair_gaps 에서 REST 로 보정
+    - 심볼별 체결과 간격별 확정 캔들을 고정 용량 RingBuffer 에 숫자형으로 보관
+      (심볼당 메모리 상한: memory_ceiling(trade_capacity, capacity, len(intervals)),
+       기본값 기준 약 2.0MB)
+    """
+    def __init__(self, symbols, intervals=('1s', '1m', '5m', '1h'), capacity=1000, api=None,
+                 trade_capacity=20000):
+        """캔들 집계기 초기화
+
+        api: 초기 적재 및 누락 보정용 REST API (get_klines 제공)
+        capacity: 간격별 보관할 확정 캔들 수
+        trade_capacity: 심볼별 보관할 최근 체결 수
+        """
+        self.symbols = [symbol.upper() for symbol in symbols]
+        self.intervals = list(intervals)
+        self.capacity = capacity
+        self.api = api
+        self._lock = threading.Lock()
+        self.trade_capacity = trade_capacity
+        self.candles = {(symbol, interval): RingBuffer(CANDLE_DTYPE, capacity)
+                        for symbol in self.symbols for interval in self.intervals}
+        self.trades = {symbol: RingBuffer(TRADE_DTYPE, trade_capacity) for symbol in self.symbols}
+        self.current = {}        # (symbol, interval) -> 진행 중 캔들
+        self.last_prices = {}
+        self.last_trade_ids = {}
+        self.gaps = []           # [(symbol, 시작 ms, 종료 ms)]
+        self.stats = {'trades': 0, 'klines': 0, 'filled': 0, 'gaps': 0, 'repaired': 0}
+
+    def streams(self, kline_interval='1m'):
+        """구독할 스트림 이름 목록 (trade + kline)"""
+        names = []
+        for symbol in self.symbols:
+            names.append(stream_name(symbol, 'trade'))
+            names.append(stream_name(symbol, 'kline', kline_interval))
+        return names
+
+    async def start(self, stream_manager, kline_interval='1m'):
+        """스트림 구독 시작 (체결 누락은 캔들 오차가 되므로 버리지 않음)"""
+        return await stream_manager.subscribe(self.streams(kline_interval), self.handle_event, policy='block')
+
+    async def handle_event(self, stream, data):
+        """StreamManager 메시지 처리"""
+        event_type = data.get('e')
+        if event_type == 'trade':
+            self.on_trade(data)
+        elif event_type == 'kline':
+            self.on_kline(data)
+
+    def backfill(self, limit=None):
+        """REST 로 간격별 최근 캔들 적재 (시작 시 한 번)"""
+        limit = min(limit or self.capacity, 1000)
+        now = int(time.time() * 1000)
+        for symbol in self.symbols:
+            for interval in self.intervals:
+                try:
+                    klines = [parse_kline(k) for k in self.api.get_klines(symbol, interval, limit=limit)]
+                except Exception as e:
+                    error_handler.log_error(e, f"캔들 초기 적재 실패: {symbol} {interval}")
+                    continue
+                with self._lock:
+                    key = (symbol, interval)
+                    # 마지막 캔들이 아직 닫히지 않았으면 진행 중 캔들로 사용 (스트림이 먼저 시작된 경우 유지)
+                    if klines and klines[-1][6] >= now:
+                        current = klines.pop()
+                        self.current.setdefault(key, current)
+                    self._replace(key, klines)
+                    last = self.current.get(key) or self.candles[key].last()
+                    if last is not None:
+                        self.last_prices.setdefault(symbol, last[4])
+        error_handler.log_info(f"캔들 초기 적재 완료: {len(self.symbols)}개 심볼, {self.intervals}")
+
+    def _roll(self, key, interval_ms, bucket, price):
+        """진행 중 캔들을 닫고 bucket 시작 캔들로 이동 (체결이 없던 구간은 채움)"""
+        current = self.current.get(key)
+        buffer = self.candles[key]
+        if current is not None:
+            buffer.append(tuple(current))
+        previous = current if current is not None else buffer.last()
+        if previous is not None:
+            close = float(previous[4])
+            open_time = int(previous[0]) + interval_ms
+            # 체결이 없던 구간은 직전 종가로 채움 (최대 버퍼 크기까지만)
+            if (bucket - open_time) // interval_ms > self.capacity:
+                open_time = bucket - self.capacity * interval_ms
+            while open_time < bucket:
+                buffer.append((open_time, close, close, close, close, 0.0,
+                               open_time + interval_ms - 1, 0.0, 0, 0.0, 0.0))
+                self.stats['filled'] += 1
+                open_time += interval_ms
+        self.current[key] = [bucket, price, price, price, price, 0.0,
+                             bucket + interval_ms - 1, 0.0, 0, 0.0, 0.0]
+
+    def on_trade(self, trade):
+        """체결 이벤트로 진행 중 캔들 갱신"""
+        symbol = trade['s']
+        price = float(trade['p'])
+        qty = float(trade['q'])
+        trade_time = int(trade['T'])
+        taker_buy = not trade.get('m', False)
+
+        with self._lock:
+            self.stats['trades'] += 1
+            trade_id = trade.get('t')
+            last_id = self.last_trade_ids.get(symbol)
+            if trade_id is not None:
+                if last_id is not None and trade_id > last_id + 1:
+                    # 체결 누락 (연결 끊김 등): 직전 캔들부터 현재까지 보정 대상
+                    last_time = self.current.get((symbol, self.intervals[0]), [trade_time])[0]
+                    self.gaps.append((symbol, last_time, trade_time))
+                    self.stats['gaps'] += 1
+                self.last_trade_ids[symbol] = max(trade_id, last_id or 0)
+            self.trades[symbol].append((trade_time, trade_id or 0, price, qty, not taker_buy))
+
+            for interval in self.intervals:
+                key = (symbol, interval)
+                interval_ms = INTERVAL_MS[interval]
+                bucket = interval_start(trade_time, interval)
+                current = self.current.get(key)
+                if current is None:
+                    last = self.candles[key].last()
+                    if last is not None and last['open_time'] >= bucket:
+                        # 이미 확정된 캔들의 지연 체결
+                        continue
+                if current is None or bucket > current[0]:
+                    self._roll(key, interval_ms, bucket, price)
+                    current = self.current[key]
+                elif bucket < current[0]:
+                    # 이미 닫힌 캔들의 지연 체결은 kline 확정값/보정으로 반영
+                    continue
+                current[2] = max(current[2], price)
+                current[3] = min(current[3], price)
+                current[4] = price
+                current[5] += qty
+                current[7] += price * qty
+                current[8] += 1
+                if taker_buy:
+                    current[9] += qty
+                    current[10] += price * qty
+            self.last_prices[symbol] = price
+
+    def on_kline(self, event):
+        """kline 스트림 이벤트 처리 (확정 캔들은 집계값 대체)"""
+        k = event['k']
+        symbol = event['s']
+        interval = k['i']
+        key = (symbol, interval)
+        if key not in self.candles or not k['x']:
+            return
+        candle = parse_kline_event(k)
+        with self._lock:
+            self.stats['klines'] += 1
+            current = self.current.get(key)
+            if current is not None and current[0] == candle[0]:
+                # 진행 중 캔들이 확정됨: 확정값으로 닫고 다음 체결에서 새 캔들 시작
+                self.candles[key].append(tuple(candle))
+                del self.current[key]
+            else:
+                self._replace(key, [candle])
+
+    def _replace(self, key, candles):
+        """open_time 기준으로 확정 캔들 병합 (같은 시각은 대체)"""
+        buffer = self.candles[key]
+        merged = {row[0]: tuple(row) for row in buffer.view().tolist()}
+        for candle in candles:
+            merged[candle[0]] = tuple(candle)
+        current = self.current.get(key)
+        if current is not None:
+            merged.pop(current[0], None)
+        buffer.clear()
+        buffer.extend([merged[open_time] for open_time in sorted(merged)[-self.capacity:]])
+
+    def repair_gaps(self):
+        """기록된 누락 구간을 REST K라인으로 보정
+
+        반환: 보정한 구간 수
+        """
+        with self._lock:
+            gaps, self.gaps = self.gaps, []
+        repaired = 0
+        for symbol, start_time, end_time in gaps:
+            try:
+                for interval in self.intervals:
+                    interval_ms = INTERVAL_MS[interval]
+                    klines = self.api.get_klines(
+                        symbol, interval, limit=1000,
+                        start_time=interval_start(start_time, interval), end_time=end_time
+                    )
+                    with self._lock:
+                        key = (symbol, interval)
+                        current = self.current.get(key)
+                        closed = [parse_kline(k) for k in klines
+                                  if current is None or int(k[0]) < current[0]]
+                        self._replace(key, closed)
+                repaired += 1
+            except Exception as e:
+                error_handler.log_error(e, f"캔들 누락 보정 실패: {symbol}")
+                with self._lock:
+                    self.gaps.append((symbol, start_time, end_time))
+        self.stats['repaired'] += repaired
+        if repaired:
+            error_handler.log_info(f"캔들 누락 보정 완료: {repaired}개 구간")
+        return repaired
+
+    def has_data(self, symbol, interval):
+        key = (symbol.upper(), interval)
+        buffer = self.candles.get(key)
+        return (buffer is not None and len(buffer) > 0) or key in self.current
+
+    def get_candles(self, symbol, interval, limit=100, include_current=True):
+        """최근 캔들 목록 (오래된 순, 진행 중 캔들 포함 여부 선택, CANDLE_FIELDS 순서의 행)"""
+        key = (symbol.upper(), interval)
+        with self._lock:
+            current = self.current.get(key) if include_current else None
+            closed = limit - 1 if current is not None else limit
+            candles = _records_to_rows(self.candles[key].view(closed)) if closed > 0 else []
+            if current is not None:
+                candles.append(list(current))
+        return candles
+
+    def get_candle_array(self, symbol, interval, limit=None):
+        """최근 확정 캔들 구조체 배열 (복사 없는 읽기 전용 뷰, 예: view['close'])"""
+        with self._lock:
+            return self.candles[(symbol.upper(), interval)].view(limit)
+
+    def get_trades(self, symbol, limit=None):
+        """최근 체결 구조체 배열 (복사 없는 읽기 전용 뷰)"""
+        with self._lock:
+            return self.trades[symbol.upper()].view(limit)
+
+    def memory_per_symbol(self):
+        """심볼당 버퍼 메모리 상한 (바이트)"""
+        return memory_ceiling(self.trade_capacity, self.capacity, len(self.intervals))
+
+    def last_price(self, symbol):
+        """마지막 체결가 (없으면 None)"""
+        return self.last_prices.get(symbol.upper())
+
+class Rolling24hStats:
+    """1분 캔들 스트림으로 심볼별 24시간 롤링 통계를 유지 (/api/v3/ticker/24hr 대체)
+
+    - 구간: 진행 중 1분 캔들을 포함한 최근 1440개 캔들
+    - 캔들 갱신은 O(1): 거래량/거래대금은 누적 합, 고가/저가는 단조 덱으로 유지
+      (누적 합의 부동소수점 오차는 캔들 1440개가 빠질 때마다 다시 합산하여 제거)
+    - reconcile_interval 초마다 REST 24시간 요약과 거래량을 비교하여 오차가 tolerance 를 넘으면 재적재
+    """
+    WINDOW = 1440
+
+    def __init__(self, symbols, api=None, reconcile_interval=3600, tolerance=0.02):
+        """24시간 롤링 통계 초기화
+
+        api: 초기 적재/대조용 REST API (get_klines, get_market_summary 제공)
+        reconcile_interval: REST 대조 주기 (초, None 이면 대조하지 않음)
+        tolerance: 재적재 기준 거래량 상대 오차
+        """
+        self.symbols = [symbol.upper() for symbol in symbols]
+        self.api = api
+        self.reconcile_interval = reconcile_interval
+        self.tolerance = tolerance
+        self._lock = threading.Lock()
+        self._state = {symbol: self._empty() for symbol in self.symbols}
+        self.reconciled_at = {}
+        self.drift = {}     # symbol -> 마지막 대조 시 거래량 상대 오차
+        self.stats = {'updates': 0, 'reconciled': 0, 'resynced': 0}
+
+    @staticmethod
+    def _empty():
+        return {
+            'candles': deque(),   # 확정 캔들 (open_time, open, close, volume, quote_volume)
+            'highs': deque(),     # (open_time, high), 고가 내림차순
+            'lows': deque(),      # (open_time, low), 저가 오름차순
+            'volume': 0.0,
+            'quote_volume': 0.0,
+            'evicted': 0,
+            'current': None       # 진행 중 캔들 (CANDLE_FIELDS 순서)
+        }
+
+    def streams(self):
+        """구독할 스트림 이름 목록 (1분 kline)"""
+        return [stream_name(symbol, 'kline', '1m') for symbol in self.symbols]
+
+    async def start(self, stream_manager):
+        """스트림 구독 시작 (캔들 누락은 통계 오차가 되므로 버리지 않음)"""
+        return await stream_manager.subscribe(self.streams(), self.handle_event, policy='block')
+
+    async def handle_event(self, stream, data):
+        """StreamManager 메시지 처리 (진행 중/확정 1분 캔들 모두 반영)"""
+        if data.get('e') == 'kline' and data['k']['i'] == '1m':
+            self.update(data['s'], parse_kline_event(data['k']))
+
+    def backfill(self, symbols=None, now=None):
+        """REST 1분 K라인으로 최근 24시간 구간 적재 (요청당 최대 1000개이므로 2회)"""
+        now = int(time.time() * 1000) if now is None else now
+        minute = INTERVAL_MS['1m']
+        for symbol in symbols or self.symbols:
+            try:
+                candles = []
+                start_time = now - now % minute - (self.WINDOW - 1) * minute
+                while start_time <= now:
+                    klines = self.api.get_klines(symbol, '1m', limit=1000, start_time=start_time, end_time=now)
+                    if not klines:
+                        break
+                    candles.extend(parse_kline(k) for k in klines)
+                    start_time = candles[-1][0] + minute
+            except Exception as e:
+                error_handler.log_error(e, f"24시간 통계 초기 적재 실패: {symbol}")
+                continue
+            with self._lock:
+                self._state[symbol] = self._empty()
+                for candle in candles:
+                    self._apply(self._state[symbol], candle)
+            self.reconciled_at[symbol] = time.time()
+        error_handler.log_info(f"24시간 통계 초기 적재 완료: {len(symbols or self.symbols)}개 심볼")
+
+    def update(self, symbol, candle):
+        """1분 캔들 갱신 (진행 중 캔들은 대체, 새 캔들이 오면 이전 캔들을 구간에 추가)"""
+        symbol = symbol.upper()
+        with self._lock:
+            state = self._state.get(symbol)
+            if state is None:
+                state = self._state[symbol] = self._empty()
+                self.symbols.append(symbol)
+            self._apply(state, candle)
+            self.stats['updates'] += 1
+
+    def _apply(self, state, candle):
+        current = state['current']
+        if current is not None:
+            if candle[0] < current[0]:
+                # 이미 구간에 들어간 캔들의 지연 갱신은 REST 대조로 보정
+                return
+            if candle[0] > current[0]:
+                self._close(state, current)
+        state['current'] = list(candle)
+        self._evict(state, candle[0] - (self.WINDOW - 1) * INTERVAL_MS['1m'])
+
+    def _close(self, state, candle):
+        """확정 캔들을 구간에 추가"""
+        open_time, high, low = candle[0], candle[2], candle[3]
+        state['candles'].append((open_time, candle[1], candle[4], candle[5], candle[7]))
+        state['volume'] += candle[5]
+        state['quote_volume'] += candle[7]
+        highs, lows = state['highs'], state['lows']
+        while highs and highs[-1][1] <= high:
+            highs.pop()
+        highs.append((open_time, high))
+        while lows and lows[-1][1] >= low:
+            lows.pop()
+        lows.append((open_time, low))
+
+    def _evict(self, state, start_time):
+        """start_time 이전 확정 캔들 제거"""
+        candles = state['candles']
+        while candles and candles[0][0] < start_time:
+            _, _, _, volume, quote_volume = candles.popleft()
+            state['volume'] -= volume
+            state['quote_volume'] -= quote_volume
+            state['evicted'] += 1
+        for extremes in (state['highs'], state['lows']):
+            while extremes and extremes[0][0] < start_time:
+                extremes.popleft()
+        if state['evicted'] >= self.WINDOW:
+            state['volume'] = sum(candle[3] for candle in candles)
+            state['quote_volume'] = sum(candle[4] for candle in candles)
+            state['evicted'] = 0
+
+    def has_data(self, symbol):
+        state = self._state.get(symbol.upper())
+        return state is not None and state['current'] is not None
+
+    def summary(self, symbol, now=None):
+        """로컬 24시간 요약 (get_market_summary 와 같은 형식, 데이터가 없으면 None)
+
+        now: 기준 시각 (밀리초, 기본값 현재 시각). 캔들이 오지 않은 동안 지난 구간도 제외
+        """
+        now = int(time.time() * 1000) if now is None else now
+        minute = INTERVAL_MS['1m']
+        with self._lock:
+            state = self._state.get(symbol.upper())
+            if state is None or state['current'] is None:
+                return None
+            start_time = now - now % minute - (self.WINDOW - 1) * minute
+            self._evict(state, start_time)
+            current = state['current']
+            if current[0] < start_time:
+                return None
+            candles, highs, lows = state['candles'], state['highs'], state['lows']
+            open_price = candles[0][1] if candles else current[1]
+            last_price = current[4]
+            high_price = max(highs[0][1], current[2]) if highs else current[2]
+            low_price = min(lows[0][1], current[3]) if lows else current[3]
+            volume = state['volume'] + current[5]
+            quote_volume = state['quote_volume'] + current[7]
+        return {
+            'symbol': symbol.upper(),
+            'price_change': last_price - open_price,
+            'price_change_percent': (last_price - open_price) / open_price * 100 if open_price else 0.0,
+            'weighted_avg_price': quote_volume / volume if volume > 0 else last_price,
+            'high_price': high_price,
+            'low_price': low_price,
+            'volume': volume,
+            'quote_volume': quote_volume,
+            'open_price': open_price,
+            'last_price': last_price
+        }
+
+    def get_market_summary(self, symbol="BTCUSDT"):
+        """로컬 24시간 요약 (대조 주기가 지났으면 REST 와 먼저 대조)"""
+        symbol = symbol.upper()
+        if self.api is not None and self.reconcile_interval is not None \
+                and time.time() - self.reconciled_at.get(symbol, 0) >= self.reconcile_interval:
+            self.reconcile([symbol])
+        return self.summary(symbol)
+
+    def reconcile(self, symbols=None):
+        """REST 24시간 요약과 거래량 대조 (오차가 tolerance 를 넘는 심볼은 재적재)
+
+        반환: 재적재한 심볼 목록
+        """
+        resynced = []
+        for symbol in symbols or self.symbols:
+            try:
+                remote = self.api.get_market_summary(symbol)
+            except Exception as e:
+                error_handler.log_error(e, f"24시간 통계 대조 실패: {symbol}")
+                continue
+            self.reconciled_at[symbol] = time.time()
+            self.stats['reconciled'] += 1
+            local = self.summary(symbol)
+            drift = 1.0 if local is None else \
+                abs(local['volume'] - remote['volume']) / max(remote['volume'], 1e-12)
+            self.drift[symbol] = drift
+            if drift > self.tolerance:
+                resynced.append(symbol)
+        if resynced:
+            self.backfill(resynced)
+            self.stats['resynced'] += len(resynced)
+            error_handler.log_info(f"24시간 통계 재적재: {resynced}")
+        return resynced
@@ -0,0 +1,246 @@
+import asyncio
+from bisect import bisect_left
+from utils import error_handler
+from data.websocket_client import stream_name
+
+class BookSide:
+    """호가 한쪽 (가격 정렬 배열 + 수량 배열)
+
+    가격 위치는 이진 탐색(O(log n))으로 찾고, 상위 N개 조회는 배열 끝의 슬라이스로 처리한다.
+    최우선 호가를 배열 끝에 두므로 단계 추가/제거 시 이동량은 최우선 호가까지의 단계 수에 비례한다
+    (diff 이벤트 대부분이 최우선 호가 근처에서 발생하므로 대개 수십 단계 이하).
+    매도 호가는 가격의 부호를 바꿔 저장하여 두 방향 모두 최우선 호가가 가장 큰 값이 되도록 한다.
+    """
+    def __init__(self, descending=False):
+        self.sign = 1.0 if descending else -1.0
+        self._keys = []
+        self._qtys = []
+
+    def __len__(self):
+        return len(self._keys)
+
+    def clear(self):
+        self._keys = []
+        self._qtys = []
+
+    def load(self, levels):
+        """스냅샷 호가로 초기화"""
+        items = sorted((self.sign * float(price), float(qty)) for price, qty in levels if float(qty) > 0)
+        self._keys = [key for key, _ in items]
+        self._qtys = [qty for _, qty in items]
+
+    def update(self, price, qty):
+        """가격 단계 갱신 (수량 0 이면 제거)"""
+        key = self.sign * float(price)
+        qty = float(qty)
+        index = bisect_left(self._keys, key)
+        if index < len(self._keys) and self._keys[index] == key:
+            if qty == 0:
+                del self._keys[index]
+                del self._qtys[index]
+            else:
+                self._qtys[index] = qty
+        elif qty != 0:
+            self._keys.insert(index, key)
+            self._qtys.insert(index, qty)
+
+    def best(self):
+        """최우선 호가 (가격, 수량), 없으면 None"""
+        if not self._keys:
+            return None
+        return self.sign * self._keys[-1], self._qtys[-1]
+
+    def _start(self, n):
+        """상위 n개 단계의 시작 위치 (n 이 None 이면 전체)"""
+        return 0 if n is None else max(len(self._keys) - n, 0)
+
+    def top(self, n):
+        """상위 n개 호가 [[가격, 수량], ...] (n 이 None 이면 전체)"""
+        start = self._start(n)
+        return [[self.sign * self._keys[i], self._qtys[i]] for i in range(len(self._keys) - 1, start - 1, -1)]
+
+    def volume(self, n):
+        """상위 n개 호가 수량 합계 (최우선 호가부터 합산)"""
+        return sum(reversed(self._qtys[self._start(n):]))
+
+class OrderBook:
+    """REST 스냅샷 + depth diff 스트림으로 유지하는 로컬 호가창
+
+    Binance 호가창 유지 절차를 따른다.
+    - 스냅샷 전에 수신한 diff 이벤트는 버퍼에 보관
+    - 스냅샷 적용 시 u <= lastUpdateId 인 이벤트는 버리고, 첫 이벤트는 U <= lastUpdateId+1 <= u 여야 함
+    - 이후 이벤트는 U == 직전 u + 1 이어야 하며, 어긋나면 누락으로 보고 재동기화 필요 상태로 전환
+    """
+    def __init__(self, symbol, max_buffer=1000):
+        self.symbol = symbol.upper()
+        self.bids = BookSide(descending=True)
+        self.asks = BookSide()
+        self.last_update_id = None
+        self.synced = False
+        self.max_buffer = max_buffer
+        self.buffer = []
+        self.stats = {'events': 0, 'gaps': 0, 'snapshots': 0, 'stale_snapshots': 0}
+
+    def _apply(self, event):
+        for price, qty in event['b']:
+            self.bids.update(price, qty)
+        for price, qty in event['a']:
+            self.asks.update(price, qty)
+        self.last_update_id = event['u']
+        self.stats['events'] += 1
+
+    def _buffer(self, event):
+        self.buffer.append(event)
+        if len(self.buffer) > self.max_buffer:
+            del self.buffer[0]
+
+    def apply_snapshot(self, snapshot):
+        """REST 스냅샷 적용 후 버퍼 이벤트 반영
+
+        반환: 동기화 성공 여부 (스냅샷이 버퍼보다 오래된 경우 False, 새 스냅샷 필요)
+        """
+        self.stats['snapshots'] += 1
+        last_update_id = snapshot['lastUpdateId']
+        pending = [event for event in self.buffer if event['u'] > last_update_id]
+        if pending and pending[0]['U'] > last_update_id + 1:
+            self.stats['stale_snapshots'] += 1
+            return False
+
+        self.bids.load(snapshot['bids'])
+        self.asks.load(snapshot['asks'])
+        self.last_update_id = last_update_id
+        self.buffer = []
+        self.synced = True
+        if pending:
+            # 첫 이벤트는 스냅샷과 범위가 겹칠 수 있으므로 연속성 검사 없이 적용
+            self._apply(pending[0])
+            for index in range(1, len(pending)):
+                if not self.on_event(pending[index]):
+                    # 누락 이후 이벤트도 다음 스냅샷에 사용하도록 다시 버퍼링
+                    for event in pending[index + 1:]:
+                        self._buffer(event)
+                    return False
+        return True
+
+    def on_event(self, event):
+        """diff 이벤트 처리
+
+        반환: 호가창이 동기화 상태인지 여부 (False 면 스냅샷 필요)
+        """
+        if not self.synced:
+            self._buffer(event)
+            return False
+        if event['u'] <= self.last_update_id:
+            return True
+        if event['U'] != self.last_update_id + 1:
+            # 이벤트 누락: 현재 이벤트부터 다시 버퍼링하고 재동기화
+            self.stats['gaps'] += 1
+            self.synced = False
+            self.buffer = [event]
+            error_handler.log_info(
+                f"호가창 이벤트 누락 감지: {self.symbol} (기대 {self.last_update_id + 1}, 수신 {event['U']})"
+            )
+            return False
+        self._apply(event)
+        return True
+
+    def best_bid(self):
+        return self.bids.best()
+
+    def best_ask(self):
+        return self.asks.best()
+
+    def mid_price(self):
+        """중간 가격 (호가가 없으면 None)"""
+        bid, ask = self.bids.best(), self.asks.best()
+        if bid is None or ask is None:
+            return None
+        return (bid[0] + ask[0]) / 2
+
+    def spread(self):
+        """매도-매수 최우선 호가 차이 (호가가 없으면 None)"""
+        bid, ask = self.bids.best(), self.asks.best()
+        if bid is None or ask is None:
+            return None
+        return ask[0] - bid[0]
+
+    def copy(self, n=None):
+        """상위 n개 호가만 담은 복사본 (스트림 처리 스레드 밖에서 읽기용, n 미지정 시 전체)"""
+        book = OrderBook(self.symbol, self.max_buffer)
+        book.bids.load(self.bids.top(n))
+        book.asks.load(self.asks.top(n))
+        book.last_update_id = self.last_update_id
+        book.synced = self.synced
+        return book
+
+    def depth(self, n=10):
+        """상위 n개 호가 (REST depth 응답과 같은 형식)"""
+        return {
+            'lastUpdateId': self.last_update_id,
+            'bids': self.bids.top(n),
+            'asks': self.asks.top(n)
+        }
+
+    def buy_sell_ratio(self, n=10):
+        """상위 n개 매수/매도 수량 비율"""
+        ask_volume = self.asks.volume(n)
+        return self.bids.volume(n) / ask_volume if ask_volume > 0 else 0
+
+    def imbalance(self, n=10):
+        """상위 n개 호가 불균형 ((매수 - 매도) / (매수 + 매도), -1 ~ 1)"""
+        bid_volume = self.bids.volume(n)
+        ask_volume = self.asks.volume(n)
+        total = bid_volume + ask_volume
+        return (bid_volume - ask_volume) / total if total > 0 else 0.0
+
+class OrderBookManager:
+    """심볼별 로컬 호가창 관리 (depth 스트림 구독, 스냅샷 조회 및 자동 재동기화)"""
+    def __init__(self, stream_manager, api, symbols, snapshot_limit=1000, retry_delay=1.0):
+        """호가창 관리자 초기화
+
+        stream_manager: data.websocket_client.StreamManager
+        api: 스냅샷 조회용 비동기 API (get_market_depth 코루틴 제공)
+        snapshot_limit: 스냅샷 호가 단계 수
+        retry_delay: 스냅샷이 오래된 경우 재조회 대기 시간 (초)
+        """
+        self.stream_manager = stream_manager
+        self.api = api
+        self.snapshot_limit = snapshot_limit
+        self.retry_delay = retry_delay
+        self.books = {symbol.upper(): OrderBook(symbol) for symbol in symbols}
+        self._streams = {stream_name(symbol, 'depth'): symbol.upper() for symbol in symbols}
+        self._snapshot_tasks = {}
+
+    def get_book(self, symbol):
+        return self.books[symbol.upper()]
+
+    async def start(self):
+        """depth 스트림 구독 (첫 이벤트 수신 시 스냅샷 조회, diff 이벤트는 버리지 않음)"""
+        await self.stream_manager.subscribe(list(self._streams), self.handle_event, policy='block')
+
+    async def stop(self):
+        await self.stream_manager.unsubscribe(list(self._streams))
+        for task in self._snapshot_tasks.values():
+            task.cancel()
+        self._snapshot_tasks = {}
+
+    async def handle_event(self, stream, event):
+        """depth 스트림 메시지 처리 (동기화가 필요하면 스냅샷 조회 시작)"""
+        symbol = self._streams.get(stream, event.get('s'))
+        book = self.books[symbol]
+        if not book.on_event(event):
+            task = self._snapshot_tasks.get(symbol)
+            if task is None or task.done():
+                self._snapshot_tasks[symbol] = asyncio.create_task(self._resync(book))
+
+    async def _resync(self, book):
+        """스냅샷 조회 후 버퍼 이벤트와 결합 (스냅샷이 오래되면 재조회)"""
+        while not book.synced:
+            try:
+                snapshot = await self.api.get_market_depth(book.symbol, limit=self.snapshot_limit)
+                if book.apply_snapshot(snapshot):
+                    error_handler.log_info(f"호가창 동기화 완료: {book.symbol} ({book.last_update_id})")
+                    return
+            except Exception as e:
+                error_handler.log_error(e, f"호가창 스냅샷 조회 실패: {book.symbol}")
+            await asyncio.sleep(self.retry_delay)
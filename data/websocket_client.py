@@ -0,0 +1,514 @@
+import json
+import time
+import random
+import asyncio
+from collections import deque
+import websockets
+from utils import error_handler
+
+try:
+    import orjson
+except ImportError:  # 선택 의존성 (없으면 표준 json 사용)
+    orjson = None
+
+# 연결당 최대 스트림 수 (Binance combined stream 제한)
+MAX_STREAMS_PER_CONNECTION = 1024
+
+# 스트림 종류별 이름 접미사
+STREAM_KINDS = {
+    'trade': 'trade',
+    'kline': 'kline_{interval}',
+    'depth': 'depth@100ms',
+    'bookTicker': 'bookTicker'
+}
+
+def stream_name(symbol, kind, interval='1m'):
+    """심볼/종류로 스트림 이름 생성 (예: btcusdt@kline_1m)"""
+    return f"{symbol.lower()}@{STREAM_KINDS[kind].format(interval=interval)}"
+
+def stream_names(symbols, kinds=('trade', 'kline', 'depth', 'bookTicker'), interval='1m'):
+    """여러 심볼 x 종류의 스트림 이름 목록"""
+    return [stream_name(symbol, kind, interval) for symbol in symbols for kind in kinds]
+
+def default_decoder():
+    """사용 가능한 가장 빠른 JSON 디코더 (orjson 설치 시 orjson.loads)"""
+    return orjson.loads if orjson is not None else json.loads
+
+# combined stream 메시지 접두사 ({"stream":"<이름>","data":...})
+_STREAM_PREFIX = '{"stream":"'
+
+def extract_stream(message):
+    """combined stream 메시지에서 전체 디코딩 없이 스트림 이름 추출 (형식이 다르면 None)"""
+    if not isinstance(message, str) or not message.startswith(_STREAM_PREFIX):
+        return None
+    end = message.find('"', len(_STREAM_PREFIX))
+    return message[len(_STREAM_PREFIX):end] if end > 0 else None
+
+# 소비자 큐가 가득 찼을 때의 처리 방식
+BACKPRESSURE_POLICIES = ('drop_oldest', 'conflate', 'block')
+
+class StreamConsumer:
+    """스트림 소비자 (크기 제한 큐 + 전용 처리 태스크)
+
+    메시지는 원문 그대로 큐에 넣고 처리 직전에 디코딩하므로, 버려지거나 병합된 메시지는 디코딩하지 않는다.
+    큐가 가득 찼을 때의 처리 방식(policy):
+    - drop_oldest: 가장 오래된 메시지를 버리고 새 메시지 추가
+    - conflate: 스트림별 최신 메시지 하나만 유지 (호가/티커처럼 최신 상태만 필요한 경우)
+    - block: 자리가 날 때까지 대기 (수신 파이프라인 전체가 멈추므로 누락이 허용되지 않는 경우에만 사용)
+    """
+    def __init__(self, handler, queue_size=1000, policy='drop_oldest', decoder=None):
+        """소비자 초기화
+
+        handler: async def handler(stream, data)
+        queue_size: 대기 메시지 최대 수
+        policy: 큐가 가득 찼을 때의 처리 방식 (BACKPRESSURE_POLICIES)
+        decoder: 원문 메시지 디코더 (기본값: default_decoder())
+        """
+        if policy not in BACKPRESSURE_POLICIES:
+            raise ValueError(f"지원하지 않는 backpressure 정책입니다: {policy}")
+        self.handler = handler
+        self.policy = policy
+        self.decoder = decoder or default_decoder()
+        # conflate 정책은 큐에 스트림 이름만 넣고 최신 메시지는 별도로 보관
+        self.queue = asyncio.Queue(maxsize=0 if policy == 'conflate' else queue_size)
+        self._latest = {}
+        self.task = None
+        self.stats = {'received': 0, 'processed': 0, 'dropped': 0, 'conflated': 0, 'errors': 0,
+                      'lag_count': 0, 'lag_total': 0.0, 'lag_max': 0.0, 'lag_last': 0.0}
+
+    async def put(self, stream, frame):
+        """메시지 추가 (frame: 원문 문자열 또는 디코딩된 data)"""
+        self.stats['received'] += 1
+        if self.policy == 'conflate':
+            if stream in self._latest:
+                self.stats['conflated'] += 1
+            else:
+                self.queue.put_nowait(stream)
+            self._latest[stream] = frame
+        elif self.policy == 'block':
+            await self.queue.put((stream, frame))
+        else:
+            if self.queue.full():
+                self.queue.get_nowait()
+                self.queue.task_done()
+                self.stats['dropped'] += 1
+            self.queue.put_nowait((stream, frame))
+
+    def depth(self):
+        """대기 중인 메시지 수"""
+        return self.queue.qsize()
+
+    def _decode(self, frame):
+        if isinstance(frame, (str, bytes, bytearray)):
+            return self.decoder(frame)['data']
+        return frame
+
+    def _record_lag(self, data):
+        """거래소 이벤트 시각(E) 대비 처리 시점 지연 기록 (밀리초)"""
+        event_time = data.get('E') if isinstance(data, dict) else None
+        if event_time is None:
+            return
+        lag = time.time() * 1000 - event_time
+        self.stats['lag_count'] += 1
+        self.stats['lag_total'] += lag
+        self.stats['lag_last'] = lag
+        if lag > self.stats['lag_max']:
+            self.stats['lag_max'] = lag
+
+    async def run(self):
+        """큐의 메시지를 순서대로 처리"""
+        while True:
+            item = await self.queue.get()
+            if self.policy == 'conflate':
+                stream, frame = item, self._latest.pop(item)
+            else:
+                stream, frame = item
+            try:
+                data = self._decode(frame)
+                self._record_lag(data)
+                await self.handler(stream, data)
+                self.stats['processed'] += 1
+            except Exception as e:
+                self.stats['errors'] += 1
+                error_handler.log_error(e, f"스트림 메시지 처리 실패: {stream}")
+            finally:
+                self.queue.task_done()
+
+    def start(self):
+        if self.task is None:
+            self.task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        if self.task is not None:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
+
+    def get_stats(self):
+        """처리/버림/병합 수, 큐 깊이, 이벤트 지연 (밀리초)"""
+        stats = dict(self.stats)
+        count = stats.pop('lag_count')
+        total = stats.pop('lag_total')
+        stats['lag_avg'] = total / count if count else 0.0
+        stats['queue_depth'] = self.depth()
+        stats['policy'] = self.policy
+        return stats
+
+class _StreamConnection:
+    """combined stream 연결 하나 (무한 재연결, 구독 상태 동기화)"""
+    def __init__(self, manager, index):
+        self.manager = manager
+        self.index = index
+        self.streams = set()    # 구독해야 할 스트림
+        self.active = set()     # 현재 연결에서 구독 중인 스트림
+        self.ws = None
+        self.task = None
+        self.reconnects = 0
+        self._changed = asyncio.Event()
+        self._sync_lock = asyncio.Lock()
+
+    @property
+    def connected(self):
+        return self.ws is not None
+
+    def start(self):
+        if self.task is None:
+            self.task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        if self.task is not None:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
+
+    async def run(self):
+        """연결 유지 루프 (끊기면 지터가 적용된 지수 백오프로 재연결)"""
+        attempt = 0
+        while True:
+            if not self.streams:
+                self._changed.clear()
+                await self._changed.wait()
+                continue
+
+            path = f"/stream?streams={'/'.join(sorted(self.streams))}"
+            recorder = self.manager.recorder
+            try:
+                async with websockets.connect(f"{self.manager.base_url}{path}",
+                                              ping_interval=self.manager.ping_interval) as ws:
+                    self.ws = ws
+                    self.active = set(self.streams)
+                    attempt = 0
+                    error_handler.log_info(
+                        f"스트림 연결 성공 #{self.index}: {len(self.active)}개 스트림"
+                    )
+                    # 연결 중에 변경된 구독 반영 (응답은 아래 수신 루프에서 전달되므로 별도 태스크)
+                    if self.streams != self.active:
+                        asyncio.create_task(self.sync())
+                    # 수신 루프는 원문 프레임만 적재 (디코딩/전달은 별도 태스크)
+                    async for message in ws:
+                        if recorder is not None:
+                            recorder.record_ws(path, message)
+                        await self.manager._enqueue(message)
+                error_handler.log_info(f"스트림 연결 종료 #{self.index}")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                error_handler.log_error(e, f"스트림 연결 오류 #{self.index}")
+            finally:
+                self.ws = None
+                self.active = set()
+
+            attempt += 1
+            self.reconnects += 1
+            delay = self.manager.backoff_delay(attempt)
+            error_handler.log_info(f"스트림 재연결 대기 #{self.index}: {delay:.2f}초 (시도 {attempt})")
+            await asyncio.sleep(delay)
+
+    async def sync(self):
+        """구독해야 할 스트림과 현재 구독 상태의 차이를 SUBSCRIBE/UNSUBSCRIBE 로 반영"""
+        self._changed.set()
+        async with self._sync_lock:
+            if self.ws is None:
+                return
+            added = sorted(self.streams - self.active)
+            removed = sorted(self.active - self.streams)
+            try:
+                if added:
+                    await self.manager._control(self.ws, 'SUBSCRIBE', added)
+                    self.active.update(added)
+                if removed:
+                    await self.manager._control(self.ws, 'UNSUBSCRIBE', removed)
+                    self.active.difference_update(removed)
+            except Exception as e:
+                # 재연결 시 URL 로 다시 구독되므로 기록만 함
+                error_handler.log_error(e, f"스트림 구독 변경 실패 #{self.index}")
+
+class StreamManager:
+    """다중 심볼/다중 스트림 WebSocket 관리자
+
+    - trade, kline, depth, bookTicker 스트림을 combined stream 연결로 다중화
+    - 연결당 스트림 수 제한을 넘으면 연결을 추가하여 분산
+    - 실행 중 SUBSCRIBE/UNSUBSCRIBE 로 구독 변경 (재연결 시 현재 구독으로 복구)
+    - 연결이 끊기면 지터가 적용된 지수 백오프로 무기한 재연결
+    - 스트림별 소비자(크기 제한 큐 + 처리 태스크)로 메시지 전달
+
+    수신 파이프라인: 소켓 수신 루프는 원문 프레임만 적재하고, 디코딩 태스크가 프레임을 묶음 단위로
+    꺼내 스트림 이름(메시지 접두사)만 읽어 소비자에게 전달한다. 본문 디코딩은 소비자가 처리 직전에 한다.
+    적재된 프레임이 max_pending_frames 에 도달하면 소켓 수신을 멈춘다 (block 정책 소비자 등).
+    """
+    def __init__(self, base_url="wss://stream.binance.com:9443",
+                 max_streams_per_connection=MAX_STREAMS_PER_CONNECTION,
+                 backoff_base=1.0, backoff_max=60.0, ping_interval=20, control_timeout=5.0,
+                 decoder=None, batch_size=256, max_pending_frames=100000, recorder=None):
+        """스트림 관리자 초기화
+
+        backoff_base: 첫 재연결 대기 시간 (초)
+        backoff_max: 재연결 대기 시간 상한 (초)
+        control_timeout: SUBSCRIBE/UNSUBSCRIBE 응답 대기 시간 (초)
+        decoder: JSON 디코더 (기본값: orjson 설치 시 orjson.loads, 아니면 json.loads)
+        batch_size: 디코딩 태스크가 한 번에 처리할 프레임 수
+        max_pending_frames: 처리 대기 프레임 상한
+        recorder: 수신 프레임 기록기 (utils.replay.TrafficRecorder, 연결 URL 경로별로 원문 기록)
+        """
+        self.base_url = base_url
+        self.max_streams_per_connection = max_streams_per_connection
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.ping_interval = ping_interval
+        self.control_timeout = control_timeout
+        self.recorder = recorder
+
+        self.connections = []
+        self.consumers = {}      # stream -> [StreamConsumer]
+        self._pending = {}       # 제어 메시지 id -> Future
+        self._next_id = 0
+        self.running = False
+        self.decoder = decoder or default_decoder()
+        self.batch_size = batch_size
+        self.max_pending_frames = max_pending_frames
+        self._frames = deque()
+        self._frames_ready = asyncio.Event()
+        self._frames_space = asyncio.Event()
+        self._frames_space.set()
+        self._decode_task = None
+        self.stats = {'frames': 0, 'messages': 0, 'unrouted': 0, 'invalid': 0, 'batches': 0,
+                      'decoded_in_pipeline': 0}
+        self._rate_mark = (time.time(), 0)
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.stop()
+
+    def backoff_delay(self, attempt):
+        """재연결 대기 시간 (지수 백오프, 0.5~1.5배 지터)"""
+        # 장시간 끊김으로 시도 횟수가 커져도 float 변환 오버플로가 나지 않도록 지수 제한
+        delay = min(self.backoff_max, self.backoff_base * (2 ** min(attempt - 1, 30)))
+        return delay * random.uniform(0.5, 1.5)
+
+    async def start(self):
+        """관리자 시작 (구독된 스트림의 연결 생성)"""
+        self.running = True
+        if self._decode_task is None:
+            self._decode_task = asyncio.create_task(self._decode_loop())
+        for connection in self.connections:
+            connection.start()
+        for consumer in self._all_consumers():
+            consumer.start()
+        error_handler.log_info("스트림 관리자 시작")
+
+    async def stop(self):
+        """모든 연결과 소비자 종료"""
+        self.running = False
+        for connection in self.connections:
+            await connection.stop()
+        if self._decode_task is not None:
+            self._decode_task.cancel()
+            try:
+                await self._decode_task
+            except asyncio.CancelledError:
+                pass
+            self._decode_task = None
+        for consumer in self._all_consumers():
+            await consumer.stop()
+        error_handler.log_info("스트림 관리자 종료")
+
+    def _all_consumers(self):
+        unique = {}
+        for consumers in self.consumers.values():
+            for consumer in consumers:
+                unique[id(consumer)] = consumer
+        return list(unique.values())
+
+    def _connection_for(self, stream):
+        """스트림을 담당하는 연결 (없으면 여유 있는 연결 선택 또는 새 연결 생성)"""
+        for connection in self.connections:
+            if stream in connection.streams:
+                return connection
+        for connection in self.connections:
+            if len(connection.streams) < self.max_streams_per_connection:
+                return connection
+        connection = _StreamConnection(self, len(self.connections))
+        self.connections.append(connection)
+        if self.running:
+            connection.start()
+        return connection
+
+    async def subscribe(self, streams, handler, queue_size=1000, policy='drop_oldest'):
+        """스트림 구독 및 소비자 등록
+
+        streams: 스트림 이름 목록 (stream_name/stream_names 참고)
+        handler: async def handler(stream, data)
+        policy: 큐가 가득 찼을 때의 처리 방식 (drop_oldest, conflate, block)
+        반환: 등록된 StreamConsumer (여러 스트림이 하나의 큐를 공유)
+        """
+        consumer = StreamConsumer(handler, queue_size, policy=policy, decoder=self.decoder)
+        changed = set()
+        for stream in streams:
+            self.consumers.setdefault(stream, []).append(consumer)
+            connection = self._connection_for(stream)
+            connection.streams.add(stream)
+            changed.add(connection)
+        if self.running:
+            consumer.start()
+        for connection in changed:
+            await connection.sync()
+        error_handler.log_info(f"스트림 구독: {len(streams)}개")
+        return consumer
+
+    async def unsubscribe(self, streams, consumer=None):
+        """스트림 구독 해제 (consumer 지정 시 해당 소비자만 해제, 소비자가 남으면 구독 유지)"""
+        before = self._all_consumers()
+        changed = set()
+        for stream in streams:
+            consumers = self.consumers.get(stream, [])
+            if consumer is not None:
+                consumers = [c for c in consumers if c is not consumer]
+            else:
+                consumers = []
+            if consumers:
+                self.consumers[stream] = consumers
+                continue
+            self.consumers.pop(stream, None)
+            for connection in self.connections:
+                if stream in connection.streams:
+                    connection.streams.discard(stream)
+                    changed.add(connection)
+
+        # 더 이상 구독 중인 스트림이 없는 소비자는 종료
+        remaining = {id(c) for c in self._all_consumers()}
+        for stale in before:
+            if id(stale) not in remaining:
+                await stale.stop()
+        for connection in changed:
+            await connection.sync()
+        error_handler.log_info(f"스트림 구독 해제: {len(streams)}개")
+
+    async def _control(self, ws, method, streams):
+        """SUBSCRIBE/UNSUBSCRIBE 요청 전송 후 응답 대기"""
+        self._next_id += 1
+        request_id = self._next_id
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        try:
+            await ws.send(json.dumps({'method': method, 'params': streams, 'id': request_id}))
+            response = await asyncio.wait_for(future, self.control_timeout)
+        finally:
+            self._pending.pop(request_id, None)
+        if response.get('error'):
+            raise RuntimeError(f"{method} 실패: {response['error']}")
+        return response
+
+    async def _enqueue(self, message):
+        """수신 프레임 적재 (대기 프레임이 상한이면 자리가 날 때까지 소켓 수신 중지)"""
+        while len(self._frames) >= self.max_pending_frames:
+            self._frames_space.clear()
+            await self._frames_space.wait()
+        self._frames.append(message)
+        self.stats['frames'] += 1
+        self._frames_ready.set()
+
+    async def _decode_loop(self):
+        """적재된 프레임을 묶음 단위로 꺼내 전달"""
+        frames = self._frames
+        while True:
+            if not frames:
+                self._frames_ready.clear()
+                await self._frames_ready.wait()
+                continue
+            batch = [frames.popleft() for _ in range(min(self.batch_size, len(frames)))]
+            self._frames_space.set()
+            self.stats['batches'] += 1
+            for message in batch:
+                await self._dispatch(message)
+            # 묶음 사이에 다른 태스크(소켓 수신, 소비자)에 실행 기회 제공
+            await asyncio.sleep(0)
+
+    async def _dispatch(self, message):
+        """수신 메시지를 스트림 소비자 또는 제어 응답으로 전달"""
+        stream = extract_stream(message)
+        frame = message
+        if stream is None:
+            # 접두사로 구분할 수 없는 메시지(제어 응답 등)만 여기서 디코딩
+            try:
+                payload = self.decoder(message)
+            except ValueError:
+                self.stats['invalid'] += 1
+                return
+            self.stats['decoded_in_pipeline'] += 1
+            if not isinstance(payload, dict):
+                self.stats['invalid'] += 1
+                return
+            stream = payload.get('stream')
+            if stream is None:
+                future = self._pending.get(payload.get('id'))
+                if future is not None and not future.done():
+                    future.set_result(payload)
+                return
+            frame = payload.get('data')
+
+        self.stats['messages'] += 1
+        consumers = self.consumers.get(stream)
+        if not consumers:
+            self.stats['unrouted'] += 1
+            return
+        for consumer in consumers:
+            await consumer.put(stream, frame)
+
+    def get_stats(self):
+        """연결/소비자 통계 조회 (messages_per_sec: 직전 조회 이후 초당 메시지 수)"""
+        now = time.time()
+        mark_time, mark_count = self._rate_mark
+        elapsed = now - mark_time
+        rate = (self.stats['messages'] - mark_count) / elapsed if elapsed > 0 else 0.0
+        self._rate_mark = (now, self.stats['messages'])
+        return {
+            'frames': self.stats['frames'],
+            'messages': self.stats['messages'],
+            'messages_per_sec': rate,
+            'pending_frames': len(self._frames),
+            'batches': self.stats['batches'],
+            'decoded_in_pipeline': self.stats['decoded_in_pipeline'],
+            'unrouted': self.stats['unrouted'],
+            'invalid': self.stats['invalid'],
+            'connections': [
+                {
+                    'streams': len(connection.streams),
+                    'connected': connection.connected,
+                    'reconnects': connection.reconnects
+                }
+                for connection in self.connections
+            ],
+            'consumers': {
+                stream: [consumer.get_stats() for consumer in consumers]
+                for stream, consumers in self.consumers.items()
+            }
+        }
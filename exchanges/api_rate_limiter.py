@@ -0,0 +1,361 @@
+import os
+import json
+import time
+import mmap
+import struct
+import asyncio
+import threading
+from contextlib import contextmanager
+from utils import error_handler
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# Binance 기본 한도 (https://api.binance.com/api/v3/exchangeInfo 의 rateLimits 기준)
+# key: 버킷 이름, limit: 윈도우당 한도, interval: 윈도우 길이(초), header: 사용량 응답 헤더
+DEFAULT_LIMITS = {
+    'weight_1m': {'limit': 6000, 'interval': 60, 'header': 'x-mbx-used-weight-1m'},
+    'orders_10s': {'limit': 100, 'interval': 10, 'header': 'x-mbx-order-count-10s'},
+    'orders_1d': {'limit': 200000, 'interval': 86400, 'header': 'x-mbx-order-count-1d'}
+}
+
+# 주문 수 한도에 포함되는 엔드포인트 (테스트 주문은 제외)
+ORDER_ENDPOINTS = {('POST', '/api/v3/order')}
+
+DEFAULT_WEIGHT = 1
+
+def _depth_weight(params):
+    """호가 조회 가중치 (limit 에 따라 증가)"""
+    limit = int(params.get('limit', 100))
+    if limit <= 100:
+        return 5
+    if limit <= 500:
+        return 25
+    if limit <= 1000:
+        return 50
+    return 250
+
+def _symbols_count(params):
+    """symbols 파라미터(JSON 배열 문자열 또는 리스트)의 심볼 개수"""
+    symbols = params.get('symbols')
+    if not symbols:
+        return 0
+    if isinstance(symbols, str):
+        symbols = json.loads(symbols)
+    return len(symbols)
+
+def _ticker_weight(params):
+    """현재가/최우선호가 조회 가중치 (전체 심볼 조회 시 증가)"""
+    return 2 if params.get('symbol') else 4
+
+def _ticker_24hr_weight(params):
+    """24시간 티커 조회 가중치 (심볼 개수에 따라 증가)"""
+    if params.get('symbol'):
+        return 2
+    count = _symbols_count(params)
+    if 0 < count <= 20:
+        return 2
+    if 0 < count <= 100:
+        return 40
+    return 80
+
+def _open_orders_weight(params):
+    """미체결 주문 조회 가중치 (심볼 생략 시 증가)"""
+    return 6 if params.get('symbol') else 80
+
+# 엔드포인트별 요청 가중치 (정수 또는 params 를 받는 함수)
+ENDPOINT_WEIGHTS = {
+    ('GET', '/api/v3/ping'): 1,
+    ('GET', '/api/v3/time'): 1,
+    ('GET', '/api/v3/exchangeInfo'): 20,
+    ('GET', '/api/v3/depth'): _depth_weight,
+    ('GET', '/api/v3/trades'): 25,
+    ('GET', '/api/v3/historicalTrades'): 25,
+    ('GET', '/api/v3/aggTrades'): 4,
+    ('GET', '/api/v3/klines'): 2,
+    ('GET', '/api/v3/ticker/price'): _ticker_weight,
+    ('GET', '/api/v3/ticker/bookTicker'): _ticker_weight,
+    ('GET', '/api/v3/ticker/24hr'): _ticker_24hr_weight,
+    ('POST', '/api/v3/order'): 1,
+    ('POST', '/api/v3/order/test'): 1,
+    ('DELETE', '/api/v3/order'): 1,
+    ('GET', '/api/v3/order'): 4,
+    ('GET', '/api/v3/openOrders'): _open_orders_weight,
+    ('GET', '/api/v3/account'): 20,
+    ('GET', '/api/v3/myTrades'): 20
+}
+
+# 전체 차단(429/418) 상태를 저장하는 내부 키
+_BLOCKED_KEY = '__blocked__'
+
+class LocalBackend:
+    """프로세스 내부 메모리 버킷 저장소"""
+    def __init__(self, keys):
+        self._state = {key: [0.0, 0.0] for key in keys}
+        self._state[_BLOCKED_KEY] = [0.0, 0.0]
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def transaction(self):
+        """버킷 상태를 잠금 상태로 조회/수정"""
+        with self._lock:
+            yield self._state
+
+class SharedFileBackend:
+    """여러 봇 프로세스가 하나의 mmap 파일로 예산을 공유하는 저장소
+
+    레코드당 (tokens, updated) 두 개의 double 을 저장하며,
+    파일 잠금(fcntl/msvcrt)으로 프로세스 간 원자성을 보장한다.
+    """
+    _RECORD = struct.Struct('dd')
+
+    def __init__(self, path, keys):
+        self.path = path
+        self.keys = list(keys) + [_BLOCKED_KEY]
+        self.size = self._RECORD.size * len(self.keys)
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        self._file = open(path, 'a+b')
+        if os.path.getsize(path) < self.size:
+            self._file.truncate(self.size)
+        self._mmap = mmap.mmap(self._file.fileno(), self.size)
+        self._lock = threading.Lock()
+
+    def _lock_file(self):
+        if fcntl is not None:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+        else:
+            self._file.seek(0)
+            msvcrt.locking(self._file.fileno(), msvcrt.LK_LOCK, self.size)
+
+    def _unlock_file(self):
+        if fcntl is not None:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+        else:
+            self._file.seek(0)
+            msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, self.size)
+
+    @contextmanager
+    def transaction(self):
+        """공유 파일을 잠그고 버킷 상태를 조회/수정"""
+        with self._lock:
+            self._lock_file()
+            try:
+                state = {}
+                for index, key in enumerate(self.keys):
+                    state[key] = list(self._RECORD.unpack_from(self._mmap, index * self._RECORD.size))
+                yield state
+                for index, key in enumerate(self.keys):
+                    self._RECORD.pack_into(self._mmap, index * self._RECORD.size, *state[key])
+            finally:
+                self._unlock_file()
+
+    def close(self):
+        """파일 매핑 해제"""
+        self._mmap.close()
+        self._file.close()
+
+class RateLimiter:
+    """Binance 요청 가중치/주문 수 기반 토큰 버킷 Rate Limiter
+
+    - 엔드포인트별 가중치 테이블로 요청 비용 계산
+    - X-MBX-USED-WEIGHT-* / X-MBX-ORDER-COUNT-* 응답 헤더로 잔여 예산 보정
+    - 429/418 응답 시 Retry-After 동안 전체 요청 차단
+    - 동기(acquire) / 비동기(acquire_async) 대기 지원
+    """
+    def __init__(self, limits=None, weights=None, safety_margin=0.95, shared_path=None):
+        """Rate Limiter 초기화
+
+        limits: 버킷 설정 (기본값: DEFAULT_LIMITS)
+        weights: 엔드포인트 가중치 테이블 (기본값: ENDPOINT_WEIGHTS)
+        safety_margin: 실제 한도 대비 사용할 비율
+        shared_path: 지정 시 해당 파일로 여러 프로세스가 예산 공유
+        """
+        self.limits = {}
+        for key, spec in (limits or DEFAULT_LIMITS).items():
+            capacity = spec['limit'] * safety_margin
+            self.limits[key] = {
+                'limit': spec['limit'],
+                'interval': spec['interval'],
+                'header': spec.get('header', '').lower(),
+                'capacity': capacity,
+                'rate': capacity / spec['interval']
+            }
+        self.weights = ENDPOINT_WEIGHTS if weights is None else weights
+        self.safety_margin = safety_margin
+        self._header_map = {spec['header']: key for key, spec in self.limits.items() if spec['header']}
+
+        if shared_path:
+            self.backend = SharedFileBackend(shared_path, self.limits.keys())
+        else:
+            self.backend = LocalBackend(self.limits.keys())
+
+        # 대기 통계
+        self.stats = {'acquired': 0, 'waits': 0, 'total_wait': 0.0, 'bans': 0}
+        self._stats_lock = threading.Lock()
+
+    def get_weight(self, method, endpoint, params=None):
+        """엔드포인트 요청 가중치 계산"""
+        weight = self.weights.get((method, endpoint), DEFAULT_WEIGHT)
+        if callable(weight):
+            weight = weight(params or {})
+        return weight
+
+    def get_costs(self, method, endpoint, params=None):
+        """요청 한 건이 각 버킷에서 소모하는 비용"""
+        weight = self.get_weight(method, endpoint, params)
+        orders = 1 if (method, endpoint) in ORDER_ENDPOINTS else 0
+        return self._default_costs(weight, orders)
+
+    def _refill(self, record, spec, now):
+        """버킷 토큰 보충 (updated 가 0 이면 최초 사용으로 간주)"""
+        if record[1] <= 0:
+            record[0] = spec['capacity']
+        else:
+            elapsed = max(0.0, now - record[1])
+            record[0] = min(spec['capacity'], record[0] + elapsed * spec['rate'])
+        record[1] = now
+
+    def _try_acquire(self, costs):
+        """토큰 획득 시도, 대기해야 할 시간(초) 반환 (0 이면 획득 성공)"""
+        now = time.time()
+        with self.backend.transaction() as state:
+            blocked_until = state[_BLOCKED_KEY][0]
+            if blocked_until > now:
+                return blocked_until - now
+
+            wait = 0.0
+            for key, cost in costs.items():
+                spec = self.limits[key]
+                record = state[key]
+                self._refill(record, spec, now)
+                cost = min(cost, spec['capacity'])
+                if record[0] < cost:
+                    wait = max(wait, (cost - record[0]) / spec['rate'])
+
+            if wait > 0:
+                return wait
+
+            for key, cost in costs.items():
+                state[key][0] -= min(cost, self.limits[key]['capacity'])
+            return 0.0
+
+    def _record_wait(self, waited):
+        """대기 통계 기록"""
+        with self._stats_lock:
+            self.stats['acquired'] += 1
+            if waited > 0:
+                self.stats['waits'] += 1
+                self.stats['total_wait'] += waited
+
+    def acquire(self, weight=1, orders=0, costs=None, timeout=None):
+        """토큰 획득 (호출 스레드만 대기), 시간 초과 시 False 반환"""
+        costs = costs or self._default_costs(weight, orders)
+        start_time = time.time()
+        waited = 0.0
+        while True:
+            wait = self._try_acquire(costs)
+            if wait <= 0:
+                self._record_wait(waited)
+                return True
+            if timeout is not None and time.time() - start_time + wait > timeout:
+                return False
+            if wait >= 1.0:
+                error_handler.log_info(f"Rate Limit 도달, {wait:.2f}초 대기")
+            time.sleep(wait)
+            waited += wait
+
+    async def acquire_async(self, weight=1, orders=0, costs=None, timeout=None):
+        """토큰 획득 (이벤트 루프를 막지 않고 대기), 시간 초과 시 False 반환"""
+        costs = costs or self._default_costs(weight, orders)
+        start_time = time.time()
+        waited = 0.0
+        while True:
+            wait = self._try_acquire(costs)
+            if wait <= 0:
+                self._record_wait(waited)
+                return True
+            if timeout is not None and time.time() - start_time + wait > timeout:
+                return False
+            if wait >= 1.0:
+                error_handler.log_info(f"Rate Limit 도달, {wait:.2f}초 대기")
+            await asyncio.sleep(wait)
+            waited += wait
+
+    def acquire_request(self, method, endpoint, params=None, timeout=None):
+        """요청 정보로 비용을 계산하여 토큰 획득"""
+        return self.acquire(costs=self.get_costs(method, endpoint, params), timeout=timeout)
+
+    async def acquire_request_async(self, method, endpoint, params=None, timeout=None):
+        """요청 정보로 비용을 계산하여 토큰 획득 (비동기)"""
+        return await self.acquire_async(costs=self.get_costs(method, endpoint, params), timeout=timeout)
+
+    def _default_costs(self, weight, orders):
+        """가중치/주문 수를 버킷별 비용으로 변환"""
+        costs = {}
+        for key in self.limits:
+            if key.startswith('weight'):
+                costs[key] = weight
+            elif key.startswith('orders') and orders:
+                costs[key] = orders
+        return costs
+
+    def update_from_headers(self, headers, status_code=None):
+        """응답 헤더의 서버 측 사용량으로 잔여 예산 보정"""
+        now = time.time()
+        used = {}
+        for name, value in headers.items():
+            key = self._header_map.get(name.lower())
+            if key is not None:
+                try:
+                    used[key] = float(value)
+                except ValueError:
+                    continue
+
+        ban_seconds = None
+        if status_code in (418, 429):
+            retry_after = headers.get('Retry-After')
+            ban_seconds = float(retry_after) if retry_after else 60.0
+
+        if not used and ban_seconds is None:
+            return
+
+        with self.backend.transaction() as state:
+            for key, value in used.items():
+                spec = self.limits[key]
+                record = state[key]
+                self._refill(record, spec, now)
+                # 서버 기준 잔여량으로 토큰 수를 맞춤
+                record[0] = max(0.0, min(spec['capacity'], spec['capacity'] - value))
+            if ban_seconds is not None:
+                state[_BLOCKED_KEY][0] = max(state[_BLOCKED_KEY][0], now + ban_seconds)
+
+        if ban_seconds is not None:
+            with self._stats_lock:
+                self.stats['bans'] += 1
+            error_handler.log_error(f"HTTP {status_code}", f"Rate Limit 초과, {ban_seconds:.0f}초간 요청 차단")
+
+    def get_status(self):
+        """버킷별 잔여 예산 및 대기 통계 조회"""
+        now = time.time()
+        status = {}
+        with self.backend.transaction() as state:
+            for key, spec in self.limits.items():
+                record = state[key]
+                self._refill(record, spec, now)
+                status[key] = {
+                    'available': record[0],
+                    'capacity': spec['capacity'],
+                    'limit': spec['limit']
+                }
+            blocked_until = state[_BLOCKED_KEY][0]
+
+        with self._stats_lock:
+            status['stats'] = dict(self.stats)
+        status['blocked_for'] = max(0.0, blocked_until - now)
+        return status
@@ -0,0 +1,92 @@
+import os
+import time
+import hmac
+import hashlib
+
+class RequestSigner:
+    """Binance 서명 요청 생성기
+
+    - 비밀키가 적용된 HMAC 상태를 미리 만들어 두고 요청마다 복사하여 사용
+    - API 키 헤더를 한 번만 생성하여 재사용
+    - 서버 시간 오프셋을 반영한 타임스탬프 생성 (주기적으로 재동기화)
+    """
+    def __init__(self, api_key, secret_key, recv_window=5000, time_sync_interval=300):
+        """서명기 초기화
+
+        recv_window: 요청 유효 시간 (밀리초)
+        time_sync_interval: 서버 시간 재동기화 주기 (초)
+        """
+        self._secret = (secret_key or '').encode('utf-8')
+        self._hmac = hmac.new(self._secret, digestmod=hashlib.sha256)
+        self.headers = {'X-MBX-APIKEY': api_key or ''}
+        self.recv_window = recv_window
+        self.time_sync_interval = time_sync_interval
+        self.time_offset = 0    # 서버 시간 - 로컬 시간 (밀리초)
+        self.last_sync = 0.0    # 마지막 동기화 시각 (로컬, 초)
+
+    def timestamp(self):
+        """서버 기준 현재 타임스탬프 (밀리초)"""
+        return int(time.time() * 1000) + self.time_offset
+
+    def needs_time_sync(self):
+        """서버 시간 재동기화 필요 여부"""
+        return time.time() - self.last_sync >= self.time_sync_interval
+
+    def update_time_offset(self, server_time, request_start, request_end):
+        """서버 시간 응답으로 오프셋 갱신 (요청 왕복의 중간 시점 기준)"""
+        local_time = (request_start + request_end) / 2 * 1000
+        self.time_offset = int(server_time - local_time)
+        self.last_sync = request_end
+        return self.time_offset
+
+    def signature(self, query_string):
+        """쿼리 스트링 HMAC-SHA256 서명"""
+        mac = self._hmac.copy()
+        mac.update(query_string.encode('utf-8'))
+        return mac.hexdigest()
+
+    def sign(self, params):
+        """타임스탬프/recvWindow 를 추가하고 서명된 쿼리 스트링 반환"""
+        params = dict(params)
+        params['timestamp'] = self.timestamp()
+        params['recvWindow'] = self.recv_window
+
+        # 파라미터를 정렬된 쿼리 스트링으로 변환
+        query_string = '&'.join([f"{k}={v}" for k, v in sorted(params.items())])
+        return f"{query_string}&signature={self.signature(query_string)}", params
+
+    def benchmark(self, iterations=10000):
+        """요청당 서명 비용 측정 (기존 방식 대비, 마이크로초 단위)"""
+        params = {
+            'symbol': 'BTCUSDT',
+            'side': 'BUY',
+            'type': 'LIMIT',
+            'quantity': '0.00100',
+            'price': '50000.00',
+            'timeInForce': 'GTC'
+        }
+
+        # 기존 방식: 요청마다 HMAC 생성, 환경변수 조회, 헤더 생성
+        start_time = time.perf_counter()
+        for _ in range(iterations):
+            request_params = dict(params)
+            request_params['timestamp'] = int(time.time() * 1000)
+            request_params['recvWindow'] = self.recv_window
+            query_string = '&'.join([f"{k}={v}" for k, v in sorted(request_params.items())])
+            hmac.new(self._secret, query_string.encode('utf-8'), hashlib.sha256).hexdigest()
+            {'X-MBX-APIKEY': os.getenv('BINANCE_API_KEY')}
+        naive = (time.perf_counter() - start_time) / iterations * 1e6
+
+        # 현재 방식: 미리 키가 적용된 HMAC 상태 복사, 캐시된 헤더
+        start_time = time.perf_counter()
+        for _ in range(iterations):
+            self.sign(params)
+            self.headers
+        precomputed = (time.perf_counter() - start_time) / iterations * 1e6
+
+        return {
+            'iterations': iterations,
+            'naive_us': naive,
+            'precomputed_us': precomputed,
+            'speedup': naive / precomputed if precomputed > 0 else 0.0
+        }
@@ -0,0 +1,382 @@
+import numpy as np
+from utils import error_handler
+from data.historical_data import INTERVAL_MS
+
+DAY_MS = 24 * 60 * 60 * 1000
+
+# 심볼에서 기준/견적 자산을 나눌 때 확인하는 견적 자산 (긴 이름 우선)
+QUOTE_ASSETS = ('USDT', 'BUSD', 'USDC', 'FDUSD', 'KRW', 'BTC', 'ETH', 'BNB')
+
+class VirtualClock:
+    """시뮬레이션 가상 시계 (밀리초, 명시적으로 진행할 때만 바뀜)"""
+    def __init__(self, start=0):
+        self.now = int(start)
+
+    def time(self):
+        """현재 시각 (밀리초)"""
+        return self.now
+
+    def advance_to(self, timestamp):
+        """지정 시각으로 진행 (되돌리지 않음)"""
+        self.now = max(self.now, int(timestamp))
+        return self.now
+
+class SimulatedExchange:
+    """가상 시계 위에서 과거/합성 캔들로 동작하는 모의 거래소
+
+    - TradingStrategy 가 사용하는 BinanceAPI 메서드(현재가, 24시간 요약, 호가, 주문 생성/취소/조회, 잔고)를
+      같은 응답 형식으로 제공하므로 binance_api 자리에 넣어 실시간과 같은 코드 경로로 실행
+    - 시계는 step() 호출 시 다음 캔들 종료 시각으로 진행 (대기 없이 CPU 속도로 시뮬레이션)
+    - 현재가는 마지막으로 종료된 캔들의 종가, 호가는 캔들 거래량의 매수 체결 비중으로 합성
+    - 주문은 latency_ms 뒤에 접수: 즉시 체결 가능한 주문은 접수 시점 가격으로 테이커 체결,
+      나머지 지정가 주문은 이후 캔들의 고가/저가가 지정가에 닿으면 지정가로 메이커 체결
+    """
+    def __init__(self, arrays, symbol='BTCUSDT', interval='1h', balances=None, maker_fee=0.001,
+                 taker_fee=0.001, latency_ms=50, depth_levels=20, depth_step=0.0005, fill_test_orders=True):
+        """모의 거래소 초기화
+
+        arrays: klines_to_arrays / KlineStore.load 형식의 열 배열 (taker_buy_volume 이 있으면 호가 비중에 사용)
+        balances: 초기 잔고 {자산: 수량} (기본값 견적 자산 10000, 기준 자산 1)
+        maker_fee, taker_fee: 체결 금액 대비 수수료율
+        latency_ms: 주문 접수 지연 (밀리초)
+        depth_levels, depth_step: 합성 호가 단계 수와 단계 간격 (가격 대비 비율)
+        fill_test_orders: test=True 주문도 체결 (전략의 청산 주문은 test=True 로 호출됨)
+        """
+        if len(arrays['close']) == 0:
+            raise ValueError("시뮬레이션 데이터가 없습니다.")
+        self.symbol = symbol.upper()
+        self.interval_ms = INTERVAL_MS[interval]
+        self.base_asset, self.quote_asset = self._split_symbol(self.symbol)
+
+        self.open_time = np.asarray(arrays['open_time'], dtype=np.int64)
+        self.close_time = np.asarray(arrays['close_time'], dtype=np.int64) if 'close_time' in arrays \
+            else self.open_time + self.interval_ms - 1
+        self.open = np.asarray(arrays['open'], dtype=np.float64)
+        self.high = np.asarray(arrays['high'], dtype=np.float64)
+        self.low = np.asarray(arrays['low'], dtype=np.float64)
+        self.close = np.asarray(arrays['close'], dtype=np.float64)
+        self.volume = np.asarray(arrays['volume'], dtype=np.float64)
+        taker_buy = arrays.get('taker_buy_volume')
+        self.taker_buy_volume = np.asarray(taker_buy, dtype=np.float64) if taker_buy is not None \
+            else self.volume / 2
+        # 24시간 거래량/거래대금 누적합 (구간 합을 O(1)로 계산)
+        self._volume_sum = np.concatenate([[0.0], np.cumsum(self.volume)])
+        self._quote_sum = np.concatenate([[0.0], np.cumsum(self.volume * self.close)])
+
+        self.maker_fee = maker_fee
+        self.taker_fee = taker_fee
+        self.latency_ms = latency_ms
+        self.depth_levels = depth_levels
+        self.depth_step = depth_step
+        self.fill_test_orders = fill_test_orders
+
+        self.index = 0
+        self.clock = VirtualClock(self.close_time[0])
+        if balances is None:
+            balances = {self.quote_asset: 10000.0, self.base_asset: 1.0}
+        self.balances = {asset: {'free': float(amount), 'locked': 0.0} for asset, amount in balances.items()}
+        self.initial_balances = dict(balances)
+        self.orders = {}          # orderId -> 주문
+        self.open_orders = []     # 미체결 주문 ID (접수 순서)
+        self.trades = []
+        self._next_order_id = 1
+        self.stats = {'steps': 0, 'orders': 0, 'fills': 0, 'canceled': 0, 'fees': {}}
+
+    @classmethod
+    def synthetic(cls, count=720, interval='1h', start_price=30000.0, volatility=0.008, seed=None,
+                  start_time=1700000000000, **kwargs):
+        """시드 고정 랜덤 워크 캔들로 생성 (매수 체결 비중은 캔들마다 40~60%)"""
+        rng = np.random.default_rng(seed)
+        interval_ms = INTERVAL_MS[interval]
+        close = start_price * np.exp(np.cumsum(rng.normal(0, volatility, count)))
+        open_ = np.concatenate([[start_price], close[:-1]])
+        spread = np.abs(rng.normal(0, volatility / 2, count))
+        volume = rng.uniform(50, 150, count)
+        arrays = {
+            'open_time': start_time + np.arange(count, dtype=np.int64) * interval_ms,
+            'open': open_,
+            'high': np.maximum(open_, close) * (1 + spread),
+            'low': np.minimum(open_, close) * (1 - spread),
+            'close': close,
+            'volume': volume,
+            'taker_buy_volume': volume * rng.uniform(0.4, 0.6, count)
+        }
+        return cls(arrays, interval=interval, **kwargs)
+
+    @staticmethod
+    def _split_symbol(symbol):
+        for quote in QUOTE_ASSETS:
+            if symbol.endswith(quote) and len(symbol) > len(quote):
+                return symbol[:-len(quote)], quote
+        raise ValueError(f"견적 자산을 알 수 없는 심볼입니다: {symbol}")
+
+    def _check_symbol(self, symbol):
+        if symbol.upper() != self.symbol:
+            raise ValueError(f"시뮬레이션하지 않는 심볼입니다: {symbol}")
+
+    # 가상 시계 진행
+
+    def remaining(self):
+        """남은 캔들 수 (현재 캔들 제외)"""
+        return len(self.close) - 1 - self.index
+
+    def step(self):
+        """다음 캔들로 시계를 진행하고 미체결 지정가 주문 체결 (마지막 캔들이면 False)"""
+        if self.index + 1 >= len(self.close):
+            return False
+        self.index += 1
+        self.clock.advance_to(self.close_time[self.index])
+        self.stats['steps'] += 1
+        if self.open_orders:
+            self._match_resting(self.index)
+        return True
+
+    def _index_at(self, timestamp):
+        """시각 기준 마지막으로 종료된 캔들 위치"""
+        index = int(np.searchsorted(self.close_time, timestamp, side='right')) - 1
+        return min(max(index, 0), len(self.close) - 1)
+
+    # 시세 조회 (BinanceAPI 와 같은 형식)
+
+    def get_server_time(self):
+        return {'serverTime': self.clock.time()}
+
+    def get_ticker_price(self, symbol="BTCUSDT"):
+        """현재가 (마지막으로 종료된 캔들의 종가)"""
+        self._check_symbol(symbol)
+        return float(self.close[self.index])
+
+    def get_market_summary(self, symbol="BTCUSDT"):
+        """최근 24시간 캔들로 계산한 시장 요약"""
+        self._check_symbol(symbol)
+        end = self.index + 1
+        start = int(np.searchsorted(self.open_time, self.close_time[self.index] + 1 - DAY_MS, side='left'))
+        first_open = float(self.open[start])
+        last = float(self.close[self.index])
+        volume = float(self._volume_sum[end] - self._volume_sum[start])
+        quote_volume = float(self._quote_sum[end] - self._quote_sum[start])
+        return {
+            'symbol': self.symbol,
+            'price_change': last - first_open,
+            'price_change_percent': (last - first_open) / first_open * 100,
+            'weighted_avg_price': quote_volume / volume if volume > 0 else last,
+            'high_price': float(self.high[start:end].max()),
+            'low_price': float(self.low[start:end].min()),
+            'volume': volume,
+            'quote_volume': quote_volume
+        }
+
+    def get_market_depth(self, symbol="BTCUSDT", limit=100):
+        """합성 호가창 (매수/매도 총량은 현재 캔들의 매수/매도 체결량, 단계별 균등 분배)"""
+        self._check_symbol(symbol)
+        price = float(self.close[self.index])
+        levels = min(limit, self.depth_levels)
+        buy_volume = float(self.taker_buy_volume[self.index])
+        sell_volume = float(self.volume[self.index]) - buy_volume
+        bids = [[f"{price * (1 - self.depth_step * (level + 1)):.2f}", f"{buy_volume / levels:.8f}"]
+                for level in range(levels)]
+        asks = [[f"{price * (1 + self.depth_step * (level + 1)):.2f}", f"{sell_volume / levels:.8f}"]
+                for level in range(levels)]
+        return {'lastUpdateId': self.index, 'bids': bids, 'asks': asks}
+
+    # 주문
+
+    def create_order(self, symbol="BTCUSDT", order_type="LIMIT", side="BUY", quantity=0.001, price=None, test=True):
+        """주문 생성 (접수 지연 후 즉시 체결 가능하면 테이커 체결, 아니면 지정가 대기)"""
+        try:
+            self._check_symbol(symbol)
+            if order_type not in ("MARKET", "LIMIT"):
+                raise ValueError(f"유효하지 않은 주문 타입입니다: {order_type}")
+            if side not in ("BUY", "SELL"):
+                raise ValueError(f"유효하지 않은 거래 구분입니다: {side}")
+            if not isinstance(quantity, (int, float)) or quantity <= 0:
+                raise ValueError("수량은 양수여야 합니다.")
+            if order_type == "LIMIT" and (not price or price <= 0):
+                raise ValueError("LIMIT 주문의 경우 유효한 가격이 필요합니다.")
+            if test and not self.fill_test_orders:
+                return {}
+
+            accept_time = self.clock.time() + self.latency_ms
+            market_price = float(self.close[self._index_at(accept_time)])
+            limit_price = float(price) if order_type == "LIMIT" else None
+            marketable = limit_price is None or \
+                (limit_price >= market_price if side == "BUY" else limit_price <= market_price)
+
+            # 잔고 확인 및 잠금 (지정가 대기 주문은 지정가 기준)
+            lock_price = market_price if marketable else limit_price
+            lock_asset, lock_amount = (self.quote_asset, lock_price * quantity) if side == "BUY" \
+                else (self.base_asset, float(quantity))
+            balance = self.balances.setdefault(lock_asset, {'free': 0.0, 'locked': 0.0})
+            if balance['free'] < lock_amount:
+                raise ValueError(f"잔고가 부족합니다: {lock_asset} {balance['free']} < {lock_amount}")
+            balance['free'] -= lock_amount
+            balance['locked'] += lock_amount
+
+            order = {
+                'symbol': self.symbol,
+                'orderId': self._next_order_id,
+                'transactTime': accept_time,
+                'price': f"{limit_price or 0.0:.8f}",
+                'origQty': f"{quantity:.8f}",
+                'executedQty': "0.00000000",
+                'cummulativeQuoteQty': "0.00000000",
+                'status': 'NEW',
+                'type': order_type,
+                'side': side,
+                'fills': [],
+                '_lock': (lock_asset, lock_amount)
+            }
+            self._next_order_id += 1
+            self.orders[order['orderId']] = order
+            self.stats['orders'] += 1
+
+            if marketable:
+                self._fill(order, market_price, accept_time, maker=False)
+            else:
+                self.open_orders.append(order['orderId'])
+            return self._public(order)
+
+        except Exception as e:
+            error_handler.log_error(e, "모의 주문 생성 실패")
+            raise
+
+    def _fill(self, order, price, fill_time, maker):
+        """주문 전량 체결 (잠금 해제, 잔고 이동, 수수료 차감)"""
+        quantity = float(order['origQty'])
+        quote = price * quantity
+        fee_rate = self.maker_fee if maker else self.taker_fee
+        lock_asset, lock_amount = order.pop('_lock')
+        self.balances[lock_asset]['locked'] -= lock_amount
+
+        if order['side'] == "BUY":
+            # 잠금액과 실제 체결 금액 차이는 반환, 수수료는 받은 기준 자산에서 차감
+            self.balances[self.quote_asset]['free'] += lock_amount - quote
+            commission, commission_asset = quantity * fee_rate, self.base_asset
+            received_asset, received = self.base_asset, quantity - commission
+        else:
+            commission, commission_asset = quote * fee_rate, self.quote_asset
+            received_asset, received = self.quote_asset, quote - commission
+        self.balances.setdefault(received_asset, {'free': 0.0, 'locked': 0.0})['free'] += received
+
+        fees = self.stats['fees']
+        fees[commission_asset] = fees.get(commission_asset, 0.0) + commission
+        self.stats['fills'] += 1
+
+        fill = {'price': f"{price:.8f}", 'qty': f"{quantity:.8f}", 'commission': f"{commission:.8f}",
+                'commissionAsset': commission_asset}
+        order.update(status='FILLED', executedQty=f"{quantity:.8f}", cummulativeQuoteQty=f"{quote:.8f}",
+                     updateTime=fill_time)
+        order['fills'].append(fill)
+        self.trades.append({
+            'symbol': self.symbol, 'orderId': order['orderId'], 'price': fill['price'], 'qty': fill['qty'],
+            'quoteQty': f"{quote:.8f}", 'commission': fill['commission'], 'commissionAsset': commission_asset,
+            'time': fill_time, 'isBuyer': order['side'] == "BUY", 'isMaker': maker
+        })
+
+    def _match_resting(self, index):
+        """캔들 고가/저가가 지정가에 닿은 대기 주문을 지정가로 체결"""
+        candle_close = int(self.close_time[index])
+        low, high = float(self.low[index]), float(self.high[index])
+        remaining = []
+        for order_id in self.open_orders:
+            order = self.orders[order_id]
+            price = float(order['price'])
+            touched = low <= price if order['side'] == "BUY" else high >= price
+            if order['transactTime'] <= candle_close and touched:
+                self._fill(order, price, candle_close, maker=True)
+            else:
+                remaining.append(order_id)
+        self.open_orders = remaining
+
+    def cancel_order(self, symbol="BTCUSDT", order_id=None, test=True):
+        """미체결 주문 취소"""
+        try:
+            self._check_symbol(symbol)
+            order = self.orders.get(order_id)
+            if order is None:
+                raise ValueError(f"주문을 찾을 수 없습니다: {order_id}")
+            if order['status'] != 'NEW':
+                raise ValueError(f"취소할 수 없는 주문 상태입니다: {order['status']}")
+            lock_asset, lock_amount = order.pop('_lock')
+            self.balances[lock_asset]['locked'] -= lock_amount
+            self.balances[lock_asset]['free'] += lock_amount
+            order['status'] = 'CANCELED'
+            self.open_orders.remove(order_id)
+            self.stats['canceled'] += 1
+            return self._public(order)
+
+        except Exception as e:
+            error_handler.log_error(e, "모의 주문 취소 실패")
+            raise
+
+    def get_order(self, symbol="BTCUSDT", order_id=None, test=True):
+        """주문 조회"""
+        self._check_symbol(symbol)
+        if order_id not in self.orders:
+            raise ValueError(f"주문을 찾을 수 없습니다: {order_id}")
+        return self._public(self.orders[order_id])
+
+    def get_open_orders(self, symbol="BTCUSDT"):
+        """미체결 주문 목록"""
+        self._check_symbol(symbol)
+        return [self._public(self.orders[order_id]) for order_id in self.open_orders]
+
+    @staticmethod
+    def _public(order):
+        return {key: value for key, value in order.items() if not key.startswith('_')}
+
+    # 계정
+
+    def get_account_info(self):
+        """계정 정보 (잔고 포함)"""
+        return {
+            'makerCommission': int(self.maker_fee * 10000),
+            'takerCommission': int(self.taker_fee * 10000),
+            'updateTime': self.clock.time(),
+            'balances': [
+                {'asset': asset, 'free': f"{balance['free']:.8f}", 'locked': f"{balance['locked']:.8f}"}
+                for asset, balance in self.balances.items()
+            ]
+        }
+
+    def get_asset_balance(self, asset="BTC"):
+        """특정 자산의 잔고"""
+        balance = self.balances.get(asset)
+        if balance is None:
+            raise ValueError(f"{asset} 자산을 찾을 수 없습니다.")
+        return {'asset': asset, 'free': balance['free'], 'locked': balance['locked'],
+                'total': balance['free'] + balance['locked']}
+
+    def get_my_trades(self, symbol="BTCUSDT", limit=500):
+        """체결 내역 (최근 limit 건)"""
+        self._check_symbol(symbol)
+        return self.trades[-limit:]
+
+    def get_summary(self):
+        """시뮬레이션 결과 요약 (견적 자산 기준 평가액은 현재가로 계산)"""
+        price = float(self.close[self.index])
+        def equity(balances):
+            total = 0.0
+            for asset, amount in balances.items():
+                if asset == self.quote_asset:
+                    total += amount
+                elif asset == self.base_asset:
+                    total += amount * price
+            return total
+        current = {asset: balance['free'] + balance['locked'] for asset, balance in self.balances.items()}
+        initial_equity = equity(self.initial_balances)
+        final_equity = equity(current)
+        return {
+            'start_time': int(self.close_time[0]),
+            'end_time': self.clock.time(),
+            'steps': self.stats['steps'],
+            'orders': self.stats['orders'],
+            'fills': self.stats['fills'],
+            'canceled': self.stats['canceled'],
+            'open_orders': len(self.open_orders),
+            'fees': dict(self.stats['fees']),
+            'balances': current,
+            'initial_equity': initial_equity,
+            'final_equity': final_equity,
+            'return_pct': (final_equity - initial_equity) / initial_equity * 100 if initial_equity else 0.0
+        }
@@ -1,14 +1,25 @@
 import sys
 import time
+import asyncio
 from utils.api_connector import BinanceAPI
+from utils.async_api_connector import AsyncBinanceAPI
 from utils.trading_strategy import TradingStrategy
+from utils.event_trigger import DecisionTrigger
 from utils.error_handler import log_info, log_error
+from data.websocket_client import StreamManager, stream_name
+from data.order_book import OrderBookManager
+from data.market_data import CandleAggregator, Rolling24hStats
 
 class TradingBot:
-    def __init__(self, test_mode=True):
+    def __init__(self, test_mode=True, event_driven=False):
         self.test_mode = test_mode
+        self.event_driven = event_driven  # 스트림 이벤트 기반 실행 (False 면 1초 주기 폴링)
         self.api = None
         self.strategy = None
+        self.trigger = None
+        self.aggregator = None
+        self.market_stats = None
+        self.order_book = None
         
     def initialize(self):
         """시스템 초기화"""
@@ -33,6 +44,19 @@ class TradingBot:
             
     def run(self):
         """트레이딩 봇 실행"""
+        if self.event_driven:
+            try:
+                asyncio.run(self.run_event_driven())
+            except KeyboardInterrupt:
+                log_info("프로그램 종료 요청")
+            except Exception as e:
+                log_error(e, "실행 중 치명적 에러")
+                return False
+            finally:
+                if self.trigger is not None:
+                    log_info(f"이벤트 기반 실행 통계: {self.trigger.get_stats()}")
+            return True
+        
         try:
             log_info(f"트레이딩 봇 시작 ({'테스트 모드' if self.test_mode else '실제 거래'})")
             
@@ -62,9 +86,67 @@ class TradingBot:
             
         return True
 
+    def evaluate(self):
+        """전략 평가 1회 (이벤트 기반 실행에서 이벤트마다 호출)"""
+        market_data = self.strategy.analyze_market()
+        log_info(f"시장 분석 결과: {market_data}")
+        
+        if not self.test_mode:
+            # 실제 거래 모드에서만 포지션 업데이트
+            self.strategy.update_position()
+        return market_data
+
+    async def evaluate_on_snapshot(self):
+        """호가창 복사본으로 전략 평가 (호가창은 이벤트 루프에서 갱신되므로 평가 스레드로 넘기기 전에 복사)"""
+        if self.order_book is not None:
+            self.strategy.order_book = self.order_book.copy(100)
+        return await asyncio.to_thread(self.evaluate)
+
+    async def handle_stream_event(self, stream, data):
+        """스트림 이벤트로 전략 평가 예약 (체결, 호가 변경, 캔들 확정)"""
+        event_type = data.get('e')
+        if event_type == 'trade':
+            self.trigger.notify('trade', data.get('E'))
+        elif event_type == 'depthUpdate':
+            self.trigger.notify('book', data.get('E'))
+        elif event_type == 'kline' and data['k'].get('x'):
+            self.trigger.notify('candle', data.get('E'))
+
+    async def run_event_driven(self, stream_url="wss://stream.binance.com:9443"):
+        """이벤트 기반 실행 (스트림 이벤트마다 전략 평가, 평가 중 도착한 이벤트는 병합)"""
+        log_info(f"트레이딩 봇 시작 - 이벤트 기반 ({'테스트 모드' if self.test_mode else '실제 거래'})")
+        symbol = self.strategy.symbol
+        self.trigger = DecisionTrigger()
+        
+        # 동기 클라이언트와 같은 IP 가중치 예산/차단 상태 공유
+        async with AsyncBinanceAPI(rate_limiter=self.api.rate_limiter) as async_api, \
+                StreamManager(base_url=stream_url) as streams:
+            # 호가는 로컬 호가창, 캔들과 현재가는 스트림 집계기에서 제공
+            books = OrderBookManager(streams, async_api, [symbol])
+            await books.start()
+            self.order_book = books.get_book(symbol)
+            
+            self.aggregator = CandleAggregator([symbol], api=self.api)
+            await asyncio.to_thread(self.aggregator.backfill)
+            await self.aggregator.start(streams)
+            self.strategy.price_source = self.aggregator   # 현재가는 REST 대신 마지막 체결가 사용
+            
+            # 24시간 요약은 1분 캔들로 로컬 유지 (주기적으로 REST 와 대조)
+            self.market_stats = Rolling24hStats([symbol], api=self.api)
+            await asyncio.to_thread(self.market_stats.backfill)
+            await self.market_stats.start(streams)
+            self.strategy.market_stats = self.market_stats
+            
+            await streams.subscribe(
+                [stream_name(symbol, 'trade'), stream_name(symbol, 'depth'), stream_name(symbol, 'kline')],
+                self.handle_stream_event,
+                policy='conflate'   # 평가 예약에는 스트림별 최신 이벤트만 필요
+            )
+            await self.trigger.run(self.evaluate_on_snapshot)
+
 def main():
-    # 트레이딩 봇 인스턴스 생성 (테스트 모드)
-    bot = TradingBot(test_mode=True)
+    # 트레이딩 봇 인스턴스 생성 (테스트 모드, --event 지정 시 이벤트 기반 실행)
+    bot = TradingBot(test_mode=True, event_driven='--event' in sys.argv)
     
     # 초기화
     if not bot.initialize():
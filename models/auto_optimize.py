@@ -0,0 +1,200 @@
+import math
+import time
+import random
+from utils import error_handler
+from utils.backtest_engine import ParallelEvaluator, timing_summary
+
+# 탐색 공간 기본값 (목록: 후보 값 중 선택, 튜플: (최소, 최대) 구간의 균등 분포)
+DEFAULT_SEARCH_SPACE = {
+    'min_price_change': (0.1, 2.0),
+    'position_size': [0.001, 0.002, 0.003],
+    'stop_loss': (0.2, 5.0),
+    'take_profit': (0.2, 10.0)
+}
+
+def sample_candidates(space, count, seed=None):
+    """탐색 공간에서 파라미터 조합을 무작위로 추출"""
+    rng = random.Random(seed)
+    candidates = []
+    for _ in range(count):
+        params = {}
+        for name, values in space.items():
+            if isinstance(values, tuple):
+                params[name] = round(rng.uniform(*values), 4)
+            else:
+                params[name] = rng.choice(values)
+        candidates.append(params)
+    return candidates
+
+class AutoOptimizer:
+    """조기 탈락(successive halving / Hyperband)과 walk-forward 검증을 지원하는 파라미터 탐색기
+
+    - 후보를 짧은 구간에서 먼저 평가하고 상위 1/eta 만 더 긴 구간으로 올려 평가
+      (구간은 평가 범위의 끝에 맞춰 eta 배씩 늘어나며 마지막 단계는 범위 전체)
+    - walk-forward: 학습 구간에서 고른 파라미터를 바로 다음 검증 구간에서 평가하며 구간을 이동
+    - 평가는 backtest_engine.ParallelEvaluator 로 공유 메모리 + 프로세스 풀에서 실행
+    """
+    def __init__(self, open_prices, close_prices, buy_sell_ratio=1.0, auto_trading=True,
+                 workers=None, metric='profit', cache=None):
+        """탐색기 초기화
+
+        metric: 순위 기준 결과 필드 (기본값 optimize_parameters 와 같은 profit)
+        cache: 평가 결과 캐시 (cache_manager.DiskLRUCache, 선택)
+        """
+        self.evaluator = ParallelEvaluator(open_prices, close_prices, buy_sell_ratio, auto_trading, workers, cache)
+        self.metric = metric
+        self.stats = {'evaluations': 0, 'candles_evaluated': 0}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        self.evaluator.close()
+
+    def _evaluate(self, candidates, start, end):
+        results = self.evaluator.evaluate(candidates, window=(start, end))
+        self.stats['evaluations'] += len(candidates)
+        self.stats['candles_evaluated'] += len(candidates) * (end - start)
+        return results
+
+    def successive_halving(self, candidates, start=0, end=None, eta=3, rungs=None, min_window=24):
+        """후보를 단계별로 평가하며 상위 1/eta 만 남김
+
+        start, end: 평가 범위 (캔들 위치, end 미포함)
+        rungs: 단계 수 (기본값 후보가 1개 남을 때까지)
+        min_window: 첫 단계 최소 구간 길이 (캔들 수)
+        반환: 최종 단계 결과 (순위 순), 후보별 마지막 평가 결과 (후보 순서, rung/window 필드 포함)
+        """
+        end = self.evaluator.length if end is None else end
+        length = end - start
+        if rungs is None:
+            rungs = max(0, math.ceil(math.log(max(len(candidates), 1), eta)))
+
+        survivors = list(range(len(candidates)))
+        latest = [None] * len(candidates)
+        ranked = []
+        for rung in range(rungs + 1):
+            window = length if rung == rungs else max(min(min_window, length), length // eta ** (rungs - rung))
+            results = self._evaluate([candidates[i] for i in survivors], end - window, end)
+            for index, result in zip(survivors, results):
+                result['rung'] = rung
+                result['window'] = window
+                latest[index] = result
+
+            # 점수 순 정렬 (동점이면 먼저 나온 후보)
+            order = sorted(range(len(survivors)), key=lambda k: (-results[k][self.metric], survivors[k]))
+            ranked = [results[k] for k in order]
+            if rung == rungs or len(survivors) == 1:
+                break
+            keep = max(1, len(survivors) // eta)
+            survivors = [survivors[k] for k in order[:keep]]
+            survivors.sort()
+        return ranked, latest
+
+    def hyperband(self, space, max_candidates=81, eta=3, seed=None, start=0, end=None):
+        """서로 다른 초기 후보 수/구간 길이의 successive halving 묶음(bracket)을 실행하고 최고 결과 선택
+
+        반환: 최고 결과, 평가된 모든 후보의 마지막 결과 목록
+        """
+        end = self.evaluator.length if end is None else end
+        s_max = max(0, int(math.floor(math.log(max_candidates, eta) + 1e-9)))
+        rng = random.Random(seed)
+        best = None
+        evaluated = []
+        for s in range(s_max, -1, -1):
+            count = int(math.ceil((s_max + 1) / (s + 1) * eta ** s))
+            candidates = sample_candidates(space, count, seed=rng.random())
+            ranked, latest = self.successive_halving(candidates, start, end, eta=eta, rungs=s)
+            evaluated.extend(latest)
+            # 범위 전체에서 평가된 결과끼리만 비교
+            if ranked[0]['window'] == end - start and (best is None or ranked[0][self.metric] > best[self.metric]):
+                best = ranked[0]
+        return best, evaluated
+
+    def walk_forward(self, candidates, train_size, test_size, step=None, eta=3):
+        """이동 학습/검증 구간별 successive halving 후 다음 구간에서 검증
+
+        반환: 구간별 결과 목록과 검증 구간 합계
+        """
+        step = test_size if step is None else step
+        folds = []
+        fold_start = 0
+        while fold_start + train_size + test_size <= self.evaluator.length:
+            train_end = fold_start + train_size
+            ranked, _ = self.successive_halving(candidates, fold_start, train_end, eta=eta)
+            chosen = {name: ranked[0][name] for name in candidates[0]}
+            test_result = self._evaluate([chosen], train_end, train_end + test_size)[0]
+            folds.append({
+                'train': (fold_start, train_end),
+                'test': (train_end, train_end + test_size),
+                'parameters': chosen,
+                'train_profit': ranked[0][self.metric],
+                'test_profit': test_result[self.metric],
+                'test_trades': test_result['trades']
+            })
+            fold_start += step
+
+        if not folds:
+            raise ValueError("walk-forward 구간을 만들 데이터가 부족합니다.")
+        return {
+            'folds': folds,
+            'test_profit': sum(fold['test_profit'] for fold in folds),
+            'train_profit': sum(fold['train_profit'] for fold in folds)
+        }
+
+def optimize(open_prices, close_prices, method="halving", space=None, candidates=243, eta=3,
+             buy_sell_ratio=1.0, auto_trading=True, workers=None, seed=None,
+             train_size=None, test_size=None, cache=None):
+    """자동 파라미터 탐색 (optimize_parameters 결과 형식)
+
+    method: "halving" (무작위 후보 successive halving), "hyperband", "walk_forward"
+    candidates: halving/walk_forward 후보 수, hyperband 의 최대 묶음 후보 수
+    cache: 평가 결과 캐시 (cache_manager.DiskLRUCache, 선택)
+    반환: best_parameters, all_results (후보별 마지막 평가), timing (+ walk_forward 는 folds)
+    """
+    try:
+        space = DEFAULT_SEARCH_SPACE if space is None else space
+        started = time.perf_counter()
+        with AutoOptimizer(open_prices, close_prices, buy_sell_ratio, auto_trading, workers,
+                           cache=cache) as optimizer:
+            output = {}
+            if method == "halving":
+                ranked, all_results = optimizer.successive_halving(sample_candidates(space, candidates, seed), eta=eta)
+                best = ranked[0]
+            elif method == "hyperband":
+                best, all_results = optimizer.hyperband(space, max_candidates=candidates, eta=eta, seed=seed)
+            elif method == "walk_forward":
+                length = optimizer.evaluator.length
+                test_size = test_size or max(1, length // 6)
+                train_size = train_size or 3 * test_size
+                pool = sample_candidates(space, candidates, seed)
+                walk = optimizer.walk_forward(pool, train_size, test_size, eta=eta)
+                # 최근 구간에서 선택된 파라미터를 검증 구간 결과와 함께 반환
+                last = walk['folds'][-1]
+                best = dict(last['parameters'], profit=last['test_profit'], trades=last['test_trades'])
+                all_results = [dict(fold['parameters'], profit=fold['test_profit'], trades=fold['test_trades'])
+                               for fold in walk['folds']]
+                output.update(folds=walk['folds'], test_profit=walk['test_profit'])
+            else:
+                raise ValueError(f"지원하지 않는 탐색 방식: {method}")
+
+            timing = timing_summary([r for r in all_results if 'elapsed' in r], started,
+                                    optimizer.evaluator.workers)
+            timing.update(optimizer.stats)
+            if cache is not None:
+                timing['cache'] = cache.get_stats()
+
+        best_parameters = {key: best[key] for key in list(space) + ['profit', 'trades']}
+        error_handler.log_info(
+            f"자동 최적화 완료 ({method}): 최적 파라미터 = {best_parameters}, "
+            f"평가 {timing['evaluations']}회, {timing['wall_clock']:.2f}초"
+        )
+        output.update(best_parameters=best_parameters, all_results=all_results, timing=timing)
+        return output
+
+    except Exception as e:
+        error_handler.log_error(e, "자동 최적화 실패")
+        raise
@@ -1,9 +1,16 @@
 import unittest
 import time
+import json
 import asyncio
+import threading
+from urllib.parse import urlsplit, parse_qs
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from utils.api_connector import BinanceAPI
+from utils.async_api_connector import AsyncBinanceAPI
+from utils.trading_strategy import TradingStrategy
 from utils.websocket_handler import BinanceWebSocket
 from utils import error_handler
+from utils.cache_manager import SingleFlight, AsyncSingleFlight
 
 class TestBinanceAPI(unittest.TestCase):
     def setUp(self):
@@ -472,5 +479,368 @@ class TestBinanceAPI(unittest.TestCase):
             error_handler.log_error(e, "시장 요약 정보 조회 테스트 실패")
             raise
 
+class _LocalBinanceHandler(BaseHTTPRequestHandler):
+    """테스트용 로컬 REST 응답 핸들러 (keep-alive)"""
+    protocol_version = "HTTP/1.1"
+    client_ports = set()
+    paths = []
+    delay = 0.0  # 응답 지연 (초)
+    serve_klines = False  # K라인 응답 여부 (False 면 404)
+
+    def do_GET(self):
+        self.client_ports.add(self.client_address[1])
+        time.sleep(self.delay)
+        url = urlsplit(self.path)
+        path = url.path
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        self.paths.append(path)
+        prices = {'BTCUSDT': '50000.00', 'ETHUSDT': '3000.00'}
+        if path == "/api/v3/ticker/price":
+            if 'symbol' in query:
+                body = {'symbol': query['symbol'], 'price': prices[query['symbol']]}
+            else:
+                body = [{'symbol': symbol, 'price': price} for symbol, price in prices.items()]
+        elif path == "/api/v3/ticker/24hr":
+            tickers = [
+                {'symbol': symbol, 'priceChange': '1000.00', 'priceChangePercent': '2.04',
+                 'weightedAvgPrice': '49500.00', 'highPrice': '50500.00', 'lowPrice': '48500.00',
+                 'lastPrice': price, 'volume': '1234.5', 'quoteVolume': '61000000.0'}
+                for symbol, price in prices.items()
+            ]
+            if 'symbol' in query:
+                body = next(t for t in tickers if t['symbol'] == query['symbol'])
+            elif 'symbols' in query:
+                symbols = json.loads(query['symbols'])
+                body = [t for t in tickers if t['symbol'] in symbols]
+            else:
+                body = tickers
+        elif path == "/api/v3/ticker/bookTicker":
+            body = [{'symbol': symbol, 'bidPrice': price, 'bidQty': '1.0',
+                     'askPrice': price, 'askQty': '2.0'} for symbol, price in prices.items()]
+        elif path == "/api/v3/depth":
+            body = {'lastUpdateId': 1, 'bids': [['49999.00', '1.0']], 'asks': [['50001.00', '2.0']]}
+        elif path == "/api/v3/klines" and self.serve_klines:
+            # 1시간 캔들, startTime 이후 최대 limit 개 (endTime 포함)
+            step = 3600000
+            open_time = -(-int(query.get('startTime', 0)) // step) * step
+            end_time = int(query.get('endTime', open_time + 10000 * step))
+            body = []
+            while open_time <= end_time and len(body) < int(query.get('limit', 500)):
+                body.append([open_time, "1.0", "1.0", "1.0", "1.0", "1.0", open_time + step - 1,
+                             "1.0", 1, "0.5", "0.5", "0"])
+                open_time += step
+        else:
+            self.send_response(404)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        payload = json.dumps(body).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+class TestHTTPTransport(unittest.TestCase):
+    """로컬 서버를 이용한 HTTP 세션 계층 테스트"""
+    def setUp(self):
+        _LocalBinanceHandler.client_ports = set()
+        _LocalBinanceHandler.paths = []
+        _LocalBinanceHandler.delay = 0.0
+        _LocalBinanceHandler.serve_klines = False
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), _LocalBinanceHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.api = BinanceAPI(pool_size=2, max_retries=0, coalesce_window=0.0)
+        self.api.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self.api.use_price_caching = False
+
+    def tearDown(self):
+        self.api.close()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_historical_klines_pagination(self):
+        """동기/비동기 과거 K라인 조회가 요청당 최대 개수를 넘는 기간을 같은 결과로 나누어 조회하는지 테스트"""
+        _LocalBinanceHandler.serve_klines = True
+        klines = self.api.get_historical_klines("BTCUSDT", "1h", "2023-01-01", "2023-04-15")
+
+        async def async_test():
+            async with AsyncBinanceAPI(max_retries=0, coalesce_window=0.0) as api:
+                api.base_url = self.api.base_url
+                return await api.get_historical_klines("BTCUSDT", "1h", "2023-01-01", "2023-04-15")
+
+        async_klines = asyncio.run(async_test())
+        self.assertGreater(len(klines), 2000)
+        self.assertEqual(async_klines, klines)
+        open_times = [kline[0] for kline in klines]
+        self.assertEqual(open_times, sorted(set(open_times)))
+        self.assertEqual(_LocalBinanceHandler.paths.count("/api/v3/klines"), 2 * 3)
+
+    def test_connection_reuse(self):
+        """keep-alive 커넥션 재사용 테스트"""
+        for _ in range(5):
+            self.assertEqual(self.api.get_ticker_price("BTCUSDT"), 50000.0)
+        self.api.get_market_depth("BTCUSDT", limit=10)
+        
+        # 모든 요청이 하나의 TCP 커넥션으로 처리되어야 함
+        self.assertEqual(len(_LocalBinanceHandler.client_ports), 1)
+
+    def test_latency_stats(self):
+        """엔드포인트별 지연시간 통계 테스트"""
+        for _ in range(3):
+            self.api.get_ticker_price("BTCUSDT")
+        with self.assertRaises(Exception):
+            self.api.get_klines("BTCUSDT")
+        
+        stats = self.api.get_latency_stats()
+        self.assertEqual(stats['/api/v3/ticker/price']['count'], 3)
+        self.assertEqual(stats['/api/v3/ticker/price']['errors'], 0)
+        self.assertGreater(stats['/api/v3/ticker/price']['avg'], 0)
+        self.assertEqual(stats['/api/v3/klines']['errors'], 1)
+        
+        self.api.reset_latency_stats()
+        self.assertEqual(self.api.get_latency_stats(), {})
+
+    def test_per_symbol_price_cache(self):
+        """심볼별 가격 캐시 테스트"""
+        self.api.use_price_caching = True
+        self.assertEqual(self.api.get_ticker_price("BTCUSDT"), 50000.0)
+        self.assertEqual(self.api.get_ticker_price("ETHUSDT"), 3000.0)
+        self.assertEqual(self.api.get_ticker_price("BTCUSDT"), 50000.0)
+        
+        # 두 번째 BTCUSDT 조회는 캐시 적중
+        self.assertEqual(_LocalBinanceHandler.paths.count("/api/v3/ticker/price"), 2)
+        stats = self.api.get_cache_stats()['price']
+        self.assertEqual(stats['hits'], 1)
+        self.assertEqual(stats['misses'], 2)
+
+    def test_book_ticker_without_caching(self):
+        """시세 캐시를 끄면 최우선 호가도 매번 조회하는지 테스트"""
+        self.api.get_book_ticker("BTCUSDT")
+        self.assertEqual(self.api.get_book_ticker("BTCUSDT")['bid_price'], 50000.0)
+        self.assertEqual(_LocalBinanceHandler.paths.count("/api/v3/ticker/bookTicker"), 2)
+        self.assertEqual(self.api.get_cache_stats()['book_ticker']['hits'], 0)
+
+    def test_bulk_refresh(self):
+        """전체 심볼 일괄 갱신 테스트"""
+        self.api.use_price_caching = True
+        self.api.track_symbols(["BTCUSDT", "ETHUSDT"])
+        
+        self.assertEqual(self.api.get_ticker_price("BTCUSDT"), 50000.0)
+        self.assertEqual(self.api.get_ticker_price("ETHUSDT"), 3000.0)
+        self.assertEqual(self.api.get_market_summary("BTCUSDT")['price_change_percent'], 2.04)
+        self.assertEqual(self.api.get_market_summary("ETHUSDT")['symbol'], "ETHUSDT")
+        self.assertEqual(self.api.get_book_ticker("ETHUSDT")['ask_qty'], 2.0)
+        
+        # 엔드포인트별 요청 1회로 모든 심볼 처리
+        self.assertEqual(_LocalBinanceHandler.paths.count("/api/v3/ticker/price"), 1)
+        self.assertEqual(_LocalBinanceHandler.paths.count("/api/v3/ticker/24hr"), 1)
+        self.assertEqual(_LocalBinanceHandler.paths.count("/api/v3/ticker/bookTicker"), 1)
+        
+        # 만료 후에는 다시 조회
+        self.api.price_update_interval = 0.0
+        self.api.get_ticker_price("BTCUSDT")
+        self.assertEqual(_LocalBinanceHandler.paths.count("/api/v3/ticker/price"), 2)
+        self.assertGreater(self.api.get_cache_stats()['price']['stale'], 0)
+
+    def test_request_coalescing(self):
+        """동시 동일 요청 병합 테스트"""
+        _LocalBinanceHandler.delay = 0.2
+        self.api.coalescer.window = 0.5
+        
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(self.api.get_market_depth("BTCUSDT", limit=10)))
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        # 다섯 스레드가 하나의 요청 결과를 공유
+        self.assertEqual(len(results), 5)
+        self.assertEqual(_LocalBinanceHandler.paths.count("/api/v3/depth"), 1)
+        
+        # 결과 공유 시간 내 재요청도 전송하지 않음, 파라미터가 다르면 별도 요청
+        self.api.get_market_depth("BTCUSDT", limit=10)
+        self.api.get_market_depth("BTCUSDT", limit=20)
+        self.assertEqual(_LocalBinanceHandler.paths.count("/api/v3/depth"), 2)
+        
+        stats = self.api.get_coalescing_stats()
+        self.assertEqual(stats['executions'], 2)
+        self.assertEqual(stats['shared_inflight'], 4)
+        self.assertEqual(stats['shared_window'], 1)
+        self.assertEqual(stats['saved'], 5)
+
+class TestAsyncBinanceAPI(unittest.TestCase):
+    """로컬 서버를 이용한 비동기 클라이언트 테스트"""
+    def setUp(self):
+        _LocalBinanceHandler.client_ports = set()
+        _LocalBinanceHandler.paths = []
+        _LocalBinanceHandler.delay = 0.2
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), _LocalBinanceHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def tearDown(self):
+        _LocalBinanceHandler.delay = 0.0
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_async_endpoints(self):
+        """비동기 공개 엔드포인트 조회 테스트"""
+        async def async_test():
+            async with AsyncBinanceAPI(max_retries=0) as api:
+                api.base_url = self.base_url
+                price = await api.get_ticker_price("BTCUSDT")
+                summary = await api.get_market_summary("BTCUSDT")
+                depth = await api.get_market_depth("BTCUSDT", limit=10)
+                return price, summary, depth
+
+        price, summary, depth = asyncio.run(async_test())
+        self.assertEqual(price, 50000.0)
+        self.assertEqual(summary['price_change_percent'], 2.04)
+        self.assertIn('bids', depth)
+
+    def test_concurrent_market_analysis(self):
+        """비동기 시장 분석 동시 조회 테스트"""
+        async def async_test():
+            async with AsyncBinanceAPI(max_retries=0) as async_api:
+                async_api.base_url = self.base_url
+                strategy = TradingStrategy(None, async_api=async_api, auto_trading=False)
+                start_time = time.perf_counter()
+                analysis = await strategy.analyze_market_async()
+                return analysis, time.perf_counter() - start_time
+
+        analysis, elapsed = asyncio.run(async_test())
+        
+        # 세 요청(각 0.2초 지연)이 동시에 처리되어야 함
+        self.assertLess(elapsed, 0.5)
+        self.assertEqual(analysis['current_price'], 50000.0)
+        self.assertEqual(analysis['buy_sell_ratio'], 0.5)
+        self.assertEqual(analysis['market_sentiment'], "NEUTRAL")
+        error_handler.log_info(f"비동기 시장 분석 소요시간: {elapsed:.3f}초")
+
+    def test_async_request_coalescing(self):
+        """비동기 동시 동일 요청 병합 테스트"""
+        async def async_test():
+            async with AsyncBinanceAPI(max_retries=0, coalesce_window=0.0) as api:
+                api.base_url = self.base_url
+                depths = await asyncio.gather(*[
+                    api.get_market_depth("BTCUSDT", limit=10) for _ in range(5)
+                ])
+                return depths, api.get_coalescing_stats()
+
+        depths, stats = asyncio.run(async_test())
+        self.assertEqual(len(depths), 5)
+        self.assertEqual(_LocalBinanceHandler.paths.count("/api/v3/depth"), 1)
+        self.assertEqual(stats['saved'], 4)
+
+    def test_async_shares_cache_policy(self):
+        """비동기 클라이언트도 동기 클라이언트와 같은 시세 캐시/일괄 갱신 정책을 적용하는지 테스트"""
+        _LocalBinanceHandler.delay = 0.0
+
+        async def async_test():
+            async with AsyncBinanceAPI(max_retries=0, coalesce_window=0.0) as api:
+                api.base_url = self.base_url
+                first = await api.get_market_summary("BTCUSDT")
+                second = await api.get_market_summary("BTCUSDT")
+                api.track_symbols(["BTCUSDT", "ETHUSDT"])
+                eth = await api.get_market_summary("ETHUSDT")
+                price = await api.get_ticker_price("ETHUSDT")
+                book = await api.get_book_ticker("ETHUSDT")
+                return first, second, eth, price, book, api.get_cache_stats()
+
+        first, second, eth, price, book, stats = asyncio.run(async_test())
+        self.assertEqual(second, first)
+        self.assertEqual(eth['symbol'], "ETHUSDT")
+        self.assertEqual(price, 3000.0)
+        self.assertEqual(book['ask_qty'], 2.0)
+        # 24시간 티커는 단일 조회 1회 + 일괄 조회 1회, 현재가는 일괄 티커 응답의 lastPrice 사용
+        self.assertEqual(_LocalBinanceHandler.paths.count("/api/v3/ticker/24hr"), 2)
+        self.assertEqual(_LocalBinanceHandler.paths.count("/api/v3/ticker/price"), 0)
+        self.assertEqual(stats['ticker_24hr']['hits'], 1)
+
+class TestSingleFlight(unittest.TestCase):
+    def test_expired_results_released(self):
+        """결과 공유 시간이 지난 키는 보관하지 않는지 테스트"""
+        flight = SingleFlight(window=0.05)
+        for index in range(1000):
+            flight.do(('klines', index), lambda: index)
+        self.assertEqual(flight.do(('klines', 999), lambda: None), 999)
+        time.sleep(0.06)
+        flight.do('latest', lambda: 0)
+        self.assertEqual(len(flight._results), 1)
+        self.assertEqual(flight.do(('klines', 999), lambda: 'new'), 'new')
+
+        async_flight = AsyncSingleFlight(window=0.05)
+
+        async def fetch(value):
+            return value
+
+        async def scenario():
+            for index in range(1000):
+                await async_flight.do(index, fetch, index)
+            await asyncio.sleep(0.06)
+            await async_flight.do('latest', fetch, 0)
+
+        asyncio.run(scenario())
+        self.assertEqual(len(async_flight._results), 1)
+
+    def test_leader_interrupt_not_shared_as_result(self):
+        """먼저 시작된 호출이 KeyboardInterrupt 로 중단되면 대기자에게 예외를 전달하고 결과를 캐시하지 않는지 테스트"""
+        flight = SingleFlight(window=10)
+        started = threading.Event()
+
+        def interrupted():
+            started.set()
+            time.sleep(0.1)
+            raise KeyboardInterrupt()
+
+        errors = []
+
+        def leader():
+            try:
+                flight.do('ticker', interrupted)
+            except KeyboardInterrupt as e:
+                errors.append(e)
+
+        thread = threading.Thread(target=leader)
+        thread.start()
+        started.wait()
+        with self.assertRaises(KeyboardInterrupt):
+            flight.do('ticker', lambda: 'waiter')
+        thread.join()
+        self.assertEqual(len(errors), 1)
+        self.assertEqual(flight.do('ticker', lambda: 'fresh'), 'fresh')
+
+    def test_leader_cancel_retries_waiters(self):
+        """먼저 시작된 호출이 취소되어도 대기자는 다시 실행해 결과를 받는지 테스트"""
+        flight = AsyncSingleFlight(window=0)
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return len(calls)
+
+        async def scenario():
+            leader = asyncio.create_task(flight.do('depth', fetch))
+            await asyncio.sleep(0.01)
+            waiters = [asyncio.create_task(flight.do('depth', fetch)) for _ in range(3)]
+            await asyncio.sleep(0.01)
+            leader.cancel()
+            results = await asyncio.gather(*waiters)
+            with self.assertRaises(asyncio.CancelledError):
+                await leader
+            return results
+
+        self.assertEqual(asyncio.run(scenario()), [2, 2, 2])
+        self.assertEqual(len(calls), 2)
+
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
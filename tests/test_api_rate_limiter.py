@@ -0,0 +1,96 @@
+import os
+import time
+import asyncio
+import tempfile
+import unittest
+from exchanges.api_rate_limiter import RateLimiter
+from utils import error_handler
+
+class TestRateLimiter(unittest.TestCase):
+    def setUp(self):
+        """테스트 설정 (작은 한도로 빠르게 검증)"""
+        self.limits = {
+            'weight_1m': {'limit': 100, 'interval': 1, 'header': 'X-MBX-USED-WEIGHT-1M'},
+            'orders_10s': {'limit': 10, 'interval': 1, 'header': 'X-MBX-ORDER-COUNT-10S'}
+        }
+        self.limiter = RateLimiter(limits=self.limits, safety_margin=1.0)
+
+    def test_endpoint_weights(self):
+        """엔드포인트별 가중치 계산 테스트"""
+        limiter = RateLimiter()
+        self.assertEqual(limiter.get_weight('GET', '/api/v3/depth', {'limit': 10}), 5)
+        self.assertEqual(limiter.get_weight('GET', '/api/v3/depth', {'limit': 1000}), 50)
+        self.assertEqual(limiter.get_weight('GET', '/api/v3/ticker/24hr', {'symbol': 'BTCUSDT'}), 2)
+        self.assertEqual(limiter.get_weight('GET', '/api/v3/ticker/24hr', {}), 80)
+        self.assertEqual(limiter.get_weight('GET', '/api/v3/account'), 20)
+        self.assertEqual(limiter.get_weight('GET', '/api/v3/unknown'), 1)
+
+        # 실제 주문만 주문 수 한도에 포함
+        self.assertIn('orders_10s', limiter.get_costs('POST', '/api/v3/order', {}))
+        self.assertNotIn('orders_10s', limiter.get_costs('POST', '/api/v3/order/test', {}))
+
+    def test_weight_budget(self):
+        """가중치 예산 소진 시 대기 테스트"""
+        # 예산 소진
+        self.assertTrue(self.limiter.acquire(weight=100))
+
+        # 즉시 추가 요청은 시간 초과
+        self.assertFalse(self.limiter.acquire(weight=50, timeout=0.1))
+
+        # 보충 후 획득 (100/초 보충 → 약 0.2초 대기)
+        start_time = time.time()
+        self.assertTrue(self.limiter.acquire(weight=20))
+        elapsed = time.time() - start_time
+        self.assertGreater(elapsed, 0.1)
+        self.assertLess(elapsed, 0.5)
+        self.assertEqual(self.limiter.get_status()['stats']['waits'], 1)
+
+    def test_header_reconciliation(self):
+        """응답 헤더 기반 예산 보정 테스트"""
+        self.limiter.acquire(weight=1)
+        self.limiter.update_from_headers({'x-mbx-used-weight-1m': '90'}, 200)
+        status = self.limiter.get_status()
+        self.assertLess(status['weight_1m']['available'], 15)
+
+    def test_ban_blocks_requests(self):
+        """429 응답 시 Retry-After 동안 요청 차단 테스트"""
+        self.limiter.update_from_headers({'Retry-After': '0.3'}, 429)
+        self.assertGreater(self.limiter.get_status()['blocked_for'], 0)
+        self.assertFalse(self.limiter.acquire(weight=1, timeout=0.1))
+        self.assertTrue(self.limiter.acquire(weight=1, timeout=1.0))
+        self.assertEqual(self.limiter.stats['bans'], 1)
+
+    def test_async_acquire(self):
+        """비동기 토큰 획득 테스트"""
+        async def async_test():
+            results = await asyncio.gather(*[
+                self.limiter.acquire_async(weight=30) for _ in range(4)
+            ])
+            return results
+
+        start_time = time.time()
+        self.assertTrue(all(asyncio.run(async_test())))
+
+        # 120 가중치 중 초과분 20 만큼 보충 대기
+        self.assertGreater(time.time() - start_time, 0.1)
+
+    def test_shared_budget(self):
+        """여러 Limiter 인스턴스 간 공유 예산 테스트"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'binance_budget.bin')
+            first = RateLimiter(limits=self.limits, safety_margin=1.0, shared_path=path)
+            second = RateLimiter(limits=self.limits, safety_margin=1.0, shared_path=path)
+            try:
+                self.assertTrue(first.acquire(weight=80))
+
+                # 다른 인스턴스(프로세스)의 사용량이 반영되어야 함
+                self.assertFalse(second.acquire(weight=50, timeout=0.05))
+                self.assertLess(second.get_status()['weight_1m']['available'], 30)
+            finally:
+                first.backend.close()
+                second.backend.close()
+
+        error_handler.log_info("공유 예산 테스트 성공")
+
+if __name__ == '__main__':
+    unittest.main()
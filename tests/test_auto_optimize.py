@@ -0,0 +1,99 @@
+import unittest
+import numpy as np
+from models.auto_optimize import AutoOptimizer, sample_candidates, optimize, DEFAULT_SEARCH_SPACE
+from utils.backtest_engine import evaluate_parameters, SharedPriceArrays
+from utils.trading_strategy import TradingStrategy
+
+def _prices(count=3000, seed=5):
+    """시드 고정 랜덤 워크 가격 (시가, 종가, 매수/매도 비율)"""
+    rng = np.random.default_rng(seed)
+    close = 30000 * np.exp(np.cumsum(rng.normal(0, 0.008, count)))
+    open_ = close * (1 + rng.normal(0, 0.006, count))
+    return open_, close, rng.uniform(0.8, 1.2, count)
+
+class _ArrayAPI:
+    """가격 배열을 K라인 형식으로 제공하는 API"""
+    def __init__(self, open_, close):
+        self.klines = [[1700000000000 + i * 3600000, o, max(o, c), min(o, c), c, 1.0]
+                       for i, (o, c) in enumerate(zip(open_.tolist(), close.tolist()))]
+
+    def get_historical_klines(self, symbol, interval, start_str, end_str=None):
+        return self.klines
+
+class TestSuccessiveHalving(unittest.TestCase):
+    def setUp(self):
+        self.open, self.close, self.ratio = _prices()
+        self.candidates = sample_candidates(DEFAULT_SEARCH_SPACE, 243, seed=1)
+
+    def test_pruning(self):
+        """단계별 상위 1/eta 만 더 긴 구간으로 평가하는지 테스트"""
+        with AutoOptimizer(self.open, self.close, self.ratio, workers=1) as optimizer:
+            ranked, latest = optimizer.successive_halving(self.candidates, eta=3)
+            stats = dict(optimizer.stats)
+
+        n = len(self.close)
+        # 243 → 81 → 27 → 9 → 3 → 1
+        self.assertEqual(stats['evaluations'], 243 + 81 + 27 + 9 + 3 + 1)
+        self.assertLess(stats['candles_evaluated'], len(self.candidates) * n / 10)
+        self.assertEqual(len(ranked), 1)
+        self.assertEqual(ranked[0]['window'], n)
+        self.assertEqual(sum(1 for result in latest if result['rung'] == 5), 1)
+
+        # 최종 결과는 전체 구간 백테스트와 동일
+        prices = SharedPriceArrays.create(self.open, self.close, self.ratio)
+        try:
+            params = {name: ranked[0][name] for name in DEFAULT_SEARCH_SPACE}
+            full = evaluate_parameters(params, prices, True)
+        finally:
+            prices.close()
+        self.assertEqual(full['profit'], ranked[0]['profit'])
+
+        # 후보별 마지막 평가 단계 (3단계 이상 9개, 2단계에서 탈락 18개)
+        rung_three = [result for result in latest if result['rung'] >= 3]
+        rung_two_only = [result for result in latest if result['rung'] == 2]
+        self.assertEqual(len(rung_three), 9)
+        self.assertEqual(len(rung_two_only), 18)
+
+    def test_hyperband(self):
+        """묶음별 결과 중 전체 구간 최고 결과 선택 테스트"""
+        with AutoOptimizer(self.open, self.close, self.ratio, workers=1) as optimizer:
+            best, evaluated = optimizer.hyperband(DEFAULT_SEARCH_SPACE, max_candidates=9, eta=3, seed=2)
+        full_window = [result for result in evaluated if result['window'] == len(self.close)]
+        self.assertEqual(best['profit'], max(result['profit'] for result in full_window))
+        # 묶음 후보 수: 9, 5, 3
+        self.assertEqual(len(evaluated), 17)
+
+    def test_walk_forward(self):
+        """이동 학습/검증 구간 테스트"""
+        with AutoOptimizer(self.open, self.close, self.ratio, workers=1) as optimizer:
+            walk = optimizer.walk_forward(self.candidates[:27], train_size=1200, test_size=400)
+        folds = walk['folds']
+        self.assertEqual(len(folds), 4)
+        for index, fold in enumerate(folds):
+            self.assertEqual(fold['train'], (index * 400, index * 400 + 1200))
+            self.assertEqual(fold['test'], (fold['train'][1], fold['train'][1] + 400))
+            self.assertIn(fold['parameters'], self.candidates[:27])
+        self.assertAlmostEqual(walk['test_profit'], sum(fold['test_profit'] for fold in folds))
+
+    def test_strategy_search_mode(self):
+        """optimize_parameters 탐색 모드 및 병렬/순차 결과 일치 테스트"""
+        api = _ArrayAPI(self.open, self.close)
+        strategy = TradingStrategy(api)
+        parallel = strategy.optimize_parameters('2023-11-14', '2024-03-18', buy_sell_ratio=self.ratio,
+                                                workers=2, search="halving", candidates=27, seed=4)
+        sequential = optimize(self.open, self.close, method="halving", candidates=27, seed=4,
+                              buy_sell_ratio=self.ratio, workers=1)
+
+        self.assertEqual(parallel['best_parameters'], sequential['best_parameters'])
+        self.assertEqual(strategy.stop_loss, parallel['best_parameters']['stop_loss'])
+        self.assertEqual(len(parallel['all_results']), 27)
+        self.assertEqual(parallel['timing']['evaluations'], 27 + 9 + 3 + 1)
+        self.assertIn('load', parallel['timing'])
+
+        walk = optimize(self.open, self.close, method="walk_forward", candidates=9, seed=4,
+                        buy_sell_ratio=self.ratio, workers=1)
+        self.assertEqual(len(walk['all_results']), len(walk['folds']))
+        self.assertEqual(walk['best_parameters']['profit'], walk['folds'][-1]['test_profit'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,301 @@
+import os
+import time
+import tempfile
+import unittest
+import numpy as np
+from utils.trading_strategy import TradingStrategy
+from utils.cache_manager import DiskLRUCache
+from utils.backtest_engine import (
+    run_backtest, loop_backtest, klines_to_arrays, entry_signals, BacktestResult,
+    SIDE_BUY, EXIT_BACKTEST_END
+)
+
+def _reference_klines(count=3000, seed=7):
+    """기준 데이터셋 (시드 고정 랜덤 워크 1시간 캔들)"""
+    rng = np.random.default_rng(seed)
+    close = 30000 * np.exp(np.cumsum(rng.normal(0, 0.008, count)))
+    open_ = np.concatenate([[30000.0], close[:-1]]) * (1 + rng.normal(0, 0.004, count))
+    klines = []
+    for index in range(count):
+        high = max(open_[index], close[index]) * 1.001
+        low = min(open_[index], close[index]) * 0.999
+        klines.append([1700000000000 + index * 3600000, f"{open_[index]:.2f}", f"{high:.2f}",
+                       f"{low:.2f}", f"{close[index]:.2f}", "12.5", 0, "0", 10, "6.0", "0", "0"])
+    ratio = rng.uniform(0.8, 1.2, count)
+    return klines, ratio
+
+class _HistoricalAPI:
+    """과거 K라인만 제공하고 주문 호출은 실패시키는 API"""
+    def __init__(self, klines):
+        self.klines = klines
+
+        self.history_calls = 0
+
+    def get_historical_klines(self, symbol, interval, start_str, end_str=None):
+        self.history_calls += 1
+        return self.klines
+
+    def create_order(self, *args, **kwargs):
+        raise AssertionError("백테스트에서 실제 주문 API 호출")
+
+    def get_ticker_price(self, symbol):
+        raise AssertionError("백테스트에서 실제 시세 API 호출")
+
+class TestBacktestEngine(unittest.TestCase):
+    def setUp(self):
+        self.klines, self.ratio = _reference_klines()
+
+    def _strategy(self):
+        strategy = TradingStrategy(_HistoricalAPI(self.klines))
+        strategy.stop_loss = 1.0
+        strategy.take_profit = 1.5
+        return strategy
+
+    def test_matches_loop_reference(self):
+        """배열 엔진과 캔들 반복 기준 구현의 거래/결과 일치 테스트"""
+        loop_strategy = self._strategy()
+        loop_results = loop_strategy.backtest('2023-11-14', '2024-03-18', buy_sell_ratio=self.ratio, engine="loop")
+        fast_strategy = self._strategy()
+        fast_results = fast_strategy.backtest('2023-11-14', '2024-03-18', buy_sell_ratio=self.ratio)
+
+        self.assertEqual(fast_results, loop_results)
+        self.assertEqual(fast_strategy.trade_count, loop_strategy.trade_count)
+        self.assertEqual(fast_strategy.profit_loss, loop_strategy.profit_loss)
+        self.assertGreater(fast_strategy.trade_count, 20)
+
+        # 모의 브로커 체결 내역과 거래 기록 비교 (진입/청산 순서대로)
+        _, broker = loop_backtest(self._strategy(), klines_to_arrays(self.klines), 10000, self.ratio)
+        trades = fast_strategy.backtest_trades
+        fills = [(fill['side'], fill['price']) for fill in broker.fills]
+        expected = []
+        for trade in trades:
+            side = "BUY" if trade['side'] == SIDE_BUY else "SELL"
+            close_side = "SELL" if side == "BUY" else "BUY"
+            expected.append((side, float(trade['entry_price'])))
+            expected.append((close_side, float(trade['exit_price'])))
+        self.assertEqual(fills, expected)
+
+    def test_open_position_closed_at_end(self):
+        """마지막까지 열린 포지션의 BACKTEST_END 청산 테스트"""
+        open_prices = np.array([100.0, 100.0, 101.0, 101.5])
+        close_prices = np.array([100.0, 101.0, 101.5, 101.2])
+        run = run_backtest(open_prices, close_prices, stop_loss=5.0, take_profit=5.0,
+                           buy_sell_ratio=np.array([1.0, 1.2, 1.0, 1.0]))
+        self.assertEqual(len(run['trades']), 1)
+        self.assertEqual(run['trades'][0]['reason'], EXIT_BACKTEST_END)
+        self.assertEqual(run['position'].tolist(), [0, SIDE_BUY, SIDE_BUY, SIDE_BUY])
+        self.assertEqual(run['trade_count'], 2)
+        self.assertAlmostEqual(run['total_profit_loss'], (101.2 - 101.0) / 101.0 * 100)
+
+    def test_default_ratio_matches_loop(self):
+        """기본 비율(1.0)에서도 두 엔진 결과 일치 테스트"""
+        loop_results = self._strategy().backtest('2023-11-14', '2024-03-18', engine="loop")
+        fast_results = self._strategy().backtest('2023-11-14', '2024-03-18')
+        self.assertEqual(fast_results, loop_results)
+
+    @unittest.skipUnless(os.environ.get('RUN_BENCHMARKS'), "처리량 측정은 RUN_BENCHMARKS=1 일 때만 실행")
+    def test_throughput(self):
+        """초당 처리 캔들 수 테스트 (부하가 없는 환경에서 실행)"""
+        rng = np.random.default_rng(1)
+        count = 2000000
+        close = 30000 * np.exp(np.cumsum(rng.normal(0, 0.008, count)))
+        open_ = close * (1 + rng.normal(0, 0.006, count))
+        ratio = rng.uniform(0.8, 1.2, count)
+
+        started = time.perf_counter()
+        run = run_backtest(open_, close, stop_loss=1.0, take_profit=2.0, buy_sell_ratio=ratio)
+        elapsed = time.perf_counter() - started
+
+        self.assertGreater(len(run['trades']), 1000)
+        self.assertTrue(np.count_nonzero(entry_signals(open_, close, ratio)) > 0)
+        self.assertGreater(count / elapsed, 500000)
+
+    def test_klines_to_arrays(self):
+        """K라인 배열 변환 테스트"""
+        arrays = klines_to_arrays(self.klines[:3])
+        self.assertEqual(arrays['open_time'].dtype, np.int64)
+        self.assertEqual(arrays['close'].tolist(), [float(k[4]) for k in self.klines[:3]])
+        self.assertEqual(len(klines_to_arrays([])['close']), 0)
+
+    def test_columnar_result(self):
+        """열 단위 결과, 요약 통계, 행 접근 호환 테스트"""
+        strategy = self._strategy()
+        result = strategy.backtest('2023-11-14', '2024-03-18', buy_sell_ratio=self.ratio)
+        columns = result.columns
+        self.assertEqual(list(columns), list(BacktestResult.COLUMNS))
+        self.assertEqual(len(result), len(self.klines))
+        self.assertEqual(columns['position'].dtype, np.int8)
+        self.assertTrue(np.allclose(columns['equity'], 10000 * (1 + columns['pnl'] / 100)))
+
+        # 기존 캔들별 dict 형식
+        last = result[-1]
+        self.assertEqual(last['timestamp'], int(columns['timestamp'][-1]))
+        self.assertEqual(last['balance'], 10000)
+        self.assertEqual(last['profit_loss'], float(columns['pnl'][-1]))
+        self.assertIn(last['position'], ("BUY", "SELL", None))
+
+        summary = result.summary
+        profits = strategy.backtest_trades['profit_pct']
+        self.assertEqual(summary['trade_count'], strategy.trade_count)
+        self.assertEqual(summary['total_profit_loss'], strategy.profit_loss)
+        self.assertAlmostEqual(summary['win_rate'], (profits > 0).mean() * 100)
+        equity = columns['equity']
+        peak = np.maximum.accumulate(np.maximum(equity, 10000))
+        self.assertAlmostEqual(summary['max_drawdown'], ((peak - equity) / peak).max() * 100)
+        self.assertGreater(summary['max_drawdown'], 0)
+
+    def test_summary_only_and_export(self):
+        """요약 통계만 보관하는 모드와 Parquet 저장 테스트"""
+        full = self._strategy().backtest('2023-11-14', '2024-03-18', buy_sell_ratio=self.ratio)
+        summary_only = self._strategy().backtest('2023-11-14', '2024-03-18', buy_sell_ratio=self.ratio,
+                                                 keep_curve=False)
+        self.assertIsNone(summary_only.columns)
+        self.assertEqual(summary_only.summary, full.summary)
+        self.assertEqual(len(summary_only), len(full))
+        with self.assertRaises(ValueError):
+            summary_only[-1]
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'results', 'btc.parquet')
+            exported = self._strategy().backtest('2023-11-14', '2024-03-18', buy_sell_ratio=self.ratio,
+                                                 export=path)
+            self.assertTrue(os.path.exists(path))
+            self.assertEqual(BacktestResult.read_parquet(path), exported)
+            self.assertEqual(exported, full)
+
+class TestParallelOptimization(unittest.TestCase):
+    def setUp(self):
+        self.klines, self.ratio = _reference_klines(count=2000, seed=11)
+
+    def _without_timing(self, results):
+        return [{k: v for k, v in result.items() if k != 'elapsed'} for result in results]
+
+    def test_parallel_matches_sequential(self):
+        """병렬 최적화 결과가 순차 실행 및 반복 백테스트와 일치하는지 테스트"""
+        api = _HistoricalAPI(self.klines)
+        strategy = TradingStrategy(api)
+        parallel = strategy.optimize_parameters('2023-11-14', '2024-02-05', buy_sell_ratio=self.ratio, workers=2)
+        sequential = TradingStrategy(_HistoricalAPI(self.klines)).optimize_parameters(
+            '2023-11-14', '2024-02-05', buy_sell_ratio=self.ratio, workers=1)
+
+        # 과거 데이터는 한 번만 조회, 전략 상태는 변경하지 않음
+        self.assertEqual(api.history_calls, 1)
+        self.assertEqual(strategy.trade_count, 0)
+
+        self.assertEqual(len(parallel['all_results']), 144)
+        self.assertEqual(self._without_timing(parallel['all_results']),
+                         self._without_timing(sequential['all_results']))
+        self.assertEqual(parallel['best_parameters']['profit'],
+                         max(r['profit'] for r in parallel['all_results']))
+        self.assertEqual(strategy.stop_loss, parallel['best_parameters']['stop_loss'])
+
+        timing = parallel['timing']
+        self.assertEqual(timing['workers'], 2)
+        self.assertEqual(timing['combinations'], 144)
+        self.assertGreater(timing['wall_clock'], 0)
+        self.assertTrue(all(r['elapsed'] > 0 for r in parallel['all_results']))
+
+        # 캔들 반복 백테스트와 같은 손익/거래 수
+        for result in parallel['all_results'][:12]:
+            reference = TradingStrategy(_HistoricalAPI(self.klines))
+            reference.stop_loss = result['stop_loss']
+            reference.take_profit = result['take_profit']
+            results = reference.backtest('2023-11-14', '2024-02-05', buy_sell_ratio=self.ratio, engine="loop")
+            self.assertEqual(result['profit'], results[-1]['profit_loss'])
+            self.assertEqual(result['trades'], reference.trade_count)
+
+class TestBacktestCache(unittest.TestCase):
+    def setUp(self):
+        self.klines, self.ratio = _reference_klines(count=1500, seed=13)
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def _strategy(self, cache):
+        return TradingStrategy(_HistoricalAPI(self.klines), backtest_cache=cache)
+
+    def test_lru_eviction(self):
+        """용량 초과 시 오래 사용하지 않은 항목 삭제 및 재시작 후 순서 유지 테스트"""
+        cache = DiskLRUCache(self.directory.name, max_bytes=3000)
+        for key in ('a', 'b', 'c'):
+            cache.set(key, b'x' * 900)
+            time.sleep(0.01)
+        self.assertEqual(cache.get('a'), b'x' * 900)   # a 를 최근 사용으로 갱신
+        cache.set('d', b'x' * 900)
+
+        self.assertIsNone(cache.get('b'))
+        stats = cache.get_stats()
+        self.assertEqual(stats['evictions'], 1)
+        self.assertLessEqual(stats['bytes'], 3000)
+        self.assertEqual(stats['hit_rate'], 0.5)
+
+        reopened = DiskLRUCache(self.directory.name, max_bytes=3000)
+        reopened.set('e', b'x' * 900)
+        self.assertIsNone(reopened.get('c'))
+        self.assertEqual(reopened.get('a'), b'x' * 900)
+
+    def test_repeated_sweep_computes_only_new_combinations(self):
+        """반복 최적화는 새 조합만 계산하고 결과는 캐시 없이 실행한 것과 같은지 테스트"""
+        uncached = TradingStrategy(_HistoricalAPI(self.klines)).optimize_parameters(
+            '2023-11-14', '2024-01-15', buy_sell_ratio=self.ratio, workers=1)
+
+        cache = DiskLRUCache(self.directory.name)
+        first = self._strategy(cache).optimize_parameters(
+            '2023-11-14', '2024-01-15', buy_sell_ratio=self.ratio, workers=1)
+        self.assertEqual(first['timing']['cache']['misses'], 144)
+
+        # 재시작 후 같은 조합 재실행
+        cache = DiskLRUCache(self.directory.name)
+        second = self._strategy(cache).optimize_parameters(
+            '2023-11-14', '2024-01-15', buy_sell_ratio=self.ratio, workers=1)
+        self.assertEqual(second['timing']['cache']['hits'], 144)
+        self.assertEqual(second['timing']['cache']['misses'], 0)
+        strip = lambda results: [{k: v for k, v in r.items() if k != 'elapsed'} for r in results]
+        self.assertEqual(strip([second['best_parameters']]), strip([uncached['best_parameters']]))
+        self.assertEqual(strip(second['all_results']), strip(uncached['all_results']))
+
+        # 데이터가 바뀌면 다시 계산
+        ratio = self.ratio.copy()
+        ratio[-1] += 0.5
+        third = self._strategy(cache).optimize_parameters(
+            '2023-11-14', '2024-01-15', buy_sell_ratio=ratio, workers=1)
+        self.assertEqual(third['timing']['cache']['misses'], 144)
+
+    def test_backtest_cache_restores_state(self):
+        """캐시된 백테스트가 같은 결과와 전략 상태를 반환하는지 테스트"""
+        cache = DiskLRUCache(self.directory.name)
+        first_strategy = self._strategy(cache)
+        first = first_strategy.backtest('2023-11-14', '2024-01-15', buy_sell_ratio=self.ratio)
+        second_strategy = self._strategy(cache)
+        second = second_strategy.backtest('2023-11-14', '2024-01-15', buy_sell_ratio=self.ratio)
+
+        self.assertEqual(cache.get_stats()['hits'], 1)
+        self.assertEqual(second, first)
+        self.assertEqual(second_strategy.trade_count, first_strategy.trade_count)
+        self.assertEqual(second_strategy.profit_loss, first_strategy.profit_loss)
+        self.assertTrue(np.array_equal(second_strategy.backtest_trades, first_strategy.backtest_trades))
+
+        # 파라미터가 바뀌면 다시 계산
+        second_strategy.stop_loss = 2.5
+        second_strategy.backtest('2023-11-14', '2024-01-15', buy_sell_ratio=self.ratio)
+        self.assertEqual(cache.get_stats()['misses'], 2)
+
+    def test_loop_cache_hit_clears_trades(self):
+        """루프 엔진 캐시 적중 시 이전 실행의 거래 배열이 남지 않는지 테스트"""
+        cache = DiskLRUCache(self.directory.name)
+        strategy = self._strategy(cache)
+        strategy.backtest('2023-11-14', '2024-01-15', buy_sell_ratio=self.ratio)
+        trades = strategy.backtest_trades
+        self.assertIsNotNone(trades)
+
+        for _ in range(2):   # 캐시 미스 후 적중
+            strategy.backtest('2023-11-14', '2024-01-15', buy_sell_ratio=self.ratio, engine="loop")
+            self.assertIsNone(strategy.backtest_trades)
+        self.assertEqual(cache.get_stats()['hits'], 1)
+
+        strategy.backtest('2023-11-14', '2024-01-15', buy_sell_ratio=self.ratio)
+        self.assertTrue(np.array_equal(strategy.backtest_trades, trades))
+
+if __name__ == '__main__':
+    unittest.main()
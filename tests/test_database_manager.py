@@ -0,0 +1,135 @@
+import os
+import time
+import tempfile
+import unittest
+import numpy as np
+from data.database_manager import KlineStore, KLINE_SCHEMA, DAY_MS
+from utils.trading_strategy import TradingStrategy
+
+MINUTE_MS = 60 * 1000
+BASE_TIME = 1704067200000  # 2024-01-01 00:00 UTC
+
+def _klines(start_time, count, interval_ms=MINUTE_MS, price=100.0):
+    """API 응답 형식의 K라인 (문자열 가격)"""
+    klines = []
+    for index in range(count):
+        open_time = start_time + index * interval_ms
+        value = f"{price + index * 0.01:.2f}"
+        klines.append([open_time, value, value, value, value, "1.5", open_time + interval_ms - 1,
+                       "150.0", 3, "0.5", "50.0", "0"])
+    return klines
+
+class _CountingAPI:
+    """과거 K라인 조회 횟수를 기록하는 API"""
+    def __init__(self, klines):
+        self.klines = klines
+        self.history_calls = 0
+
+    def get_historical_klines(self, symbol, interval, start_str, end_str=None):
+        self.history_calls += 1
+        return self.klines
+
+class TestKlineStore(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.store = KlineStore(root=self.directory.name)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_partitioned_append(self):
+        """날짜별 분할 저장 및 중복/미확정 캔들 제외 테스트"""
+        # 첫날 23:00 부터 2시간 (두 날짜에 걸침)
+        start = BASE_TIME + 23 * 60 * MINUTE_MS
+        klines = _klines(start, 120)
+        now = start + 120 * MINUTE_MS - 30 * 1000  # 마지막 캔들은 진행 중
+        self.assertEqual(self.store.append('BTCUSDT', '1m', klines, now=now), 119)
+
+        series_dir = os.path.join(self.directory.name, 'symbol=BTCUSDT', 'interval=1m')
+        self.assertEqual(sorted(os.listdir(series_dir)), ['date=2024-01-01', 'date=2024-01-02'])
+
+        # 겹치는 구간은 건너뛰고 새 캔들만 추가
+        self.assertEqual(self.store.append('BTCUSDT', '1m', _klines(start + 100 * MINUTE_MS, 40)), 21)
+        self.assertEqual(self.store.bounds('BTCUSDT', '1m'), (start, start + 139 * MINUTE_MS))
+
+        arrays = self.store.load('BTCUSDT', '1m')
+        self.assertEqual(len(arrays['open_time']), 140)
+        self.assertTrue(np.all(np.diff(arrays['open_time']) == MINUTE_MS))
+        for field in KLINE_SCHEMA:
+            self.assertIn(field.name, arrays)
+        self.assertEqual(arrays['trades'].dtype, np.int64)
+        self.assertEqual(arrays['close'].dtype, np.float64)
+
+        # 저장소를 새로 열어도 파일 통계로 구간 확인
+        self.assertEqual(KlineStore(root=self.directory.name).bounds('BTCUSDT', '1m'),
+                         (start, start + 139 * MINUTE_MS))
+
+    def test_time_range_and_columns(self):
+        """기간 조건 및 컬럼 선택 조회 테스트"""
+        self.store.append('BTCUSDT', '1m', _klines(BASE_TIME, 3 * 1440))
+        start = BASE_TIME + DAY_MS + 10 * MINUTE_MS
+        end = start + 99 * MINUTE_MS
+        arrays = self.store.load('BTCUSDT', '1m', start=start, end=end, columns=['close'])
+        self.assertEqual(sorted(arrays), ['close', 'open_time'])
+        self.assertEqual(arrays['open_time'][0], start)
+        self.assertEqual(arrays['open_time'][-1], end)
+        self.assertEqual(len(arrays['close']), 100)
+
+        self.assertEqual(len(self.store.load('ETHUSDT', '1m')['close']), 0)
+
+    def test_fill_hole_between_ranges(self):
+        """저장된 두 구간 사이의 빈 구간 추가 및 저장 범위 확인 테스트"""
+        klines = _klines(BASE_TIME, 110)
+        self.store.append('BTCUSDT', '1m', klines[:10])
+        self.store.append('BTCUSDT', '1m', klines[100:])
+        start, end = BASE_TIME + 20 * MINUTE_MS, BASE_TIME + 50 * MINUTE_MS
+        self.assertFalse(self.store.is_covered('BTCUSDT', '1m', start, end))
+
+        # 빈 구간만 기록 (양쪽 겹치는 캔들 제외)
+        self.assertEqual(self.store.append('BTCUSDT', '1m', klines[5:105]), 90)
+        self.assertTrue(self.store.is_covered('BTCUSDT', '1m', start, end))
+        arrays = self.store.load('BTCUSDT', '1m')
+        self.assertEqual(len(arrays['open_time']), 110)
+        self.assertTrue(np.all(np.diff(arrays['open_time']) == MINUTE_MS))
+        self.assertEqual(self.store.append('BTCUSDT', '1m', klines), 0)
+
+    def test_weekly_coverage(self):
+        """주봉(월요일 00:00 UTC 시작) 저장 범위 확인 테스트"""
+        week = 7 * DAY_MS
+        klines = _klines(BASE_TIME, 8, interval_ms=week)   # 2024-01-01 은 월요일
+        self.store.append('BTCUSDT', '1w', klines, now=BASE_TIME + 8 * week)
+        now = BASE_TIME + 8 * week + DAY_MS
+        self.assertTrue(self.store.is_covered('BTCUSDT', '1w', BASE_TIME + DAY_MS, BASE_TIME + 7 * week, now=now))
+        self.assertFalse(self.store.is_covered('BTCUSDT', '1w', BASE_TIME - week, BASE_TIME + 7 * week, now=now))
+
+    @unittest.skipUnless(os.environ.get('RUN_BENCHMARKS'), "조회 시간 측정은 RUN_BENCHMARKS=1 일 때만 실행")
+    def test_year_of_minutes_load_time(self):
+        """1년치 1분봉 조회 시간 테스트 (부하가 없는 환경에서 실행)"""
+        days = 365
+        for day in range(days):
+            self.store.append('BTCUSDT', '1m', _klines(BASE_TIME + day * DAY_MS, 1440))
+
+        started = time.perf_counter()
+        arrays = self.store.load('BTCUSDT', '1m')
+        elapsed = time.perf_counter() - started
+
+        self.assertEqual(len(arrays['close']), days * 1440)
+        self.assertLess(elapsed, 1.0)
+
+    def test_backtest_without_network(self):
+        """저장된 구간의 백테스트는 API 를 다시 조회하지 않는지 테스트"""
+        klines = _klines(BASE_TIME, 24 * 10, interval_ms=60 * MINUTE_MS)
+        api = _CountingAPI(klines)
+        strategy = TradingStrategy(api, market_store=self.store)
+
+        start = time.strftime('%Y-%m-%d', time.localtime(BASE_TIME / 1000 + DAY_MS / 1000))
+        end = time.strftime('%Y-%m-%d', time.localtime(BASE_TIME / 1000 + 8 * DAY_MS / 1000))
+        first = strategy.backtest(start, end)
+        second = strategy.backtest(start, end)
+
+        self.assertEqual(api.history_calls, 1)
+        self.assertEqual(first, second)
+        self.assertGreater(len(first), 0)
+
+if __name__ == '__main__':
+    unittest.main()
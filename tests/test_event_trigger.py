@@ -0,0 +1,133 @@
+import time
+import asyncio
+import unittest
+from utils.event_trigger import DecisionTrigger
+from utils.trading_strategy import TradingStrategy
+from data.order_book import OrderBook
+from main import TradingBot
+
+class _SlowStrategy:
+    """평가에 시간이 걸리는 전략"""
+    symbol = 'BTCUSDT'
+
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.calls = 0
+
+    def analyze_market(self):
+        self.calls += 1
+        time.sleep(self.delay)
+        return {'current_price': 50000.0}
+
+class _SummaryOnlyAPI:
+    """24시간 요약만 REST 로 제공 (현재가/호가 조회 시 실패)"""
+    def get_market_summary(self, symbol):
+        return {'price_change_percent': 0.0, 'volume': 100.0}
+
+    def get_ticker_price(self, symbol):
+        raise AssertionError("스트림 체결가가 있으면 REST 현재가를 조회하지 않아야 함")
+
+    def get_market_depth(self, symbol, limit=100):
+        raise AssertionError("로컬 호가창이 동기화된 경우 REST 호가를 조회하지 않아야 함")
+
+class _LastPrice:
+    def last_price(self, symbol):
+        return 50123.0
+
+class TestDecisionTrigger(unittest.TestCase):
+    def test_coalescing(self):
+        """평가 중 도착한 이벤트 병합 테스트"""
+        async def scenario():
+            trigger = DecisionTrigger()
+            evaluations = []
+
+            async def evaluate():
+                evaluations.append(time.perf_counter())
+                await asyncio.sleep(0.05)
+
+            runner = asyncio.create_task(trigger.run(evaluate))
+            for _ in range(3):
+                # 평가 시간보다 빠르게 이벤트 도착
+                for _ in range(20):
+                    trigger.notify('trade', event_time=time.time() * 1000)
+                    await asyncio.sleep(0.001)
+                await asyncio.sleep(0.06)
+            await asyncio.sleep(0.1)
+            trigger.stop()
+            await runner
+            return trigger.get_stats(), len(evaluations)
+
+        stats, evaluations = asyncio.run(scenario())
+        self.assertEqual(stats['events'], 60)
+        self.assertEqual(stats['evaluations'], evaluations)
+        self.assertLess(evaluations, 10)
+        self.assertEqual(stats['events'], stats['evaluations'] + stats['coalesced'])
+        self.assertGreaterEqual(stats['tick_to_decision']['avg'], 0.05)
+        self.assertEqual(stats['exchange_to_decision']['count'], evaluations)
+
+    def test_evaluation_error(self):
+        """평가 실패 시 루프 유지 테스트"""
+        async def scenario():
+            trigger = DecisionTrigger()
+
+            def evaluate():
+                raise ValueError("평가 실패")
+
+            runner = asyncio.create_task(trigger.run(evaluate))
+            trigger.notify('book')
+            await asyncio.sleep(0.05)
+            trigger.notify('book')
+            await asyncio.sleep(0.05)
+            trigger.stop()
+            await runner
+            return trigger.get_stats()
+
+        stats = asyncio.run(scenario())
+        self.assertEqual(stats['errors'], 2)
+        self.assertEqual(stats['evaluations'], 2)
+
+class TestEventDrivenBot(unittest.TestCase):
+    def test_stream_events_trigger_strategy(self):
+        """스트림 이벤트 종류별 평가 예약 테스트"""
+        async def scenario():
+            bot = TradingBot(test_mode=True, event_driven=True)
+            bot.strategy = _SlowStrategy()
+            bot.trigger = DecisionTrigger()
+            runner = asyncio.create_task(bot.trigger.run(bot.evaluate))
+
+            now = int(time.time() * 1000)
+            await bot.handle_stream_event('btcusdt@trade', {'e': 'trade', 'E': now})
+            await asyncio.sleep(0.1)
+            # 미확정 캔들은 평가하지 않음
+            await bot.handle_stream_event('btcusdt@kline_1m', {'e': 'kline', 'E': now, 'k': {'x': False}})
+            await asyncio.sleep(0.1)
+            await bot.handle_stream_event('btcusdt@kline_1m', {'e': 'kline', 'E': now, 'k': {'x': True}})
+            await bot.handle_stream_event('btcusdt@depth@100ms', {'e': 'depthUpdate', 'E': now})
+            await asyncio.sleep(0.2)
+            bot.trigger.stop()
+            await runner
+            return bot.strategy.calls, bot.trigger.get_stats()
+
+        calls, stats = asyncio.run(scenario())
+        self.assertEqual(stats['sources'], {'trade': 1, 'candle': 1, 'book': 1})
+        self.assertEqual(calls, stats['evaluations'])
+        self.assertIn(calls, (2, 3))
+
+    def test_evaluation_uses_stream_state(self):
+        """스트림 체결가와 호가창 복사본으로 평가 (REST 현재가/호가 조회 없음) 테스트"""
+        book = OrderBook('BTCUSDT')
+        book.apply_snapshot({'lastUpdateId': 100, 'bids': [['49999.00', '3.0'], ['49998.00', '1.0']],
+                             'asks': [['50001.00', '2.0']]})
+        bot = TradingBot(test_mode=True, event_driven=True)
+        bot.strategy = TradingStrategy(_SummaryOnlyAPI(), auto_trading=False, price_source=_LastPrice())
+        bot.order_book = book
+
+        analysis = asyncio.run(bot.evaluate_on_snapshot())
+        self.assertEqual(analysis['current_price'], 50123.0)
+        self.assertEqual(analysis['buy_sell_ratio'], 2.0)
+        # 평가 스레드는 이벤트 루프에서 갱신되는 호가창 대신 복사본을 읽음
+        self.assertIsNot(bot.strategy.order_book, book)
+        self.assertEqual(bot.strategy.order_book.depth(10), book.depth(10))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,122 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from data.feature_store import FeatureStore, feature_set_version
+from data.feature_engineering import compute_features, feature_columns, lookback
+from data.database_manager import KlineStore
+
+MINUTE_MS = 60 * 1000
+BASE_TIME = 1704067200000  # 2024-01-01 00:00 UTC
+
+def _arrays(count, seed=3):
+    """시드 고정 랜덤 워크 캔들 열 배열 (1분 간격)"""
+    rng = np.random.default_rng(seed)
+    close = 30000 * np.exp(np.cumsum(rng.normal(0, 0.003, count)))
+    spread = np.abs(rng.normal(0, 0.002, count))
+    return {
+        'open_time': BASE_TIME + np.arange(count, dtype=np.int64) * MINUTE_MS,
+        'high': close * (1 + spread),
+        'low': close * (1 - spread),
+        'close': close,
+        'volume': rng.uniform(0.5, 20.0, count)
+    }
+
+def _window(arrays, start, end):
+    return {name: values[start:end] for name, values in arrays.items()}
+
+class TestFeatureStore(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.store = FeatureStore(root=self.directory.name)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_incremental_extend_matches_full(self):
+        """새 캔들 추가분만 계산해 이어 붙인 결과가 전체 재계산과 같은지 테스트"""
+        arrays = _arrays(3000)
+        self.store.materialize('BTCUSDT', '1m', _window(arrays, 0, 1200))
+        # 이전 캔들이 부족하면 거부
+        with self.assertRaises(ValueError):
+            self.store.extend('BTCUSDT', '1m', _window(arrays, 1190, 1300))
+        # lookback 만큼의 이전 캔들만 포함한 입력으로 여러 번 추가
+        window = lookback()
+        for end in (1201, 1700, 2400, 3000):
+            last = len(self.store.open('BTCUSDT', '1m')) - 1
+            self.store.extend('BTCUSDT', '1m', _window(arrays, last - window, end))
+        self.assertEqual(self.store.extend('BTCUSDT', '1m', _window(arrays, 2000, 3000)), 0)
+
+        matrix = self.store.open('BTCUSDT', '1m')
+        expected = compute_features(arrays)
+        self.assertEqual(len(matrix), 3000)
+        np.testing.assert_array_equal(matrix.open_time, arrays['open_time'])
+        for column in matrix.columns:
+            np.testing.assert_array_equal(np.isnan(matrix.column(column)), np.isnan(expected[column]))
+            np.testing.assert_allclose(matrix.column(column), expected[column], rtol=1e-9, atol=1e-9,
+                                       err_msg=column)
+
+    def test_zero_copy_slices(self):
+        """학습/검증 구간과 열 조회가 메모리 매핑 뷰인지 테스트"""
+        arrays = _arrays(1000)
+        self.store.materialize('BTCUSDT', '1m', arrays)
+        matrix = FeatureStore(root=self.directory.name).open('BTCUSDT', '1m')
+        self.assertEqual(matrix.columns, feature_columns())
+
+        split = matrix.split(validation=0.25)
+        train_time, train = split['train']
+        validation_time, validation = split['validation']
+        for view in (train, validation, matrix.column('rsi_14')):
+            self.assertIsInstance(view, np.memmap)
+            self.assertTrue(np.shares_memory(view, matrix.values))
+        self.assertFalse(np.isnan(train).any())
+        self.assertTrue(np.isnan(matrix.values[matrix.warmup - 1]).any())
+        self.assertEqual(len(train) + len(validation), 1000 - matrix.warmup)
+        self.assertEqual(len(validation), 250 - round(matrix.warmup * 0.25))
+        self.assertLess(train_time[-1], validation_time[0])
+
+        open_time, values = matrix.slice(BASE_TIME + 100 * MINUTE_MS, BASE_TIME + 200 * MINUTE_MS)
+        self.assertEqual(len(values), 100)
+        self.assertEqual(open_time[0], BASE_TIME + 100 * MINUTE_MS)
+
+    def test_version_and_interrupted_write(self):
+        """지표 구성별 버전 분리 및 기록 중단 후 복구 테스트"""
+        arrays = _arrays(300)
+        features = [('ema', {'period': 5}), ('obv', {})]
+        self.store.materialize('BTCUSDT', '1m', arrays)
+        self.store.materialize('BTCUSDT', '1m', _window(arrays, 0, 200), features)
+        self.assertNotEqual(feature_set_version(), feature_set_version(features))
+        self.assertEqual(len(self.store.open('BTCUSDT', '1m')), 300)
+        matrix = self.store.open('BTCUSDT', '1m', features)
+        self.assertEqual(matrix.columns, ['ema_5', 'obv'])
+        self.assertEqual(len(os.listdir(os.path.join(self.directory.name, 'symbol=BTCUSDT', 'interval=1m'))), 2)
+
+        # meta.json 갱신 전 중단되어 남은 행은 무시하고 다음 추가 시 덮어씀
+        with open(os.path.join(matrix.directory, 'values.f8'), 'ab') as f:
+            f.write(np.zeros(6).tobytes())
+        self.assertEqual(len(self.store.open('BTCUSDT', '1m', features)), 200)
+        self.store.extend('BTCUSDT', '1m', arrays, features)
+        matrix = self.store.open('BTCUSDT', '1m', features)
+        expected = compute_features(arrays, features)
+        np.testing.assert_allclose(matrix.column('obv'), expected['obv'])
+        np.testing.assert_allclose(matrix.column('ema_5')[4:], expected['ema_5'][4:])
+
+    def test_update_from_kline_store(self):
+        """K라인 저장소에 새 캔들이 쌓일 때 특성 행렬 갱신 테스트"""
+        arrays = _arrays(1500)
+        klines = [[int(arrays['open_time'][i]), 0, arrays['high'][i], arrays['low'][i], arrays['close'][i],
+                   arrays['volume'][i], int(arrays['open_time'][i]) + MINUTE_MS - 1, 0, 1, 0, 0, 0]
+                  for i in range(1500)]
+        kline_store = KlineStore(root=os.path.join(self.directory.name, 'klines'))
+        kline_store.append('BTCUSDT', '1m', klines[:900])
+        self.assertEqual(len(self.store.update_from_store(kline_store, 'BTCUSDT', '1m')), 900)
+        kline_store.append('BTCUSDT', '1m', klines[900:])
+        matrix = self.store.update_from_store(kline_store, 'BTCUSDT', '1m')
+
+        expected = compute_features(arrays)
+        self.assertEqual(len(matrix), 1500)
+        np.testing.assert_allclose(matrix.column('macd_12_26_9'), expected['macd_12_26_9'], rtol=1e-9, atol=1e-9)
+        np.testing.assert_allclose(matrix.column('obv'), expected['obv'], rtol=1e-9, atol=1e-9)
+
+if __name__ == '__main__':
+    unittest.main()
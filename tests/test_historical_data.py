@@ -0,0 +1,121 @@
+import os
+import time
+import tempfile
+import threading
+import unittest
+from data.historical_data import HistoricalKlineDownloader, iter_klines, interval_start, INTERVAL_MS
+from utils import error_handler
+
+class _FakeKlineAPI:
+    """합성 K라인을 반환하는 테스트용 API (누락 구간/중복/실패 주입 가능)"""
+    def __init__(self, missing=(), fail_after=None):
+        self.missing = set(missing)
+        self.fail_after = fail_after
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def get_klines(self, symbol, interval, limit=500, start_time=None, end_time=None):
+        with self._lock:
+            self.calls += 1
+            if self.fail_after is not None and self.calls > self.fail_after:
+                raise ConnectionError("연결 끊김 (테스트)")
+
+        step = INTERVAL_MS[interval]
+        open_time = start_time - start_time % step
+        if open_time < start_time:
+            open_time += step
+        klines = []
+        while open_time <= end_time and len(klines) < limit:
+            if open_time not in self.missing:
+                price = str(100 + open_time // step % 10)
+                klines.append([open_time, price, price, price, price, "1.0", open_time + step - 1,
+                               "100.0", 10, "0.5", "50.0", "0"])
+            open_time += step
+        # 구간 경계 중복 캔들 (이전 구간 마지막 캔들 재전송)
+        if klines and start_time - step >= 0:
+            klines.insert(0, list(klines[0]))
+        return klines
+
+class TestHistoricalKlineDownloader(unittest.TestCase):
+    def setUp(self):
+        """테스트 설정"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.step = INTERVAL_MS['1m']
+        self.start = 1700000000000 - 1700000000000 % self.step
+        self.end = self.start + 2500 * self.step  # 2500개 캔들 (3개 구간)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_chunked_download(self):
+        """구간 분할 다운로드 및 중복/누락 검출 테스트"""
+        missing = self.start + 1500 * self.step
+        api = _FakeKlineAPI(missing=[missing])
+        downloader = HistoricalKlineDownloader(api, output_dir=self.temp_dir.name, max_workers=3)
+
+        summary = downloader.download("BTCUSDT", "1m", self.start, self.end)
+
+        self.assertEqual(api.calls, 3)
+        self.assertEqual(summary['rows'], 2499)
+        self.assertEqual(summary['gaps'], [(missing, missing)])
+        self.assertGreater(summary['duplicates'], 0)
+
+        # 결과 파일은 시간순, 중복 없음
+        open_times = [kline[0] for kline in iter_klines(summary['path'])]
+        self.assertEqual(open_times, sorted(set(open_times)))
+        self.assertEqual(open_times[0], self.start)
+
+    def test_resume_after_interruption(self):
+        """중단 후 남은 구간만 다시 조회하는지 테스트"""
+        failing_api = _FakeKlineAPI(fail_after=1)
+        downloader = HistoricalKlineDownloader(failing_api, output_dir=self.temp_dir.name, max_workers=1)
+        with self.assertRaises(ConnectionError):
+            downloader.download("BTCUSDT", "1m", self.start, self.end)
+
+        api = _FakeKlineAPI()
+        downloader = HistoricalKlineDownloader(api, output_dir=self.temp_dir.name, max_workers=2)
+        summary = downloader.download("BTCUSDT", "1m", self.start, self.end)
+
+        # 첫 구간은 이미 저장되어 있으므로 나머지 2개 구간만 조회
+        self.assertEqual(api.calls, 2)
+        self.assertEqual(summary['rows'], 2500)
+        self.assertEqual(summary['gaps'], [])
+        self.assertFalse(any(name.endswith('.parts') for name in os.listdir(self.temp_dir.name)))
+        error_handler.log_info(f"다운로드 재개 테스트 성공: {summary['rows']}개 캔들")
+
+    def test_resume_open_ended_download(self):
+        """종료 시각 미지정 다운로드도 같은 작업으로 재개되는지 테스트"""
+        now = int(time.time() * 1000)
+        start = now - now % self.step - 2500 * self.step
+        downloader = HistoricalKlineDownloader(_FakeKlineAPI(fail_after=1), output_dir=self.temp_dir.name,
+                                               max_workers=1)
+        with self.assertRaises(ConnectionError):
+            downloader.download("BTCUSDT", "1m", start)
+        self.assertEqual([name for name in os.listdir(self.temp_dir.name) if name.endswith('.parts')],
+                         [f"BTCUSDT_1m_{start}_open.parts"])
+
+        api = _FakeKlineAPI()
+        summary = HistoricalKlineDownloader(api, output_dir=self.temp_dir.name, max_workers=2).download(
+            "BTCUSDT", "1m", start)
+        self.assertEqual(api.calls, 2)
+        self.assertIn(summary['rows'], (2500, 2501))   # 실행 중 분이 바뀐 경우 1개 추가
+        self.assertEqual(summary['gaps'], [])
+        self.assertFalse(any(name.endswith('.parts') for name in os.listdir(self.temp_dir.name)))
+
+    def test_weekly_candle_boundaries(self):
+        """주봉 캔들 경계가 월요일 00:00 UTC 기준인지 테스트 (Unix epoch 는 목요일)"""
+        monday = 1704067200000   # 2024-01-01 (월) 00:00 UTC
+        day = INTERVAL_MS['1d']
+        week = INTERVAL_MS['1w']
+        self.assertEqual(interval_start(monday + 3 * day + 5, '1w'), monday)
+        self.assertEqual(interval_start(monday - 1, '1w'), monday - week)
+        self.assertEqual(interval_start(monday + 90 * 60 * 1000, '1h'), monday + INTERVAL_MS['1h'])
+
+        # 종료 시각 미지정 작업은 진행 중인 주봉을 포함하지 않음
+        downloader = HistoricalKlineDownloader(_FakeKlineAPI(), output_dir=self.temp_dir.name)
+        end_time = downloader._open_end_time(os.path.join(self.temp_dir.name, 'weekly.parts'), '1w')
+        self.assertEqual((end_time + 1 - monday) % week, 0)
+        self.assertGreater(end_time + week, int(time.time() * 1000))
+
+if __name__ == '__main__':
+    unittest.main()
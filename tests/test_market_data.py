@@ -0,0 +1,323 @@
+import os
+import time
+import unittest
+import numpy as np
+from data.historical_data import INTERVAL_MS
+from data.market_data import (
+    CandleAggregator, RingBuffer, Rolling24hStats, CANDLE_FIELDS, TRADE_DTYPE, CANDLE_DTYPE, memory_ceiling
+)
+from utils.data_collector import DataCollector
+from utils.trading_strategy import TradingStrategy
+
+class _FakeKlineAPI:
+    """REST K라인 조회 기록용 API"""
+    def __init__(self, price=100.0):
+        self.price = price
+        self.kline_calls = []
+        self.ticker_calls = 0
+
+    def get_klines(self, symbol, interval, limit=500, start_time=None, end_time=None):
+        self.kline_calls.append((symbol, interval, start_time, end_time))
+        interval_ms = INTERVAL_MS[interval]
+        if start_time is None:
+            now = int(time.time() * 1000)
+            start_time = now - now % interval_ms - (limit - 1) * interval_ms
+            end_time = now
+        klines = []
+        open_time = start_time
+        while open_time <= end_time and len(klines) < limit:
+            price = str(self.price)
+            klines.append([open_time, price, price, price, price, '1.0', open_time + interval_ms - 1,
+                           price, 1, '0.5', str(self.price / 2), '0'])
+            open_time += interval_ms
+        return klines
+
+    def get_ticker_price(self, symbol):
+        self.ticker_calls += 1
+        return self.price
+
+class _TickerAPI(_FakeKlineAPI):
+    """REST 24시간 요약 조회 횟수를 기록하는 API"""
+    def __init__(self, price=100.0, volume=1440.0):
+        super().__init__(price)
+        self.volume = volume
+        self.summary_calls = 0
+
+    def get_market_summary(self, symbol):
+        self.summary_calls += 1
+        return {'price_change_percent': 0.0, 'volume': self.volume}
+
+    def get_market_depth(self, symbol, limit=100):
+        return {'bids': [['99.0', '1.0']], 'asks': [['101.0', '1.0']]}
+
+def _trade(trade_id, trade_time, price, qty, maker=False):
+    return {'e': 'trade', 's': 'BTCUSDT', 't': trade_id, 'p': str(price), 'q': str(qty),
+            'T': trade_time, 'm': maker}
+
+class TestRingBuffer(unittest.TestCase):
+    def test_append_and_view(self):
+        """링 버퍼 추가 및 최근 구간 뷰 테스트"""
+        buffer = RingBuffer(TRADE_DTYPE, capacity=4)
+        for index in range(6):
+            buffer.append((index, index, 100.0 + index, 1.0, False))
+
+        self.assertEqual(len(buffer), 4)
+        self.assertEqual(buffer.view()['id'].tolist(), [2, 3, 4, 5])
+        self.assertEqual(buffer.view(2)['price'].tolist(), [104.0, 105.0])
+        self.assertEqual(int(buffer.last()['id']), 5)
+
+        # 복사 없는 읽기 전용 뷰
+        window = buffer.view(3)
+        self.assertIs(window.base, buffer.view().base)
+        with self.assertRaises(ValueError):
+            window['price'][0] = 0.0
+
+    def test_extend(self):
+        """여러 레코드 일괄 추가 (용량 초과분은 오래된 순으로 제거) 테스트"""
+        buffer = RingBuffer(CANDLE_DTYPE, capacity=5)
+        buffer.append(tuple([0] + [1.0] * 5 + [0, 0.0, 0, 0.0, 0.0]))
+        rows = [tuple([i] + [float(i)] * 5 + [i, 0.0, 1, 0.0, 0.0]) for i in range(1, 8)]
+        buffer.extend(rows)
+        self.assertEqual(buffer.view()['open_time'].tolist(), [3, 4, 5, 6, 7])
+        self.assertTrue(np.allclose(buffer.view()['close'], [3.0, 4.0, 5.0, 6.0, 7.0]))
+
+    def test_memory_ceiling(self):
+        """심볼당 메모리 상한 테스트"""
+        aggregator = CandleAggregator(['BTCUSDT'], intervals=('1m', '5m'), capacity=100, trade_capacity=1000)
+        allocated = aggregator.trades['BTCUSDT'].nbytes + sum(b.nbytes for b in aggregator.candles.values())
+        self.assertEqual(aggregator.memory_per_symbol(), allocated)
+        self.assertEqual(memory_ceiling(1000, 100, 2), allocated)
+
+class TestCandleAggregator(unittest.TestCase):
+    def setUp(self):
+        """테스트 설정 (분 경계 기준 시각)"""
+        self.api = _FakeKlineAPI()
+        self.aggregator = CandleAggregator(['BTCUSDT'], intervals=('1s', '1m'), capacity=100, api=self.api)
+        self.base = 1700000040000  # 1분 경계
+
+    def test_trade_aggregation(self):
+        """체결 이벤트로 1초/1분 캔들 생성 테스트"""
+        trades = [
+            _trade(1, self.base + 100, 100.0, 1.0),
+            _trade(2, self.base + 500, 102.0, 2.0, maker=True),
+            _trade(3, self.base + 3200, 99.0, 1.0),
+        ]
+        for trade in trades:
+            self.aggregator.on_trade(trade)
+
+        seconds = self.aggregator.get_candles('BTCUSDT', '1s')
+        # 0초 캔들, 체결이 없던 1~2초 채움 캔들, 진행 중인 3초 캔들
+        self.assertEqual([c[0] - self.base for c in seconds], [0, 1000, 2000, 3000])
+        self.assertEqual(seconds[0][1:6], [100.0, 102.0, 100.0, 102.0, 3.0])
+        self.assertEqual(seconds[1][1:6], [102.0, 102.0, 102.0, 102.0, 0.0])
+
+        minute = self.aggregator.get_candles('BTCUSDT', '1m')[-1]
+        self.assertEqual(minute[1:6], [100.0, 102.0, 99.0, 99.0, 4.0])
+        self.assertEqual(minute[8], 3)
+        self.assertEqual(minute[9], 2.0)  # 매수 체결 수량
+        self.assertEqual(self.aggregator.last_price('btcusdt'), 99.0)
+
+        # 숫자형 배열 뷰 (문자열 재파싱 없음)
+        closes = self.aggregator.get_candle_array('BTCUSDT', '1s')['close']
+        self.assertEqual(closes.tolist(), [102.0, 102.0, 102.0])
+        trades = self.aggregator.get_trades('BTCUSDT')
+        self.assertEqual(trades['is_buyer_maker'].tolist(), [False, True, False])
+
+    def test_kline_replaces_aggregate(self):
+        """확정 kline 이벤트가 집계 캔들을 대체하는지 테스트"""
+        self.aggregator.on_trade(_trade(1, self.base + 100, 100.0, 1.0))
+        self.aggregator.on_kline({'e': 'kline', 's': 'BTCUSDT', 'k': {
+            't': self.base, 'T': self.base + 59999, 'i': '1m', 'x': True,
+            'o': '100.0', 'h': '105.0', 'l': '95.0', 'c': '101.0', 'v': '10.0',
+            'q': '1000.0', 'n': 20, 'V': '5.0', 'Q': '500.0'
+        }})
+        candles = self.aggregator.get_candles('BTCUSDT', '1m')
+        self.assertEqual(len(candles), 1)
+        self.assertEqual(candles[0][2], 105.0)
+
+        # 다음 분의 체결은 새 캔들로 시작
+        self.aggregator.on_trade(_trade(2, self.base + 60000, 101.5, 1.0))
+        candles = self.aggregator.get_candles('BTCUSDT', '1m')
+        self.assertEqual([c[0] - self.base for c in candles], [0, 60000])
+
+    def test_gap_repair(self):
+        """체결 ID 누락 시 REST 보정 테스트"""
+        self.aggregator.on_trade(_trade(1, self.base + 100, 100.0, 1.0))
+        self.aggregator.on_trade(_trade(50, self.base + 5100, 101.0, 1.0))
+        self.assertEqual(len(self.aggregator.gaps), 1)
+
+        collector = DataCollector(self.api, aggregator=self.aggregator)
+        collector.interval = '1s'
+        candles = collector.get_recent_data(limit=10)
+
+        self.assertEqual(self.aggregator.gaps, [])
+        self.assertEqual(self.aggregator.stats['repaired'], 1)
+        # 보정된 1~4초 캔들은 REST 값(거래량 1.0) 사용
+        self.assertEqual([c[5] for c in candles[1:5]], [1.0, 1.0, 1.0, 1.0])
+        self.assertEqual(candles[-1][0], self.base + 5000)
+
+    def test_weekly_candle_starts_on_monday(self):
+        """주봉 캔들은 월요일 00:00 UTC 에 시작하는지 테스트"""
+        aggregator = CandleAggregator(['BTCUSDT'], intervals=('1w',), capacity=4)
+        monday = 1704067200000   # 2024-01-01 (월) 00:00 UTC
+        aggregator.on_trade(_trade(1, monday + 2 * INTERVAL_MS['1d'], 100.0, 1.0))
+        aggregator.on_trade(_trade(2, monday + 8 * INTERVAL_MS['1d'], 101.0, 1.0))
+        candles = aggregator.get_candles('BTCUSDT', '1w')
+        self.assertEqual([candle[0] for candle in candles], [monday, monday + INTERVAL_MS['1w']])
+        self.assertEqual(candles[0][6], monday + INTERVAL_MS['1w'] - 1)
+
+class TestRolling24hStats(unittest.TestCase):
+    MINUTE = INTERVAL_MS['1m']
+
+    def _random_candles(self, count, seed=7):
+        """1분 캔들 (일부 구간 누락, 시작 시각 2024-01-01 00:00 UTC)"""
+        rng = np.random.default_rng(seed)
+        candles = []
+        price = 100.0
+        for index in range(count):
+            if 1000 <= index < 1100:   # 스트림 끊김 등으로 캔들 없음
+                continue
+            open_price = price
+            price *= np.exp(rng.normal(0, 0.002))
+            volume = rng.uniform(0.5, 5.0)
+            open_time = 1704067200000 + index * self.MINUTE
+            candles.append([open_time, open_price, max(open_price, price) * 1.001, min(open_price, price) * 0.999,
+                            price, volume, open_time + self.MINUTE - 1, volume * price, 10,
+                            volume / 2, volume * price / 2])
+        return candles
+
+    def _expected(self, candles, now):
+        start = now - now % self.MINUTE - 1439 * self.MINUTE
+        window = [candle for candle in candles if start <= candle[0] <= now]
+        volume = sum(candle[5] for candle in window)
+        return {
+            'price_change': window[-1][4] - window[0][1],
+            'high_price': max(candle[2] for candle in window),
+            'low_price': min(candle[3] for candle in window),
+            'volume': volume,
+            'quote_volume': sum(candle[7] for candle in window),
+            'weighted_avg_price': sum(candle[7] for candle in window) / volume
+        }
+
+    def test_incremental_matches_window(self):
+        """진행 중/확정 캔들 갱신으로 유지한 통계가 최근 24시간 캔들 직접 계산과 같은지 테스트"""
+        candles = self._random_candles(4000)
+        stats = Rolling24hStats(['BTCUSDT'], reconcile_interval=None)
+        for index, candle in enumerate(candles):
+            # 진행 중 캔들 갱신 후 확정값으로 대체
+            partial = list(candle)
+            partial[5] /= 2
+            partial[7] /= 2
+            stats.update('BTCUSDT', partial)
+            stats.update('BTCUSDT', candle)
+            if index % 250 == 0 or index == len(candles) - 1:
+                now = candle[0] + 30 * 1000
+                summary = stats.summary('BTCUSDT', now=now)
+                for field, value in self._expected(candles[:index + 1], now).items():
+                    self.assertAlmostEqual(summary[field], value, places=6, msg=field)
+                self.assertEqual(summary['last_price'], candle[4])
+
+        # 지연 도착한 이전 캔들은 무시하고, 캔들 없이 시간이 지나면 구간에서 제외
+        stats.update('BTCUSDT', candles[-5])
+        now = candles[-1][0] + 600 * self.MINUTE
+        expected = self._expected(candles, now)
+        self.assertAlmostEqual(stats.summary('BTCUSDT', now=now)['volume'], expected['volume'], places=6)
+        self.assertIsNone(stats.summary('BTCUSDT', now=candles[-1][0] + 2 * 1440 * self.MINUTE))
+        self.assertIsNone(stats.summary('ETHUSDT'))
+
+    @unittest.skipUnless(os.environ.get('RUN_BENCHMARKS'), "갱신 비용 측정은 RUN_BENCHMARKS=1 일 때만 실행")
+    def test_update_cost(self):
+        """캔들 갱신이 구간 크기와 무관한 O(1) 비용인지 테스트 (부하가 없는 환경에서 실행)"""
+        candles = self._random_candles(20000, seed=3)
+        stats = Rolling24hStats(['BTCUSDT'], reconcile_interval=None)
+        started = time.perf_counter()
+        for candle in candles:
+            stats.update('BTCUSDT', candle)
+        elapsed = time.perf_counter() - started
+        self.assertEqual(stats.stats['updates'], len(candles))
+        self.assertLess(elapsed / len(candles), 20e-6)
+
+    def test_backfill_and_reconcile(self):
+        """REST 초기 적재 후 주기적 대조, 오차가 크면 재적재 테스트"""
+        api = _TickerAPI(price=100.0)
+        stats = Rolling24hStats(['BTCUSDT'], api=api, reconcile_interval=3600)
+        now = int(time.time() * 1000)
+        stats.backfill(now=now)
+        self.assertEqual(len(api.kline_calls), 2)
+        summary = stats.summary('BTCUSDT', now=now)
+        self.assertAlmostEqual(summary['volume'], 1440.0)
+        self.assertAlmostEqual(summary['weighted_avg_price'], 100.0)
+
+        # 대조 주기 전에는 REST 를 조회하지 않음
+        for _ in range(10):
+            stats.get_market_summary('BTCUSDT')
+        self.assertEqual(api.summary_calls, 0)
+
+        stats.reconciled_at['BTCUSDT'] = 0
+        stats.get_market_summary('BTCUSDT')
+        self.assertEqual(api.summary_calls, 1)
+        self.assertEqual(stats.stats['resynced'], 0)
+
+        api.volume = 2000.0
+        self.assertEqual(stats.reconcile(), ['BTCUSDT'])
+        self.assertEqual(len(api.kline_calls), 4)
+        self.assertGreater(stats.drift['BTCUSDT'], stats.tolerance)
+
+    def test_analysis_uses_local_stats(self):
+        """로컬 24시간 통계가 있으면 REST 요약 없이 시장 분석 테스트"""
+        api = _TickerAPI(price=100.0)
+        stats = Rolling24hStats(['BTCUSDT'], api=api)
+        stats.backfill()
+        strategy = TradingStrategy(api, auto_trading=False, market_stats=stats)
+        for _ in range(5):
+            analysis = strategy.analyze_market()
+        self.assertEqual(analysis['volume_24h'], stats.summary('BTCUSDT')['volume'])
+        self.assertEqual(api.summary_calls, 0)
+
+        # 통계가 없으면 REST 요약 사용
+        TradingStrategy(api, auto_trading=False).analyze_market()
+        self.assertEqual(api.summary_calls, 1)
+
+class TestDataCollectorFromMemory(unittest.TestCase):
+    def test_backfill_then_memory(self):
+        """초기 적재 후 메모리에서 조회 (REST 재조회 없음) 테스트"""
+        api = _FakeKlineAPI(price=200.0)
+        aggregator = CandleAggregator(['BTCUSDT'], intervals=('1m', '5m'), capacity=50, api=api)
+        aggregator.backfill()
+        self.assertEqual(len(api.kline_calls), 2)
+
+        collector = DataCollector(api, aggregator=aggregator)
+        for _ in range(5):
+            candles = collector.get_recent_data(limit=20)
+        self.assertEqual(len(candles), 20)
+        self.assertEqual(len(api.kline_calls), 2)
+
+        self.assertEqual(collector.get_current_price(), 200.0)
+        self.assertEqual(api.ticker_calls, 0)
+
+    def test_fallback_without_aggregator(self):
+        """집계기가 없으면 REST 조회 테스트"""
+        api = _FakeKlineAPI()
+        collector = DataCollector(api)
+        self.assertEqual(len(collector.get_recent_data(limit=5)), 5)
+        self.assertEqual(collector.get_current_price(), 100.0)
+        self.assertEqual(api.ticker_calls, 1)
+
+    def test_same_row_shape_from_memory_and_rest(self):
+        """메모리/REST 조회 모두 CANDLE_FIELDS 순서의 숫자형 행을 반환하는지 테스트"""
+        api = _FakeKlineAPI()
+        aggregator = CandleAggregator(['BTCUSDT'], intervals=('1m',), capacity=50, api=api)
+        aggregator.backfill()
+        rest_rows = DataCollector(api).get_recent_data(limit=5)
+        memory_rows = DataCollector(api, aggregator=aggregator).get_recent_data(limit=5)
+
+        for rows in (rest_rows, memory_rows):
+            for row in rows:
+                self.assertEqual(len(row), len(CANDLE_FIELDS))
+                self.assertEqual([type(value) for value in row],
+                                 [int if name in ('open_time', 'close_time', 'trades') else float
+                                  for name in CANDLE_FIELDS])
+        self.assertEqual(rest_rows[-1][1:6], memory_rows[-1][1:6])
+
+if __name__ == '__main__':
+    unittest.main()
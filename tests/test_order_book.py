@@ -0,0 +1,153 @@
+import asyncio
+import unittest
+from data.order_book import BookSide, OrderBook, OrderBookManager
+from utils.trading_strategy import TradingStrategy
+
+def _event(first, last, bids=(), asks=()):
+    """depthUpdate 이벤트 생성"""
+    return {'e': 'depthUpdate', 's': 'BTCUSDT', 'U': first, 'u': last,
+            'b': [list(level) for level in bids], 'a': [list(level) for level in asks]}
+
+SNAPSHOT = {
+    'lastUpdateId': 100,
+    'bids': [['49999.00', '1.0'], ['49998.00', '2.0'], ['49997.00', '3.0']],
+    'asks': [['50001.00', '1.5'], ['50002.00', '2.5']]
+}
+
+class TestBookSide(unittest.TestCase):
+    def test_sorted_updates(self):
+        """가격 정렬 유지 및 수량 0 제거 테스트"""
+        bids = BookSide(descending=True)
+        for price, qty in [('100', '1'), ('102', '2'), ('101', '3')]:
+            bids.update(price, qty)
+        self.assertEqual(bids.top(3), [[102.0, 2.0], [101.0, 3.0], [100.0, 1.0]])
+
+        bids.update('102', '0')
+        bids.update('101', '5')
+        self.assertEqual(bids.best(), (101.0, 5.0))
+        self.assertEqual(bids.volume(10), 6.0)
+        self.assertEqual(len(bids), 2)
+
+        asks = BookSide()
+        asks.load([['101', '1'], ['103', '3'], ['102', '2']])
+        asks.update('100.5', '4')
+        self.assertEqual(asks.best(), (100.5, 4.0))
+        self.assertEqual(asks.top(2), [[100.5, 4.0], [101.0, 1.0]])
+        self.assertEqual(asks.top(None), [[100.5, 4.0], [101.0, 1.0], [102.0, 2.0], [103.0, 3.0]])
+        self.assertEqual(asks.top(0), [])
+        self.assertEqual(asks.volume(2), 5.0)
+
+class TestOrderBook(unittest.TestCase):
+    def setUp(self):
+        """테스트 설정"""
+        self.book = OrderBook('BTCUSDT')
+
+    def test_snapshot_with_buffered_events(self):
+        """스냅샷 이전 이벤트 버퍼링 및 순서 결합 테스트"""
+        self.assertFalse(self.book.on_event(_event(95, 100, bids=[('49999.00', '9.0')])))
+        self.assertFalse(self.book.on_event(_event(99, 102, bids=[('50000.00', '0.5')])))
+        self.assertFalse(self.book.on_event(_event(103, 104, asks=[('50001.00', '0')])))
+
+        self.assertTrue(self.book.apply_snapshot(SNAPSHOT))
+        self.assertEqual(self.book.last_update_id, 104)
+
+        # u <= lastUpdateId 인 이벤트는 버려짐 (49999 수량 유지)
+        self.assertEqual(self.book.depth(2)['bids'], [[50000.0, 0.5], [49999.0, 1.0]])
+        self.assertEqual(self.book.best_ask(), (50002.0, 2.5))
+        self.assertEqual(self.book.spread(), 2.0)
+
+    def test_stale_snapshot(self):
+        """버퍼보다 오래된 스냅샷 거부 테스트"""
+        self.book.on_event(_event(150, 151))
+        self.assertFalse(self.book.apply_snapshot(SNAPSHOT))
+        self.assertFalse(self.book.synced)
+        self.assertEqual(self.book.stats['stale_snapshots'], 1)
+
+    def test_gap_detection(self):
+        """이벤트 누락 감지 후 재동기화 필요 상태 전환 테스트"""
+        self.book.apply_snapshot(SNAPSHOT)
+        self.assertTrue(self.book.on_event(_event(101, 101, bids=[('49999.00', '4.0')])))
+        self.assertFalse(self.book.on_event(_event(105, 106)))
+        self.assertFalse(self.book.synced)
+        self.assertEqual(self.book.stats['gaps'], 1)
+        self.assertEqual(len(self.book.buffer), 1)
+
+    def test_gap_inside_buffered_events(self):
+        """스냅샷 적용 중 버퍼 이벤트 누락 시 이후 이벤트 유지 테스트"""
+        for first, last in [(101, 101), (102, 103), (106, 107), (108, 110), (111, 112)]:
+            self.book.on_event(_event(first, last))
+        self.assertFalse(self.book.apply_snapshot(SNAPSHOT))
+        self.assertFalse(self.book.synced)
+        self.assertEqual([event['U'] for event in self.book.buffer], [106, 108, 111])
+
+        # 다음 스냅샷은 남은 이벤트로 동기화
+        snapshot = dict(SNAPSHOT, lastUpdateId=105)
+        self.assertTrue(self.book.apply_snapshot(snapshot))
+        self.assertEqual(self.book.last_update_id, 112)
+
+    def test_imbalance(self):
+        """호가 불균형 및 매수/매도 비율 테스트"""
+        self.book.apply_snapshot(SNAPSHOT)
+        self.assertAlmostEqual(self.book.buy_sell_ratio(10), 6.0 / 4.0)
+        self.assertAlmostEqual(self.book.imbalance(10), 2.0 / 10.0)
+        self.assertAlmostEqual(self.book.buy_sell_ratio(1), 1.0 / 1.5)
+
+class _FakeDepthAPI:
+    """스냅샷 조회용 비동기 API"""
+    def __init__(self, snapshots):
+        self.snapshots = list(snapshots)
+        self.calls = 0
+
+    async def get_market_depth(self, symbol, limit=100):
+        self.calls += 1
+        return self.snapshots.pop(0) if len(self.snapshots) > 1 else self.snapshots[0]
+
+class TestOrderBookManager(unittest.TestCase):
+    def test_automatic_resync(self):
+        """첫 이벤트 및 누락 시 스냅샷 자동 조회 테스트"""
+        async def scenario():
+            api = _FakeDepthAPI([SNAPSHOT, dict(SNAPSHOT, lastUpdateId=200)])
+            manager = OrderBookManager(stream_manager=None, api=api, symbols=['BTCUSDT'], retry_delay=0.01)
+            book = manager.get_book('btcusdt')
+            stream = 'btcusdt@depth@100ms'
+
+            await manager.handle_event(stream, _event(99, 101))
+            while not book.synced:
+                await asyncio.sleep(0.01)
+            synced_id = book.last_update_id
+
+            # 누락 발생 → 두 번째 스냅샷(200)으로 재동기화
+            await manager.handle_event(stream, _event(195, 201))
+            while not book.synced:
+                await asyncio.sleep(0.01)
+            return api.calls, synced_id, book.last_update_id
+
+        calls, synced_id, last_update_id = asyncio.run(asyncio.wait_for(scenario(), 5))
+        self.assertEqual(calls, 2)
+        self.assertEqual(synced_id, 101)
+        self.assertEqual(last_update_id, 201)
+
+class _NoDepthAPI:
+    """REST 호가 조회가 호출되면 실패하는 API"""
+    def get_ticker_price(self, symbol):
+        return 50000.0
+
+    def get_market_summary(self, symbol):
+        return {'price_change_percent': 1.5, 'volume': 1000.0}
+
+    def get_market_depth(self, symbol, limit=100):
+        raise AssertionError("로컬 호가창이 동기화된 경우 REST 호가를 조회하지 않아야 함")
+
+class TestStrategyOrderBook(unittest.TestCase):
+    def test_analysis_uses_local_book(self):
+        """동기화된 로컬 호가창으로 시장 분석 테스트"""
+        book = OrderBook('BTCUSDT')
+        book.apply_snapshot(SNAPSHOT)
+        strategy = TradingStrategy(_NoDepthAPI(), auto_trading=False, order_book=book)
+
+        analysis = strategy.analyze_market()
+        self.assertAlmostEqual(analysis['buy_sell_ratio'], book.buy_sell_ratio(10))
+        self.assertEqual(analysis['market_sentiment'], "STRONG_BUY")
+
+if __name__ == '__main__':
+    unittest.main()
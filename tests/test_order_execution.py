@@ -0,0 +1,118 @@
+import hmac
+import json
+import time
+import hashlib
+import threading
+import unittest
+from urllib.parse import urlsplit, parse_qsl
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from exchanges.exchange_utils import RequestSigner
+from utils.api_connector import BinanceAPI
+from utils import error_handler
+
+class _OrderHandler(BaseHTTPRequestHandler):
+    """테스트용 로컬 주문 엔드포인트"""
+    protocol_version = "HTTP/1.1"
+    requests = []
+    server_time_offset = 0  # 밀리초
+
+    def _send_json(self, body):
+        payload = json.dumps(body).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        if self.path.startswith("/api/v3/time"):
+            self._send_json({'serverTime': int(time.time() * 1000) + self.server_time_offset})
+            return
+        self.requests.append(('GET', self.path, dict(self.headers)))
+        self._send_json([])
+
+    def do_POST(self):
+        self.requests.append(('POST', self.path, dict(self.headers)))
+        self._send_json({})
+
+    def log_message(self, format, *args):
+        pass
+
+class TestRequestSigner(unittest.TestCase):
+    def setUp(self):
+        """테스트 설정"""
+        self.secret = "test-secret-key"
+        self.signer = RequestSigner("test-api-key", self.secret)
+
+    def test_signature(self):
+        """미리 키가 적용된 HMAC 서명이 기존 방식과 동일한지 테스트"""
+        query_string = "price=50000.00&quantity=0.00100&side=BUY&symbol=BTCUSDT"
+        expected = hmac.new(self.secret.encode('utf-8'), query_string.encode('utf-8'),
+                            hashlib.sha256).hexdigest()
+
+        # 여러 번 호출해도 같은 결과 (상태 복사 확인)
+        self.assertEqual(self.signer.signature(query_string), expected)
+        self.assertEqual(self.signer.signature(query_string), expected)
+
+    def test_sign_params(self):
+        """서명 쿼리 스트링 생성 테스트"""
+        query_string, params = self.signer.sign({'symbol': 'BTCUSDT', 'limit': 10})
+        self.assertIn('timestamp', params)
+        self.assertEqual(params['recvWindow'], 5000)
+
+        payload, signature = query_string.rsplit('&signature=', 1)
+        self.assertEqual(payload, '&'.join(f"{k}={v}" for k, v in sorted(params.items())))
+        self.assertEqual(signature, self.signer.signature(payload))
+
+    def test_time_offset(self):
+        """서버 시간 오프셋 반영 테스트"""
+        now = time.time()
+        self.signer.update_time_offset(int(now * 1000) + 5000, now - 0.01, now + 0.01)
+        self.assertAlmostEqual(self.signer.timestamp() - int(time.time() * 1000), 5000, delta=50)
+        self.assertFalse(self.signer.needs_time_sync())
+
+    def test_benchmark(self):
+        """서명 비용 벤치마크 테스트"""
+        result = self.signer.benchmark(iterations=2000)
+        self.assertGreater(result['naive_us'], 0)
+        self.assertGreater(result['precomputed_us'], 0)
+        error_handler.log_info(f"서명 벤치마크: {result}")
+
+class TestSignedOrderFlow(unittest.TestCase):
+    def setUp(self):
+        """로컬 서버 설정"""
+        _OrderHandler.requests = []
+        _OrderHandler.server_time_offset = 3000
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), _OrderHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.api = BinanceAPI(max_retries=0)
+        self.api.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def tearDown(self):
+        self.api.close()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_signed_order(self):
+        """서명 주문 요청 및 서버 시간 동기화 테스트"""
+        self.api.create_order(symbol="BTCUSDT", order_type="LIMIT", side="BUY",
+                              quantity=0.001, price=50000.0, test=True)
+        self.api.get_open_orders("BTCUSDT")
+
+        # 최초 서명 요청 시 서버 시간 오프셋 동기화
+        self.assertAlmostEqual(self.api.signer.time_offset, 3000, delta=100)
+
+        method, path, headers = _OrderHandler.requests[0]
+        self.assertEqual(method, 'POST')
+        self.assertIn('X-MBX-APIKEY', headers)
+
+        query = urlsplit(path).query
+        payload, signature = query.rsplit('&signature=', 1)
+        self.assertEqual(signature, self.api.signer.signature(payload))
+
+        params = dict(parse_qsl(payload))
+        self.assertAlmostEqual(int(params['timestamp']) - int(time.time() * 1000), 3000, delta=1000)
+        self.assertEqual(len(_OrderHandler.requests), 2)
+
+if __name__ == '__main__':
+    unittest.main()
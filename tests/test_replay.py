@@ -0,0 +1,170 @@
+import os
+import json
+import time
+import asyncio
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from utils.api_connector import BinanceAPI
+from utils.replay import ReplayServer, TrafficRecorder, load_recording
+from utils.websocket_handler import BinanceWebSocket
+from data.websocket_client import StreamManager
+from utils import error_handler
+
+class _LiveHandler(BaseHTTPRequestHandler):
+    """기록 대상 역할의 로컬 서버"""
+    protocol_version = "HTTP/1.1"
+
+    def _send_json(self, body):
+        payload = json.dumps(body).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.send_header('X-MBX-USED-WEIGHT-1M', '7')
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        if self.path.startswith("/api/v3/time"):
+            self._send_json({'serverTime': int(time.time() * 1000)})
+        elif self.path.startswith("/api/v3/ticker/price"):
+            self._send_json({'symbol': 'BTCUSDT', 'price': '50000.00'})
+        elif self.path.startswith("/api/v3/depth"):
+            self._send_json({'lastUpdateId': 1, 'bids': [['49999.00', '1.0']], 'asks': [['50001.00', '2.0']]})
+        else:
+            self._send_json([])
+
+    def do_POST(self):
+        self._send_json({'symbol': 'BTCUSDT', 'orderId': 1, 'status': 'NEW'})
+
+    def log_message(self, format, *args):
+        pass
+
+class TestRecordReplay(unittest.TestCase):
+    def setUp(self):
+        """기록 파일 및 로컬 서버 설정"""
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'session.jsonl.gz')
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), _LiveHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.directory.cleanup()
+
+    def _run_session(self, base_url, record_path=None):
+        """시세 조회 + 주문 흐름 실행"""
+        api = BinanceAPI(max_retries=0, coalesce_window=0.0)
+        api.base_url = base_url
+        api.use_price_caching = False
+        if record_path:
+            api.start_recording(record_path)
+        try:
+            return [
+                api.get_ticker_price("BTCUSDT"),
+                api.get_market_depth("BTCUSDT", limit=5),
+                api.create_order(symbol="BTCUSDT", order_type="LIMIT", side="BUY",
+                                 quantity=0.001, price=50000.0, test=True)
+            ]
+        finally:
+            api.close()
+
+    def test_record_and_replay(self):
+        """기록한 REST 응답을 재생 서버로 동일하게 재현하는지 테스트"""
+        recorded = self._run_session(f"http://127.0.0.1:{self.server.server_address[1]}", self.path)
+
+        entries = load_recording(self.path)
+        endpoints = [entry['endpoint'] for entry in entries if entry['kind'] == 'http']
+        self.assertIn('/api/v3/order/test', endpoints)
+        order = next(entry for entry in entries if entry['endpoint'] == '/api/v3/order/test')
+        self.assertNotIn('timestamp', order['params'])
+        self.assertEqual(order['headers']['x-mbx-used-weight-1m'], '7')
+
+        # 재생 시 고정 지연시간 적용, 서명 타임스탬프가 달라도 같은 응답
+        with ReplayServer(self.path, latency=0.05, jitter=0.01, seed=1) as replay:
+            start_time = time.perf_counter()
+            replayed = self._run_session(replay.base_url)
+            elapsed = time.perf_counter() - start_time
+            self.assertEqual(replay.stats['unmatched'], 0)
+
+        self.assertEqual(replayed, recorded)
+        self.assertGreater(elapsed, 0.12)
+        error_handler.log_info(f"재생 세션 소요시간: {elapsed:.3f}초")
+
+    def test_unmatched_request(self):
+        """기록되지 않은 요청은 404 응답 테스트"""
+        with ReplayServer(entries=[]) as replay:
+            api = BinanceAPI(max_retries=0)
+            api.base_url = replay.base_url
+            with self.assertRaises(Exception):
+                api.get_market_depth("BTCUSDT", limit=5)
+            api.close()
+            self.assertEqual(replay.stats['unmatched'], 1)
+
+    def test_websocket_replay_reconnect(self):
+        """WebSocket 메시지 재생 및 연결 끊김 후 재연결 테스트"""
+        stream = "/ws/btcusdt@trade"
+        entries = [
+            {'kind': 'ws', 'stream': stream, 't': index * 0.01, 'data': json.dumps({'p': str(50000 + index)})}
+            for index in range(5)
+        ]
+
+        async def async_test(ws_url, recorder):
+            ws_client = BinanceWebSocket(base_url=ws_url, recorder=recorder)
+            ws_client.reconnect_delay = 0.01
+            await ws_client.connect()
+            messages = [await ws_client.receive_message() for _ in range(5)]
+            await ws_client.close()
+            return messages
+
+        recorder = TrafficRecorder(self.path)
+        with ReplayServer(entries=entries, speed=0, disconnect_after=2) as replay:
+            messages = asyncio.run(async_test(replay.ws_url, recorder))
+            connections = replay.stats['ws_connections']
+        recorder.close()
+
+        self.assertEqual([message['p'] for message in messages], [str(50000 + i) for i in range(5)])
+        self.assertEqual(connections, 3)
+
+        # 재수신한 메시지도 같은 형식으로 다시 기록됨
+        self.assertEqual([entry['data'] for entry in load_recording(self.path)],
+                         [entry['data'] for entry in entries])
+
+    def test_combined_stream_record_and_replay(self):
+        """StreamManager combined stream 수신 프레임 기록 및 재생 테스트"""
+        streams = ['btcusdt@depth@100ms', 'btcusdt@trade']
+        path = f"/stream?streams={'/'.join(streams)}"
+        entries = [
+            {'kind': 'ws', 'stream': path, 't': index * 0.01,
+             'data': json.dumps({'stream': streams[index % 2], 'data': {'s': 'BTCUSDT', 'n': index}})}
+            for index in range(6)
+        ]
+
+        async def async_test(ws_url, recorder):
+            received = []
+
+            async def handler(stream, data):
+                received.append((stream, data['n']))
+
+            async with StreamManager(base_url=ws_url, recorder=recorder) as manager:
+                await manager.subscribe(streams, handler)
+                while len(received) < len(entries):
+                    await asyncio.sleep(0.01)
+            return received
+
+        recorder = TrafficRecorder(self.path)
+        with ReplayServer(entries=entries, speed=0) as replay:
+            received = asyncio.run(asyncio.wait_for(async_test(replay.ws_url, recorder), 10))
+        recorder.close()
+
+        self.assertEqual(sorted(n for _, n in received), list(range(6)))
+        self.assertTrue(all(stream == streams[n % 2] for stream, n in received))
+        # 기록 경로가 같아 기록 파일을 그대로 재생 서버에 사용할 수 있음
+        recorded = load_recording(self.path)
+        self.assertEqual([(entry['stream'], entry['data']) for entry in recorded],
+                         [(entry['stream'], entry['data']) for entry in entries])
+
+if __name__ == '__main__':
+    unittest.main()
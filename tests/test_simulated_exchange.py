@@ -0,0 +1,101 @@
+import time
+import unittest
+import numpy as np
+from exchanges.simulated_exchange import SimulatedExchange, DAY_MS
+from utils.trading_strategy import TradingStrategy
+
+class _LiveAPI:
+    """시뮬레이션 중 호출되면 실패하는 실제 API 자리"""
+    def __getattr__(self, name):
+        raise AssertionError(f"시뮬레이션에서 실제 API 호출: {name}")
+
+def _flat_arrays(closes, lows=None, highs=None, interval_ms=3600000):
+    closes = np.asarray(closes, dtype=np.float64)
+    return {
+        'open_time': 1700000000000 + np.arange(len(closes), dtype=np.int64) * interval_ms,
+        'open': closes.copy(),
+        'high': np.asarray(highs if highs is not None else closes, dtype=np.float64),
+        'low': np.asarray(lows if lows is not None else closes, dtype=np.float64),
+        'close': closes,
+        'volume': np.full(len(closes), 10.0),
+        'taker_buy_volume': np.full(len(closes), 6.0)
+    }
+
+class TestSimulatedExchange(unittest.TestCase):
+    def test_market_data(self):
+        """24시간 요약과 합성 호가가 캔들 데이터와 일치하는지 테스트"""
+        exchange = SimulatedExchange.synthetic(count=100, seed=1)
+        for _ in range(50):
+            exchange.step()
+        index = exchange.index
+        summary = exchange.get_market_summary('BTCUSDT')
+        start = index - 23
+        self.assertAlmostEqual(summary['volume'], exchange.volume[start:index + 1].sum())
+        self.assertAlmostEqual(summary['price_change_percent'],
+                               (exchange.close[index] - exchange.open[start]) / exchange.open[start] * 100)
+        self.assertEqual(summary['high_price'], exchange.high[start:index + 1].max())
+        self.assertEqual(exchange.get_ticker_price('BTCUSDT'), exchange.close[index])
+
+        depth = exchange.get_market_depth('BTCUSDT', limit=10)
+        bid_volume = sum(float(qty) for _, qty in depth['bids'])
+        ask_volume = sum(float(qty) for _, qty in depth['asks'])
+        buy = exchange.taker_buy_volume[index]
+        self.assertAlmostEqual(bid_volume / ask_volume, buy / (exchange.volume[index] - buy), places=5)
+        self.assertLess(float(depth['bids'][0][0]), exchange.close[index])
+        self.assertGreater(float(depth['asks'][0][0]), exchange.close[index])
+
+    def test_limit_order_matching(self):
+        """지정가 대기 주문의 메이커 체결, 수수료, 접수 지연, 취소 테스트"""
+        arrays = _flat_arrays([100.0, 100.0, 100.0, 100.0], lows=[100.0, 99.5, 98.5, 100.0])
+        exchange = SimulatedExchange(arrays, balances={'USDT': 1000.0, 'BTC': 0.0},
+                                     maker_fee=0.001, taker_fee=0.002, latency_ms=50)
+        order = exchange.create_order('BTCUSDT', 'LIMIT', 'BUY', 1.0, price=99.0, test=False)
+        self.assertEqual(order['status'], 'NEW')
+        self.assertEqual(order['transactTime'], exchange.clock.time() + 50)
+        self.assertEqual(exchange.get_asset_balance('USDT')['locked'], 99.0)
+
+        exchange.step()   # 저가 99.5: 미체결
+        self.assertEqual(exchange.get_order('BTCUSDT', order['orderId'])['status'], 'NEW')
+        exchange.step()   # 저가 98.5: 지정가 체결
+        filled = exchange.get_order('BTCUSDT', order['orderId'])
+        self.assertEqual(filled['status'], 'FILLED')
+        self.assertEqual(float(filled['fills'][0]['price']), 99.0)
+        self.assertAlmostEqual(exchange.get_asset_balance('BTC')['free'], 1.0 - 0.001)
+        self.assertAlmostEqual(exchange.get_asset_balance('USDT')['total'], 1000.0 - 99.0)
+        self.assertTrue(exchange.get_my_trades('BTCUSDT')[-1]['isMaker'])
+
+        # 즉시 체결 가능한 매도 지정가는 현재가로 테이커 체결
+        sell = exchange.create_order('BTCUSDT', 'LIMIT', 'SELL', 0.5, price=95.0, test=False)
+        self.assertEqual(float(sell['fills'][0]['price']), 100.0)
+        self.assertAlmostEqual(float(sell['fills'][0]['commission']), 100.0 * 0.5 * 0.002)
+
+        # 취소 시 잠금 해제, 잔고 부족 주문 거부
+        pending = exchange.create_order('BTCUSDT', 'LIMIT', 'BUY', 1.0, price=50.0, test=False)
+        self.assertEqual(len(exchange.get_open_orders('BTCUSDT')), 1)
+        exchange.cancel_order('BTCUSDT', pending['orderId'])
+        self.assertEqual(exchange.get_asset_balance('USDT')['locked'], 0.0)
+        with self.assertRaises(ValueError):
+            exchange.create_order('BTCUSDT', 'MARKET', 'BUY', 100.0, test=False)
+
+    def test_simulate_trades_without_live_calls(self):
+        """simulate_trades 가 실제 API 호출/대기 없이 전략 코드 경로로 실행되는지 테스트"""
+        exchange = SimulatedExchange.synthetic(count=30 * 24 + 1, seed=4)
+        strategy = TradingStrategy(_LiveAPI())
+        started = time.perf_counter()
+        metrics = strategy.simulate_trades(days=30, exchange=exchange)
+        elapsed = time.perf_counter() - started
+
+        simulation = metrics['simulation']
+        self.assertEqual(simulation['steps'], 30 * 24 - 1)
+        self.assertEqual(simulation['end_time'] - simulation['start_time'], (30 * 24 - 1) * 3600000)
+        self.assertLess(simulation['end_time'] - simulation['start_time'], 30 * DAY_MS)
+        self.assertGreater(metrics['total_trades'], 0)
+        self.assertEqual(metrics['total_trades'], simulation['fills'])
+        self.assertEqual(simulation['orders'], simulation['fills'])
+        self.assertIsNone(metrics['current_position'])
+        self.assertGreater(simulation['fees']['USDT'] + simulation['fees'].get('BTC', 0), 0)
+        self.assertIsInstance(strategy.binance_api, _LiveAPI)
+        self.assertLess(elapsed, 30 * 0.1)
+
+if __name__ == '__main__':
+    unittest.main()
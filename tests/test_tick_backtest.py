@@ -0,0 +1,204 @@
+import os
+import json
+import tempfile
+import tracemalloc
+import unittest
+import numpy as np
+from data.order_book import OrderBook
+from utils.tick_backtest import (
+    TickBacktester, TickEventWriter, convert_recording, iter_event_chunks, TICK_EVENT_DTYPE,
+    EVENT_TRADE, EVENT_BID, EVENT_ASK
+)
+from utils.replay import TrafficRecorder
+from utils.trading_strategy import TradingStrategy
+
+BASE_TIME = 1700000000000
+
+def _market_events(steps=600, seed=3):
+    """스냅샷 1개와 100ms 마다의 depth diff/체결 이벤트 (스트림 형식)"""
+    rng = np.random.default_rng(seed)
+    mid = 30000.0
+    snapshot = {
+        'lastUpdateId': 100,
+        'bids': [[f"{mid - 0.5 - i * 0.5:.2f}", "1.0"] for i in range(40)],
+        'asks': [[f"{mid + 0.5 + i * 0.5:.2f}", "1.0"] for i in range(40)]
+    }
+    events = []
+    update_id = 100
+    trade_id = 0
+    for step in range(steps):
+        mid += rng.normal(0, 15)
+        event_time = BASE_TIME + step * 100
+        bids, asks = [], []
+        for _ in range(rng.integers(5, 30)):
+            offset = 0.5 * rng.integers(1, 40)
+            qty = f"{rng.choice([0.0, rng.uniform(0.1, 5.0)]):.3f}"
+            bids.append([f"{round(mid - offset, 1):.2f}", qty])
+        for _ in range(rng.integers(5, 30)):
+            offset = 0.5 * rng.integers(1, 40)
+            qty = f"{rng.choice([0.0, rng.uniform(0.1, 5.0)]):.3f}"
+            asks.append([f"{round(mid + offset, 1):.2f}", qty])
+        events.append({'e': 'depthUpdate', 'E': event_time, 's': 'BTCUSDT', 'U': update_id + 1,
+                       'u': update_id + 2, 'b': bids, 'a': asks})
+        update_id += 2
+        for index in range(rng.integers(0, 4)):
+            trade_id += 1
+            events.append({'e': 'trade', 'E': event_time, 's': 'BTCUSDT', 't': trade_id,
+                           'p': f"{mid:.2f}", 'q': "0.010", 'T': event_time + index, 'm': bool(index % 2)})
+    return snapshot, events
+
+class _RecordingBacktester(TickBacktester):
+    """평가 시점의 매수/매도 비율 기록"""
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.ratios = []
+
+    def _evaluate(self, event_time):
+        if self.last_price is not None:
+            self.ratios.append((event_time, self.buy_sell_ratio()))
+        super()._evaluate(event_time)
+
+class TestTickBacktester(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.snapshot, self.events = _market_events()
+        writer = TickEventWriter(self.directory.name, chunk_rows=2000)
+        writer.on_snapshot(self.snapshot, BASE_TIME - 1)
+        for event in self.events:
+            if event['e'] == 'trade':
+                writer.on_trade(event)
+            else:
+                writer.on_depth(event)
+        writer.close()
+        self.writer = writer
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_event_files(self):
+        """이벤트 파일 분할 기록 및 메모리 매핑 읽기 테스트"""
+        self.assertGreater(len(self.writer.files), 1)
+        rows = sum(len(chunk) for chunk in iter_event_chunks(self.directory.name, chunk_rows=500))
+        self.assertEqual(rows, self.writer.rows)
+        first = next(iter_event_chunks(self.directory.name))
+        self.assertIsInstance(first, np.memmap)
+
+    def test_book_matches_live_order_book(self):
+        """재생 호가의 매수/매도 비율이 실시간 OrderBook 과 일치하는지 테스트"""
+        strategy = TradingStrategy(None)
+        backtester = _RecordingBacktester(strategy, tick_size=0.01, decision_interval_ms=100, chunk_rows=700)
+        backtester.run(self.directory.name)
+
+        # 같은 이벤트를 실시간 호가창으로 처리하고 100ms 구간 끝마다 비율 계산
+        book = OrderBook('BTCUSDT')
+        book.on_event(self.events[0])
+        book.apply_snapshot(self.snapshot)
+        expected = {}
+        traded = False
+        for event in self.events:
+            if event['e'] == 'depthUpdate':
+                book.on_event(event)
+            else:
+                traded = True
+            if traded:
+                expected[event['E'] // 100] = book.buy_sell_ratio(10)
+
+        self.assertEqual(len(backtester.ratios), len(expected))
+        for event_time, ratio in backtester.ratios:
+            self.assertEqual(ratio, expected[event_time // 100])
+
+    def test_recording_with_diff_before_snapshot(self):
+        """스냅샷 응답 전에 수신한 diff 를 스냅샷 뒤에 다시 반영하여 실시간 OrderBook 과 일치하는지 테스트"""
+        # 스냅샷에 이미 포함된 diff(u <= lastUpdateId)와 포함되지 않은 diff 가 스냅샷 응답 전에 도착
+        stale = {'e': 'depthUpdate', 'E': BASE_TIME - 50, 's': 'BTCUSDT', 'U': 99, 'u': 100,
+                 'b': [[self.snapshot['bids'][0][0], "7.0"]], 'a': []}
+        before = [stale, self.events[0]]
+        path = os.path.join(self.directory.name, 'traffic.jsonl.gz')
+        recorder = TrafficRecorder(path)
+        for event in before:
+            recorder.record_ws('/stream', json.dumps({'stream': 'btcusdt@depth', 'data': event}))
+        recorder.record_http('GET', '/api/v3/depth', {'symbol': 'BTCUSDT', 'limit': 1000}, None, 200, {},
+                             json.dumps(self.snapshot), 0.01)
+        for event in self.events[1:]:
+            recorder.record_ws('/stream', json.dumps({'stream': 'btcusdt@depth', 'data': event}))
+        recorder.close()
+
+        output = os.path.join(self.directory.name, 'converted')
+        convert_recording(path, output, 'BTCUSDT')
+        strategy = TradingStrategy(None)
+        backtester = _RecordingBacktester(strategy, tick_size=0.01, decision_interval_ms=100)
+        backtester.run(output)
+
+        book = OrderBook('BTCUSDT')
+        for event in before:
+            book.on_event(event)
+        book.apply_snapshot(self.snapshot)
+        expected = {}
+        traded = False
+        for event in self.events[1:]:
+            if event['e'] == 'depthUpdate':
+                book.on_event(event)
+            else:
+                traded = True
+            if traded:
+                expected[event['E'] // 100] = book.buy_sell_ratio(10)
+
+        self.assertTrue(book.synced)
+        self.assertEqual(len(backtester.ratios), len(expected))
+        for event_time, ratio in backtester.ratios:
+            self.assertEqual(ratio, expected[event_time // 100])
+
+    def test_strategy_trades_on_depth_signals(self):
+        """호가 기반 신호로 거래하고 모의 브로커로 체결하는지 테스트"""
+        strategy = TradingStrategy(None)
+        strategy.stop_loss = 0.05
+        strategy.take_profit = 0.05
+        backtester = TickBacktester(strategy, change_window_ms=60000)
+        result = backtester.run(self.directory.name)
+
+        self.assertGreater(result['trade_count'], 0)
+        self.assertEqual(result['trade_count'] % 2, 0)
+        self.assertIsNone(strategy.position)
+        self.assertIsNone(strategy.binance_api)
+        trade_prices = {float(event['p']) for event in self.events if event['e'] == 'trade'}
+        self.assertTrue(all(fill['price'] in trade_prices for fill in result['fills']))
+        self.assertEqual(result['events'], self.writer.rows)
+
+    def _large_events(self, count=2000000):
+        """대용량 이벤트 파일 (100ms 마다 200개, 반환: 이벤트 디렉토리)"""
+        rng = np.random.default_rng(9)
+        events = np.zeros(count, dtype=TICK_EVENT_DTYPE)
+        events['time'] = BASE_TIME + np.arange(count) // 200 * 100
+        kinds = rng.choice([EVENT_TRADE, EVENT_BID, EVENT_ASK], size=count, p=[0.1, 0.45, 0.45])
+        mid = 30000 + np.cumsum(rng.normal(0, 0.05, count))
+        offset = rng.integers(1, 200, count) * 0.01
+        events['kind'] = kinds
+        events['price'] = np.where(kinds == EVENT_BID, mid - offset, np.where(kinds == EVENT_ASK, mid + offset, mid))
+        events['price'] = np.round(events['price'], 2)
+        events['qty'] = np.where(rng.random(count) < 0.2, 0.0, rng.uniform(0.1, 2.0, count))
+        path = os.path.join(self.directory.name, 'large', 'events-000000.npy')
+        os.makedirs(os.path.dirname(path))
+        np.save(path, events)
+        return os.path.dirname(path)
+
+    def test_bounded_memory(self):
+        """대용량 이벤트 재생 시 메모리 상한 테스트"""
+        source = self._large_events()
+        backtester = TickBacktester(TradingStrategy(None), book_levels=1 << 18, chunk_rows=200000)
+        tracemalloc.start()
+        result = backtester.run(source)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        self.assertEqual(result['events'], 2000000)
+        self.assertLess(peak, 48 * 1024 * 1024)   # 데이터 파일 크기(약 68MB)보다 작음
+
+    @unittest.skipUnless(os.environ.get('RUN_BENCHMARKS'), "처리량 측정은 RUN_BENCHMARKS=1 일 때만 실행")
+    def test_throughput(self):
+        """대용량 이벤트 재생 처리량 테스트 (부하가 없는 환경에서 실행)"""
+        result = TickBacktester(TradingStrategy(None), book_levels=1 << 18, chunk_rows=200000)\
+            .run(self._large_events())
+        self.assertEqual(result['events'], 2000000)
+        self.assertGreater(result['events_per_sec'], 1000000)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,7 @@
 import unittest
 from utils.api_connector import BinanceAPI
 from utils.trading_strategy import TradingStrategy
+from utils.backtest_engine import BacktestResult
 from utils import error_handler
 import time
 
@@ -233,7 +234,7 @@ class TestTradingStrategy(unittest.TestCase):
             )
             
             # 결과 검증
-            self.assertIsInstance(results, list)
+            self.assertIsInstance(results, BacktestResult)
             self.assertGreater(len(results), 0)
             
             # 각 결과 항목 검증
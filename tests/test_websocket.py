@@ -0,0 +1,235 @@
+import json
+import time
+import asyncio
+import unittest
+from urllib.parse import urlsplit, parse_qs
+import websockets
+from data.websocket_client import StreamManager, StreamConsumer, stream_name, stream_names, extract_stream
+
+class _CombinedStreamServer:
+    """테스트용 로컬 combined stream 서버 (SUBSCRIBE/UNSUBSCRIBE 지원)"""
+    def __init__(self, close_after=None, interval=0.01):
+        self.close_after = close_after
+        self.interval = interval
+        self.connections = 0
+        self.controls = []
+        self.server = None
+        self.url = None
+
+    async def start(self):
+        self.server = await websockets.serve(self.handler, '127.0.0.1', 0)
+        self.url = f"ws://127.0.0.1:{self.server.sockets[0].getsockname()[1]}"
+
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def handler(self, ws, path):
+        self.connections += 1
+        query = parse_qs(urlsplit(path).query)
+        streams = set(query.get('streams', [''])[0].split('/')) - {''}
+
+        async def read_controls():
+            async for message in ws:
+                request = json.loads(message)
+                self.controls.append((request['method'], request['params']))
+                if request['method'] == 'SUBSCRIBE':
+                    streams.update(request['params'])
+                else:
+                    streams.difference_update(request['params'])
+                await ws.send(json.dumps({'result': None, 'id': request['id']}))
+
+        reader = asyncio.create_task(read_controls())
+        sent = 0
+        try:
+            while True:
+                for stream in sorted(streams):
+                    event = {'E': int(time.time() * 1000) - 5, 's': stream, 'n': sent}
+                    await ws.send(json.dumps({'stream': stream, 'data': event}, separators=(',', ':')))
+                    sent += 1
+                    if self.close_after is not None and sent >= self.close_after:
+                        await ws.close()
+                        return
+                await asyncio.sleep(self.interval)
+        except websockets.ConnectionClosed:
+            pass
+        finally:
+            reader.cancel()
+
+class TestStreamManager(unittest.TestCase):
+    def _run(self, coroutine_function, **server_options):
+        async def async_test():
+            server = _CombinedStreamServer(**server_options)
+            await server.start()
+            try:
+                return await asyncio.wait_for(coroutine_function(server), 10)
+            finally:
+                await server.stop()
+        return asyncio.run(async_test())
+
+    def test_stream_names(self):
+        """스트림 이름 생성 테스트"""
+        self.assertEqual(stream_name('BTCUSDT', 'kline', '5m'), 'btcusdt@kline_5m')
+        self.assertEqual(stream_names(['BTCUSDT', 'ETHUSDT'], kinds=('trade', 'depth')),
+                         ['btcusdt@trade', 'btcusdt@depth@100ms', 'ethusdt@trade', 'ethusdt@depth@100ms'])
+
+    def test_sharding_and_dispatch(self):
+        """연결당 스트림 제한에 따른 분산 및 스트림별 전달 테스트"""
+        async def scenario(server):
+            received = {}
+
+            async def handler(stream, data):
+                received.setdefault(stream, []).append(data)
+
+            async with StreamManager(base_url=server.url, max_streams_per_connection=2) as manager:
+                streams = stream_names(['BTCUSDT'], kinds=('trade', 'depth', 'bookTicker'))
+                await manager.subscribe(streams, handler)
+                while len(received) < 3:
+                    await asyncio.sleep(0.01)
+                return received, manager.get_stats()
+
+        received, stats = self._run(scenario)
+        self.assertEqual(len(stats['connections']), 2)
+        self.assertEqual(sorted(c['streams'] for c in stats['connections']), [1, 2])
+        for stream, messages in received.items():
+            self.assertTrue(all(message['s'] == stream for message in messages))
+
+    def test_runtime_subscribe(self):
+        """실행 중 구독 추가/해제 테스트"""
+        async def scenario(server):
+            received = []
+
+            async def handler(stream, data):
+                received.append(stream)
+
+            async with StreamManager(base_url=server.url) as manager:
+                await manager.subscribe(['btcusdt@trade'], handler)
+                while not received:
+                    await asyncio.sleep(0.01)
+
+                # 같은 연결에 SUBSCRIBE 로 추가
+                await manager.subscribe(['ethusdt@trade'], handler)
+                while 'ethusdt@trade' not in received:
+                    await asyncio.sleep(0.01)
+
+                await manager.unsubscribe(['btcusdt@trade'])
+                await asyncio.sleep(0.05)
+                received.clear()
+                await asyncio.sleep(0.05)
+                return received, server.connections
+
+        received, connections = self._run(scenario)
+        self.assertEqual(connections, 1)
+        self.assertTrue(received)
+        self.assertNotIn('btcusdt@trade', received)
+
+    def test_reconnect(self):
+        """연결 종료 후 무기한 재연결 테스트"""
+        async def scenario(server):
+            received = []
+
+            async def handler(stream, data):
+                received.append(data)
+
+            async with StreamManager(base_url=server.url, backoff_base=0.01) as manager:
+                await manager.subscribe(['btcusdt@trade'], handler)
+                while len(received) < 10:
+                    await asyncio.sleep(0.01)
+                return manager.get_stats()
+
+        stats = self._run(scenario, close_after=3)
+        self.assertGreaterEqual(stats['connections'][0]['reconnects'], 3)
+
+    def test_bounded_queue(self):
+        """소비자 큐가 가득 차면 가장 오래된 메시지를 버리는지 테스트"""
+        async def scenario():
+            consumer = StreamConsumer(handler=None, queue_size=2)
+            for index in range(5):
+                await consumer.put('btcusdt@trade', index)
+            return consumer, [consumer.queue.get_nowait()[1] for _ in range(2)]
+
+        consumer, remaining = asyncio.run(scenario())
+        self.assertEqual(remaining, [3, 4])
+        self.assertEqual(consumer.stats['dropped'], 3)
+
+    def test_conflate_policy(self):
+        """스트림별 최신 메시지만 처리하고 나머지는 디코딩하지 않는지 테스트"""
+        decoded = []
+
+        def decoder(frame):
+            decoded.append(frame)
+            return json.loads(frame)
+
+        async def scenario():
+            processed = []
+
+            async def handler(stream, data):
+                processed.append((stream, data['n']))
+
+            consumer = StreamConsumer(handler, policy='conflate', decoder=decoder)
+            for index in range(5):
+                for stream in ('btcusdt@bookTicker', 'ethusdt@bookTicker'):
+                    await consumer.put(stream, json.dumps({'stream': stream, 'data': {'n': index}}))
+            consumer.start()
+            await consumer.queue.join()
+            await consumer.stop()
+            return consumer.get_stats(), processed
+
+        stats, processed = asyncio.run(scenario())
+        self.assertEqual(processed, [('btcusdt@bookTicker', 4), ('ethusdt@bookTicker', 4)])
+        self.assertEqual(stats['conflated'], 8)
+        self.assertEqual(len(decoded), 2)
+
+    def test_block_policy(self):
+        """block 정책은 자리가 날 때까지 대기하는지 테스트"""
+        async def scenario():
+            consumer = StreamConsumer(handler=None, queue_size=1, policy='block')
+            await consumer.put('btcusdt@depth@100ms', 1)
+            blocked = asyncio.create_task(consumer.put('btcusdt@depth@100ms', 2))
+            await asyncio.sleep(0.02)
+            waiting = not blocked.done()
+            consumer.queue.get_nowait()
+            await asyncio.wait_for(blocked, 1)
+            return waiting, consumer.stats['dropped']
+
+        waiting, dropped = asyncio.run(scenario())
+        self.assertTrue(waiting)
+        self.assertEqual(dropped, 0)
+
+    def test_pipeline_metrics(self):
+        """접두사 기반 전달, 처리 속도, 큐 깊이, 이벤트 지연 통계 테스트"""
+        self.assertEqual(extract_stream('{"stream":"btcusdt@trade","data":{}}'), 'btcusdt@trade')
+        self.assertIsNone(extract_stream('{"result":null,"id":1}'))
+
+        async def scenario(server):
+            received = []
+
+            async def handler(stream, data):
+                received.append(data)
+
+            async with StreamManager(base_url=server.url, batch_size=8) as manager:
+                await manager.subscribe(['btcusdt@trade'], handler)
+                while len(received) < 20:
+                    await asyncio.sleep(0.01)
+                return manager.get_stats()
+
+        stats = self._run(scenario)
+        self.assertGreater(stats['messages_per_sec'], 0)
+        self.assertGreater(stats['batches'], 0)
+        consumer = stats['consumers']['btcusdt@trade'][0]
+        self.assertGreaterEqual(consumer['processed'], 20)
+        self.assertIn('queue_depth', consumer)
+        self.assertGreater(consumer['lag_max'], 0)
+        # 스트림 메시지는 파이프라인에서 디코딩하지 않음 (제어 응답만)
+        self.assertEqual(stats['decoded_in_pipeline'], 0)
+
+    def test_backoff_delay(self):
+        """지터가 적용된 지수 백오프 테스트"""
+        manager = StreamManager(backoff_base=1.0, backoff_max=8.0)
+        for attempt, base in [(1, 1.0), (3, 4.0), (10, 8.0), (5000, 8.0), (10 ** 6, 8.0)]:
+            delay = manager.backoff_delay(attempt)
+            self.assertGreaterEqual(delay, base * 0.5)
+            self.assertLessEqual(delay, base * 1.5)
+
+if __name__ == '__main__':
+    unittest.main()
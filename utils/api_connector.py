@@ -1,19 +1,341 @@
 import os
+import json
 import time
 import ccxt
+import threading
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from dotenv import load_dotenv
 from . import error_handler
-import hmac
-import hashlib
+from .cache_manager import TTLCache, SingleFlight
+from .replay import TrafficRecorder
+from exchanges.api_rate_limiter import RateLimiter
+from exchanges.exchange_utils import RequestSigner
 from datetime import datetime
 
 # .env 파일에서 환경변수 로드
 load_dotenv()
 
-class BinanceAPI:
+class LatencyStats:
+    """엔드포인트별 요청 지연시간 집계 (스레드 안전)"""
     def __init__(self):
-        """Binance API 초기화"""
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def record(self, endpoint, elapsed, error=False):
+        """지연시간 기록"""
+        with self._lock:
+            stats = self._stats.get(endpoint)
+            if stats is None:
+                stats = {'count': 0, 'errors': 0, 'total': 0.0,
+                         'min': float('inf'), 'max': 0.0, 'last': 0.0}
+                self._stats[endpoint] = stats
+            stats['count'] += 1
+            stats['total'] += elapsed
+            stats['min'] = min(stats['min'], elapsed)
+            stats['max'] = max(stats['max'], elapsed)
+            stats['last'] = elapsed
+            if error:
+                stats['errors'] += 1
+
+    def report(self, endpoint=None):
+        """통계 조회 (endpoint 지정 시 해당 엔드포인트만)"""
+        with self._lock:
+            report = {}
+            for name, stats in self._stats.items():
+                if endpoint is not None and name != endpoint:
+                    continue
+                count = stats['count']
+                report[name] = {
+                    'count': count,
+                    'errors': stats['errors'],
+                    'avg': stats['total'] / count if count else 0.0,
+                    'min': stats['min'] if count else 0.0,
+                    'max': stats['max'],
+                    'last': stats['last']
+                }
+        
+        if endpoint is not None:
+            return report.get(endpoint)
+        return report
+
+    def reset(self):
+        """통계 초기화"""
+        with self._lock:
+            self._stats = {}
+
+# K라인 요청당 최대 캔들 수
+MAX_KLINES_PER_REQUEST = 1000
+
+# 요청 병합에서 제외할 엔드포인트 (응답 시각 자체가 의미 있는 요청)
+NO_COALESCE_ENDPOINTS = frozenset(['/api/v3/time'])
+
+def coalesce_key(method, endpoint, params=None, headers=None, query_string=None):
+    """요청 병합 키 (서명/인증이 없는 GET 요청만, 그 외는 None)"""
+    if method != 'GET' or headers or query_string or endpoint in NO_COALESCE_ENDPOINTS:
+        return None
+    return endpoint, tuple(sorted((str(k), str(v)) for k, v in (params or {}).items()))
+
+def parse_market_summary(ticker):
+    """24시간 티커 응답을 시장 요약 형식으로 변환"""
+    return {
+        'symbol': ticker['symbol'],
+        'price_change': float(ticker['priceChange']),
+        'price_change_percent': float(ticker['priceChangePercent']),
+        'weighted_avg_price': float(ticker['weightedAvgPrice']),
+        'high_price': float(ticker['highPrice']),
+        'low_price': float(ticker['lowPrice']),
+        'volume': float(ticker['volume']),
+        'quote_volume': float(ticker['quoteVolume'])
+    }
+
+# 일시적 오류 재시도 정책 (동기/비동기 클라이언트 공통)
+RETRY_STATUSES = (500, 502, 503, 504)
+RETRY_METHODS = frozenset(['GET', 'DELETE'])   # 주문 생성(POST)은 중복 체결 위험이 있어 재시도하지 않음
+
+def klines_params(symbol, interval, limit, start_time=None, end_time=None):
+    """K라인 조회 파라미터 (start_time/end_time: 밀리초 타임스탬프)"""
+    params = {
+        'symbol': symbol,
+        'interval': interval,
+        'limit': limit
+    }
+    if start_time is not None:
+        params['startTime'] = int(start_time)
+    if end_time is not None:
+        params['endTime'] = int(end_time)
+    return params
+
+def parse_date_range(start_str, end_str=None):
+    """'YYYY-MM-DD' 기간을 밀리초 타임스탬프로 변환 (end_str 미지정 시 end 는 None)"""
+    start_time = int(datetime.strptime(start_str, '%Y-%m-%d').timestamp() * 1000)
+    end_time = None
+    if end_str:
+        end_time = int(datetime.strptime(end_str, '%Y-%m-%d').timestamp() * 1000)
+    return start_time, end_time
+
+def next_klines_start(batch, end_time):
+    """과거 K라인 분할 조회의 다음 구간 시작 시각 (더 조회할 구간이 없으면 None)"""
+    if len(batch) < MAX_KLINES_PER_REQUEST:
+        return None
+    # 다음 구간은 마지막 캔들 이후부터
+    start_time = batch[-1][0] + 1
+    if end_time is not None and start_time > end_time:
+        return None
+    return start_time
+
+def parse_book_ticker(item):
+    """최우선 호가 응답 한 항목 변환"""
+    return {
+        'bid_price': float(item['bidPrice']),
+        'bid_qty': float(item['bidQty']),
+        'ask_price': float(item['askPrice']),
+        'ask_qty': float(item['askQty'])
+    }
+
+def find_asset_balance(account_info, asset):
+    """계정 정보 응답에서 자산 잔고 조회 (없으면 ValueError)"""
+    for balance in account_info['balances']:
+        if balance['asset'] == asset:
+            free = float(balance['free'])
+            locked = float(balance['locked'])
+            return {
+                'asset': asset,
+                'free': free,
+                'locked': locked,
+                'total': free + locked
+            }
+    raise ValueError(f"{asset} 자산을 찾을 수 없습니다.")
+
+def summarize_trades(trades, days):
+    """내 거래 내역 요약 (최근 days 일)"""
+    # 최근 N일 동안의 거래만 필터링
+    cutoff_time = int(time.time() * 1000) - (days * 24 * 60 * 60 * 1000)
+    recent_trades = [t for t in trades if t['time'] > cutoff_time]
+    
+    # 거래 통계 계산
+    buy_trades = [t for t in recent_trades if t['isBuyer']]
+    sell_trades = [t for t in recent_trades if not t['isBuyer']]
+    total_buy_qty = sum(float(t['qty']) for t in buy_trades)
+    total_sell_qty = sum(float(t['qty']) for t in sell_trades)
+    
+    return {
+        'period': f"최근 {days}일",
+        'total_trades': len(recent_trades),
+        'buy_trades': len(buy_trades),
+        'sell_trades': len(sell_trades),
+        'total_buy_quantity': total_buy_qty,
+        'total_sell_quantity': total_sell_qty,
+        'net_position': total_buy_qty - total_sell_qty
+    }
+
+class BinanceClientBase:
+    """동기/비동기 Binance 클라이언트 공통 부분
+
+    요청 파라미터 구성, 주문 검증, 응답 변환, 시세 캐시 정책, 통계/기록 기능을 모아 두고
+    BinanceAPI(requests)와 utils.async_api_connector.AsyncBinanceAPI(aiohttp)는 전송 계층만 각자 구현한다.
+    """
+    def _init_common(self, rate_limiter, coalescer):
+        """전송 계층과 무관한 공통 상태 초기화"""
+        # 엔드포인트별 지연시간 통계
+        self.latency_stats = LatencyStats()
+        
+        # 요청 가중치 기반 Rate Limit
+        self.rate_limiter = rate_limiter or RateLimiter()
+        
+        # 동일 시세 요청 병합 (동시 요청은 하나만 전송하고 결과 공유)
+        self.request_coalescing = True
+        self.coalescer = coalescer
+        
+        # 요청-응답 기록기 (start_recording 으로 활성화)
+        self.recorder = None
+        
+        # 심볼별 시세 캐시
+        self.price_update_interval = 1.0  # 가격 업데이트 최소 간격 (초)
+        self.use_price_caching = True     # 가격 캐싱 사용 여부
+        self.bulk_price_refresh = False   # 캐시 미스 시 전체 심볼 일괄 갱신 여부
+        self.tracked_symbols = set()      # 일괄 24시간 티커 조회 대상 (비어 있으면 전체)
+        self.price_cache = TTLCache(ttl=self.price_update_interval)
+        self.ticker_24hr_cache = TTLCache(ttl=self.price_update_interval)
+        self.book_ticker_cache = TTLCache(ttl=self.price_update_interval)
+
+    def _cached_quote(self, cache, symbol):
+        """시세 캐시 조회 (캐시 미사용이거나 만료 시 None)"""
+        if not self.use_price_caching:
+            return None
+        return cache.get(symbol, self.price_update_interval)
+
+    def _store_ticker_price(self, symbol, data):
+        price = float(data['price'])
+        self.price_cache.set(symbol, price)
+        return price
+
+    def _store_ticker_prices(self, data):
+        prices = {item['symbol']: float(item['price']) for item in data}
+        self.price_cache.set_many(prices)
+        return prices
+
+    def _store_market_summary(self, symbol, ticker):
+        summary = parse_market_summary(ticker)
+        self.ticker_24hr_cache.set(symbol, summary)
+        return summary
+
+    def _24hr_tickers_params(self, symbols=None):
+        """24시간 티커 일괄 조회 파라미터 (symbols 미지정 시 추적 심볼, 없으면 전체)"""
+        symbols = sorted(symbols or self.tracked_symbols)
+        if not symbols:
+            return None
+        return {'symbols': json.dumps(symbols, separators=(',', ':'))}
+
+    def _store_24hr_tickers(self, data):
+        summaries = {item['symbol']: parse_market_summary(item) for item in data}
+        self.ticker_24hr_cache.set_many(summaries)
+        self.price_cache.set_many({
+            item['symbol']: float(item['lastPrice']) for item in data if 'lastPrice' in item
+        })
+        return summaries
+
+    def _store_book_tickers(self, data):
+        book_tickers = {item['symbol']: parse_book_ticker(item) for item in data}
+        self.book_ticker_cache.set_many(book_tickers)
+        return book_tickers
+
+    def _order_params(self, symbol, order_type, side, quantity, price=None):
+        """주문 생성 파라미터 (검증 후 정밀도 조정)"""
+        self._validate_order_params(symbol, order_type, side, quantity, price)
+        
+        params = {
+            'symbol': symbol,
+            'side': side,
+            'type': order_type,
+            'quantity': self._format_number(quantity, 5)
+        }
+        if order_type == "LIMIT":
+            params['price'] = self._format_number(price, 2)
+            params['timeInForce'] = 'GTC'
+        return params
+
+    def _format_number(self, number, decimals):
+        """숫자 포맷팅 (정밀도 조정)"""
+        format_str = f"{{:.{decimals}f}}"
+        return format_str.format(number)
+
+    def _validate_order_params(self, symbol, order_type, side, quantity, price=None):
+        """주문 파라미터 검증"""
+        # 심볼 검증
+        if not isinstance(symbol, str) or len(symbol) < 5:
+            raise ValueError("유효하지 않은 심볼입니다.")
+            
+        # 주문 타입 검증
+        valid_order_types = ["MARKET", "LIMIT"]
+        if order_type not in valid_order_types:
+            raise ValueError(f"유효하지 않은 주문 타입입니다. 가능한 값: {valid_order_types}")
+            
+        # 매수/매도 구분 검증
+        valid_sides = ["BUY", "SELL"]
+        if side not in valid_sides:
+            raise ValueError(f"유효하지 않은 거래 구분입니다. 가능한 값: {valid_sides}")
+            
+        # 수량 검증
+        if not isinstance(quantity, (int, float)) or quantity <= 0:
+            raise ValueError("수량은 양수여야 합니다.")
+            
+        # 가격 검증 (LIMIT 주문의 경우)
+        if order_type == "LIMIT":
+            if not price or not isinstance(price, (int, float)) or price <= 0:
+                raise ValueError("LIMIT 주문의 경우 유효한 가격이 필요합니다.")
+
+    def track_symbols(self, symbols):
+        """일괄 갱신 대상 심볼 등록 (등록 시 전체 일괄 갱신 모드 사용)"""
+        self.tracked_symbols.update(symbols)
+        self.bulk_price_refresh = True
+
+    def get_cache_stats(self):
+        """시세 캐시 적중/미스/만료 통계 조회"""
+        return {
+            'price': self.price_cache.get_stats(),
+            'ticker_24hr': self.ticker_24hr_cache.get_stats(),
+            'book_ticker': self.book_ticker_cache.get_stats()
+        }
+
+    def get_latency_stats(self, endpoint=None):
+        """엔드포인트별 지연시간 통계 조회 (초 단위)"""
+        return self.latency_stats.report(endpoint)
+
+    def reset_latency_stats(self):
+        """지연시간 통계 초기화"""
+        self.latency_stats.reset()
+
+    def get_coalescing_stats(self):
+        """요청 병합 통계 조회 (saved: 전송하지 않고 공유된 요청 수)"""
+        return self.coalescer.get_stats()
+
+    def start_recording(self, path):
+        """요청-응답 기록 시작 (gzip 압축 JSON Lines, utils.replay.ReplayServer 로 재생)"""
+        self.stop_recording()
+        self.recorder = TrafficRecorder(path)
+        error_handler.log_info(f"트래픽 기록 시작: {path}")
+        return self.recorder
+
+    def stop_recording(self):
+        """요청-응답 기록 종료"""
+        if self.recorder is not None:
+            self.recorder.close()
+            self.recorder = None
+
+class BinanceAPI(BinanceClientBase):
+    def __init__(self, pool_size=10, timeout=(3.05, 10), max_retries=3, backoff_factor=0.3,
+                 rate_limiter=None, coalesce_window=0.1):
+        """Binance API 초기화
+
+        pool_size: 호스트당 유지할 keep-alive 커넥션 수
+        timeout: 요청별 (연결, 읽기) 타임아웃 (초)
+        max_retries: 일시적 오류(5xx, 연결 실패) 재시도 횟수
+        backoff_factor: 재시도 간 지수 백오프 계수
+        rate_limiter: 공유할 RateLimiter (미지정 시 기본 한도로 생성)
+        coalesce_window: 동일 시세 요청 결과를 공유할 시간 (초, 0 이면 진행 중인 요청만 병합)
+        """
         try:
             self.exchange = ccxt.binance({
                 'apiKey': os.getenv('BINANCE_API_KEY'),
@@ -27,48 +349,136 @@ class BinanceAPI:
             })
             self.base_url = "https://api.binance.com"
             
-            # TODO: 실제 운영 시 조정 필요한 설정들
-            self.request_count = 0
-            self.last_request_time = time.time()
-            self.rate_limit = {
-                'max_requests': 1200,  # 1분당 최대 요청 수 (실제 제한: 2400)
-                'time_window': 60      # 시간 윈도우 (초)
-            }
+            # HTTP 세션 (커넥션 풀 + keep-alive)
+            self.pool_size = pool_size
+            self.timeout = timeout
+            self.max_retries = max_retries
+            self.backoff_factor = backoff_factor
+            self.session = self._create_session()
             
-            # FIXME: 테스트용 임시 설정
-            self.price_update_interval = 1.0  # 가격 업데이트 최소 간격 (초)
-            self.use_price_caching = True     # 가격 캐싱 사용 여부
+            # 통계, Rate Limit, 요청 병합, 기록기, 시세 캐시
+            self._init_common(rate_limiter, SingleFlight(window=coalesce_window))
+            
+            # 서명 요청 생성기 (HMAC 상태/헤더 캐시, 서버 시간 오프셋)
+            self.signer = RequestSigner(os.getenv('BINANCE_API_KEY'), self.exchange.secret)
             
             error_handler.log_info("Binance API 초기화 완료")
         except Exception as e:
             error_handler.log_error(e, "Binance API 초기화 실패")
             raise
 
-    def _check_rate_limit(self):
-        """Rate Limit 체크 및 대기"""
-        current_time = time.time()
-        time_passed = current_time - self.last_request_time
+    def _create_session(self):
+        """커넥션 풀과 재시도 정책이 적용된 HTTP 세션 생성"""
+        retry = Retry(
+            total=self.max_retries,
+            connect=self.max_retries,
+            read=self.max_retries,
+            backoff_factor=self.backoff_factor,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=RETRY_METHODS,
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_size,
+            pool_maxsize=self.pool_size,
+            max_retries=retry
+        )
+        session = requests.Session()
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+
+    def _request(self, method, endpoint, params=None, headers=None, query_string=None,
+                 weight_params=None):
+        """공통 REST 요청 (동일한 공개 GET 요청은 병합)
+
+        병합된 요청의 응답 객체는 호출자 간에 공유되므로 수정하지 않아야 한다.
+        """
+        key = coalesce_key(method, endpoint, params, headers, query_string)
+        if key is None or not self.request_coalescing:
+            return self._send(method, endpoint, params, headers, query_string, weight_params)
+        return self.coalescer.do(key, self._send, method, endpoint, params, headers,
+                                 query_string, weight_params)
+
+    def _send(self, method, endpoint, params=None, headers=None, query_string=None,
+              weight_params=None):
+        """REST 요청 전송 (세션 재사용, 타임아웃, 지연시간 기록)"""
+        url = f"{self.base_url}{endpoint}"
+        if query_string:
+            url = f"{url}?{query_string}"
+        
+        # 요청 가중치만큼 Rate Limit 예산 확보
+        self.rate_limiter.acquire_request(method, endpoint,
+                                          params if weight_params is None else weight_params)
+        
+        start_time = time.perf_counter()
+        try:
+            response = self.session.request(
+                method, url, params=params, headers=headers, timeout=self.timeout
+            )
+        except Exception:
+            self.latency_stats.record(endpoint, time.perf_counter() - start_time, error=True)
+            raise
         
-        # 시간 윈도우가 지나면 카운터 리셋
-        if time_passed >= self.rate_limit['time_window']:
-            self.request_count = 0
-            self.last_request_time = current_time
+        self.latency_stats.record(endpoint, time.perf_counter() - start_time,
+                                  error=response.status_code != 200)
+        self.rate_limiter.update_from_headers(response.headers, response.status_code)
+        if self.recorder is not None:
+            self.recorder.record_http(method, endpoint, params, query_string, response.status_code,
+                                      response.headers, response.text, response.elapsed.total_seconds())
+        if response.status_code != 200:
+            error_handler.log_error(f"API 응답: {response.text}", f"{method} {endpoint} 요청 실패")
+        response.raise_for_status()
+        return response.json()
+
+    def _signed_request(self, method, endpoint, params):
+        """서명이 필요한 요청 실행 (공통 서명 파이프라인)"""
+        if self.signer.needs_time_sync():
+            self.sync_server_time()
         
-        # Rate Limit 초과 시 대기
-        if self.request_count >= self.rate_limit['max_requests']:
-            wait_time = self.rate_limit['time_window'] - time_passed
-            if wait_time > 0:
-                error_handler.log_info(f"Rate Limit 도달, {wait_time:.2f}초 대기")
-                time.sleep(wait_time)
-                self.request_count = 0
-                self.last_request_time = time.time()
+        query_string, signed_params = self.signer.sign(params)
+        return self._request(
+            method, endpoint,
+            query_string=query_string,
+            headers=self.signer.headers,
+            weight_params=signed_params
+        )
+
+    def sync_server_time(self):
+        """서버 시간 오프셋 동기화 (실패 시 기존 오프셋 유지)"""
+        request_start = time.time()
+        try:
+            server_time = self.get_server_time()
+        except Exception as e:
+            # 다음 주기까지 재시도하지 않도록 동기화 시각만 갱신
+            self.signer.last_sync = time.time()
+            error_handler.log_error(e, "서버 시간 동기화 실패, 기존 오프셋 사용")
+            return self.signer.time_offset
         
-        self.request_count += 1
+        offset = self.signer.update_time_offset(server_time, request_start, time.time())
+        error_handler.log_info(f"서버 시간 동기화 완료: 오프셋 {offset}ms")
+        return offset
+
+    def benchmark_signing(self, iterations=10000):
+        """서명 비용 마이크로벤치마크 (기존 방식 대비)"""
+        result = self.signer.benchmark(iterations)
+        error_handler.log_info(
+            f"서명 벤치마크: 기존 {result['naive_us']:.2f}us, "
+            f"현재 {result['precomputed_us']:.2f}us ({result['speedup']:.2f}배)"
+        )
+        return result
+
+    def close(self):
+        """HTTP 세션 종료 (풀링된 커넥션 반환)"""
+        self.stop_recording()
+        self.session.close()
+        error_handler.log_info("Binance API 세션 종료")
 
     def get_server_time(self):
         """서버 시간 조회"""
         try:
-            server_time = self.exchange.fetch_time()
+            server_time = self._request('GET', '/api/v3/time')['serverTime']
             error_handler.log_info(f"서버 시간 조회 성공: {server_time}")
             return server_time
         except Exception as e:
@@ -86,27 +496,21 @@ class BinanceAPI:
             return False
 
     def get_ticker_price(self, symbol="BTCUSDT"):
-        """REST API를 통한 현재가 조회 (Rate Limit 적용)"""
+        """REST API를 통한 현재가 조회 (심볼별 캐시 적용)"""
         try:
-            current_time = time.time()
+            price = self._cached_quote(self.price_cache, symbol)
+            if price is not None:
+                return price  # 캐시된 가격 반환
             
-            # FIXME: 테스트 단계에서만 사용하는 캐싱 로직
-            # 실제 운영 시에는 WebSocket으로 실시간 가격 수신으로 변경 예정
-            if self.use_price_caching and hasattr(self, 'last_price_check'):
-                if current_time - self.last_price_check < self.price_update_interval:
-                    return self.last_price  # 캐시된 가격 반환
+            # 여러 심볼을 추적하는 경우 한 번의 요청으로 전체 갱신
+            if self.use_price_caching and self.bulk_price_refresh:
+                prices = self.get_all_ticker_prices()
+                if symbol in prices:
+                    return prices[symbol]
             
-            self._check_rate_limit()
-            url = f"{self.base_url}/api/v3/ticker/price"
             params = {'symbol': symbol}
-            response = requests.get(url, params=params)
-            response.raise_for_status()
-            data = response.json()
-            price = float(data['price'])
-            
-            # 마지막 요청 시간과 가격 저장
-            self.last_price_check = current_time
-            self.last_price = price
+            data = self._request('GET', '/api/v3/ticker/price', params=params)
+            price = self._store_ticker_price(symbol, data)
             
             error_handler.log_info(f"현재가 조회 성공: {symbol} = {price}")
             return price
@@ -114,14 +518,54 @@ class BinanceAPI:
             error_handler.log_error(e, f"{symbol} 현재가 조회 실패")
             raise
 
+    def get_all_ticker_prices(self):
+        """전체 심볼 현재가 일괄 조회 (요청 1회로 가격 캐시 갱신)"""
+        try:
+            data = self._request('GET', '/api/v3/ticker/price')
+            prices = self._store_ticker_prices(data)
+            
+            error_handler.log_info(f"전체 현재가 조회 성공: {len(prices)}개 심볼")
+            return prices
+        except Exception as e:
+            error_handler.log_error(e, "전체 현재가 조회 실패")
+            raise
+
+    def get_all_24hr_tickers(self, symbols=None):
+        """24시간 티커 일괄 조회 (symbols 미지정 시 추적 심볼, 없으면 전체)"""
+        try:
+            data = self._request('GET', '/api/v3/ticker/24hr', params=self._24hr_tickers_params(symbols))
+            summaries = self._store_24hr_tickers(data)
+            
+            error_handler.log_info(f"24시간 티커 일괄 조회 성공: {len(summaries)}개 심볼")
+            return summaries
+        except Exception as e:
+            error_handler.log_error(e, "24시간 티커 일괄 조회 실패")
+            raise
+
+    def get_all_book_tickers(self):
+        """전체 심볼 최우선 호가 일괄 조회"""
+        try:
+            data = self._request('GET', '/api/v3/ticker/bookTicker')
+            book_tickers = self._store_book_tickers(data)
+            
+            error_handler.log_info(f"최우선 호가 일괄 조회 성공: {len(book_tickers)}개 심볼")
+            return book_tickers
+        except Exception as e:
+            error_handler.log_error(e, "최우선 호가 일괄 조회 실패")
+            raise
+
+    def get_book_ticker(self, symbol="BTCUSDT"):
+        """최우선 호가 조회 (시세 캐시 사용 시 캐시 적용, 미스 시 전체 일괄 갱신)"""
+        book_ticker = self._cached_quote(self.book_ticker_cache, symbol)
+        if book_ticker is not None:
+            return book_ticker
+        return self.get_all_book_tickers().get(symbol)
+
     def get_recent_trades(self, symbol="BTCUSDT", limit=1):
         """최근 체결 내역 조회 (Public API 사용)"""
         try:
-            url = f"{self.base_url}/api/v3/trades"
             params = {'symbol': symbol, 'limit': limit}
-            response = requests.get(url, params=params)
-            response.raise_for_status()
-            trades = response.json()
+            trades = self._request('GET', '/api/v3/trades', params=params)
             latest_trade = trades[-1]
             error_handler.log_info(f"최근 거래 조회 성공: {symbol} = {latest_trade['price']}")
             return {'price': float(latest_trade['price'])}
@@ -157,118 +601,37 @@ class BinanceAPI:
                     quantity=0.001, price=None, test=True):
         """주문 생성 (테스트 모드 지원)"""
         try:
-            self._validate_order_params(symbol, order_type, side, quantity, price)
-            
-            # 기본 파라미터 설정
-            params = {
-                'symbol': symbol,
-                'side': side,
-                'type': order_type,
-                'quantity': self._format_number(quantity, 5),
-                'timestamp': int(time.time() * 1000),
-                'recvWindow': 5000
-            }
-            
-            if order_type == "LIMIT":
-                params['price'] = self._format_number(price, 2)
-                params['timeInForce'] = 'GTC'
+            # 주문 파라미터 검증 및 설정
+            params = self._order_params(symbol, order_type, side, quantity, price)
             
-            # 파라미터를 정렬된 쿼리 스트링으로 변환
-            query_string = '&'.join([f"{k}={v}" for k, v in sorted(params.items())])
-            
-            # 서명 생성 및 추가
-            signature = hmac.new(
-                self.exchange.secret.encode('utf-8'),
-                query_string.encode('utf-8'),
-                hashlib.sha256
-            ).hexdigest()
-            
-            # 최종 요청 URL 생성
+            # 요청 엔드포인트
             endpoint = "/api/v3/order/test" if test else "/api/v3/order"
-            url = f"{self.base_url}{endpoint}?{query_string}&signature={signature}"
-            
-            # API 요청 헤더
-            headers = {'X-MBX-APIKEY': os.getenv('BINANCE_API_KEY')}
             
-            # POST 요청 실행
-            response = requests.post(url, headers=headers)
+            # 서명된 POST 요청 실행
+            result = self._signed_request('POST', endpoint, params)
             
-            if response.status_code != 200:
-                error_handler.log_error(f"API 응답: {response.text}", "주문 생성 실패")
-            response.raise_for_status()
-            
-            return response.json()
+            return result
             
         except Exception as e:
             error_handler.log_error(e, "주문 생성 실패")
             raise
 
-    def _format_number(self, number, decimals):
-        """숫자 포맷팅 (정밀도 조정)"""
-        format_str = f"{{:.{decimals}f}}"
-        return format_str.format(number)
-
-    def _validate_order_params(self, symbol, order_type, side, quantity, price=None):
-        """주문 파라미터 검증"""
-        # 심볼 검증
-        if not isinstance(symbol, str) or len(symbol) < 5:
-            raise ValueError("유효하지 않은 심볼입니다.")
-            
-        # 주문 타입 검증
-        valid_order_types = ["MARKET", "LIMIT"]
-        if order_type not in valid_order_types:
-            raise ValueError(f"유효하지 않은 주문 타입입니다. 가능한 값: {valid_order_types}")
-            
-        # 매수/매도 구분 검증
-        valid_sides = ["BUY", "SELL"]
-        if side not in valid_sides:
-            raise ValueError(f"유효하지 않은 거래 구분입니다. 가능한 값: {valid_sides}")
-            
-        # 수량 검증
-        if not isinstance(quantity, (int, float)) or quantity <= 0:
-            raise ValueError("수량은 양수여야 합니다.")
-            
-        # 가격 검증 (LIMIT 주문의 경우)
-        if order_type == "LIMIT":
-            if not price or not isinstance(price, (int, float)) or price <= 0:
-                raise ValueError("LIMIT 주문의 경우 유효한 가격이 필요합니다.")
-
     def cancel_order(self, symbol="BTCUSDT", order_id=None, test=True):
         """주문 취소 (테스트 모드 지원)"""
         try:
             # 기본 파라미터 설정
             params = {
                 'symbol': symbol,
-                'orderId': order_id,
-                'timestamp': int(time.time() * 1000),
-                'recvWindow': 5000
+                'orderId': order_id
             }
             
-            # 파라미터를 정렬된 쿼리 스트링으로 변환
-            query_string = '&'.join([f"{k}={v}" for k, v in sorted(params.items())])
-            
-            # 서명 생성 및 추가
-            signature = hmac.new(
-                self.exchange.secret.encode('utf-8'),
-                query_string.encode('utf-8'),
-                hashlib.sha256
-            ).hexdigest()
-            
-            # 최종 요청 URL 생성
+            # 요청 엔드포인트
             endpoint = "/api/v3/order/test" if test else "/api/v3/order"
-            url = f"{self.base_url}{endpoint}?{query_string}&signature={signature}"
             
-            # API 요청 헤더
-            headers = {'X-MBX-APIKEY': os.getenv('BINANCE_API_KEY')}
+            # 서명된 DELETE 요청 실행
+            result = self._signed_request('DELETE', endpoint, params)
             
-            # DELETE 요청 실행
-            response = requests.delete(url, headers=headers)
-            
-            if response.status_code != 200:
-                error_handler.log_error(f"API 응답: {response.text}", "주문 취소 실패")
-            response.raise_for_status()
-            
-            return response.json()
+            return result
             
         except Exception as e:
             error_handler.log_error(e, "주문 취소 실패")
@@ -280,36 +643,16 @@ class BinanceAPI:
             # 기본 파라미터 설정
             params = {
                 'symbol': symbol,
-                'orderId': order_id,
-                'timestamp': int(time.time() * 1000),
-                'recvWindow': 5000
+                'orderId': order_id
             }
             
-            # 파라미터를 정렬된 쿼리 스트링으로 변환
-            query_string = '&'.join([f"{k}={v}" for k, v in sorted(params.items())])
-            
-            # 서명 생성 및 추가
-            signature = hmac.new(
-                self.exchange.secret.encode('utf-8'),
-                query_string.encode('utf-8'),
-                hashlib.sha256
-            ).hexdigest()
-            
-            # 최종 요청 URL 생성
+            # 요청 엔드포인트
             endpoint = "/api/v3/order"
-            url = f"{self.base_url}{endpoint}?{query_string}&signature={signature}"
-            
-            # API 요청 헤더
-            headers = {'X-MBX-APIKEY': os.getenv('BINANCE_API_KEY')}
-            
-            # GET 요청 실행
-            response = requests.get(url, headers=headers)
             
-            if response.status_code != 200:
-                error_handler.log_error(f"API 응답: {response.text}", "주문 조회 실패")
-            response.raise_for_status()
+            # 서명된 GET 요청 실행
+            result = self._signed_request('GET', endpoint, params)
             
-            return response.json()
+            return result
             
         except Exception as e:
             error_handler.log_error(e, "주문 조회 실패")
@@ -320,36 +663,16 @@ class BinanceAPI:
         try:
             # 기본 파라미터 설정
             params = {
-                'symbol': symbol,
-                'timestamp': int(time.time() * 1000),
-                'recvWindow': 5000
+                'symbol': symbol
             }
             
-            # 파라미터를 정렬된 쿼리 스트링으로 변환
-            query_string = '&'.join([f"{k}={v}" for k, v in sorted(params.items())])
-            
-            # 서명 생성 및 추가
-            signature = hmac.new(
-                self.exchange.secret.encode('utf-8'),
-                query_string.encode('utf-8'),
-                hashlib.sha256
-            ).hexdigest()
-            
-            # 최종 요청 URL 생성
+            # 요청 엔드포인트
             endpoint = "/api/v3/openOrders"
-            url = f"{self.base_url}{endpoint}?{query_string}&signature={signature}"
-            
-            # API 요청 헤더
-            headers = {'X-MBX-APIKEY': os.getenv('BINANCE_API_KEY')}
-            
-            # GET 요청 실행
-            response = requests.get(url, headers=headers)
             
-            if response.status_code != 200:
-                error_handler.log_error(f"API 응답: {response.text}", "미체결 주문 조회 실패")
-            response.raise_for_status()
+            # 서명된 GET 요청 실행
+            result = self._signed_request('GET', endpoint, params)
             
-            return response.json()
+            return result
             
         except Exception as e:
             error_handler.log_error(e, "미체결 주문 조회 실패")
@@ -358,37 +681,16 @@ class BinanceAPI:
     def get_account_info(self):
         """계정 정보 조회 (잔고 포함)"""
         try:
-            # 기본 파라미터 설정
-            params = {
-                'timestamp': int(time.time() * 1000),
-                'recvWindow': 5000
-            }
-            
-            # 파라미터를 정렬된 쿼리 스트링으로 변환
-            query_string = '&'.join([f"{k}={v}" for k, v in sorted(params.items())])
-            
-            # 서명 생성 및 추가
-            signature = hmac.new(
-                self.exchange.secret.encode('utf-8'),
-                query_string.encode('utf-8'),
-                hashlib.sha256
-            ).hexdigest()
+            # 기본 파라미터 설정 (서명 시 timestamp/recvWindow 추가)
+            params = {}
             
-            # 최종 요청 URL 생성
+            # 요청 엔드포인트
             endpoint = "/api/v3/account"
-            url = f"{self.base_url}{endpoint}?{query_string}&signature={signature}"
             
-            # API 요청 헤더
-            headers = {'X-MBX-APIKEY': os.getenv('BINANCE_API_KEY')}
+            # 서명된 GET 요청 실행
+            result = self._signed_request('GET', endpoint, params)
             
-            # GET 요청 실행
-            response = requests.get(url, headers=headers)
-            
-            if response.status_code != 200:
-                error_handler.log_error(f"API 응답: {response.text}", "계정 정보 조회 실패")
-            response.raise_for_status()
-            
-            return response.json()
+            return result
             
         except Exception as e:
             error_handler.log_error(e, "계정 정보 조회 실패")
@@ -397,25 +699,10 @@ class BinanceAPI:
     def get_asset_balance(self, asset="BTC"):
         """특정 자산의 잔고 조회"""
         try:
-            account_info = self.get_account_info()
-            balances = account_info['balances']
-            
-            # 특정 자산 찾기
-            for balance in balances:
-                if balance['asset'] == asset:
-                    free = float(balance['free'])
-                    locked = float(balance['locked'])
-                    total = free + locked
-                    
-                    error_handler.log_info(f"{asset} 잔고 조회 성공: 사용가능={free}, 거래중={locked}, 총잔고={total}")
-                    return {
-                        'asset': asset,
-                        'free': free,
-                        'locked': locked,
-                        'total': total
-                    }
-            
-            raise ValueError(f"{asset} 자산을 찾을 수 없습니다.")
+            balance = find_asset_balance(self.get_account_info(), asset)
+            error_handler.log_info(f"{asset} 잔고 조회 성공: 사용가능={balance['free']}, "
+                                   f"거래중={balance['locked']}, 총잔고={balance['total']}")
+            return balance
             
         except Exception as e:
             error_handler.log_error(e, f"{asset} 잔고 조회 실패")
@@ -427,36 +714,14 @@ class BinanceAPI:
             # 기본 파라미터 설정
             params = {
                 'symbol': symbol,
-                'limit': limit,
-                'timestamp': int(time.time() * 1000),
-                'recvWindow': 5000
+                'limit': limit
             }
             
-            # 파라미터를 정렬된 쿼리 스트링으로 변환
-            query_string = '&'.join([f"{k}={v}" for k, v in sorted(params.items())])
-            
-            # 서명 생성 및 추가
-            signature = hmac.new(
-                self.exchange.secret.encode('utf-8'),
-                query_string.encode('utf-8'),
-                hashlib.sha256
-            ).hexdigest()
-            
-            # 최종 요청 URL 생성
+            # 요청 엔드포인트
             endpoint = "/api/v3/myTrades"
-            url = f"{self.base_url}{endpoint}?{query_string}&signature={signature}"
             
-            # API 요청 헤더
-            headers = {'X-MBX-APIKEY': os.getenv('BINANCE_API_KEY')}
-            
-            # GET 요청 실행
-            response = requests.get(url, headers=headers)
-            
-            if response.status_code != 200:
-                error_handler.log_error(f"API 응답: {response.text}", "거래 내역 조회 실패")
-            response.raise_for_status()
-            
-            trades = response.json()
+            # 서명된 GET 요청 실행
+            trades = self._signed_request('GET', endpoint, params)
             error_handler.log_info(f"거래 내역 조회 성공: {len(trades)}건")
             return trades
             
@@ -467,29 +732,7 @@ class BinanceAPI:
     def get_trade_history_summary(self, symbol="BTCUSDT", days=30):
         """거래 내역 요약 정보 조회"""
         try:
-            trades = self.get_my_trades(symbol)
-            
-            # 최근 N일 동안의 거래만 필터링
-            cutoff_time = int(time.time() * 1000) - (days * 24 * 60 * 60 * 1000)
-            recent_trades = [t for t in trades if t['time'] > cutoff_time]
-            
-            # 거래 통계 계산
-            total_trades = len(recent_trades)
-            buy_trades = [t for t in recent_trades if t['isBuyer']]
-            sell_trades = [t for t in recent_trades if not t['isBuyer']]
-            
-            total_buy_qty = sum(float(t['qty']) for t in buy_trades)
-            total_sell_qty = sum(float(t['qty']) for t in sell_trades)
-            
-            summary = {
-                'period': f"최근 {days}일",
-                'total_trades': total_trades,
-                'buy_trades': len(buy_trades),
-                'sell_trades': len(sell_trades),
-                'total_buy_quantity': total_buy_qty,
-                'total_sell_quantity': total_sell_qty,
-                'net_position': total_buy_qty - total_sell_qty
-            }
+            summary = summarize_trades(self.get_my_trades(symbol), days)
             
             error_handler.log_info(f"거래 내역 요약: {summary}")
             return summary
@@ -498,25 +741,17 @@ class BinanceAPI:
             error_handler.log_error(e, "거래 내역 요약 조회 실패")
             raise
 
-    def get_klines(self, symbol="BTCUSDT", interval="1h", limit=500):
-        """K라인(캔들스틱) 데이터 조회"""
+    def get_klines(self, symbol="BTCUSDT", interval="1h", limit=500, start_time=None, end_time=None):
+        """K라인(캔들스틱) 데이터 조회 (start_time/end_time: 밀리초 타임스탬프)"""
         try:
             # 기본 파라미터 설정
-            params = {
-                'symbol': symbol,
-                'interval': interval,
-                'limit': limit
-            }
+            params = klines_params(symbol, interval, limit, start_time, end_time)
             
             # 엔드포인트 설정
             endpoint = "/api/v3/klines"
-            url = f"{self.base_url}{endpoint}"
             
             # GET 요청 실행
-            response = requests.get(url, params=params)
-            response.raise_for_status()
-            
-            klines = response.json()
+            klines = self._request('GET', endpoint, params=params)
             error_handler.log_info(f"K라인 데이터 조회 성공: {len(klines)}개")
             return klines
             
@@ -535,13 +770,9 @@ class BinanceAPI:
             
             # 엔드포인트 설정
             endpoint = "/api/v3/depth"
-            url = f"{self.base_url}{endpoint}"
             
             # GET 요청 실행
-            response = requests.get(url, params=params)
-            response.raise_for_status()
-            
-            depth = response.json()
+            depth = self._request('GET', endpoint, params=params)
             error_handler.log_info(f"시장 깊이 조회 성공: {len(depth['bids'])}개 매수호가, {len(depth['asks'])}개 매도호가")
             return depth
             
@@ -552,25 +783,22 @@ class BinanceAPI:
     def get_market_summary(self, symbol="BTCUSDT"):
         """시장 요약 정보 조회"""
         try:
+            summary = self._cached_quote(self.ticker_24hr_cache, symbol)
+            if summary is not None:
+                return summary
+            
+            # 여러 심볼을 추적하는 경우 한 번의 요청으로 전체 갱신
+            if self.use_price_caching and self.bulk_price_refresh:
+                summaries = self.get_all_24hr_tickers()
+                if symbol in summaries:
+                    return summaries[symbol]
+            
             # 24시간 티커 정보 조회
             endpoint = "/api/v3/ticker/24hr"
-            url = f"{self.base_url}{endpoint}"
             params = {'symbol': symbol}
             
-            response = requests.get(url, params=params)
-            response.raise_for_status()
-            
-            ticker = response.json()
-            summary = {
-                'symbol': ticker['symbol'],
-                'price_change': float(ticker['priceChange']),
-                'price_change_percent': float(ticker['priceChangePercent']),
-                'weighted_avg_price': float(ticker['weightedAvgPrice']),
-                'high_price': float(ticker['highPrice']),
-                'low_price': float(ticker['lowPrice']),
-                'volume': float(ticker['volume']),
-                'quote_volume': float(ticker['quoteVolume'])
-            }
+            ticker = self._request('GET', endpoint, params=params)
+            summary = self._store_market_summary(symbol, ticker)
             
             error_handler.log_info(f"시장 요약 정보 조회 성공: {symbol}")
             return summary
@@ -580,27 +808,22 @@ class BinanceAPI:
             raise
 
     def get_historical_klines(self, symbol, interval, start_str, end_str=None):
-        """과거 K라인(캔들스틱) 데이터 조회"""
+        """과거 K라인(캔들스틱) 데이터 조회
+
+        요청당 최대 1000개 제한을 넘는 기간은 순차적으로 나누어 조회한다.
+        대용량 기간은 data.historical_data.HistoricalKlineDownloader 사용 권장.
+        """
         try:
-            # 기본 파라미터 설정
-            params = {
-                'symbol': symbol,
-                'interval': interval,
-                'startTime': int(datetime.strptime(start_str, '%Y-%m-%d').timestamp() * 1000)
-            }
-            
-            if end_str:
-                params['endTime'] = int(datetime.strptime(end_str, '%Y-%m-%d').timestamp() * 1000)
-            
-            # 엔드포인트 설정
-            endpoint = "/api/v3/klines"
-            url = f"{self.base_url}{endpoint}"
+            start_time, end_time = parse_date_range(start_str, end_str)
             
-            # GET 요청 실행
-            response = requests.get(url, params=params)
-            response.raise_for_status()
+            klines = []
+            while start_time is not None:
+                # 요청당 최대 1000개 단위로 조회
+                batch = self.get_klines(symbol, interval, limit=MAX_KLINES_PER_REQUEST,
+                                        start_time=start_time, end_time=end_time)
+                klines.extend(batch)
+                start_time = next_klines_start(batch, end_time)
             
-            klines = response.json()
             error_handler.log_info(f"과거 데이터 조회 성공: {len(klines)}개 캔들")
             return klines
             
@@ -0,0 +1,391 @@
+import os
+import time
+import asyncio
+import aiohttp
+from yarl import URL
+from dotenv import load_dotenv
+from . import error_handler
+from exchanges.exchange_utils import RequestSigner
+from .cache_manager import AsyncSingleFlight
+from .api_connector import (
+    BinanceClientBase, coalesce_key, klines_params, parse_date_range, next_klines_start, find_asset_balance,
+    summarize_trades, MAX_KLINES_PER_REQUEST, RETRY_STATUSES, RETRY_METHODS
+)
+
+# .env 파일에서 환경변수 로드
+load_dotenv()
+
+class AsyncBinanceAPI(BinanceClientBase):
+    """asyncio 기반 Binance REST 클라이언트 (BinanceAPI와 동일한 메서드 구성)
+
+    파라미터 구성, 주문 검증, 응답 변환, 시세 캐시 정책은 BinanceClientBase 를 공유하고
+    aiohttp 전송과 재시도만 따로 구현한다.
+    """
+    def __init__(self, pool_size=10, timeout=10, max_retries=3, backoff_factor=0.3,
+                 rate_limiter=None, coalesce_window=0.1):
+        """비동기 Binance API 초기화
+
+        pool_size: 동시에 유지할 keep-alive 커넥션 수
+        timeout: 요청별 전체 타임아웃 (초)
+        max_retries: 일시적 오류(5xx, 연결 실패) 재시도 횟수
+        backoff_factor: 재시도 간 지수 백오프 계수
+        rate_limiter: 공유할 RateLimiter (동기 클라이언트와 예산 공유 가능)
+        coalesce_window: 동일 시세 요청 결과를 공유할 시간 (초, 0 이면 진행 중인 요청만 병합)
+        """
+        self.base_url = "https://api.binance.com"
+
+        # 서명 요청 생성기 (HMAC 상태/헤더 캐시, 서버 시간 오프셋)
+        self.signer = RequestSigner(os.getenv('BINANCE_API_KEY'), os.getenv('BINANCE_SECRET_KEY'))
+
+        self.pool_size = pool_size
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.session = None
+
+        # 통계, Rate Limit, 요청 병합, 기록기, 시세 캐시 (동기 클라이언트와 동일)
+        self._init_common(rate_limiter, AsyncSingleFlight(window=coalesce_window))
+
+        error_handler.log_info("비동기 Binance API 초기화 완료")
+
+    async def __aenter__(self):
+        await self._get_session()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def _get_session(self):
+        """HTTP 세션 조회 (실행 중인 이벤트 루프에서 지연 생성)"""
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(limit=self.pool_size, keepalive_timeout=60)
+            self.session = aiohttp.ClientSession(connector=connector, timeout=self.timeout)
+        return self.session
+
+    async def close(self):
+        """HTTP 세션 종료"""
+        self.stop_recording()
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
+            error_handler.log_info("비동기 Binance API 세션 종료")
+        self.session = None
+
+    async def _request(self, method, endpoint, params=None, headers=None, query_string=None,
+                       weight_params=None):
+        """공통 REST 요청 (동일한 공개 GET 요청은 병합, 응답 객체는 공유되므로 수정 금지)"""
+        key = coalesce_key(method, endpoint, params, headers, query_string)
+        if key is None or not self.request_coalescing:
+            return await self._send(method, endpoint, params, headers, query_string, weight_params)
+        return await self.coalescer.do(key, self._send, method, endpoint, params, headers,
+                                       query_string, weight_params)
+
+    async def _send(self, method, endpoint, params=None, headers=None, query_string=None,
+                    weight_params=None):
+        """REST 요청 전송 (세션 재사용, 타임아웃, 재시도, 지연시간 기록)"""
+        session = await self._get_session()
+        url = f"{self.base_url}{endpoint}"
+        if query_string:
+            # 서명된 쿼리 스트링은 재인코딩되지 않도록 그대로 전달
+            url = URL(f"{url}?{query_string}", encoded=True)
+        if weight_params is None:
+            weight_params = params
+
+        retries = self.max_retries if method in RETRY_METHODS else 0
+        attempt = 0
+        while True:
+            # 요청 가중치만큼 Rate Limit 예산 확보 (재시도도 가중치를 소모)
+            await self.rate_limiter.acquire_request_async(method, endpoint, weight_params)
+            start_time = time.perf_counter()
+            try:
+                async with session.request(method, url, params=params, headers=headers) as response:
+                    status = response.status
+                    self.rate_limiter.update_from_headers(response.headers, status)
+                    if status in RETRY_STATUSES and attempt < retries:
+                        self.latency_stats.record(endpoint, time.perf_counter() - start_time, error=True)
+                        attempt += 1
+                        await asyncio.sleep(self.backoff_factor * (2 ** (attempt - 1)))
+                        continue
+
+                    self.latency_stats.record(endpoint, time.perf_counter() - start_time,
+                                              error=status != 200)
+                    if status != 200:
+                        text = await response.text()
+                        error_handler.log_error(f"API 응답: {text}", f"{method} {endpoint} 요청 실패")
+                    if self.recorder is not None:
+                        text = await response.text()
+                        self.recorder.record_http(method, endpoint, params, query_string, status,
+                                                  response.headers, text,
+                                                  time.perf_counter() - start_time)
+                    response.raise_for_status()
+                    return await response.json(content_type=None)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                self.latency_stats.record(endpoint, time.perf_counter() - start_time, error=True)
+                if attempt >= retries:
+                    raise
+                attempt += 1
+                await asyncio.sleep(self.backoff_factor * (2 ** (attempt - 1)))
+
+    async def _signed_request(self, method, endpoint, params):
+        """서명이 필요한 요청 실행 (공통 서명 파이프라인)"""
+        if self.signer.needs_time_sync():
+            await self.sync_server_time()
+
+        query_string, signed_params = self.signer.sign(params)
+        return await self._request(
+            method, endpoint,
+            query_string=query_string,
+            headers=self.signer.headers,
+            weight_params=signed_params
+        )
+
+    async def sync_server_time(self):
+        """서버 시간 오프셋 동기화 (실패 시 기존 오프셋 유지)"""
+        request_start = time.time()
+        try:
+            server_time = await self.get_server_time()
+        except Exception as e:
+            # 다음 주기까지 재시도하지 않도록 동기화 시각만 갱신
+            self.signer.last_sync = time.time()
+            error_handler.log_error(e, "서버 시간 동기화 실패, 기존 오프셋 사용")
+            return self.signer.time_offset
+
+        offset = self.signer.update_time_offset(server_time, request_start, time.time())
+        error_handler.log_info(f"서버 시간 동기화 완료: 오프셋 {offset}ms")
+        return offset
+
+    async def get_server_time(self):
+        """서버 시간 조회"""
+        try:
+            data = await self._request('GET', '/api/v3/time')
+            server_time = data['serverTime']
+            error_handler.log_info(f"서버 시간 조회 성공: {server_time}")
+            return server_time
+        except Exception as e:
+            error_handler.log_error(e, "서버 시간 조회 실패")
+            raise
+
+    async def test_connection(self):
+        """API 연결 테스트"""
+        try:
+            await self.get_server_time()
+            error_handler.log_info("API 연결 테스트 성공")
+            return True
+        except Exception as e:
+            error_handler.log_error(e, "API 연결 테스트 실패")
+            return False
+
+    async def get_ticker_price(self, symbol="BTCUSDT"):
+        """현재가 조회 (심볼별 캐시 적용)"""
+        try:
+            price = self._cached_quote(self.price_cache, symbol)
+            if price is not None:
+                return price  # 캐시된 가격 반환
+
+            # 여러 심볼을 추적하는 경우 한 번의 요청으로 전체 갱신
+            if self.use_price_caching and self.bulk_price_refresh:
+                prices = await self.get_all_ticker_prices()
+                if symbol in prices:
+                    return prices[symbol]
+
+            data = await self._request('GET', '/api/v3/ticker/price', params={'symbol': symbol})
+            price = self._store_ticker_price(symbol, data)
+
+            error_handler.log_info(f"현재가 조회 성공: {symbol} = {price}")
+            return price
+        except Exception as e:
+            error_handler.log_error(e, f"{symbol} 현재가 조회 실패")
+            raise
+
+    async def get_all_ticker_prices(self):
+        """전체 심볼 현재가 일괄 조회 (요청 1회로 가격 캐시 갱신)"""
+        try:
+            data = await self._request('GET', '/api/v3/ticker/price')
+            prices = self._store_ticker_prices(data)
+
+            error_handler.log_info(f"전체 현재가 조회 성공: {len(prices)}개 심볼")
+            return prices
+        except Exception as e:
+            error_handler.log_error(e, "전체 현재가 조회 실패")
+            raise
+
+    async def get_all_24hr_tickers(self, symbols=None):
+        """24시간 티커 일괄 조회 (symbols 미지정 시 추적 심볼, 없으면 전체)"""
+        try:
+            data = await self._request('GET', '/api/v3/ticker/24hr', params=self._24hr_tickers_params(symbols))
+            summaries = self._store_24hr_tickers(data)
+
+            error_handler.log_info(f"24시간 티커 일괄 조회 성공: {len(summaries)}개 심볼")
+            return summaries
+        except Exception as e:
+            error_handler.log_error(e, "24시간 티커 일괄 조회 실패")
+            raise
+
+    async def get_all_book_tickers(self):
+        """전체 심볼 최우선 호가 일괄 조회"""
+        try:
+            data = await self._request('GET', '/api/v3/ticker/bookTicker')
+            book_tickers = self._store_book_tickers(data)
+
+            error_handler.log_info(f"최우선 호가 일괄 조회 성공: {len(book_tickers)}개 심볼")
+            return book_tickers
+        except Exception as e:
+            error_handler.log_error(e, "최우선 호가 일괄 조회 실패")
+            raise
+
+    async def get_book_ticker(self, symbol="BTCUSDT"):
+        """최우선 호가 조회 (시세 캐시 사용 시 캐시 적용, 미스 시 전체 일괄 갱신)"""
+        book_ticker = self._cached_quote(self.book_ticker_cache, symbol)
+        if book_ticker is not None:
+            return book_ticker
+        return (await self.get_all_book_tickers()).get(symbol)
+
+    async def get_recent_trades(self, symbol="BTCUSDT", limit=1):
+        """최근 체결 내역 조회"""
+        try:
+            params = {'symbol': symbol, 'limit': limit}
+            trades = await self._request('GET', '/api/v3/trades', params=params)
+            latest_trade = trades[-1]
+            error_handler.log_info(f"최근 거래 조회 성공: {symbol} = {latest_trade['price']}")
+            return {'price': float(latest_trade['price'])}
+        except Exception as e:
+            error_handler.log_error(e, f"{symbol} 최근 거래 조회 실패")
+            raise
+
+    async def create_order(self, symbol="BTCUSDT", order_type="LIMIT", side="BUY",
+                           quantity=0.001, price=None, test=True):
+        """주문 생성 (테스트 모드 지원)"""
+        try:
+            params = self._order_params(symbol, order_type, side, quantity, price)
+            endpoint = "/api/v3/order/test" if test else "/api/v3/order"
+            return await self._signed_request('POST', endpoint, params)
+        except Exception as e:
+            error_handler.log_error(e, "주문 생성 실패")
+            raise
+
+    async def cancel_order(self, symbol="BTCUSDT", order_id=None, test=True):
+        """주문 취소 (테스트 모드 지원)"""
+        try:
+            endpoint = "/api/v3/order/test" if test else "/api/v3/order"
+            params = {'symbol': symbol, 'orderId': order_id}
+            return await self._signed_request('DELETE', endpoint, params)
+        except Exception as e:
+            error_handler.log_error(e, "주문 취소 실패")
+            raise
+
+    async def get_order(self, symbol="BTCUSDT", order_id=None, test=True):
+        """주문 조회"""
+        try:
+            params = {'symbol': symbol, 'orderId': order_id}
+            return await self._signed_request('GET', "/api/v3/order", params)
+        except Exception as e:
+            error_handler.log_error(e, "주문 조회 실패")
+            raise
+
+    async def get_open_orders(self, symbol="BTCUSDT"):
+        """미체결 주문 목록 조회"""
+        try:
+            return await self._signed_request('GET', "/api/v3/openOrders", {'symbol': symbol})
+        except Exception as e:
+            error_handler.log_error(e, "미체결 주문 조회 실패")
+            raise
+
+    async def get_account_info(self):
+        """계정 정보 조회 (잔고 포함)"""
+        try:
+            return await self._signed_request('GET', "/api/v3/account", {})
+        except Exception as e:
+            error_handler.log_error(e, "계정 정보 조회 실패")
+            raise
+
+    async def get_asset_balance(self, asset="BTC"):
+        """특정 자산의 잔고 조회"""
+        try:
+            balance = find_asset_balance(await self.get_account_info(), asset)
+            error_handler.log_info(f"{asset} 잔고 조회 성공: 사용가능={balance['free']}, "
+                                   f"거래중={balance['locked']}, 총잔고={balance['total']}")
+            return balance
+        except Exception as e:
+            error_handler.log_error(e, f"{asset} 잔고 조회 실패")
+            raise
+
+    async def get_my_trades(self, symbol="BTCUSDT", limit=500):
+        """내 거래 내역 조회"""
+        try:
+            params = {'symbol': symbol, 'limit': limit}
+            trades = await self._signed_request('GET', "/api/v3/myTrades", params)
+            error_handler.log_info(f"거래 내역 조회 성공: {len(trades)}건")
+            return trades
+        except Exception as e:
+            error_handler.log_error(e, "거래 내역 조회 실패")
+            raise
+
+    async def get_trade_history_summary(self, symbol="BTCUSDT", days=30):
+        """거래 내역 요약 정보 조회"""
+        try:
+            summary = summarize_trades(await self.get_my_trades(symbol), days)
+            error_handler.log_info(f"거래 내역 요약: {summary}")
+            return summary
+        except Exception as e:
+            error_handler.log_error(e, "거래 내역 요약 조회 실패")
+            raise
+
+    async def get_klines(self, symbol="BTCUSDT", interval="1h", limit=500, start_time=None, end_time=None):
+        """K라인(캔들스틱) 데이터 조회 (start_time/end_time: 밀리초 타임스탬프)"""
+        try:
+            params = klines_params(symbol, interval, limit, start_time, end_time)
+            klines = await self._request('GET', "/api/v3/klines", params=params)
+            error_handler.log_info(f"K라인 데이터 조회 성공: {len(klines)}개")
+            return klines
+        except Exception as e:
+            error_handler.log_error(e, "K라인 데이터 조회 실패")
+            raise
+
+    async def get_market_depth(self, symbol="BTCUSDT", limit=100):
+        """시장 깊이(호가창) 조회"""
+        try:
+            params = {'symbol': symbol, 'limit': limit}
+            depth = await self._request('GET', "/api/v3/depth", params=params)
+            error_handler.log_info(f"시장 깊이 조회 성공: {len(depth['bids'])}개 매수호가, {len(depth['asks'])}개 매도호가")
+            return depth
+        except Exception as e:
+            error_handler.log_error(e, "시장 깊이 조회 실패")
+            raise
+
+    async def get_market_summary(self, symbol="BTCUSDT"):
+        """시장 요약 정보 조회 (24시간 티커 캐시 적용)"""
+        try:
+            summary = self._cached_quote(self.ticker_24hr_cache, symbol)
+            if summary is not None:
+                return summary
+
+            # 여러 심볼을 추적하는 경우 한 번의 요청으로 전체 갱신
+            if self.use_price_caching and self.bulk_price_refresh:
+                summaries = await self.get_all_24hr_tickers()
+                if symbol in summaries:
+                    return summaries[symbol]
+
+            ticker = await self._request('GET', "/api/v3/ticker/24hr", params={'symbol': symbol})
+            summary = self._store_market_summary(symbol, ticker)
+            error_handler.log_info(f"시장 요약 정보 조회 성공: {symbol}")
+            return summary
+        except Exception as e:
+            error_handler.log_error(e, "시장 요약 정보 조회 실패")
+            raise
+
+    async def get_historical_klines(self, symbol, interval, start_str, end_str=None):
+        """과거 K라인(캔들스틱) 데이터 조회 (요청당 최대 1000개 제한을 넘는 기간은 순차적으로 나누어 조회)"""
+        try:
+            start_time, end_time = parse_date_range(start_str, end_str)
+
+            klines = []
+            while start_time is not None:
+                batch = await self.get_klines(symbol, interval, limit=MAX_KLINES_PER_REQUEST,
+                                              start_time=start_time, end_time=end_time)
+                klines.extend(batch)
+                start_time = next_klines_start(batch, end_time)
+
+            error_handler.log_info(f"과거 데이터 조회 성공: {len(klines)}개 캔들")
+            return klines
+        except Exception as e:
+            error_handler.log_error(e, "과거 데이터 조회 실패")
+            raise
@@ -0,0 +1,622 @@
+import os
+import json
+import time
+import hashlib
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory, resource_tracker
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+from .cache_manager import fingerprint
+
+# 포지션 방향 (배열 표현)
+SIDE_BUY = 1
+SIDE_SELL = -1
+SIDE_NAMES = {SIDE_BUY: "BUY", SIDE_SELL: "SELL", 0: None}
+
+# 청산 사유 코드
+EXIT_STOP_LOSS = 1
+EXIT_TAKE_PROFIT = 2
+EXIT_BACKTEST_END = 3
+EXIT_REASONS = {EXIT_STOP_LOSS: "STOP_LOSS", EXIT_TAKE_PROFIT: "TAKE_PROFIT", EXIT_BACKTEST_END: "BACKTEST_END"}
+
+# 거래 기록 형식 (진입/청산 캔들 위치, 방향, 가격, 손익 %)
+TRADE_RECORD_DTYPE = np.dtype([
+    ('entry_index', 'i8'), ('exit_index', 'i8'), ('side', 'i1'),
+    ('entry_price', 'f8'), ('exit_price', 'f8'), ('profit_pct', 'f8'), ('reason', 'i1')
+])
+
+# 백테스트 결과 Parquet 저장 위치
+RESULTS_DIR = "models/backtest_results"
+
+# 결과에 영향을 주는 소스 파일 (캐시 키의 코드 버전)
+_VERSIONED_SOURCES = ('backtest_engine.py', 'trading_strategy.py')
+_code_version = None
+
+# 청산 탐색 시 한 번에 비교하는 최대 원소 수 (후보 수 x 탐색 폭)
+_SCAN_ELEMENTS = 1 << 22
+
+class SimulatedBroker:
+    """백테스트용 모의 브로커
+
+    - 실제 주문 API 대신 현재 캔들 종가로 즉시 체결하고 체결 내역을 기록
+    - TradingStrategy 의 binance_api 자리에 넣어 execute_trade/close_position 을 그대로 사용
+    """
+    def __init__(self, symbol='BTCUSDT'):
+        self.symbol = symbol
+        self.price = None
+        self.timestamp = None
+        self.fills = []
+
+    def set_price(self, price, timestamp=None):
+        """현재 캔들 가격 설정"""
+        self.price = float(price)
+        self.timestamp = timestamp
+
+    def get_ticker_price(self, symbol):
+        return self.price
+
+    def create_order(self, symbol, order_type, side, quantity, price=None, test=False):
+        """주문을 현재 가격으로 즉시 체결"""
+        fill_price = self.price if price is None else float(price)
+        order = {
+            'symbol': symbol,
+            'orderId': len(self.fills) + 1,
+            'type': order_type,
+            'side': side,
+            'origQty': quantity,
+            'price': fill_price,
+            'status': 'FILLED',
+            'transactTime': self.timestamp
+        }
+        self.fills.append(order)
+        return order
+
+def code_version():
+    """백테스트 엔진과 전략 모듈 소스의 해시 (코드가 바뀌면 캐시된 결과를 쓰지 않도록 키에 포함)"""
+    global _code_version
+    if _code_version is None:
+        digest = hashlib.sha256()
+        directory = os.path.dirname(os.path.abspath(__file__))
+        for name in _VERSIONED_SOURCES:
+            with open(os.path.join(directory, name), 'rb') as f:
+                digest.update(f.read())
+        _code_version = digest.hexdigest()
+    return _code_version
+
+def backtest_key(arrays, buy_sell_ratio, params, **options):
+    """TradingStrategy.backtest 결과 캐시 키 (데이터, 매수/매도 비율, 파라미터, 실행 옵션, 코드 버전)"""
+    columns = [arrays[name] for name in ('open_time', 'open', 'close', 'volume')]
+    ratio = np.asarray(buy_sell_ratio, dtype=np.float64)
+    return fingerprint('backtest', code_version(), *columns, ratio, params, options)
+
+def summary_statistics(position, pnl, trade_profits, balance, total_profit_loss):
+    """캔들별 포지션/누적 손익 %와 거래별 손익 %로 요약 통계 계산
+
+    max_drawdown 은 실현 손익 기준 평가 자산의 최고점 대비 최대 하락률 (%)
+    """
+    trade_profits = np.asarray(trade_profits, dtype=np.float64)
+    equity = balance * (1 + np.asarray(pnl, dtype=np.float64) / 100)
+    peak = np.maximum.accumulate(np.maximum(equity, balance)) if len(equity) else equity
+    drawdown = float(((peak - equity) / peak).max() * 100) if len(equity) and balance > 0 else 0.0
+    return {
+        'candles': len(position),
+        'trades': len(trade_profits),
+        'trade_count': 2 * len(trade_profits),
+        'total_profit_loss': float(total_profit_loss),
+        'final_equity': float(balance * (1 + total_profit_loss / 100)),
+        'win_rate': float((trade_profits > 0).mean() * 100) if len(trade_profits) else 0.0,
+        'average_profit': float(trade_profits.mean()) if len(trade_profits) else 0.0,
+        'best_trade': float(trade_profits.max()) if len(trade_profits) else 0.0,
+        'worst_trade': float(trade_profits.min()) if len(trade_profits) else 0.0,
+        'max_drawdown': drawdown,
+        'exposure': float(np.count_nonzero(position) / len(position) * 100) if len(position) else 0.0
+    }
+
+class BacktestResult:
+    """열 단위 백테스트 결과
+
+    - 캔들별 열: timestamp, price, position (SIDE_BUY/SIDE_SELL/0), equity (실현 손익 기준 평가 자산), pnl (누적 손익 %)
+    - summary: summary_statistics 요약 통계
+    - 행 접근(result[i], 반복)은 기존 캔들별 결과 dict 형식으로 변환 (timestamp, price, position, balance, profit_loss, equity)
+    - keep_curve=False 로 만들면 캔들별 열은 버리고 요약 통계만 보관
+    """
+    COLUMNS = ('timestamp', 'price', 'position', 'equity', 'pnl')
+
+    def __init__(self, columns, summary, balance):
+        self.columns = columns
+        self.summary = summary
+        self.balance = balance
+
+    @classmethod
+    def from_arrays(cls, timestamp, price, position, pnl, trade_profits, balance, total_profit_loss,
+                    keep_curve=True):
+        """캔들별 배열과 거래별 손익 %로 결과 생성"""
+        position = np.asarray(position, dtype=np.int8)
+        pnl = np.asarray(pnl, dtype=np.float64)
+        summary = summary_statistics(position, pnl, trade_profits, balance, total_profit_loss)
+        columns = None
+        if keep_curve:
+            columns = {
+                'timestamp': np.asarray(timestamp, dtype=np.int64),
+                'price': np.asarray(price, dtype=np.float64),
+                'position': position,
+                'equity': balance * (1 + pnl / 100),
+                'pnl': pnl
+            }
+        return cls(columns, summary, balance)
+
+    @property
+    def has_curve(self):
+        return self.columns is not None
+
+    def _require_curve(self):
+        if self.columns is None:
+            raise ValueError("요약 통계만 보관한 백테스트 결과입니다 (keep_curve=False).")
+
+    def __len__(self):
+        return self.summary['candles']
+
+    def __getitem__(self, index):
+        """캔들 하나의 결과 (기존 dict 형식)"""
+        self._require_curve()
+        columns = self.columns
+        return {
+            'timestamp': int(columns['timestamp'][index]),
+            'price': float(columns['price'][index]),
+            'position': SIDE_NAMES[int(columns['position'][index])],
+            'balance': self.balance,
+            'profit_loss': float(columns['pnl'][index]),
+            'equity': float(columns['equity'][index])
+        }
+
+    def __iter__(self):
+        self._require_curve()
+        return (self[index] for index in range(len(self)))
+
+    def __eq__(self, other):
+        if not isinstance(other, BacktestResult):
+            return NotImplemented
+        if self.summary != other.summary or self.balance != other.balance or self.has_curve != other.has_curve:
+            return False
+        return not self.has_curve or all(
+            np.array_equal(self.columns[name], other.columns[name]) for name in self.COLUMNS
+        )
+
+    __hash__ = None
+
+    def to_table(self):
+        """Arrow 테이블 (요약 통계와 초기 잔고는 스키마 메타데이터로 저장)"""
+        self._require_curve()
+        table = pa.Table.from_arrays([self.columns[name] for name in self.COLUMNS], names=list(self.COLUMNS))
+        metadata = {'summary': json.dumps(self.summary), 'balance': json.dumps(self.balance)}
+        return table.replace_schema_metadata(metadata)
+
+    def to_parquet(self, path):
+        """Parquet 파일로 저장 (임시 파일에 기록 후 교체)"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = f"{path}.tmp"
+        pq.write_table(self.to_table(), temp_path)
+        os.replace(temp_path, path)
+        return path
+
+    @classmethod
+    def read_parquet(cls, path):
+        """to_parquet 로 저장한 결과 읽기"""
+        table = pq.read_table(path)
+        metadata = table.schema.metadata
+        columns = {name: table.column(name).to_numpy() for name in cls.COLUMNS}
+        return cls(columns, json.loads(metadata[b'summary']), json.loads(metadata[b'balance']))
+
+def klines_to_arrays(klines):
+    """K라인 목록을 열 단위 숫자 배열로 변환 (OHLCV, 응답에 있으면 taker_buy_volume)"""
+    if len(klines) == 0:
+        return {
+            'open_time': np.zeros(0, dtype=np.int64),
+            **{name: np.zeros(0) for name in ('open', 'high', 'low', 'close', 'volume')}
+        }
+    columns = list(zip(*(kline[:10] for kline in klines)))
+    arrays = {
+        'open_time': np.array(columns[0], dtype=np.int64),
+        'open': np.array(columns[1], dtype=np.float64),
+        'high': np.array(columns[2], dtype=np.float64),
+        'low': np.array(columns[3], dtype=np.float64),
+        'close': np.array(columns[4], dtype=np.float64),
+        'volume': np.array(columns[5], dtype=np.float64)
+    }
+    # 전체 응답 형식이면 매수 체결량 포함 (모의 거래소 호가 비중)
+    if len(columns) == 10:
+        arrays['taker_buy_volume'] = np.array(columns[9], dtype=np.float64)
+    return arrays
+
+def entry_signals(open_prices, close_prices, buy_sell_ratio=1.0):
+    """캔들별 진입 신호 (TradingStrategy._get_market_sentiment 와 동일한 기준)
+
+    반환: SIDE_BUY / SIDE_SELL / 0 의 int8 배열
+    """
+    price_change = ((close_prices - open_prices) / open_prices) * 100
+    ratio = np.broadcast_to(np.asarray(buy_sell_ratio, dtype=np.float64), price_change.shape)
+    buy = ((price_change > 1.0) & (ratio > 1.1)) | ((price_change > 0.5) & (ratio > 1.0))
+    sell = ((price_change < -1.0) & (ratio < 0.9)) | ((price_change < -0.5) & (ratio < 1.0))
+    signals = np.zeros(len(price_change), dtype=np.int8)
+    signals[sell] = SIDE_SELL
+    signals[buy] = SIDE_BUY
+    return signals
+
+def _exit_hits(change, sides, stop_loss, take_profit):
+    """손절/익절 조건 충족 여부와 사유 (TradingStrategy.should_close_position 과 동일한 비교)"""
+    long_stop = change <= -stop_loss
+    long_take = change >= take_profit
+    short_stop = change >= stop_loss
+    short_take = change <= -take_profit
+    is_long = sides > 0
+    stop = np.where(is_long, long_stop, short_stop)
+    take = np.where(is_long, long_take, short_take)
+    return stop | take, stop
+
+def find_exits(close_prices, entries, sides, stop_loss, take_profit, width=32):
+    """진입 후보마다 첫 청산 캔들 위치와 사유 계산
+
+    - 모든 후보를 진입 다음 캔들부터 width 개씩 한꺼번에 비교하고,
+      청산되지 않은 후보만 탐색 폭을 두 배로 늘려 이어서 비교
+    - 끝까지 청산되지 않으면 위치 -1
+    """
+    n = len(close_prices)
+    exits = np.full(len(entries), -1, dtype=np.int64)
+    reasons = np.zeros(len(entries), dtype=np.int8)
+    pending = np.arange(len(entries))
+    offset = 1
+    while pending.size:
+        pending = pending[entries[pending] + offset < n]
+        if not pending.size:
+            break
+        columns = np.arange(width)
+        rows = max(1, _SCAN_ELEMENTS // width)
+        unresolved = []
+        for chunk_start in range(0, pending.size, rows):
+            chunk = pending[chunk_start:chunk_start + rows]
+            start = entries[chunk] + offset
+            index = start[:, None] + columns
+            valid = index < n
+            entry_price = close_prices[entries[chunk]][:, None]
+            change = (close_prices[np.minimum(index, n - 1)] - entry_price) / entry_price * 100
+            hit, stop = _exit_hits(change, sides[chunk][:, None], stop_loss, take_profit)
+            hit &= valid
+            found = hit.any(axis=1)
+            first = hit.argmax(axis=1)
+            rows_found = np.flatnonzero(found)
+            exits[chunk[found]] = start[found] + first[found]
+            reasons[chunk[found]] = np.where(stop[rows_found, first[found]],
+                                             EXIT_STOP_LOSS, EXIT_TAKE_PROFIT)
+            unresolved.append(chunk[~found])
+        pending = np.concatenate(unresolved)
+        offset += width
+        width *= 2
+    return exits, reasons
+
+def run_backtest(open_prices, close_prices, stop_loss, take_profit, buy_sell_ratio=1.0, auto_trading=True):
+    """가격 배열 전체에 대한 백테스트 (TradingStrategy.backtest 캔들 반복과 동일한 거래 생성)
+
+    - 진입 신호와 후보별 청산 위치는 배열 연산으로 계산하고,
+      실제 거래 경로는 청산 다음 신호로 건너뛰며 연결 (반복 횟수 = 거래 수)
+    - 진입/청산은 해당 캔들 종가로 체결, 한 캔들에서는 진입 또는 청산 중 하나만 발생
+    - 마지막까지 열린 포지션은 마지막 종가로 BACKTEST_END 청산
+
+    반환: trades (TRADE_RECORD_DTYPE 배열), position (캔들별 방향), profit_loss (캔들별 누적 손익 %),
+          trade_count (진입+청산 주문 수), total_profit_loss
+    """
+    open_prices = np.asarray(open_prices, dtype=np.float64)
+    close_prices = np.asarray(close_prices, dtype=np.float64)
+    n = len(close_prices)
+
+    signals = entry_signals(open_prices, close_prices, buy_sell_ratio)
+    if not auto_trading:
+        signals[:] = 0
+    candidates = np.flatnonzero(signals)
+    sides = signals[candidates]
+    exits, reasons = find_exits(close_prices, candidates, sides, stop_loss, take_profit)
+
+    # 청산 이후 첫 진입 후보로 연결
+    next_candidate = np.searchsorted(candidates, exits, side='right').tolist()
+    exit_list = exits.tolist()
+    path = []
+    k = 0
+    while k < len(candidates):
+        path.append(k)
+        if exit_list[k] < 0:
+            break
+        k = next_candidate[k]
+    path = np.array(path, dtype=np.int64)
+
+    trades = np.zeros(len(path), dtype=TRADE_RECORD_DTYPE)
+    if len(path):
+        trades['entry_index'] = candidates[path]
+        trades['exit_index'] = exits[path]
+        trades['side'] = sides[path]
+        trades['reason'] = reasons[path]
+        open_end = trades['exit_index'] < 0
+        trades['reason'][open_end] = EXIT_BACKTEST_END
+        trades['entry_price'] = close_prices[trades['entry_index']]
+        trades['exit_price'] = close_prices[np.where(open_end, n - 1, trades['exit_index'])]
+        change = (trades['exit_price'] - trades['entry_price']) / trades['entry_price'] * 100
+        trades['profit_pct'] = np.where(trades['side'] == SIDE_SELL, -change, change)
+
+    # 캔들별 포지션 (청산 캔들부터 포지션 없음)
+    delta = np.zeros(n + 1, dtype=np.int64)
+    closed = trades[trades['exit_index'] >= 0]
+    np.add.at(delta, trades['entry_index'], trades['side'])
+    np.add.at(delta, closed['exit_index'], -closed['side'].astype(np.int64))
+    position = np.cumsum(delta[:n]).astype(np.int8)
+
+    # 캔들별 누적 손익 (청산 캔들에서 반영, 순차 합산과 동일한 순서)
+    realized = np.zeros(n)
+    realized[closed['exit_index']] = closed['profit_pct']
+    profit_loss = np.cumsum(realized)
+
+    total = float(profit_loss[-1]) if n else 0.0
+    if len(trades) and trades['reason'][-1] == EXIT_BACKTEST_END:
+        total += float(trades['profit_pct'][-1])
+
+    return {
+        'trades': trades,
+        'position': position,
+        'profit_loss': profit_loss,
+        'trade_count': 2 * len(trades),
+        'total_profit_loss': total
+    }
+
+def loop_backtest(strategy, arrays, balance, buy_sell_ratio=1.0, keep_curve=True):
+    """캔들 단위 반복 백테스트 (기준 구현)
+
+    전략의 진입/청산 메서드를 그대로 사용하되 주문은 SimulatedBroker 로 체결.
+    arrays: klines_to_arrays 형식의 열 배열
+    반환: (BacktestResult, 브로커)
+    """
+    broker = SimulatedBroker(strategy.symbol)
+    count = len(arrays['close'])
+    ratios = np.broadcast_to(np.asarray(buy_sell_ratio, dtype=np.float64), (count,)).tolist()
+    sides = {"BUY": SIDE_BUY, "SELL": SIDE_SELL, None: 0}
+    live_api = strategy.binance_api
+    strategy.binance_api = broker
+    try:
+        positions = []
+        profit_loss = []
+        rows = zip(arrays['open_time'].tolist(), arrays['open'].tolist(), arrays['close'].tolist(),
+                   arrays['volume'].tolist(), ratios)
+        for timestamp, open_price, close_price, volume, ratio in rows:
+            broker.set_price(close_price, timestamp)
+
+            price_change = ((close_price - open_price) / open_price) * 100
+            analysis = {
+                'current_price': close_price,
+                'price_change_24h': price_change,
+                'volume_24h': volume,
+                'buy_sell_ratio': ratio,
+                'market_sentiment': strategy._get_market_sentiment(price_change, ratio)
+            }
+
+            if strategy.position is None:
+                signal = strategy.should_open_position(analysis)
+                if signal:
+                    strategy.execute_trade(signal, close_price)
+            else:
+                signal = strategy.should_close_position(analysis)
+                if signal:
+                    strategy.close_position(signal)
+
+            positions.append(sides[strategy.position])
+            profit_loss.append(strategy.profit_loss)
+
+        if strategy.position:
+            strategy.close_position("BACKTEST_END")
+
+        # 체결 내역(진입/청산 쌍)으로 거래별 손익 %
+        trade_profits = []
+        for entry, exit_ in zip(broker.fills[::2], broker.fills[1::2]):
+            change = (exit_['price'] - entry['price']) / entry['price'] * 100
+            trade_profits.append(-change if entry['side'] == "SELL" else change)
+
+        result = BacktestResult.from_arrays(
+            arrays['open_time'], arrays['close'], positions, profit_loss, trade_profits,
+            balance, strategy.profit_loss, keep_curve=keep_curve
+        )
+        return result, broker
+    finally:
+        strategy.binance_api = live_api
+
+class SharedPriceArrays:
+    """공유 메모리에 올린 백테스트 입력 배열 (시가, 종가, 매수/매도 비율)
+
+    프로세스 풀 작업자는 이름으로 연결하여 복사 없이 읽기 전용으로 사용.
+    """
+    COLUMNS = ('open', 'close', 'buy_sell_ratio')
+
+    def __init__(self, shm, length, owner):
+        self.shm = shm
+        self.length = length
+        self.owner = owner
+        data = np.ndarray((len(self.COLUMNS), length), dtype=np.float64, buffer=shm.buf)
+        if not owner:
+            data.flags.writeable = False
+        self._data = data
+
+    @classmethod
+    def create(cls, open_prices, close_prices, buy_sell_ratio=1.0):
+        """배열을 새 공유 메모리 블록에 복사"""
+        length = len(close_prices)
+        size = max(1, len(cls.COLUMNS) * length * np.dtype(np.float64).itemsize)
+        shm = shared_memory.SharedMemory(create=True, size=size)
+        shared = cls(shm, length, owner=True)
+        shared._data[0] = open_prices
+        shared._data[1] = close_prices
+        shared._data[2] = np.broadcast_to(np.asarray(buy_sell_ratio, dtype=np.float64), (length,))
+        return shared
+
+    @classmethod
+    def attach(cls, name, length):
+        """기존 공유 메모리 블록에 연결 (작업자 프로세스용)"""
+        shm = shared_memory.SharedMemory(name=name)
+        # 블록 해제는 생성한 프로세스가 담당 (작업자 종료 시 리소스 추적기가 해제하지 않도록)
+        resource_tracker.unregister(shm._name, 'shared_memory')
+        return cls(shm, length, owner=False)
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def column(self, name):
+        return self._data[self.COLUMNS.index(name)]
+
+    def close(self):
+        """연결 해제 (생성한 프로세스는 블록도 삭제)"""
+        self._data = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+# 작업자 프로세스별 상태 (공유 배열, 자동 거래 여부)
+_worker_state = {}
+
+def _init_worker(name, length, auto_trading):
+    _worker_state['prices'] = SharedPriceArrays.attach(name, length)
+    _worker_state['auto_trading'] = auto_trading
+
+def evaluate_parameters(params, prices=None, auto_trading=None, window=None):
+    """파라미터 조합 하나의 백테스트 결과 (TradingStrategy.optimize_parameters 결과 항목 형식)
+
+    profit 은 마지막 캔들 기록 시점의 누적 손익 %, trades 는 BACKTEST_END 청산을 포함한 주문 수.
+    window: 평가할 캔들 구간 (start, end), 미지정 시 전체
+    """
+    if prices is None:
+        prices = _worker_state['prices']
+        auto_trading = _worker_state['auto_trading']
+    start, end = window if window is not None else (0, prices.length)
+    started = time.perf_counter()
+    run = run_backtest(
+        prices.column('open')[start:end], prices.column('close')[start:end],
+        params['stop_loss'], params['take_profit'],
+        buy_sell_ratio=prices.column('buy_sell_ratio')[start:end], auto_trading=auto_trading
+    )
+    result = dict(params)
+    result['profit'] = float(run['profit_loss'][-1])
+    result['trades'] = run['trade_count']
+    result['elapsed'] = time.perf_counter() - started
+    return result
+
+def _evaluate_task(task):
+    params, window = task
+    return evaluate_parameters(params, window=window)
+
+def parameter_grid(param_ranges):
+    """파라미터 범위의 모든 조합 (입력 순서대로 중첩 반복한 순서)"""
+    names = list(param_ranges)
+    return [dict(zip(names, values)) for values in itertools.product(*param_ranges.values())]
+
+class ParallelEvaluator:
+    """공유 메모리 가격 배열 위에서 파라미터 조합을 병렬 평가하는 프로세스 풀
+
+    - 가격 배열은 공유 메모리에 한 번만 올리고 작업자는 이름으로 연결
+    - 각 조합은 독립된 상태로 계산 (전략 객체를 변경하지 않음)
+    - workers=1 이면 현재 프로세스에서 순차 실행
+    - 여러 번 evaluate 를 호출해도 풀과 공유 메모리를 재사용 (close 또는 with 블록 종료 시 해제)
+    - cache (cache_manager.DiskLRUCache) 가 있으면 구간 데이터 해시, 코드 버전, 파라미터가 같은 조합은
+      저장된 결과를 사용하고 나머지만 계산 (캐시 결과의 elapsed 는 0)
+    """
+    def __init__(self, open_prices, close_prices, buy_sell_ratio=1.0, auto_trading=True, workers=None,
+                 cache=None):
+        if len(close_prices) == 0:
+            raise ValueError("백테스트 데이터가 없습니다.")
+        self.auto_trading = auto_trading
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.prices = SharedPriceArrays.create(open_prices, close_prices, buy_sell_ratio)
+        self.cache = cache
+        self._fingerprints = {}   # 구간 -> 구간 데이터 해시
+        self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    @property
+    def length(self):
+        return self.prices.length
+
+    def _cache_key(self, params, window):
+        start, end = window if window is not None else (0, self.length)
+        data = self._fingerprints.get((start, end))
+        if data is None:
+            data = fingerprint(*(self.prices.column(name)[start:end] for name in SharedPriceArrays.COLUMNS))
+            self._fingerprints[(start, end)] = data
+        return fingerprint('evaluate', code_version(), data, self.auto_trading, params)
+
+    def evaluate(self, candidates, window=None):
+        """파라미터 조합 목록 평가 (입력 순서대로의 결과 목록)"""
+        if self.cache is None:
+            return self._compute(candidates, window)
+
+        keys = [self._cache_key(params, window) for params in candidates]
+        results = []
+        missing = []
+        for index, key in enumerate(keys):
+            cached = self.cache.get(key)
+            if cached is None:
+                missing.append(index)
+            else:
+                cached['elapsed'] = 0.0
+            results.append(cached)
+        for index, result in zip(missing, self._compute([candidates[i] for i in missing], window)):
+            self.cache.set(keys[index], result)
+            results[index] = result
+        return results
+
+    def _compute(self, candidates, window):
+        if self.workers == 1 or len(candidates) <= 1:
+            return [evaluate_parameters(params, self.prices, self.auto_trading, window) for params in candidates]
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                             initargs=(self.prices.name, self.prices.length, self.auto_trading))
+        chunksize = max(1, len(candidates) // (self.workers * 4))
+        tasks = [(params, window) for params in candidates]
+        return list(self._pool.map(_evaluate_task, tasks, chunksize=chunksize))
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+        if self.prices is not None:
+            self.prices.close()
+            self.prices = None
+
+def timing_summary(results, started, workers):
+    """평가 결과의 시간 통계"""
+    elapsed = [result['elapsed'] for result in results]
+    return {
+        'wall_clock': time.perf_counter() - started,
+        'workers': workers,
+        'combinations': len(results),
+        'per_combination_avg': sum(elapsed) / len(elapsed) if elapsed else 0.0,
+        'per_combination_max': max(elapsed, default=0.0),
+        'cpu_total': sum(elapsed)
+    }
+
+def grid_search(open_prices, close_prices, param_ranges, buy_sell_ratio=1.0, auto_trading=True, workers=None,
+                cache=None):
+    """파라미터 범위의 모든 조합을 ParallelEvaluator 로 병렬 백테스트
+
+    cache: 결과 캐시 (cache_manager.DiskLRUCache, 선택)
+    반환: (조합 순서대로의 결과 목록, 시간 통계 (+ 캐시 사용 시 cache 통계))
+    """
+    started = time.perf_counter()
+    combinations = parameter_grid(param_ranges)
+    workers = max(1, min(workers or os.cpu_count() or 1, len(combinations)))
+    with ParallelEvaluator(open_prices, close_prices, buy_sell_ratio, auto_trading, workers, cache) as evaluator:
+        results = evaluator.evaluate(combinations)
+    timing = timing_summary(results, started, workers)
+    if cache is not None:
+        timing['cache'] = cache.get_stats()
+    return results, timing
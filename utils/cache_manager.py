@@ -0,0 +1,325 @@
+import os
+import time
+import json
+import pickle
+import asyncio
+import hashlib
+import threading
+from collections import OrderedDict
+
+class TTLCache:
+    """키별 유효시간(TTL) 캐시 (스레드 안전, 적중/미스/만료 통계)"""
+    def __init__(self, ttl=1.0):
+        """캐시 초기화
+
+        ttl: 기본 유효시간 (초)
+        """
+        self.ttl = ttl
+        self._data = {}
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'stale': 0, 'updates': 0}
+
+    def get(self, key, ttl=None):
+        """유효한 캐시 값 조회 (없거나 만료된 경우 None)"""
+        ttl = self.ttl if ttl is None else ttl
+        now = time.time()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.stats['misses'] += 1
+                return None
+            value, timestamp = entry
+            if now - timestamp >= ttl:
+                self.stats['stale'] += 1
+                return None
+            self.stats['hits'] += 1
+            return value
+
+    def set(self, key, value, timestamp=None):
+        """캐시 값 저장"""
+        timestamp = time.time() if timestamp is None else timestamp
+        with self._lock:
+            self._data[key] = (value, timestamp)
+            self.stats['updates'] += 1
+
+    def set_many(self, items, timestamp=None):
+        """여러 캐시 값을 같은 시각으로 저장 (일괄 조회 결과)"""
+        timestamp = time.time() if timestamp is None else timestamp
+        with self._lock:
+            for key, value in items.items():
+                self._data[key] = (value, timestamp)
+            self.stats['updates'] += len(items)
+
+    def age(self, key):
+        """캐시 값의 경과 시간 (초, 없으면 None)"""
+        with self._lock:
+            entry = self._data.get(key)
+        return None if entry is None else time.time() - entry[1]
+
+    def invalidate(self, key=None):
+        """캐시 무효화 (key 미지정 시 전체)"""
+        with self._lock:
+            if key is None:
+                self._data.clear()
+            else:
+                self._data.pop(key, None)
+
+    def get_stats(self):
+        """적중률 등 캐시 통계 조회"""
+        with self._lock:
+            stats = dict(self.stats)
+            stats['size'] = len(self._data)
+        lookups = stats['hits'] + stats['misses'] + stats['stale']
+        stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+        return stats
+
+def _cached_result(results, key, window):
+    """재사용 가능한 완료 결과 (만료된 항목은 제거)"""
+    cached = results.get(key)
+    if cached is None:
+        return None
+    if time.time() - cached[1] < window:
+        return cached
+    del results[key]
+    return None
+
+def _store_result(results, key, result, window):
+    """완료 결과 저장 (저장 순서가 시간 순이므로 앞에서부터 만료 항목 정리)"""
+    now = time.time()
+    results.pop(key, None)
+    results[key] = (result, now)
+    while results:
+        oldest = next(iter(results.values()))
+        if now - oldest[1] < window:
+            break
+        results.popitem(last=False)
+
+class SingleFlight:
+    """동일 키 요청 병합 (스레드용)
+
+    같은 키로 동시에 들어온 호출은 먼저 시작된 호출 하나의 결과를 공유하고,
+    완료 후 window 초 동안은 그 결과를 그대로 재사용한다.
+    공유된 결과 객체는 호출자 간에 공유되므로 읽기 전용으로 사용해야 한다.
+    """
+    def __init__(self, window=0.0):
+        """요청 병합기 초기화
+
+        window: 완료된 결과를 재사용할 시간 (초)
+        """
+        self.window = window
+        self._inflight = {}
+        self._results = OrderedDict()   # key -> (결과, 완료 시각), 완료 순
+        self._lock = threading.Lock()
+        self.stats = {'calls': 0, 'executions': 0, 'shared_inflight': 0, 'shared_window': 0}
+
+    def do(self, key, func, *args, **kwargs):
+        """key 기준으로 병합하여 func 실행"""
+        with self._lock:
+            self.stats['calls'] += 1
+            cached = _cached_result(self._results, key, self.window)
+            if cached is not None:
+                self.stats['shared_window'] += 1
+                return cached[0]
+
+            call = self._inflight.get(key)
+            if call is None:
+                call = {'event': threading.Event(), 'result': None, 'error': None}
+                self._inflight[key] = call
+                leader = True
+                self.stats['executions'] += 1
+            else:
+                leader = False
+                self.stats['shared_inflight'] += 1
+
+        if not leader:
+            call['event'].wait()
+            if call['error'] is not None:
+                raise call['error']
+            return call['result']
+
+        try:
+            call['result'] = func(*args, **kwargs)
+            return call['result']
+        except BaseException as e:
+            # KeyboardInterrupt 등도 대기자에게 전달 (결과 None 으로 공유/캐시 방지)
+            call['error'] = e
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+                if call['error'] is None and self.window > 0:
+                    _store_result(self._results, key, call['result'], self.window)
+            call['event'].set()
+
+    def get_stats(self):
+        """병합 통계 조회 (saved: 절약된 요청 수)"""
+        with self._lock:
+            stats = dict(self.stats)
+        stats['saved'] = stats['shared_inflight'] + stats['shared_window']
+        return stats
+
+class AsyncSingleFlight:
+    """동일 키 요청 병합 (asyncio 용, SingleFlight 와 동일한 동작)"""
+    def __init__(self, window=0.0):
+        self.window = window
+        self._inflight = {}
+        self._results = OrderedDict()
+        self.stats = {'calls': 0, 'executions': 0, 'shared_inflight': 0, 'shared_window': 0}
+
+    async def do(self, key, func, *args, **kwargs):
+        """key 기준으로 병합하여 코루틴 함수 func 실행"""
+        self.stats['calls'] += 1
+        cached = _cached_result(self._results, key, self.window)
+        if cached is not None:
+            self.stats['shared_window'] += 1
+            return cached[0]
+
+        future = self._inflight.get(key)
+        while future is not None:
+            self.stats['shared_inflight'] += 1
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+                # 먼저 시작된 호출만 취소된 경우 대기자는 다시 시도 (대기자 중 하나가 새로 실행)
+                self.stats['shared_inflight'] -= 1
+                cached = _cached_result(self._results, key, self.window)
+                if cached is not None:
+                    self.stats['shared_window'] += 1
+                    return cached[0]
+                future = self._inflight.get(key)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        self.stats['executions'] += 1
+        try:
+            result = await func(*args, **kwargs)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # 대기자가 없는 경우 예외 미조회 경고 방지
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            if self.window > 0:
+                _store_result(self._results, key, result, self.window)
+            return result
+        finally:
+            self._inflight.pop(key, None)
+
+    def get_stats(self):
+        """병합 통계 조회 (saved: 절약된 요청 수)"""
+        stats = dict(self.stats)
+        stats['saved'] = stats['shared_inflight'] + stats['shared_window']
+        return stats
+
+def fingerprint(*parts):
+    """값 목록의 SHA-256 해시 (numpy 배열은 dtype/shape/바이트, 그 외는 정렬된 JSON 기준)"""
+    digest = hashlib.sha256()
+    for part in parts:
+        if hasattr(part, 'tobytes') and hasattr(part, 'dtype'):
+            digest.update(f"{part.dtype.str}{part.shape}".encode())
+            digest.update(part.tobytes() if part.flags.c_contiguous else part.copy().tobytes())
+        else:
+            digest.update(json.dumps(part, sort_keys=True, default=str).encode())
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+class DiskLRUCache:
+    """용량 제한 디스크 캐시 (최근 사용 순 제거, 프로세스 재시작 후에도 유지)
+
+    - 항목마다 {directory}/{key}.pkl 파일 하나 (임시 파일에 기록 후 교체)
+    - 최근 사용 시각은 파일 수정 시각으로 유지하여 재시작 시 디렉토리에서 순서를 복원
+    - 전체 크기가 max_bytes 를 넘으면 가장 오래 사용하지 않은 항목부터 삭제
+    """
+    def __init__(self, directory="data/cache/backtest", max_bytes=256 * 1024 * 1024):
+        """캐시 초기화
+
+        directory: 캐시 파일 디렉토리
+        max_bytes: 최대 전체 크기 (바이트)
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()   # key -> 파일 크기 (오래 사용하지 않은 순)
+        self._bytes = 0
+        self.stats = {'hits': 0, 'misses': 0, 'updates': 0, 'evictions': 0}
+
+        os.makedirs(directory, exist_ok=True)
+        files = []
+        for name in os.listdir(directory):
+            if name.endswith('.pkl'):
+                stat = os.stat(os.path.join(directory, name))
+                files.append((stat.st_mtime_ns, name[:-len('.pkl')], stat.st_size))
+        for _, key, size in sorted(files):
+            self._entries[key] = size
+            self._bytes += size
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.pkl")
+
+    def get(self, key):
+        """캐시 값 조회 (없으면 None)"""
+        with self._lock:
+            if key not in self._entries:
+                self.stats['misses'] += 1
+                return None
+            try:
+                with open(self._path(key), 'rb') as f:
+                    value = pickle.load(f)
+                os.utime(self._path(key))
+            except (OSError, pickle.UnpicklingError, EOFError):
+                # 외부에서 삭제되었거나 손상된 항목
+                self._bytes -= self._entries.pop(key)
+                self.stats['misses'] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats['hits'] += 1
+            return value
+
+    def set(self, key, value):
+        """캐시 값 저장 후 용량 초과분 제거"""
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            path = self._path(key)
+            temp_path = f"{path}.tmp"
+            with open(temp_path, 'wb') as f:
+                f.write(data)
+            os.replace(temp_path, path)
+            self._bytes += len(data) - self._entries.pop(key, 0)
+            self._entries[key] = len(data)
+            self.stats['updates'] += 1
+
+            while self._bytes > self.max_bytes and len(self._entries) > 1:
+                old_key, size = self._entries.popitem(last=False)
+                self._bytes -= size
+                self.stats['evictions'] += 1
+                try:
+                    os.remove(self._path(old_key))
+                except FileNotFoundError:
+                    pass
+
+    def invalidate(self, key=None):
+        """캐시 무효화 (key 미지정 시 전체)"""
+        with self._lock:
+            keys = list(self._entries) if key is None else [key] if key in self._entries else []
+            for old_key in keys:
+                self._bytes -= self._entries.pop(old_key)
+                try:
+                    os.remove(self._path(old_key))
+                except FileNotFoundError:
+                    pass
+
+    def get_stats(self):
+        """적중률, 항목 수, 전체 크기 등 캐시 통계 조회"""
+        with self._lock:
+            stats = dict(self.stats)
+            stats['size'] = len(self._entries)
+            stats['bytes'] = self._bytes
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+        return stats
@@ -1,30 +1,45 @@
 from .error_handler import log_error, log_info
+from data.market_data import parse_kline
 
 class DataCollector:
-    def __init__(self, api):
+    def __init__(self, api, aggregator=None):
         self.api = api
+        self.aggregator = aggregator  # 스트림 캔들 집계기 (선택, data.market_data.CandleAggregator)
         self.symbol = 'BTCUSDT'
         self.interval = '1m'
         log_info("데이터 수집기 초기화 완료")
 
     def get_recent_data(self, limit=100):
-        """최근 OHLCV 데이터 조회"""
+        """최근 OHLCV 데이터 조회 (집계기가 있으면 메모리에서 반환)
+
+        반환: 오래된 순 캔들 목록 (data.market_data.CANDLE_FIELDS 순서의 숫자형 행, 조회 경로와 무관)
+        """
         try:
+            if self.aggregator is not None and self.interval in self.aggregator.intervals \
+                    and self.aggregator.has_data(self.symbol, self.interval):
+                # 누락 구간이 있을 때만 REST 로 보정
+                if self.aggregator.gaps:
+                    self.aggregator.repair_gaps()
+                return self.aggregator.get_candles(self.symbol, self.interval, limit=limit)
+
             klines = self.api.get_klines(
                 symbol=self.symbol,
                 interval=self.interval,
                 limit=limit
             )
-            return klines
+            return [parse_kline(kline) for kline in klines]
         except Exception as e:
             log_error(e, "OHLCV 데이터 조회 실패")
             raise
 
     def get_current_price(self):
-        """현재가 조회"""
+        """현재가 조회 (집계기의 마지막 체결가 우선)"""
         try:
-            ticker = self.api.get_ticker(symbol=self.symbol)
-            return float(ticker['lastPrice'])
+            if self.aggregator is not None:
+                price = self.aggregator.last_price(self.symbol)
+                if price is not None:
+                    return price
+            return self.api.get_ticker_price(self.symbol)
         except Exception as e:
             log_error(e, "현재가 조회 실패")
-            raise 
\ No newline at end of file
+            raise
@@ -0,0 +1,96 @@
+import time
+import asyncio
+from collections import deque
+from . import error_handler
+
+class DecisionTrigger:
+    """스트림 이벤트 기반 전략 평가 트리거
+
+    - 이벤트가 들어오면 전략 평가를 예약하고, 평가 중에 들어온 이벤트는 다음 평가 한 번으로 병합
+    - 이벤트 수신부터 평가 완료까지의 지연시간(tick-to-decision)을 이벤트별로 기록
+      (병합된 평가는 가장 먼저 도착한 이벤트 기준)
+    """
+    def __init__(self, history_size=10000):
+        """트리거 초기화
+
+        history_size: 보관할 지연시간 기록 수
+        """
+        self._event = asyncio.Event()
+        self._pending = None     # 평가 대기 중인 이벤트 (최초 수신 시각, 거래소 이벤트 시각, 병합 수, 출처)
+        self.latencies = deque(maxlen=history_size)
+        self.exchange_latencies = deque(maxlen=history_size)
+        self.running = False
+        self.stats = {'events': 0, 'evaluations': 0, 'coalesced': 0, 'errors': 0, 'sources': {}}
+
+    def notify(self, source='event', event_time=None):
+        """이벤트 수신 알림
+
+        source: 이벤트 종류 (trade, book, candle 등)
+        event_time: 거래소 이벤트 시각 (밀리초, 선택)
+        """
+        self.stats['events'] += 1
+        self.stats['sources'][source] = self.stats['sources'].get(source, 0) + 1
+        if self._pending is None:
+            self._pending = [time.perf_counter(), event_time, 1, source]
+        else:
+            self._pending[2] += 1
+            self.stats['coalesced'] += 1
+        self._event.set()
+
+    async def run(self, evaluate):
+        """이벤트마다 전략 평가 실행 (stop 호출 전까지)
+
+        evaluate: 코루틴 함수 또는 일반 함수 (일반 함수는 별도 스레드에서 실행하여 수신을 막지 않음)
+        """
+        self.running = True
+        while self.running:
+            await self._event.wait()
+            self._event.clear()
+            pending, self._pending = self._pending, None
+            if pending is None:
+                continue
+
+            received_at, event_time, count, source = pending
+            try:
+                if asyncio.iscoroutinefunction(evaluate):
+                    await evaluate()
+                else:
+                    await asyncio.to_thread(evaluate)
+            except Exception as e:
+                self.stats['errors'] += 1
+                error_handler.log_error(e, f"이벤트 기반 전략 평가 실패 ({source})")
+            finally:
+                self.stats['evaluations'] += 1
+                self.latencies.append(time.perf_counter() - received_at)
+                if event_time is not None:
+                    self.exchange_latencies.append(time.time() - event_time / 1000)
+
+    def stop(self):
+        """평가 루프 종료"""
+        self.running = False
+        self._event.set()
+
+    @staticmethod
+    def _summary(values):
+        if not values:
+            return {'count': 0, 'avg': 0.0, 'p50': 0.0, 'p99': 0.0, 'max': 0.0}
+        ordered = sorted(values)
+        return {
+            'count': len(ordered),
+            'avg': sum(ordered) / len(ordered),
+            'p50': ordered[len(ordered) // 2],
+            'p99': ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))],
+            'max': ordered[-1]
+        }
+
+    def get_stats(self):
+        """평가 횟수, 병합 수, 지연시간 통계 (초 단위)"""
+        return {
+            'events': self.stats['events'],
+            'evaluations': self.stats['evaluations'],
+            'coalesced': self.stats['coalesced'],
+            'errors': self.stats['errors'],
+            'sources': dict(self.stats['sources']),
+            'tick_to_decision': self._summary(self.latencies),
+            'exchange_to_decision': self._summary(self.exchange_latencies)
+        }
@@ -0,0 +1,270 @@
+import json
+import gzip
+import time
+import random
+import asyncio
+import threading
+from urllib.parse import urlsplit, parse_qsl
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import websockets
+from . import error_handler
+
+# 요청마다 달라져 재생 시 매칭에서 제외하는 서명 파라미터
+VOLATILE_PARAMS = frozenset(['timestamp', 'recvWindow', 'signature'])
+
+# 기록할 응답 헤더 (Rate Limit 보정에 사용되는 헤더만)
+RECORDED_HEADER_PREFIXES = ('x-mbx-', 'retry-after')
+
+def normalize_params(params=None, query_string=None):
+    """요청 파라미터를 매칭용 정렬 문자열로 변환 (서명 파라미터 제외)"""
+    items = []
+    if params:
+        items.extend((str(k), str(v)) for k, v in params.items())
+    if query_string:
+        items.extend(parse_qsl(query_string, keep_blank_values=True))
+    return '&'.join(f"{k}={v}" for k, v in sorted(items) if k not in VOLATILE_PARAMS)
+
+def load_recording(path):
+    """기록 파일(gzip 압축 JSON Lines)을 항목 목록으로 읽기"""
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+class TrafficRecorder:
+    """REST/WebSocket 요청-응답 기록기
+
+    한 줄에 한 항목씩 gzip 압축 JSON Lines 형식으로 저장한다.
+    - http: 메서드, 엔드포인트, 정규화된 파라미터, 상태 코드, Rate Limit 헤더, 응답 본문, 소요 시간
+    - ws: 스트림 경로, 수신 메시지 (기록 시작 기준 경과 시간 포함)
+    """
+    def __init__(self, path):
+        self.path = path
+        self._file = gzip.open(path, 'at', encoding='utf-8')
+        self._lock = threading.Lock()
+        self._start = time.time()
+        self.count = 0
+
+    def _write(self, entry):
+        entry['t'] = round(time.time() - self._start, 6)
+        line = json.dumps(entry, separators=(',', ':'), ensure_ascii=False)
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.write(line + '\n')
+            self.count += 1
+
+    def record_http(self, method, endpoint, params, query_string, status, headers, body, elapsed):
+        """REST 요청-응답 기록"""
+        self._write({
+            'kind': 'http',
+            'method': method,
+            'endpoint': endpoint,
+            'params': normalize_params(params, query_string),
+            'status': status,
+            'headers': {k.lower(): v for k, v in headers.items()
+                        if k.lower().startswith(RECORDED_HEADER_PREFIXES)},
+            'body': body,
+            'elapsed': round(elapsed, 6)
+        })
+
+    def record_ws(self, stream, message):
+        """WebSocket 수신 메시지 기록 (stream: 연결 URL 경로)"""
+        self._write({'kind': 'ws', 'stream': stream, 'data': message})
+
+    def close(self):
+        """기록 파일 닫기"""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+        error_handler.log_info(f"트래픽 기록 종료: {self.path} ({self.count}건)")
+
+class ReplayServer:
+    """기록된 트래픽을 재생하는 로컬 대체 서버 (HTTP + WebSocket)
+
+    - REST: (메서드, 엔드포인트, 파라미터) 가 같은 기록 응답을 순서대로 반환 (마지막 응답은 반복)
+    - /api/v3/time: 서명 타임스탬프가 유효하도록 현재 시각으로 응답
+    - WebSocket: 연결 경로의 기록 메시지를 기록된 간격(speed 배속)으로 전송
+    - 지연시간: latency 미지정 시 기록된 소요 시간, 지정 시 고정값에 ±jitter 균등 분포 지터 추가
+    - disconnect_after: WebSocket 연결당 전송 메시지 수 제한 (재연결 로직 검증용, 재연결 시 이어서 전송)
+    """
+    def __init__(self, path=None, entries=None, latency=None, jitter=0.0, speed=1.0,
+                 disconnect_after=None, seed=None, host='127.0.0.1'):
+        """재생 서버 초기화
+
+        path: 기록 파일 경로 (또는 entries 로 항목 목록 직접 전달)
+        latency: REST 응답 지연 (초, None 이면 기록된 소요 시간)
+        jitter: 지연시간 지터 폭 (초)
+        speed: WebSocket 메시지 재생 배속 (0 이하면 간격 없이 전송)
+        seed: 지터 난수 시드 (재현 가능한 벤치마크용)
+        """
+        entries = load_recording(path) if entries is None else entries
+        self.latency = latency
+        self.jitter = jitter
+        self.speed = speed
+        self.disconnect_after = disconnect_after
+        self.host = host
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+        self.responses = {}
+        self.streams = {}
+        for entry in entries:
+            if entry['kind'] == 'http':
+                key = (entry['method'], entry['endpoint'], entry['params'])
+                self.responses.setdefault(key, []).append(entry)
+            elif entry['kind'] == 'ws':
+                self.streams.setdefault(entry['stream'], []).append(entry)
+        self._cursors = {}
+        self._stream_cursors = {}
+
+        self.stats = {'http': 0, 'unmatched': 0, 'ws_connections': 0, 'ws_messages': 0}
+        self._http_server = None
+        self._ws_loop = None
+        self._ws_server = None
+        self._ws_thread = None
+        self.base_url = None
+        self.ws_url = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def delay(self, recorded=0.0):
+        """응답 지연시간 계산"""
+        base = recorded if self.latency is None else self.latency
+        with self._lock:
+            jitter = self._random.uniform(-self.jitter, self.jitter) if self.jitter else 0.0
+        return max(0.0, base + jitter)
+
+    def next_response(self, method, endpoint, params):
+        """요청에 해당하는 다음 기록 응답 (없으면 None)"""
+        key = (method, endpoint, params)
+        with self._lock:
+            responses = self.responses.get(key)
+            if not responses:
+                self.stats['unmatched'] += 1
+                return None
+            index = self._cursors.get(key, 0)
+            self._cursors[key] = index + 1
+            self.stats['http'] += 1
+            return responses[min(index, len(responses) - 1)]
+
+    def _make_handler(self):
+        replay = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _handle(self, method):
+                parts = urlsplit(self.path)
+                if parts.path == '/api/v3/time':
+                    status, headers = 200, {}
+                    body = json.dumps({'serverTime': int(time.time() * 1000)})
+                else:
+                    entry = replay.next_response(method, parts.path, normalize_params(query_string=parts.query))
+                    if entry is None:
+                        status, headers = 404, {}
+                        body = json.dumps({'code': -1, 'msg': f"기록되지 않은 요청: {method} {self.path}"})
+                    else:
+                        time.sleep(replay.delay(entry.get('elapsed', 0.0)))
+                        status, headers, body = entry['status'], entry['headers'], entry['body']
+
+                payload = body.encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_GET(self):
+                self._handle('GET')
+
+            def do_POST(self):
+                self._handle('POST')
+
+            def do_DELETE(self):
+                self._handle('DELETE')
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    async def _ws_handler(self, websocket, path):
+        """WebSocket 연결별 기록 메시지 전송"""
+        with self._lock:
+            self.stats['ws_connections'] += 1
+        messages = self.streams.get(path, [])
+        sent = 0
+        previous = None
+        while True:
+            with self._lock:
+                index = self._stream_cursors.get(path, 0)
+                if index >= len(messages):
+                    break
+                self._stream_cursors[path] = index + 1
+            entry = messages[index]
+            if previous is not None and self.speed > 0:
+                await asyncio.sleep(max(0.0, entry['t'] - previous) / self.speed)
+            previous = entry['t']
+
+            await websocket.send(entry['data'])
+            sent += 1
+            with self._lock:
+                self.stats['ws_messages'] += 1
+            if self.disconnect_after is not None and sent >= self.disconnect_after:
+                await websocket.close()
+                return
+        await websocket.wait_closed()
+
+    def _run_ws(self, ready):
+        """WebSocket 서버 이벤트 루프 (별도 스레드)"""
+        asyncio.set_event_loop(self._ws_loop)
+        self._ws_server = self._ws_loop.run_until_complete(
+            websockets.serve(self._ws_handler, self.host, 0)
+        )
+        ready.set()
+        self._ws_loop.run_forever()
+
+    def start(self):
+        """HTTP/WebSocket 서버 시작 (base_url, ws_url 설정)"""
+        self._http_server = ThreadingHTTPServer((self.host, 0), self._make_handler())
+        self._http_server.daemon_threads = True
+        threading.Thread(target=self._http_server.serve_forever, daemon=True).start()
+        self.base_url = f"http://{self.host}:{self._http_server.server_address[1]}"
+
+        if self.streams:
+            ready = threading.Event()
+            self._ws_loop = asyncio.new_event_loop()
+            self._ws_thread = threading.Thread(target=self._run_ws, args=(ready,), daemon=True)
+            self._ws_thread.start()
+            ready.wait()
+            port = self._ws_server.sockets[0].getsockname()[1]
+            self.ws_url = f"ws://{self.host}:{port}"
+
+        error_handler.log_info(
+            f"재생 서버 시작: {self.base_url} (REST {len(self.responses)}종, "
+            f"스트림 {len(self.streams)}개)"
+        )
+        return self
+
+    def stop(self):
+        """서버 종료"""
+        if self._http_server is not None:
+            self._http_server.shutdown()
+            self._http_server.server_close()
+            self._http_server = None
+
+        if self._ws_loop is not None:
+            async def shutdown():
+                self._ws_server.close()
+                await self._ws_server.wait_closed()
+            asyncio.run_coroutine_threadsafe(shutdown(), self._ws_loop).result()
+            self._ws_loop.call_soon_threadsafe(self._ws_loop.stop)
+            self._ws_thread.join()
+            self._ws_loop.close()
+            self._ws_loop = None
@@ -0,0 +1,513 @@
+import os
+import json
+import gzip
+import time
+from collections import deque
+import numpy as np
+from . import error_handler
+from .backtest_engine import SimulatedBroker
+
+# 이벤트 종류
+EVENT_TRADE = 0
+EVENT_BID = 1          # 매수 호가 단계 갱신 (수량 0 이면 제거)
+EVENT_ASK = 2          # 매도 호가 단계 갱신
+EVENT_BOOK_RESET = 3   # 스냅샷 시작 (이후 BID/ASK 행이 스냅샷 호가)
+
+# 이벤트 레코드 형식 (depth diff 이벤트는 호가 단계마다 한 행)
+TICK_EVENT_DTYPE = np.dtype([
+    ('time', 'i8'), ('kind', 'i1'), ('price', 'f8'), ('qty', 'f8'), ('update_id', 'i8'), ('maker', '?')
+])
+
+DAY_MS = 24 * 60 * 60 * 1000
+
+class TickEventWriter:
+    """체결/호가 이벤트를 시간 순 .npy 파일 묶음으로 기록
+
+    chunk_rows 행마다 events-000000.npy 형식의 파일로 나누어 저장 (기록 중 메모리 사용량 고정).
+    """
+    def __init__(self, directory, chunk_rows=1000000):
+        self.directory = directory
+        self.chunk_rows = chunk_rows
+        self._buffer = np.zeros(chunk_rows, dtype=TICK_EVENT_DTYPE)
+        self._size = 0
+        self.files = []
+        self.rows = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def _append(self, event_time, kind, price, qty, update_id=0, maker=False):
+        self._buffer[self._size] = (event_time, kind, price, qty, update_id, maker)
+        self._size += 1
+        self.rows += 1
+        if self._size == self.chunk_rows:
+            self.flush()
+
+    def on_trade(self, event):
+        """체결 이벤트 (trade 스트림 형식)"""
+        self._append(event['T'], EVENT_TRADE, float(event['p']), float(event['q']), event['t'], event['m'])
+
+    def on_depth(self, event):
+        """호가 diff 이벤트 (depthUpdate 스트림 형식)"""
+        for price, qty in event['b']:
+            self._append(event['E'], EVENT_BID, float(price), float(qty), event['u'])
+        for price, qty in event['a']:
+            self._append(event['E'], EVENT_ASK, float(price), float(qty), event['u'])
+
+    def on_snapshot(self, snapshot, event_time):
+        """REST 호가 스냅샷 (이후 호가창을 스냅샷으로 대체)"""
+        update_id = snapshot['lastUpdateId']
+        self._append(event_time, EVENT_BOOK_RESET, 0.0, 0.0, update_id)
+        for price, qty in snapshot['bids']:
+            self._append(event_time, EVENT_BID, float(price), float(qty), update_id)
+        for price, qty in snapshot['asks']:
+            self._append(event_time, EVENT_ASK, float(price), float(qty), update_id)
+
+    async def handle_event(self, stream, data):
+        """StreamManager 구독 핸들러 (trade, depthUpdate 기록)"""
+        event_type = data.get('e')
+        if event_type == 'trade':
+            self.on_trade(data)
+        elif event_type == 'depthUpdate':
+            self.on_depth(data)
+
+    def flush(self):
+        """버퍼의 이벤트를 다음 파일로 저장"""
+        if self._size == 0:
+            return
+        path = os.path.join(self.directory, f"events-{len(self.files):06d}.npy")
+        np.save(path, self._buffer[:self._size])
+        self.files.append(path)
+        self._size = 0
+
+    def close(self):
+        self.flush()
+        error_handler.log_info(f"틱 이벤트 기록 완료: {self.directory} ({self.rows}행, {len(self.files)}개 파일)")
+
+def convert_recording(recording_path, output_dir, symbol, chunk_rows=1000000, max_buffer=1000):
+    """TrafficRecorder 기록(gzip JSON Lines)의 체결/호가 메시지와 호가 스냅샷을 이벤트 파일로 변환
+
+    호가 diff 는 실시간 OrderBook 과 같은 절차로 기록한다.
+    - 첫 스냅샷 전이나 이벤트 누락 후에는 기록하지 않고 보관
+    - 스냅샷은 기록 위치 이전에 수신한 diff 중 u > lastUpdateId 인 이벤트를 스냅샷 호가 뒤에 다시 기록
+      (첫 이벤트는 U <= lastUpdateId+1 이어야 하며, 아니면 오래된 스냅샷으로 보고 건너뜀)
+    - 이후 이벤트는 U == 직전 u + 1 이어야 하며, 어긋나면 다음 스냅샷까지 보관
+    max_buffer: 스냅샷 사이에 보관할 최대 diff 이벤트 수
+    """
+    writer = TickEventWriter(output_dir, chunk_rows)
+    symbol = symbol.upper()
+    pending = deque(maxlen=max_buffer)   # 직전 스냅샷 이후 diff 이벤트
+    synced = False
+    last_id = None
+    last_time = 0
+
+    def apply(event):
+        """diff 이벤트 기록 (누락이면 False)"""
+        nonlocal last_id
+        if event['u'] <= last_id:
+            return True
+        if event['U'] != last_id + 1:
+            return False
+        # 스냅샷 뒤에 다시 기록하는 이벤트도 시간 순서 유지
+        writer.on_depth(event if event['E'] >= last_time else dict(event, E=last_time))
+        last_id = event['u']
+        return True
+
+    with gzip.open(recording_path, 'rt', encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            if entry['kind'] == 'http':
+                if entry['endpoint'] == '/api/v3/depth' and entry['status'] == 200 \
+                        and f"symbol={symbol}" in entry['params']:
+                    body = entry['body']
+                    snapshot = json.loads(body) if isinstance(body, str) else body
+                    snapshot_id = snapshot['lastUpdateId']
+                    buffered = [event for event in pending if event['u'] > snapshot_id]
+                    if buffered and buffered[0]['U'] > snapshot_id + 1:
+                        continue
+                    writer.on_snapshot(snapshot, last_time)
+                    pending.clear()
+                    synced = True
+                    last_id = snapshot_id
+                    for index, event in enumerate(buffered):
+                        if index == 0:
+                            # 첫 이벤트는 스냅샷과 범위가 겹칠 수 있으므로 연속성 검사 없이 기록
+                            last_id = event['U'] - 1
+                        pending.append(event)
+                        if synced and not apply(event):
+                            synced = False
+                            pending.clear()
+                            pending.append(event)
+                continue
+
+            message = entry['data']
+            message = json.loads(message) if isinstance(message, str) else message
+            data = message.get('data', message)
+            if data.get('s', '').upper() != symbol:
+                continue
+            if data.get('e') == 'trade':
+                writer.on_trade(data)
+                last_time = data['T']
+            elif data.get('e') == 'depthUpdate':
+                pending.append(data)
+                if synced and not apply(data):
+                    synced = False
+                    pending.clear()
+                    pending.append(data)
+                last_time = max(last_time, data['E'])
+    writer.close()
+    return writer.files
+
+def iter_event_chunks(source, chunk_rows=1000000):
+    """이벤트 파일(.npy)을 메모리 매핑으로 열어 chunk_rows 행씩 반환
+
+    source: 이벤트 파일 디렉토리 또는 파일 경로 목록 (파일 이름 순서 = 시간 순서)
+    """
+    if isinstance(source, str):
+        paths = [os.path.join(source, name) for name in sorted(os.listdir(source)) if name.endswith('.npy')]
+    else:
+        paths = list(source)
+    for path in paths:
+        events = np.load(path, mmap_mode='r')
+        for start in range(0, len(events), chunk_rows):
+            yield events[start:start + chunk_rows]
+
+class DenseBookSide:
+    """틱 단위 고정 크기 배열 호가 (가격 → 틱 위치 인덱스)
+
+    - 갱신은 구간 단위 배열 대입 (같은 가격은 마지막 값 적용)
+    - 최우선 호가 위치를 힌트로 유지하고 상위 n개 조회 시 힌트 주변만 탐색
+    - 배열 범위(levels 틱)를 벗어나면 새 가격 중심으로 이동 (멀리 떨어진 단계는 버림)
+    """
+    def __init__(self, descending, tick_size, levels=1 << 20):
+        self.descending = descending
+        self.tick_size = tick_size
+        self.levels = levels
+        self.qty = np.zeros(levels)
+        self.base = None
+        self.best = None    # 최우선 호가 후보 위치 (실제 최우선 호가 이상으로 좋은 위치)
+
+    def ticks(self, prices):
+        return np.rint(prices / self.tick_size).astype(np.int64)
+
+    def clear(self):
+        self.qty[:] = 0
+        self.best = None
+
+    def _recenter(self, center):
+        """center 틱이 배열 중앙에 오도록 이동"""
+        new_base = int(center) - self.levels // 2
+        if self.base is not None:
+            shift = new_base - self.base
+            moved = np.zeros(self.levels)
+            if abs(shift) < self.levels:
+                if shift > 0:
+                    moved[:self.levels - shift] = self.qty[shift:]
+                else:
+                    moved[-shift:] = self.qty[:self.levels + shift]
+            self.qty = moved
+            if self.best is not None:
+                self.best = min(max(self.best - shift, 0), self.levels - 1)
+        self.base = new_base
+
+    def contains(self, ticks):
+        """모든 틱이 현재 배열 범위 안인지 (범위가 없으면 마지막 틱 기준으로 설정)"""
+        if len(ticks) == 0:
+            return True
+        if self.base is None:
+            self._recenter(ticks[-1])
+        return ticks.min() >= self.base and ticks.max() < self.base + self.levels
+
+    def assign(self, index, qtys, candidate):
+        """범위 확인이 끝난 위치 배열로 갱신 (candidate: 수량이 있는 가장 좋은 위치, 없으면 None)"""
+        self.qty[index] = qtys
+        if candidate is not None and (self.best is None or
+                                      (candidate > self.best if self.descending else candidate < self.best)):
+            self.best = candidate
+
+    def update(self, ticks, qtys):
+        """틱 위치 배열과 수량 배열로 갱신 (범위를 벗어나면 이동)"""
+        if len(ticks) == 0:
+            return
+        if self.base is None:
+            self._recenter(ticks[-1])
+        index = ticks - self.base
+        if index.min() < 0 or index.max() >= self.levels:
+            self._recenter(ticks[-1])
+            index = ticks - self.base
+            inside = (index >= 0) & (index < self.levels)
+            index, qtys = index[inside], qtys[inside]
+            if len(index) == 0:
+                return
+        self.qty[index] = qtys
+        added = index[qtys > 0]
+        if len(added):
+            candidate = int(added.min() if not self.descending else added.max())
+            if self.best is None or (candidate > self.best if self.descending else candidate < self.best):
+                self.best = candidate
+
+    def top_volume(self, n):
+        """상위 n개 호가 수량 합계 (최우선 호가부터 순서대로 합산)"""
+        if self.best is None:
+            return 0.0
+        width = 1024
+        while True:
+            if self.descending:
+                low = max(0, self.best - width + 1)
+                window = self.qty[low:self.best + 1]
+                found = np.flatnonzero(window)
+                exhausted = low == 0
+                selected = window[found[::-1][:n]]
+                if len(found):
+                    self.best = low + int(found[-1])
+            else:
+                high = min(self.levels, self.best + width)
+                window = self.qty[self.best:high]
+                found = np.flatnonzero(window)
+                exhausted = high == self.levels
+                selected = window[found[:n]]
+                if len(found):
+                    self.best = self.best + int(found[0])
+            if len(selected) >= n or exhausted:
+                return sum(selected.tolist())
+            width *= 4
+
+class TickBacktester:
+    """기록된 체결/호가 이벤트를 시간 순으로 재생하는 이벤트 기반 백테스터
+
+    - 이벤트 파일을 chunk_rows 행씩 메모리 매핑으로 읽어 데이터 크기와 관계없이 메모리 사용량 고정
+    - decision_interval_ms 구간마다 호가/체결 이벤트를 배열 단위로 반영한 뒤 전략을 한 번 평가
+      (실시간 모드에서 평가 중 도착한 이벤트를 병합하는 것과 같은 방식, 0 이면 이벤트 시각마다 평가)
+    - 평가 입력은 실시간 분석과 같은 형식: 최근 체결가, 24시간 가격 변동률/거래량, 상위 호가 매수/매도 비율
+    - 주문은 SimulatedBroker 가 최근 체결가로 체결
+    """
+    def __init__(self, strategy, tick_size=0.01, decision_interval_ms=100, depth_levels=10,
+                 book_levels=1 << 20, change_window_ms=DAY_MS, chunk_rows=1000000):
+        """백테스터 초기화
+
+        strategy: TradingStrategy (진입/청산 판단 메서드 사용)
+        tick_size: 호가 가격 단위
+        depth_levels: 매수/매도 비율 계산에 사용할 상위 호가 수 (실시간 분석과 같은 10)
+        book_levels: 호가 한쪽 배열 크기 (틱 수, 메모리 = 2 * book_levels * 8 바이트)
+        change_window_ms: 가격 변동률/거래량 계산 구간 (기본 24시간, 1초 단위 표본)
+        """
+        self.strategy = strategy
+        self.tick_size = tick_size
+        self.decision_interval_ms = decision_interval_ms
+        self.depth_levels = depth_levels
+        self.change_window_ms = change_window_ms
+        self.chunk_rows = chunk_rows
+        self.bids = DenseBookSide(True, tick_size, book_levels)
+        self.asks = DenseBookSide(False, tick_size, book_levels)
+        self.broker = SimulatedBroker(strategy.symbol)
+        self.last_price = None
+        self.last_time = None
+        self._history = deque()     # (초, 해당 초 마지막 체결가, 해당 초 거래량)
+        self._window_volume = 0.0
+        self.stats = {'events': 0, 'trades': 0, 'depth_updates': 0, 'resets': 0, 'evaluations': 0}
+
+    def buy_sell_ratio(self):
+        """상위 호가 매수/매도 수량 비율 (OrderBook.buy_sell_ratio 와 같은 계산)"""
+        ask_volume = self.asks.top_volume(self.depth_levels)
+        return self.bids.top_volume(self.depth_levels) / ask_volume if ask_volume > 0 else 0
+
+    def _record_trade(self, trade_time, price, volume):
+        """평가 구간의 마지막 체결가와 거래량을 1초 단위 표본으로 누적"""
+        second = trade_time // 1000
+        self._window_volume += volume
+        if self._history and self._history[-1][0] == second:
+            self._history[-1] = (second, price, self._history[-1][2] + volume)
+        else:
+            self._history.append((second, price, volume))
+        oldest = second - self.change_window_ms // 1000
+        while self._history[0][0] < oldest:
+            self._window_volume -= self._history.popleft()[2]
+        self.last_price = price
+
+    def _apply(self, events):
+        """같은 평가 구간의 이벤트 반영"""
+        self.stats['events'] += len(events)
+        kinds = events['kind']
+        resets = np.flatnonzero(kinds == EVENT_BOOK_RESET)
+        if len(resets):
+            # 스냅샷 시작 위치 기준으로 나누어 순서대로 반영
+            bounds = [0] + resets.tolist() + [len(events)]
+            for start, end in zip(bounds[:-1], bounds[1:]):
+                part = events[start:end]
+                if len(part) and part['kind'][0] == EVENT_BOOK_RESET:
+                    self.bids.clear()
+                    self.asks.clear()
+                    self.stats['resets'] += 1
+                    part = part[1:]
+                self._apply_levels(part)
+            return
+        self._apply_levels(events)
+
+    def _apply_levels(self, events):
+        kinds = events['kind']
+        prices = events['price']
+        qtys = events['qty']
+        for side, kind in ((self.bids, EVENT_BID), (self.asks, EVENT_ASK)):
+            mask = kinds == kind
+            if mask.any():
+                side.update(side.ticks(prices[mask]), qtys[mask])
+                self.stats['depth_updates'] += int(mask.sum())
+        trades = np.flatnonzero(kinds == EVENT_TRADE)
+        if len(trades):
+            last = trades[-1]
+            self._record_trade(int(events['time'][last]), float(prices[last]), float(qtys[trades].sum()))
+            self.stats['trades'] += len(trades)
+
+    def _analysis(self):
+        """실시간 분석(_build_analysis)과 같은 형식의 분석 결과"""
+        reference = self._history[0][1]
+        price_change = (self.last_price - reference) / reference * 100 if reference else 0.0
+        ratio = self.buy_sell_ratio()
+        return {
+            'current_price': self.last_price,
+            'price_change_24h': price_change,
+            'volume_24h': self._window_volume,
+            'buy_sell_ratio': ratio,
+            'market_sentiment': self.strategy._get_market_sentiment(price_change, ratio)
+        }
+
+    def _evaluate(self, event_time):
+        """전략 평가 (update_position 과 같은 진입/청산 흐름)"""
+        if self.last_price is None:
+            return
+        self.stats['evaluations'] += 1
+        self.broker.set_price(self.last_price, event_time)
+        analysis = self._analysis()
+        strategy = self.strategy
+        if strategy.position is None:
+            signal = strategy.should_open_position(analysis)
+            if signal in ["BUY", "SELL"]:
+                strategy.execute_trade(signal, analysis['current_price'])
+        else:
+            signal = strategy.should_close_position(analysis)
+            if signal in ["STOP_LOSS", "TAKE_PROFIT"]:
+                strategy.close_position(signal)
+
+    def _side_segments(self, side, kinds, prices, qtys, kind, starts):
+        """평가 구간별 호가 갱신 범위와 수량이 있는 가장 좋은 위치 (범위를 벗어나면 None)"""
+        rows = np.flatnonzero(kinds == kind)
+        ticks = side.ticks(prices[rows])
+        if not side.contains(ticks):
+            return None
+        index = ticks - side.base
+        side_qtys = qtys[rows]
+        low = np.searchsorted(rows, starts)
+        high = np.append(low[1:], len(rows))
+        empty = -1 if side.descending else side.levels
+        best = np.full(len(starts), empty, dtype=np.int64)
+        nonempty = low < high
+        if len(rows):
+            values = np.where(side_qtys > 0, index, empty)
+            reduce = np.maximum if side.descending else np.minimum
+            best[nonempty] = reduce.reduceat(values, low[nonempty])
+        best = [None if value == empty else value for value in best.tolist()]
+        return index, side_qtys, low.tolist(), high.tolist(), best
+
+    def _run_chunk(self, events, current):
+        """이벤트 묶음 처리 (반환: 진행 중인 평가 구간)
+
+        구간별 갱신 범위, 최우선 호가 후보, 마지막 체결가/거래량을 묶음 단위 배열 연산으로 미리 계산하고
+        구간마다 배열 대입과 평가만 수행. 스냅샷이 있거나 호가 배열 범위를 벗어나는 묶음은 구간별로 처리.
+        """
+        interval = self.decision_interval_ms
+        times = events['time']
+        kinds = events['kind']
+        prices = events['price']
+        qtys = events['qty']
+        buckets = times // interval if interval > 0 else times
+        starts = np.concatenate([[0], np.flatnonzero(np.diff(buckets)) + 1])
+        ends = np.append(starts[1:], len(events))
+        bucket_list = buckets[starts].tolist()
+        last_times = times[ends - 1].tolist()
+
+        bid_segments = ask_segments = None
+        if not (kinds == EVENT_BOOK_RESET).any():
+            bid_segments = self._side_segments(self.bids, kinds, prices, qtys, EVENT_BID, starts)
+            ask_segments = self._side_segments(self.asks, kinds, prices, qtys, EVENT_ASK, starts)
+
+        if bid_segments is None or ask_segments is None:
+            for start, end, bucket, last_time in zip(starts.tolist(), ends.tolist(), bucket_list, last_times):
+                if current is not None and bucket != current:
+                    # 이전 구간의 모든 이벤트를 반영한 상태로 평가
+                    self._evaluate(self.last_time)
+                current = bucket
+                self._apply(events[start:end])
+                self.last_time = last_time
+            return current
+
+        trade_rows = np.flatnonzero(kinds == EVENT_TRADE)
+        trade_low = np.searchsorted(trade_rows, starts)
+        trade_high = np.append(trade_low[1:], len(trade_rows))
+        has_trade = (trade_low < trade_high).tolist()
+        volumes = np.zeros(len(starts))
+        if len(trade_rows):
+            volumes[trade_low < trade_high] = np.add.reduceat(qtys[trade_rows], trade_low[trade_low < trade_high])
+        last_trade = trade_rows[np.maximum(trade_high - 1, 0)] if len(trade_rows) else np.zeros(len(starts), np.int64)
+        trade_times = times[last_trade].tolist()
+        trade_prices = prices[last_trade].tolist()
+        volumes = volumes.tolist()
+
+        bid_index, bid_qtys, bid_low, bid_high, bid_best = bid_segments
+        ask_index, ask_qtys, ask_low, ask_high, ask_best = ask_segments
+        for i, bucket in enumerate(bucket_list):
+            if current is not None and bucket != current:
+                self._evaluate(self.last_time)
+            current = bucket
+            if bid_low[i] < bid_high[i]:
+                self.bids.assign(bid_index[bid_low[i]:bid_high[i]], bid_qtys[bid_low[i]:bid_high[i]], bid_best[i])
+            if ask_low[i] < ask_high[i]:
+                self.asks.assign(ask_index[ask_low[i]:ask_high[i]], ask_qtys[ask_low[i]:ask_high[i]], ask_best[i])
+            if has_trade[i]:
+                self._record_trade(trade_times[i], trade_prices[i], volumes[i])
+            self.last_time = last_times[i]
+
+        self.stats['events'] += len(events)
+        self.stats['trades'] += len(trade_rows)
+        self.stats['depth_updates'] += len(bid_index) + len(ask_index)
+        return current
+
+    def run(self, source):
+        """이벤트 재생 실행
+
+        source: 이벤트 파일 디렉토리 또는 파일 경로 목록
+        반환: 체결 내역, 거래 수, 누적 손익, 처리 이벤트 수 및 초당 처리량
+        """
+        strategy = self.strategy
+        strategy.trade_count = 0
+        strategy.profit_loss = 0.0
+        strategy.position = None
+        strategy.last_trade_price = None
+        live_api = strategy.binance_api
+        strategy.binance_api = self.broker
+        started = time.perf_counter()
+        try:
+            current = None      # 진행 중인 평가 구간
+            for chunk in iter_event_chunks(source, self.chunk_rows):
+                current = self._run_chunk(np.asarray(chunk), current)
+            if current is not None:
+                self._evaluate(self.last_time)
+            if strategy.position:
+                strategy.close_position("BACKTEST_END")
+        finally:
+            strategy.binance_api = live_api
+
+        elapsed = time.perf_counter() - started
+        result = {
+            'fills': self.broker.fills,
+            'trade_count': strategy.trade_count,
+            'profit_loss': strategy.profit_loss,
+            'events': self.stats['events'],
+            'evaluations': self.stats['evaluations'],
+            'elapsed': elapsed,
+            'events_per_sec': self.stats['events'] / elapsed if elapsed > 0 else 0.0
+        }
+        error_handler.log_info(
+            f"틱 백테스트 완료: 이벤트 {result['events']}개, 평가 {result['evaluations']}회, "
+            f"{result['events_per_sec']:.0f} 이벤트/초"
+        )
+        return result
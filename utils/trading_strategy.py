@@ -1,11 +1,24 @@
 import time
 import os
+import asyncio
+from datetime import datetime, timedelta
 from . import error_handler
+from . import backtest_engine
+from models import auto_optimize
+from exchanges.simulated_exchange import SimulatedExchange, DAY_MS
 
 class TradingStrategy:
-    def __init__(self, binance_api, symbol='BTCUSDT', auto_trading=True):
+    def __init__(self, binance_api, symbol='BTCUSDT', auto_trading=True, async_api=None,
+                 order_book=None, market_store=None, backtest_cache=None, market_stats=None, price_source=None):
         """거래 전략 초기화"""
         self.binance_api = binance_api
+        self.async_api = async_api    # 동시 조회용 비동기 API (선택)
+        self.order_book = order_book  # 스트림으로 유지되는 로컬 호가창 (선택, data.order_book.OrderBook)
+        self.market_store = market_store  # 과거 K라인 저장소 (선택, data.database_manager.KlineStore)
+        self.backtest_cache = backtest_cache  # 백테스트/최적화 결과 캐시 (선택, cache_manager.DiskLRUCache)
+        self.market_stats = market_stats  # 스트림으로 유지되는 24시간 통계 (선택, data.market_data.Rolling24hStats)
+        self.price_source = price_source  # 스트림 마지막 체결가 (선택, last_price(symbol) 제공, 예: CandleAggregator)
+        self.backtest_trades = None
         self.symbol = symbol
         self.position = None
         self.last_trade_price = None
@@ -27,27 +40,50 @@ class TradingStrategy:
         """시장 분석"""
         try:
             # 시장 데이터 수집
-            current_price = self.binance_api.get_ticker_price(self.symbol)
-            market_summary = self.binance_api.get_market_summary(self.symbol)
-            depth = self.binance_api.get_market_depth(self.symbol, limit=10)
-            
-            # 기본 시장 분석
-            price_change_24h = market_summary['price_change_percent']
-            volume_24h = market_summary['volume']
-            
-            # 호가 분석
-            bid_volume = sum(float(qty) for _, qty in depth['bids'])
-            ask_volume = sum(float(qty) for _, qty in depth['asks'])
-            buy_sell_ratio = bid_volume / ask_volume if ask_volume > 0 else 0
-            
-            analysis = {
-                'current_price': current_price,
-                'price_change_24h': price_change_24h,
-                'volume_24h': volume_24h,
-                'buy_sell_ratio': buy_sell_ratio,
-                'market_sentiment': self._get_market_sentiment(price_change_24h, buy_sell_ratio)
-            }
+            current_price = self._local_price()
+            if current_price is None:
+                current_price = self.binance_api.get_ticker_price(self.symbol)
+            market_summary = self._local_summary()
+            if market_summary is None:
+                market_summary = self.binance_api.get_market_summary(self.symbol)
+            depth = self._local_depth()
+            if depth is None:
+                depth = self.binance_api.get_market_depth(self.symbol, limit=10)
+            
+            analysis = self._build_analysis(current_price, market_summary, depth)
+            error_handler.log_info(f"시장 분석 완료: {analysis}")
+            return analysis
             
+        except Exception as e:
+            error_handler.log_error(e, "시장 분석 실패")
+            raise
+
+    async def analyze_market_async(self):
+        """시장 분석 (비동기, 시장 데이터 동시 조회)"""
+        try:
+            if self.async_api is None:
+                raise ValueError("비동기 API가 설정되지 않았습니다.")
+            
+            # 로컬에 없는 현재가, 24시간 요약, 호가만 동시에 요청 (왕복 1회 수준의 지연)
+            current_price = self._local_price()
+            market_summary = self._local_summary()
+            depth = self._local_depth()
+            requests = []
+            if current_price is None:
+                requests.append(self.async_api.get_ticker_price(self.symbol))
+            if market_summary is None:
+                requests.append(self.async_api.get_market_summary(self.symbol))
+            if depth is None:
+                requests.append(self.async_api.get_market_depth(self.symbol, limit=10))
+            results = iter(await asyncio.gather(*requests))
+            if current_price is None:
+                current_price = next(results)
+            if market_summary is None:
+                market_summary = next(results)
+            if depth is None:
+                depth = next(results)
+            
+            analysis = self._build_analysis(current_price, market_summary, depth)
             error_handler.log_info(f"시장 분석 완료: {analysis}")
             return analysis
             
@@ -55,6 +91,43 @@ class TradingStrategy:
             error_handler.log_error(e, "시장 분석 실패")
             raise
 
+    def _local_price(self):
+        """스트림 마지막 체결가 (없거나 아직 체결 수신 전이면 None)"""
+        if self.price_source is None:
+            return None
+        return self.price_source.last_price(self.symbol)
+
+    def _local_summary(self):
+        """로컬 24시간 통계 요약 (없거나 아직 적재 전이면 None)"""
+        if self.market_stats is None or not self.market_stats.has_data(self.symbol):
+            return None
+        return self.market_stats.get_market_summary(self.symbol)
+
+    def _local_depth(self, limit=10):
+        """동기화된 로컬 호가창의 상위 호가 (없거나 재동기화 중이면 None)"""
+        if self.order_book is None or not self.order_book.synced:
+            return None
+        return self.order_book.depth(limit)
+
+    def _build_analysis(self, current_price, market_summary, depth):
+        """수집된 시장 데이터로 분석 결과 생성"""
+        # 기본 시장 분석
+        price_change_24h = market_summary['price_change_percent']
+        volume_24h = market_summary['volume']
+        
+        # 호가 분석
+        bid_volume = sum(float(qty) for _, qty in depth['bids'])
+        ask_volume = sum(float(qty) for _, qty in depth['asks'])
+        buy_sell_ratio = bid_volume / ask_volume if ask_volume > 0 else 0
+        
+        return {
+            'current_price': current_price,
+            'price_change_24h': price_change_24h,
+            'volume_24h': volume_24h,
+            'buy_sell_ratio': buy_sell_ratio,
+            'market_sentiment': self._get_market_sentiment(price_change_24h, buy_sell_ratio)
+        }
+
     def _get_market_sentiment(self, price_change, buy_sell_ratio):
         """시장 심리 분석"""
         if price_change > 1.0 and buy_sell_ratio > 1.1:
@@ -235,9 +308,22 @@ class TradingStrategy:
             error_handler.log_error(e, "성능 지표 계산 실패")
             raise
 
-    def simulate_trades(self, days=30):
-        """거래 시뮬레이션 실행"""
+    def simulate_trades(self, days=30, exchange=None, interval="1h"):
+        """거래 시뮬레이션 실행
+
+        실제 API 대신 가상 시계의 모의 거래소에서 update_position 을 그대로 실행하고
+        캔들마다 시계를 진행 (대기 없음, 주문은 모의 거래소에서 체결).
+        exchange: exchanges.simulated_exchange.SimulatedExchange (미지정 시 최근 days 일 과거 K라인으로 생성)
+        반환: 성능 지표 + simulation (모의 거래소 결과 요약)
+        """
         try:
+            if exchange is None:
+                end_date = datetime.now()
+                start_date = end_date - timedelta(days=days)
+                arrays = self._historical_arrays(start_date.strftime('%Y-%m-%d'), end_date.strftime('%Y-%m-%d'),
+                                                 interval)
+                exchange = SimulatedExchange(arrays, symbol=self.symbol, interval=interval)
+            
             # 시뮬레이션 초기화
             self.trade_count = 0
             self.profit_loss = 0.0
@@ -247,94 +333,134 @@ class TradingStrategy:
             # 자동 거래 활성화
             self.auto_trading = True
             
-            # 시뮬레이션 실행
-            for _ in range(days):
-                self.update_position()
-                time.sleep(0.1)  # API 호출 제한 고려
-            
-            # 마지막 포지션 청산
-            if self.position:
-                self.close_position("SIMULATION_END")
+            # 모의 거래소로 교체 (실시간 호가창/24시간 통계/체결가도 사용하지 않음)
+            live = self.binance_api, self.order_book, self.market_stats, self.price_source
+            self.binance_api, self.order_book, self.market_stats, self.price_source = exchange, None, None, None
+            try:
+                steps = min(days * DAY_MS // exchange.interval_ms, exchange.remaining() + 1)
+                for step in range(steps):
+                    self.update_position()
+                    if step + 1 < steps and not exchange.step():
+                        break
+                
+                # 마지막 포지션 청산
+                if self.position:
+                    self.close_position("SIMULATION_END")
+            finally:
+                self.binance_api, self.order_book, self.market_stats, self.price_source = live
             
             # 성능 지표 반환
-            return self.get_performance_metrics()
+            metrics = self.get_performance_metrics()
+            metrics['simulation'] = exchange.get_summary()
+            return metrics
             
         except Exception as e:
             error_handler.log_error(e, "거래 시뮬레이션 실패")
             raise
 
-    def backtest(self, start_date, end_date, initial_balance=10000):
-        """백테스트 실행"""
+    def backtest(self, start_date, end_date, initial_balance=10000, buy_sell_ratio=1.0, engine="vectorized",
+                 keep_curve=True, export=None):
+        """백테스트 실행
+
+        주문은 실제 API 대신 모의 브로커(캔들 종가 즉시 체결)로 처리.
+        buy_sell_ratio: 캔들별 매수/매도 비율 (스칼라 또는 캔들 수 길이의 배열)
+        engine: "vectorized" (배열 연산) 또는 "loop" (캔들 단위 반복, 기준 구현)
+        keep_curve: False 면 캔들별 결과 없이 요약 통계만 보관
+        export: True 면 models/backtest_results/ 아래, 문자열이면 해당 경로에 Parquet 저장
+        backtest_cache 가 있으면 데이터/파라미터/코드 버전이 같은 실행은 저장된 결과와 전략 상태를 사용
+        반환: backtest_engine.BacktestResult
+        """
         try:
+            if export and not keep_curve:
+                raise ValueError("요약 통계만 보관하는 백테스트는 저장할 수 없습니다.")
+
             # 백테스트 초기화
             self.trade_count = 0
             self.profit_loss = 0.0
             self.position = None
             self.last_trade_price = None
             self.balance = initial_balance
+            self.backtest_trades = None   # 루프 엔진은 거래 배열을 만들지 않으므로 이전 실행 값 제거
             
             # 과거 데이터 수집
-            historical_data = self.binance_api.get_historical_klines(
-                self.symbol,
-                interval="1h",
-                start_str=start_date,
-                end_str=end_date
-            )
+            arrays = self._historical_arrays(start_date, end_date)
+            
+            key = cached = None
+            if self.backtest_cache is not None:
+                key = backtest_engine.backtest_key(
+                    arrays, buy_sell_ratio, self._current_parameters(),
+                    engine=engine, keep_curve=keep_curve, balance=initial_balance, auto_trading=self.auto_trading
+                )
+                cached = self.backtest_cache.get(key)
+            
+            if cached is not None:
+                results, (self.trade_count, self.profit_loss, self.backtest_trades) = cached
+            elif engine == "loop":
+                results, _ = backtest_engine.loop_backtest(self, arrays, self.balance, buy_sell_ratio, keep_curve)
+            elif engine == "vectorized":
+                results = self._backtest_vectorized(arrays, buy_sell_ratio, keep_curve)
+            else:
+                raise ValueError(f"지원하지 않는 백테스트 엔진: {engine}")
             
-            # 백테스트 실행
-            results = []
-            for kline in historical_data:
-                timestamp = kline[0]
-                open_price = float(kline[1])
-                high_price = float(kline[2])
-                low_price = float(kline[3])
-                close_price = float(kline[4])
-                volume = float(kline[5])
-                
-                # 시장 분석 데이터 생성
-                analysis = {
-                    'current_price': close_price,
-                    'price_change_24h': ((close_price - open_price) / open_price) * 100,
-                    'volume_24h': volume,
-                    'buy_sell_ratio': 1.0,  # 백테스트에서는 임시로 1.0 사용
-                    'market_sentiment': self._get_market_sentiment(
-                        ((close_price - open_price) / open_price) * 100,
-                        1.0
-                    )
-                }
-                
-                # 포지션 업데이트
-                if self.position is None:
-                    signal = self.should_open_position(analysis)
-                    if signal:
-                        self.execute_trade(signal, close_price)
-                else:
-                    signal = self.should_close_position(analysis)
-                    if signal:
-                        self.close_position(signal)
-                
-                # 결과 기록
-                results.append({
-                    'timestamp': timestamp,
-                    'price': close_price,
-                    'position': self.position,
-                    'balance': self.balance,
-                    'profit_loss': self.profit_loss
-                })
+            if key is not None and cached is None:
+                self.backtest_cache.set(key, (results, (self.trade_count, self.profit_loss, self.backtest_trades)))
             
-            # 마지막 포지션 청산
-            if self.position:
-                self.close_position("BACKTEST_END")
+            if export:
+                path = export if isinstance(export, str) else os.path.join(
+                    backtest_engine.RESULTS_DIR, f"{self.symbol}_{start_date}_{end_date}_{engine}.parquet"
+                )
+                results.to_parquet(path)
+                error_handler.log_info(f"백테스트 결과 저장: {path}")
             
-            error_handler.log_info(f"백테스트 완료: {len(results)}개 데이터 처리")
+            error_handler.log_info(
+                f"백테스트 완료: {len(results)}개 데이터 처리, "
+                f"수익률 {results.summary['total_profit_loss']:.2f}%, 최대 낙폭 {results.summary['max_drawdown']:.2f}%"
+            )
             return results
             
         except Exception as e:
             error_handler.log_error(e, "백테스트 실행 실패")
             raise
 
-    def optimize_parameters(self, start_date, end_date, initial_balance=10000):
-        """전략 파라미터 최적화"""
+    def _historical_arrays(self, start_date, end_date, interval="1h"):
+        """백테스트용 과거 K라인 열 배열 (저장소가 있으면 저장된 구간은 네트워크 없이 조회)"""
+        if self.market_store is not None:
+            return self.market_store.ensure(self.binance_api, self.symbol, interval, start_date, end_date)
+        historical_data = self.binance_api.get_historical_klines(
+            self.symbol,
+            interval=interval,
+            start_str=start_date,
+            end_str=end_date
+        )
+        return backtest_engine.klines_to_arrays(historical_data)
+
+    def _backtest_vectorized(self, arrays, buy_sell_ratio=1.0, keep_curve=True):
+        """배열 연산 백테스트 후 전략 상태 반영 및 열 단위 결과 생성"""
+        run = backtest_engine.run_backtest(
+            arrays['open'], arrays['close'], self.stop_loss, self.take_profit,
+            buy_sell_ratio=buy_sell_ratio, auto_trading=self.auto_trading
+        )
+        self.trade_count = run['trade_count']
+        self.profit_loss = run['total_profit_loss']
+        self.position = None
+        self.last_trade_price = None
+        self.backtest_trades = run['trades']
+        
+        return backtest_engine.BacktestResult.from_arrays(
+            arrays['open_time'], arrays['close'], run['position'], run['profit_loss'],
+            run['trades']['profit_pct'], self.balance, run['total_profit_loss'], keep_curve=keep_curve
+        )
+
+    def optimize_parameters(self, start_date, end_date, initial_balance=10000, buy_sell_ratio=1.0, workers=None,
+                            search="grid", **search_options):
+        """전략 파라미터 최적화
+
+        과거 데이터는 한 번만 조회하여 공유 메모리에 올리고,
+        파라미터 조합별 백테스트는 프로세스 풀에서 병렬로 실행 (workers: 작업자 수, 기본값 CPU 수).
+        search: "grid" (고정 격자 전체) 또는 models.auto_optimize 탐색 방식
+                ("halving", "hyperband", "walk_forward", search_options 는 auto_optimize.optimize 인자)
+        backtest_cache 가 있으면 이미 평가한 조합은 재계산하지 않음 (timing['cache']: 적중률 등 캐시 통계)
+        """
         try:
             # 최적화할 파라미터 범위 설정
             param_ranges = {
@@ -344,59 +470,73 @@ class TradingStrategy:
                 'take_profit': [1.0, 1.5, 2.0, 2.5]
             }
             
-            # 최적화 결과 저장
+            # 과거 데이터 1회 조회
+            load_started = time.perf_counter()
+            arrays = self._historical_arrays(start_date, end_date)
+            load_time = time.perf_counter() - load_started
+            
+            # 조기 탈락/walk-forward 탐색
+            if search != "grid":
+                output = auto_optimize.optimize(
+                    arrays['open'], arrays['close'], method=search, buy_sell_ratio=buy_sell_ratio,
+                    auto_trading=self.auto_trading, workers=workers, cache=self.backtest_cache, **search_options
+                )
+                output['timing']['load'] = load_time
+                output['timing']['wall_clock'] += load_time
+                self._apply_parameters(output['best_parameters'])
+                return output
+            
+            # 모든 파라미터 조합에 대해 병렬 백테스트 실행
+            optimization_results, timing = backtest_engine.grid_search(
+                arrays['open'], arrays['close'], param_ranges,
+                buy_sell_ratio=buy_sell_ratio, auto_trading=self.auto_trading, workers=workers,
+                cache=self.backtest_cache
+            )
+            timing['load'] = load_time
+            timing['wall_clock'] += load_time
+            
+            # 최고 수익률 조합 (동률이면 먼저 나온 조합)
             best_params = None
             best_profit = float('-inf')
-            optimization_results = []
-            
-            # 모든 파라미터 조합에 대해 백테스트 실행
-            for min_price_change in param_ranges['min_price_change']:
-                for position_size in param_ranges['position_size']:
-                    for stop_loss in param_ranges['stop_loss']:
-                        for take_profit in param_ranges['take_profit']:
-                            # 파라미터 설정
-                            self.min_price_change = min_price_change
-                            self.position_size = position_size
-                            self.stop_loss = stop_loss
-                            self.take_profit = take_profit
-                            
-                            # 백테스트 실행
-                            results = self.backtest(start_date, end_date, initial_balance)
-                            final_result = results[-1]
-                            
-                            # 결과 저장
-                            params = {
-                                'min_price_change': min_price_change,
-                                'position_size': position_size,
-                                'stop_loss': stop_loss,
-                                'take_profit': take_profit,
-                                'profit': final_result['profit_loss'],
-                                'trades': self.trade_count
-                            }
-                            optimization_results.append(params)
-                            
-                            # 최고 수익률 갱신 확인
-                            if final_result['profit_loss'] > best_profit:
-                                best_profit = final_result['profit_loss']
-                                best_params = params.copy()
+            for params in optimization_results:
+                if params['profit'] > best_profit:
+                    best_profit = params['profit']
+                    best_params = params.copy()
             
             # 최적 파라미터 적용
-            if best_params:
-                self.min_price_change = best_params['min_price_change']
-                self.position_size = best_params['position_size']
-                self.stop_loss = best_params['stop_loss']
-                self.take_profit = best_params['take_profit']
+            self._apply_parameters(best_params)
             
-            error_handler.log_info(f"전략 최적화 완료: 최적 파라미터 = {best_params}")
+            error_handler.log_info(
+                f"전략 최적화 완료: 최적 파라미터 = {best_params}, "
+                f"{timing['combinations']}개 조합 {timing['wall_clock']:.2f}초 (작업자 {timing['workers']}개)"
+            )
             return {
                 'best_parameters': best_params,
-                'all_results': optimization_results
+                'all_results': optimization_results,
+                'timing': timing
             }
             
         except Exception as e:
             error_handler.log_error(e, "전략 최적화 실패")
             raise
 
+    def _current_parameters(self):
+        """현재 전략 파라미터"""
+        return {
+            'min_price_change': self.min_price_change,
+            'position_size': self.position_size,
+            'stop_loss': self.stop_loss,
+            'take_profit': self.take_profit
+        }
+
+    def _apply_parameters(self, params):
+        """최적화 결과 파라미터 적용"""
+        if params:
+            self.min_price_change = params['min_price_change']
+            self.position_size = params['position_size']
+            self.stop_loss = params['stop_loss']
+            self.take_profit = params['take_profit']
+
     def calculate_risk_metrics(self):
         """리스크 지표 계산"""
         try:
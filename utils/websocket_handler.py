@@ -4,9 +4,11 @@ import websockets
 from . import error_handler
 
 class BinanceWebSocket:
-    def __init__(self, symbol="btcusdt"):
+    def __init__(self, symbol="btcusdt", base_url="wss://stream.binance.com:9443", recorder=None):
         self.symbol = symbol.lower()
-        self.ws_url = f"wss://stream.binance.com:9443/ws/{self.symbol}@trade"
+        self.stream_path = f"/ws/{self.symbol}@trade"
+        self.ws_url = f"{base_url}{self.stream_path}"
+        self.recorder = recorder  # 수신 메시지 기록기 (utils.replay.TrafficRecorder)
         self.ws = None
         self.is_connected = False
         self.reconnect_attempts = 0
@@ -47,6 +49,8 @@ class BinanceWebSocket:
         
         try:
             message = await self.ws.recv()
+            if self.recorder is not None:
+                self.recorder.record_ws(self.stream_path, message)
             return json.loads(message)
         except websockets.ConnectionClosed:
             self.is_connected = False